@@ -3,11 +3,12 @@
 
 from flask import Flask
 from flask_cors import CORS # CORS is often initialized directly in create_app
+from werkzeug.middleware.proxy_fix import ProxyFix
 import os
 
 # Import configuration and initialized extensions
 from .config import config
-from .extensions import db, migrate, bcrypt, jwt # Import extension instances
+from .extensions import db, migrate, bcrypt, jwt, revocation_cache, blocklist_filter, scheduler, password_hasher, rate_limiter, identity_cache # Import extension instances
 
 def create_app(config_name='development'):
     """
@@ -22,11 +23,23 @@ def create_app(config_name='development'):
     # Load sensitive config from instance/config.py if it exists
     # Example: app.config.from_pyfile('config.py', silent=True)
 
+    # Take the client address from the trusted proxies' X-Forwarded-For, so the
+    # per-IP rate limits see each client rather than the proxy.
+    trusted_proxies = app.config.get('RATELIMIT_TRUSTED_PROXIES', 0)
+    if trusted_proxies:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=trusted_proxies, x_proto=trusted_proxies)
+
     # --- Initialize Extensions with App Context ---
     db.init_app(app)
     migrate.init_app(app, db) # Flask-Migrate needs both app and db
     bcrypt.init_app(app)
+    password_hasher.init_app(app)
     jwt.init_app(app) # Initialize JWTManager
+    revocation_cache.init_app(app)
+    identity_cache.init_app(app)
+    blocklist_filter.init_app(app)
+    scheduler.init_app(app)
+    rate_limiter.init_app(app)
 
     # Initialize CORS
     CORS(app, resources={r"/api/*": {"origins": "*"}}) # Adjust origins for production
@@ -37,6 +50,8 @@ def create_app(config_name='development'):
     from .api.todo_bp import todo_bp # Import the new todo_bp
     from .api.achievements_bp import achievements_bp
     from .api.plans_bp import plans_bp
+    from .api.metrics_bp import metrics_bp
+    from .api.admin_bp import admin_bp
 
     from .api.blog_bp import blog_bp # Assuming this exists or will be added
     from .api.ai_bp import ai_bp   # Assuming this exists or will be added
@@ -48,8 +63,40 @@ def create_app(config_name='development'):
     app.register_blueprint(anchor_bp, url_prefix='/api/v1/anchor')
     app.register_blueprint(achievements_bp, url_prefix='/api/v1/achievements')
     app.register_blueprint(plans_bp, url_prefix='/api/v1/plans')
+    app.register_blueprint(metrics_bp, url_prefix='/api/v1/metrics')
+    app.register_blueprint(admin_bp, url_prefix='/api/v1/admin')
+
+
 
+    # --- CLI Commands and Background Jobs ---
+    from .commands import register_commands
+    from .utils.db_maintenance import (purge_expired_tokens, compact_todo_tombstones, purge_todo_trash,
+                                       rebalance_long_todo_positions)
 
+    register_commands(app)
+    scheduler.every(
+        app.config.get('BLOCKLIST_PURGE_INTERVAL', 0), 'blocklist_purge',
+        lambda: purge_expired_tokens(batch_size=app.config['BLOCKLIST_PURGE_BATCH_SIZE'],
+                                     pause=app.config['BLOCKLIST_PURGE_PAUSE'])
+    )
+    scheduler.every(app.config.get('RATELIMIT_PRUNE_INTERVAL', 0), 'ratelimit_prune', rate_limiter.prune)
+    scheduler.every(
+        app.config.get('TODO_TOMBSTONE_COMPACT_INTERVAL', 0), 'todo_tombstone_compact',
+        lambda: compact_todo_tombstones(app.config['TODO_TOMBSTONE_RETENTION_DAYS'],
+                                        batch_size=app.config['TODO_TOMBSTONE_COMPACT_BATCH_SIZE'],
+                                        pause=app.config['MAINTENANCE_BATCH_PAUSE'])
+    )
+    scheduler.every(
+        app.config.get('TODO_TRASH_PURGE_INTERVAL', 0), 'todo_trash_purge',
+        lambda: purge_todo_trash(app.config['TODO_TRASH_RETENTION_DAYS'],
+                                 batch_size=app.config['TODO_TRASH_PURGE_BATCH_SIZE'],
+                                 pause=app.config['MAINTENANCE_BATCH_PAUSE'])
+    )
+    scheduler.every(
+        app.config.get('TODO_POSITION_REBALANCE_INTERVAL', 0), 'todo_position_rebalance',
+        lambda: rebalance_long_todo_positions(app.config['TODO_POSITION_MAX_LENGTH'],
+                                              pause=app.config['MAINTENANCE_BATCH_PAUSE'])
+    )
 
     # --- Database Creation (within Application Context) ---
     # This section is typically handled by Flask-Migrate.
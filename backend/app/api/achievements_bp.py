@@ -2,17 +2,29 @@
 # Blueprint for "Achievements" (Done) related API endpoints.
 
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, current_user
 import datetime
 
 # Import models and db instance
 from ..models.user import User # Assuming User model might be needed for context, though not directly used in these routes
 from ..models.achievement import Achievement
 from ..extensions import db
+from ..utils.owned_rows import delete_owned, ownership_status, update_owned
 
 # Create a Blueprint instance named 'achievements'
 achievements_bp = Blueprint('achievements', __name__)
 
+# List order of GET /achievements; ix_achievements_user_date_created serves it scanned backwards.
+ACHIEVEMENT_LIST_ORDER = (Achievement.date_achieved.desc().nullslast(), Achievement.created_at.desc())
+
+def _achievement_access_error(status, verb=None):
+    """Error response for an achievement the user cannot write (status from ownership_status)."""
+    if status == 403:
+        if verb:
+            return jsonify({"error": f"Forbidden: You do not have permission to {verb} this achievement"}), 403
+        return jsonify({"error": "Forbidden"}), 403
+    return jsonify({"error": "Achievement not found"}), 404
+
 @achievements_bp.route('/ping', methods=['GET'])
 def ping_achievements():
     """Simple test route to check if the achievements blueprint is registered."""
@@ -22,11 +34,7 @@ def ping_achievements():
 @achievements_bp.route('/', methods=['POST']) # Changed from '/achievements' to '/'
 @jwt_required()
 def create_achievement():
-    current_user_id_str = get_jwt_identity()
-    try:
-        current_user_id = int(current_user_id_str)
-    except ValueError:
-        return jsonify({"error": "Invalid user identity in token"}), 400
+    current_user_id = current_user.id
 
     data = request.get_json()
     if not data:
@@ -82,20 +90,16 @@ def create_achievement():
 @achievements_bp.route('/', methods=['GET']) # Changed from '/achievements' to '/'
 @jwt_required()
 def get_all_achievements():
-    current_user_id_str = get_jwt_identity()
-    try: current_user_id = int(current_user_id_str)
-    except ValueError: return jsonify({"error": "Invalid user identity in token"}), 400
+    current_user_id = current_user.id
     user_achievements = Achievement.query.filter_by(user_id=current_user_id)\
-        .order_by(Achievement.date_achieved.desc().nullslast(), Achievement.created_at.desc())\
+        .order_by(*ACHIEVEMENT_LIST_ORDER)\
         .all()
     return jsonify([ach.to_dict() for ach in user_achievements]), 200
 
 @achievements_bp.route('/<int:achievement_id>', methods=['GET']) # Changed from '/achievements/<id>' to '/<id>'
 @jwt_required()
 def get_achievement_by_id(achievement_id):
-    current_user_id_str = get_jwt_identity()
-    try: current_user_id = int(current_user_id_str)
-    except ValueError: return jsonify({"error": "Invalid user identity in token"}), 400
+    current_user_id = current_user.id
     achievement = db.session.get(Achievement, achievement_id)
     if not achievement: return jsonify({"error": "Achievement not found"}), 404
     if achievement.user_id != current_user_id: return jsonify({"error": "Forbidden: You do not have permission to access this achievement"}), 403
@@ -104,35 +108,27 @@ def get_achievement_by_id(achievement_id):
 @achievements_bp.route('/<int:achievement_id>', methods=['PUT']) # Changed from '/achievements/<id>' to '/<id>'
 @jwt_required()
 def update_achievement(achievement_id):
-    current_user_id_str = get_jwt_identity()
-    try: current_user_id = int(current_user_id_str)
-    except ValueError: return jsonify({"error": "Invalid user identity in token"}), 400
-    achievement = db.session.get(Achievement, achievement_id)
-    if not achievement: return jsonify({"error": "Achievement not found"}), 404
-    if achievement.user_id != current_user_id: return jsonify({"error": "Forbidden: You do not have permission to update this achievement"}), 403
+    current_user_id = current_user.id
     data = request.get_json()
     if not data: return jsonify({"error": "Request body must be JSON and cannot be empty"}), 400
 
-    updated_fields_count = 0
+    values = {}
 
     if 'title' in data:
         title = data['title']
         if not title or not isinstance(title, str) or not title.strip():
             return jsonify({"error": "Title is required and must be a non-empty string"}), 400
-        achievement.title = title.strip()
-        updated_fields_count += 1
+        values['title'] = title.strip()
     if 'description' in data:
         description = data['description']
         if description is not None and not isinstance(description, str):
             return jsonify({"error": "Description must be a string if provided"}), 400
-        achievement.description = description.strip() if description else None
-        updated_fields_count += 1
+        values['description'] = description.strip() if description else None
     if 'quantifiable_results' in data:
         quantifiable_results = data['quantifiable_results']
         if quantifiable_results is not None and not isinstance(quantifiable_results, str):
             return jsonify({"error": "Quantifiable results must be a string if provided"}), 400
-        achievement.quantifiable_results = quantifiable_results.strip() if quantifiable_results else None
-        updated_fields_count += 1
+        values['quantifiable_results'] = quantifiable_results.strip() if quantifiable_results else None
     if 'core_skills_json' in data:
         core_skills_json_input = data['core_skills_json']
         if core_skills_json_input is not None:
@@ -141,28 +137,35 @@ def update_achievement(achievement_id):
             for skill_item in core_skills_json_input:
                 if not isinstance(skill_item, str):
                     return jsonify({"error": "All items in core_skills_json must be strings"}), 400
-            achievement.core_skills_json = core_skills_json_input
+            values['core_skills_json'] = core_skills_json_input
         else:
-             achievement.core_skills_json = None
-        updated_fields_count += 1
+             values['core_skills_json'] = None
     if 'date_achieved' in data:
         date_achieved_str = data['date_achieved']
         if date_achieved_str is None:
-             achievement.date_achieved = None
+             values['date_achieved'] = None
         elif isinstance(date_achieved_str, str):
             try:
-                achievement.date_achieved = datetime.datetime.strptime(date_achieved_str, '%Y-%m-%d').date()
+                values['date_achieved'] = datetime.datetime.strptime(date_achieved_str, '%Y-%m-%d').date()
             except ValueError:
                 return jsonify({"error": "Invalid date_achieved format. Please use YYYY-MM-DD or null."}), 400
         else:
              return jsonify({"error": "date_achieved must be a string in YYYY-MM-DD format or null."}), 400
-        updated_fields_count += 1
 
-    if updated_fields_count == 0 and data:
+    if not values:
+        status = ownership_status(Achievement, achievement_id, current_user_id)
+        if status != 200:
+            return _achievement_access_error(status, "update")
         return jsonify({"message": "No relevant achievement fields provided for update."}), 200
     try:
+        # One UPDATE ... RETURNING checks ownership, writes and reads the row back.
+        achievement = update_owned(Achievement, achievement_id, current_user_id, values)
+        if achievement is None:
+            db.session.rollback()
+            return _achievement_access_error(ownership_status(Achievement, achievement_id, current_user_id), "update")
+        achievement_data = achievement.to_dict()
         db.session.commit()
-        return jsonify(achievement.to_dict()), 200
+        return jsonify(achievement_data), 200
     except Exception as e:
         db.session.rollback()
         # current_app.logger.error(f"Error updating achievement: {e}", exc_info=True) # Use current_app.logger
@@ -171,14 +174,11 @@ def update_achievement(achievement_id):
 @achievements_bp.route('/<int:achievement_id>', methods=['DELETE']) # Changed from '/achievements/<id>' to '/<id>'
 @jwt_required()
 def delete_achievement(achievement_id):
-    current_user_id_str = get_jwt_identity()
-    try: current_user_id = int(current_user_id_str)
-    except ValueError: return jsonify({"error": "Invalid user identity in token"}), 400
-    achievement = db.session.get(Achievement, achievement_id)
-    if not achievement: return jsonify({"error": "Achievement not found"}), 404
-    if achievement.user_id != current_user_id: return jsonify({"error": "Forbidden"}), 403
+    current_user_id = current_user.id
     try:
-        db.session.delete(achievement)
+        if not delete_owned(Achievement, achievement_id, current_user_id):
+            db.session.rollback()
+            return _achievement_access_error(ownership_status(Achievement, achievement_id, current_user_id))
         db.session.commit()
         return '', 204
     except Exception as e:
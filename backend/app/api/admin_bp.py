@@ -0,0 +1,58 @@
+# /your_project_root/app/api/admin_bp.py
+# Blueprint for administrative API endpoints (restricted to ADMIN_EMAILS).
+
+from flask import Blueprint, request, current_app
+from flask_jwt_extended import jwt_required, current_user
+import functools
+
+from ..utils.api_responses import api_success, api_error
+from ..utils.user_import import UserImporter, detect_format, parse_users, text_stream
+
+# Create a Blueprint instance named 'admin'
+admin_bp = Blueprint('admin', __name__)
+
+
+def admin_required(f):
+    """Allows the view only for users whose email is listed in ADMIN_EMAILS (use after @jwt_required)."""
+    @functools.wraps(f)
+    def decorated_function(*args, **kwargs):
+        if current_user.email not in current_app.config.get('ADMIN_EMAILS', []):
+            return api_error("Forbidden: administrator access required", 403)
+        return f(*args, **kwargs)
+    return decorated_function
+
+
+@admin_bp.route('/users/import', methods=['POST'])
+@jwt_required()
+@admin_required
+def import_users_endpoint():
+    """
+    Creates users in bulk from the request body.
+    The body is CSV (Content-Type: text/csv, header row username,email,password)
+    or NDJSON (Content-Type: application/x-ndjson, one object per line);
+    ?format=csv|ndjson overrides the Content-Type.
+    The import runs inside the request, so bodies with more than
+    USER_IMPORT_MAX_REQUEST_ROWS records are rejected with 413; larger
+    files go through `flask users import`.
+    """
+    try:
+        fmt = request.args.get('format') or detect_format(content_type=request.content_type)
+        if fmt not in ('csv', 'ndjson'):
+            raise ValueError(f"Unsupported import format '{fmt}' (expected 'csv' or 'ndjson')")
+        records = list(parse_users(text_stream(request.get_data()), fmt))
+    except (ValueError, UnicodeDecodeError) as e:
+        return api_error(str(e), 400)
+
+    config = current_app.config
+    limit = config['USER_IMPORT_MAX_REQUEST_ROWS']
+    if len(records) > limit:
+        return api_error(f"Too many users for one request ({len(records)} > {limit}); "
+                         "use `flask users import` for larger files", 413)
+    importer = UserImporter(
+        batch_size=config['USER_IMPORT_BATCH_SIZE'],
+        workers=config['USER_IMPORT_WORKERS'],
+        log_rounds=config['BCRYPT_LOG_ROUNDS'],
+    )
+    result = importer.run(records)
+    status_code = 201 if result['created'] else 200
+    return api_success(data=result, message=f"Imported {result['created']} users", status_code=status_code)
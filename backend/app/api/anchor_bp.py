@@ -2,7 +2,7 @@
 # Blueprint for "Personal Anchor Overview" (User Profile) related API endpoints.
 
 from flask import Blueprint, jsonify, request, current_app
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, current_user
 import datetime # Keep for potential future use in profile, though not directly used now
 
 # Import models
@@ -23,13 +23,11 @@ def ping_anchor():
 @anchor_bp.route('/profile', methods=['GET'])
 @jwt_required()
 def get_user_anchor_profile():
-    current_user_id_str = get_jwt_identity()
-    try:
-        current_user_id = int(current_user_id_str)
-    except ValueError:
-        return jsonify({"error": "Invalid user identity in token"}), 400
-    
-    user = db.session.get(User, current_user_id)
+    # The current-user snapshot carries the profile, so a cache hit needs no query.
+    if current_user.profile is not None:
+        return jsonify(current_user.profile), 200
+
+    user = db.session.get(User, current_user.id)
     if not user:
         return jsonify({"error": "User not found"}), 404
     
@@ -51,20 +49,13 @@ def get_user_anchor_profile():
 @anchor_bp.route('/profile', methods=['PUT'])
 @jwt_required()
 def update_user_anchor_profile():
-    current_user_id_str = get_jwt_identity()
-    try:
-        current_user_id = int(current_user_id_str)
-    except ValueError:
-        return jsonify({"error": "Invalid user identity in token"}), 400
-
-    user = db.session.get(User, current_user_id)
-    if not user:
-        return jsonify({"error": "User not found"}), 404
+    # Load the profile row directly; the User row itself is not needed here.
+    profile = db.session.get(UserProfile, current_user.id)
 
-    if not user.profile: # Should be auto-created by GET, but as a fallback or if GET was never called
+    if not profile: # Should be auto-created by GET, but as a fallback or if GET was never called
         try:
-            user.profile = UserProfile(id=user.id)
-            db.session.add(user.profile)
+            profile = UserProfile(id=current_user.id)
+            db.session.add(profile)
             # We might not commit here, let the subsequent updates be part of the same transaction
         except Exception as e:
             db.session.rollback() # Rollback if profile creation itself failed
@@ -86,7 +77,7 @@ def update_user_anchor_profile():
             # Add specific validation if needed, e.g., length, type
             if field_value is not None and not isinstance(field_value, str):
                  return jsonify({"error": f"{field_name} must be a string or null"}), 400
-            setattr(user.profile, field_name, field_value)
+            setattr(profile, field_name, field_value)
             updated_fields_count += 1
     
     if updated_fields_count == 0 and data: 
@@ -94,7 +85,7 @@ def update_user_anchor_profile():
 
     try:
         db.session.commit()
-        return jsonify(user.profile.to_dict()), 200
+        return jsonify(profile.to_dict()), 200
     except Exception as e:
         db.session.rollback()
         current_app.logger.error(f"Error updating user profile: {e}", exc_info=True)
@@ -2,36 +2,137 @@
 # Blueprint for authentication-related API endpoints.
 
 from flask import Blueprint, jsonify, request
+from sqlalchemy import or_, update
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
 import datetime # For blocklist entry creation and timezone
 
-# Import database session, models, and bcrypt instance
-from ..extensions import db, bcrypt, jwt # Import jwt from extensions
+# Import database session, models, and JWT-related extensions
+from ..extensions import db, jwt, revocation_cache, blocklist_filter, rate_limiter, identity_cache # Import jwt from extensions
 from ..models.user import User
 from ..models.token_blocklist import TokenBlocklist # Import TokenBlocklist model
+from ..utils.password_hashing import PasswordHashingBusy
+from ..utils.rate_limit import RateLimitExceeded
+from ..utils.api_responses import api_error
 
 # Import JWT functions
 from flask_jwt_extended import (
     create_access_token,
     create_refresh_token,
     jwt_required,
-    get_jwt_identity,
-    get_jwt # To access full JWT data (like jti, type)
+    get_jwt, # To access full JWT data (like jti, type)
+    current_user # UserSnapshot resolved by load_current_user below
 )
 
 auth_bp = Blueprint('auth', __name__)
 
+
+@auth_bp.errorhandler(PasswordHashingBusy)
+def handle_password_hashing_busy(error):
+    """Sheds load with 429 when the bcrypt pool and its queue are full."""
+    response = jsonify({"error": "Server is busy, please retry shortly."})
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response, 429
+
+
+@auth_bp.errorhandler(RateLimitExceeded)
+def handle_rate_limit_exceeded(error):
+    """Rejects requests over their RATELIMIT_LIMITS entry with 429."""
+    response = jsonify({"error": "Too many attempts, please try again later."})
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response, 429
+
 # --- JWT Callback for Blocklisting ---
 @jwt.token_in_blocklist_loader
 def check_if_token_is_revoked(jwt_header, jwt_payload: dict):
     """
     Callback function to check if a JWT has been revoked (blocklisted).
+    A token is revoked if it predates its user's token epoch ("log out all
+    devices") or if its JTI is blocklisted. Both answers are served from the
+    in-process revocation cache when possible; the database is only queried
+    on a cache miss.
+    """
+    if revocation_cache.is_epoch_revoked(jwt_payload, _lookup_token_epoch):
+        return True
+    return revocation_cache.is_revoked(jwt_payload, _lookup_blocklist)
+
+
+def _lookup_token_epoch(user_id: str):
+    """Returns the user's current token epoch (None if the user does not exist)."""
+    try:
+        return db.session.query(User.token_epoch).filter_by(id=int(user_id)).scalar()
+    except ValueError:
+        return None
+
+
+# --- JWT Callbacks for the Current User ---
+@jwt.user_lookup_loader
+def load_current_user(jwt_header, jwt_payload: dict):
+    """
+    Resolves the token's identity to a UserSnapshot, once per request.
+    Snapshots are served from the identity cache, so most requests do not
+    SELECT the user at all. Views read it through flask_jwt_extended.current_user.
+    """
+    return identity_cache.load(jwt_payload['sub'], _load_user_snapshot)
+
+
+@jwt.user_lookup_error_loader
+def handle_user_lookup_error(jwt_header, jwt_payload: dict):
+    """Responds when the token's identity does not resolve to an existing user."""
+    if not str(jwt_payload.get('sub', '')).isdigit():
+        return api_error("Invalid user identity in token", 400)
+    return api_error("User not found", 404)
+
+
+def _load_user_snapshot(identity: str):
+    """Loads the user behind a JWT identity as a detached snapshot (None if absent)."""
+    try:
+        # One query for the user and its profile, both of which the snapshot holds.
+        user = db.session.get(User, int(identity), options=[joinedload(User.profile)])
+    except ValueError:
+        return None
+    return user.snapshot() if user else None
+
+
+def _lookup_blocklist(jwt_payload: dict) -> bool:
+    """
+    Queries the blocklist table for the token's JTI.
+    The Bloom filter answers "not revoked" for almost every token; only a
+    filter hit (a revoked token or a rare false positive) reaches the table.
     """
     jti = jwt_payload['jti']
-    token = TokenBlocklist.query.filter_by(jti=jti).one_or_none()
+    if not blocklist_filter.might_contain(jti, revocation_cache.generation(), _blocklist_rows_since):
+        return False
+    token = TokenBlocklist.query.filter_by(jti=jti)\
+        .filter(_blocklist_row_is_live())\
+        .one_or_none()
     return token is not None
 
 
+def _blocklist_row_is_live():
+    """Filter clause excluding blocklist rows whose token has already expired."""
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return or_(TokenBlocklist.expires_at.is_(None), TokenBlocklist.expires_at > now)
+
+
+def _blocklist_rows_since(after_id: int):
+    """Streams (id, jti) pairs of live blocklist rows with an id greater than after_id."""
+    query = db.session.query(TokenBlocklist.id, TokenBlocklist.jti)\
+        .filter(TokenBlocklist.id > after_id, _blocklist_row_is_live())\
+        .order_by(TokenBlocklist.id)\
+        .yield_per(10000)
+    for row_id, jti in query:
+        yield row_id, jti
+
+
+def _token_expiry(token_payload: dict):
+    """Returns the token's 'exp' claim as a UTC datetime (None if absent)."""
+    exp = token_payload.get('exp')
+    if exp is None:
+        return None
+    return datetime.datetime.fromtimestamp(exp, datetime.timezone.utc)
+
+
 # --- API Endpoints ---
 @auth_bp.route('/ping', methods=['GET'])
 def ping_auth():
@@ -40,6 +141,7 @@ def ping_auth():
 
 
 @auth_bp.route('/register', methods=['POST'])
+@rate_limiter.limit
 def register():
     """Handles user registration."""
     data = request.get_json()
@@ -72,6 +174,9 @@ def register():
                 "created_at": new_user.created_at.isoformat() + 'Z' # Assuming created_at is UTC
             }
         }), 201
+    except PasswordHashingBusy:
+        db.session.rollback()
+        raise
     except IntegrityError as e:
         db.session.rollback()
         print(f"Database Integrity Error during registration: {e}")
@@ -83,6 +188,7 @@ def register():
 
 
 @auth_bp.route('/login', methods=['POST'])
+@rate_limiter.limit
 def login():
     """Handles user login and issues JWT tokens."""
     data = request.get_json()
@@ -98,9 +204,13 @@ def login():
     user = User.query.filter_by(email=email).first() # Okay for login check
 
     if user and user.check_password(password):
+        if user.password_needs_rehash():
+            # Upgrade hashes made at an older BCRYPT_LOG_ROUNDS; runs after the response.
+            user.rehash_password_later(password)
         user_identity = str(user.id)
-        access_token = create_access_token(identity=user_identity, fresh=True)
-        refresh_token = create_refresh_token(identity=user_identity)
+        claims = {revocation_cache.EPOCH_CLAIM: user.token_epoch}
+        access_token = create_access_token(identity=user_identity, fresh=True, additional_claims=claims)
+        refresh_token = create_refresh_token(identity=user_identity, additional_claims=claims)
         return jsonify(
             access_token=access_token,
             refresh_token=refresh_token
@@ -116,18 +226,21 @@ def logout():
     token_payload = get_jwt()
     jti = token_payload['jti']
     token_type = token_payload['type']
-    current_user_id_str = get_jwt_identity()
 
     try:
         blocklisted_token = TokenBlocklist(
             jti=jti,
             token_type=token_type,
-            user_id=int(current_user_id_str),
+            user_id=current_user.id,
             # Use timezone-aware UTC datetime
-            created_at=datetime.datetime.now(datetime.timezone.utc)
+            created_at=datetime.datetime.now(datetime.timezone.utc),
+            expires_at=_token_expiry(token_payload)
         )
         db.session.add(blocklisted_token)
         db.session.commit()
+        blocklist_filter.add(jti)
+        revocation_cache.mark_revoked(jti, token_payload.get('exp'))
+        jwt.forget(jti)
         return jsonify({"message": "Access token revoked. User logged out."}), 200
     except Exception as e:
         db.session.rollback()
@@ -142,18 +255,21 @@ def logout_refresh():
     token_payload = get_jwt()
     jti = token_payload['jti']
     token_type = token_payload['type']
-    current_user_id_str = get_jwt_identity()
 
     try:
         blocklisted_token = TokenBlocklist(
             jti=jti,
             token_type=token_type,
-            user_id=int(current_user_id_str),
+            user_id=current_user.id,
             # Use timezone-aware UTC datetime
-            created_at=datetime.datetime.now(datetime.timezone.utc)
+            created_at=datetime.datetime.now(datetime.timezone.utc),
+            expires_at=_token_expiry(token_payload)
         )
         db.session.add(blocklisted_token)
         db.session.commit()
+        blocklist_filter.add(jti)
+        revocation_cache.mark_revoked(jti, token_payload.get('exp'))
+        jwt.forget(jti)
         return jsonify({"message": "Refresh token revoked."}), 200
     except Exception as e:
         db.session.rollback()
@@ -161,19 +277,33 @@ def logout_refresh():
         return jsonify({"error": "Could not process logout request for refresh token."}), 500
 
 
+@auth_bp.route('/logout-all', methods=['POST'])
+@jwt_required()
+def logout_all_devices():
+    """Revokes every access and refresh token of the current user, on all devices."""
+    user_id = current_user.id
+    try:
+        # A single UPDATE; no per-token rows are written.
+        result = db.session.execute(
+            update(User).where(User.id == user_id).values(token_epoch=User.token_epoch + 1)
+        )
+        if result.rowcount == 0:
+            db.session.rollback()
+            return jsonify({"error": "User not found"}), 404
+        db.session.commit()
+        revocation_cache.forget_epoch(user_id)
+        return jsonify({"message": "All sessions revoked. User logged out on all devices."}), 200
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error revoking all sessions: {e}")
+        return jsonify({"error": "Could not process logout request."}), 500
+
+
 @auth_bp.route('/me', methods=['GET'])
 @jwt_required()
 def get_current_user_profile():
     """Gets the profile of the currently authenticated user."""
-    current_user_id_str = get_jwt_identity()
-    try:
-        # Use db.session.get() for SQLAlchemy 2.0 compatibility
-        user = db.session.get(User, int(current_user_id_str))
-    except ValueError:
-        return jsonify({"error": "Invalid user identity format"}), 400
-
-    if not user:
-        return jsonify({"error": "User not found"}), 404
+    user = current_user # Snapshot from the identity cache; no query on a cache hit
 
     return jsonify({
         "id": user.id,
@@ -189,8 +319,9 @@ def get_current_user_profile():
 @jwt_required(refresh=True)
 def refresh_access_token():
     """Gets a new access token using a refresh token."""
-    current_user_id_str = get_jwt_identity()
-    new_access_token = create_access_token(identity=current_user_id_str, fresh=False)
+    # Carry the refresh token's epoch over; it was checked by the blocklist loader.
+    claims = {revocation_cache.EPOCH_CLAIM: get_jwt().get(revocation_cache.EPOCH_CLAIM, 0)}
+    new_access_token = create_access_token(identity=str(current_user.id), fresh=False, additional_claims=claims)
     return jsonify(access_token=new_access_token), 200
 
 
@@ -198,19 +329,14 @@ def refresh_access_token():
 @jwt_required(fresh=True)
 def change_password():
     """Changes the current user's password (requires a fresh token)."""
-    current_user_id_str = get_jwt_identity()
     data = request.get_json()
     new_password = data.get('new_password')
 
     if not new_password:
         return jsonify({"error": "New password is required"}), 400
     
-    try:
-        # Use db.session.get() for SQLAlchemy 2.0 compatibility
-        user = db.session.get(User, int(current_user_id_str))
-    except ValueError:
-        return jsonify({"error": "Invalid user identity format"}), 400
-
+    # The snapshot is read-only; load the row itself to change it.
+    user = db.session.get(User, current_user.id)
     if not user:
         return jsonify({"error": "User not found"}), 404
 
@@ -218,6 +344,9 @@ def change_password():
         user.set_password(new_password)
         db.session.commit()
         return jsonify({"message": "Password updated successfully."}), 200
+    except PasswordHashingBusy:
+        db.session.rollback()
+        raise
     except Exception as e:
         db.session.rollback()
         print(f"Error changing password: {e}")
@@ -0,0 +1,27 @@
+# /your_project_root/app/api/metrics_bp.py
+# Blueprint exposing in-process performance counters (cache hit rates, etc.).
+
+from flask import Blueprint, current_app
+from flask_jwt_extended import jwt_required
+
+from .admin_bp import admin_required
+from ..utils.api_responses import api_success, api_error
+from ..utils.metrics import collect_metrics
+
+# Create a Blueprint instance named 'metrics'
+metrics_bp = Blueprint('metrics', __name__)
+
+
+@metrics_bp.route('', methods=['GET'])
+@jwt_required()
+@admin_required
+def get_metrics():
+    """
+    Returns the counters published by this worker process (administrators
+    only: the counters reveal how much load gets through the limits).
+    Each gunicorn worker keeps its own counters, so repeated calls may be
+    answered by different workers (see the 'pid' field).
+    """
+    if not current_app.config.get('METRICS_ENABLED', True):
+        return api_error("Metrics are disabled", 404)
+    return api_success(data=collect_metrics())
@@ -2,13 +2,14 @@
 # Blueprint for "Future Plans" (Plan) related API endpoints.
 
 from flask import Blueprint, jsonify, request, current_app
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, current_user
 import datetime
 
 # Import models and db instance
 from ..models.user import User # Assuming User model might be needed for context
 from ..models.future_plan import FuturePlan
 from ..extensions import db
+from ..utils.owned_rows import delete_owned, ownership_status, update_owned
 
 # Create a Blueprint instance named 'plans'
 plans_bp = Blueprint('plans', __name__)
@@ -16,6 +17,14 @@ plans_bp = Blueprint('plans', __name__)
 # Allowed values for FuturePlan status - for validation
 ALLOWED_FUTURE_PLAN_STATUSES = ['active', 'achieved', 'deferred', 'abandoned']
 
+# List order of GET /plans; ix_future_plans_user_target_created stores rows in this order.
+PLAN_LIST_ORDER = (FuturePlan.target_date.asc().nullslast(), FuturePlan.created_at.desc())
+
+def _plan_access_error(status):
+    """Error response for a plan the user cannot write (status from ownership_status)."""
+    if status == 403: return jsonify({"error": "Forbidden"}), 403
+    return jsonify({"error": "Future plan not found"}), 404
+
 @plans_bp.route('/ping', methods=['GET'])
 def ping_plans():
     """Simple test route to check if the plans blueprint is registered."""
@@ -25,9 +34,7 @@ def ping_plans():
 @plans_bp.route('/', methods=['POST']) # Changed from '/future_plans' to '/'
 @jwt_required()
 def create_future_plan():
-    current_user_id_str = get_jwt_identity()
-    try: current_user_id = int(current_user_id_str)
-    except ValueError: return jsonify({"error": "Invalid user identity in token"}), 400
+    current_user_id = current_user.id
     data = request.get_json()
     if not data: return jsonify({"error": "Request body must be JSON"}), 400
 
@@ -71,18 +78,14 @@ def create_future_plan():
 @plans_bp.route('/', methods=['GET']) # Changed from '/future_plans' to '/'
 @jwt_required()
 def get_all_future_plans():
-    current_user_id_str = get_jwt_identity()
-    try: current_user_id = int(current_user_id_str)
-    except ValueError: return jsonify({"error": "Invalid user identity in token"}), 400
-    user_plans = FuturePlan.query.filter_by(user_id=current_user_id).order_by(FuturePlan.target_date.asc().nullslast(), FuturePlan.created_at.desc()).all()
+    current_user_id = current_user.id
+    user_plans = FuturePlan.query.filter_by(user_id=current_user_id).order_by(*PLAN_LIST_ORDER).all()
     return jsonify([plan.to_dict() for plan in user_plans]), 200
 
 @plans_bp.route('/<int:plan_id>', methods=['GET']) # Changed from '/future_plans/<id>' to '/<id>'
 @jwt_required()
 def get_future_plan_by_id(plan_id):
-    current_user_id_str = get_jwt_identity()
-    try: current_user_id = int(current_user_id_str)
-    except ValueError: return jsonify({"error": "Invalid user identity in token"}), 400
+    current_user_id = current_user.id
     plan = db.session.get(FuturePlan, plan_id)
     if not plan: return jsonify({"error": "Future plan not found"}), 404
     if plan.user_id != current_user_id: return jsonify({"error": "Forbidden"}), 403
@@ -91,48 +94,49 @@ def get_future_plan_by_id(plan_id):
 @plans_bp.route('/<int:plan_id>', methods=['PUT']) # Changed from '/future_plans/<id>' to '/<id>'
 @jwt_required()
 def update_future_plan(plan_id):
-    current_user_id_str = get_jwt_identity()
-    try: current_user_id = int(current_user_id_str)
-    except ValueError: return jsonify({"error": "Invalid user identity in token"}), 400
-    plan = db.session.get(FuturePlan, plan_id)
-    if not plan: return jsonify({"error": "Future plan not found"}), 404
-    if plan.user_id != current_user_id: return jsonify({"error": "Forbidden"}), 403
+    current_user_id = current_user.id
     data = request.get_json()
     if not data: return jsonify({"error": "Request body must be JSON"}), 400
-    updated_fields_count = 0
+    values = {}
 
     if 'title' in data:
         title = data.get('title')
         if not title or not isinstance(title, str) or not title.strip():
             return jsonify({"error":"Title must be non-empty string"}), 400
-        plan.title = title.strip()
-        updated_fields_count += 1
+        values['title'] = title.strip()
 
     if 'description' in data:
         desc = data.get('description')
         if not desc or not isinstance(desc, str) or not desc.strip():
             return jsonify({"error":"Description must be non-empty string"}), 400
-        plan.description = desc.strip()
-        updated_fields_count += 1
+        values['description'] = desc.strip()
     if 'goal_type' in data:
         goal_type = data.get('goal_type')
         if goal_type is not None and (not isinstance(goal_type, str) or len(goal_type) > 50): return jsonify({"error":"goal_type must be string max 50 chars or null"}),400
-        plan.goal_type = goal_type.strip() if goal_type else None; updated_fields_count += 1
+        values['goal_type'] = goal_type.strip() if goal_type else None
     if 'status' in data:
         status = data.get('status').lower()
         if status not in ALLOWED_FUTURE_PLAN_STATUSES: return jsonify({"error":"Invalid status"}), 400
-        plan.status = status; updated_fields_count += 1
+        values['status'] = status
     if 'target_date' in data:
         date_str = data.get('target_date')
-        if date_str is None: plan.target_date = None
+        if date_str is None: values['target_date'] = None
         else:
-            try: plan.target_date = datetime.datetime.strptime(date_str, '%Y-%m-%d').date()
+            try: values['target_date'] = datetime.datetime.strptime(date_str, '%Y-%m-%d').date()
             except ValueError: return jsonify({"error":"Invalid target_date format"}), 400
-        updated_fields_count += 1
-    if updated_fields_count == 0 and data: return jsonify({"message":"No relevant fields to update"}), 200
+    if not values:
+        status = ownership_status(FuturePlan, plan_id, current_user_id)
+        if status != 200: return _plan_access_error(status)
+        return jsonify({"message":"No relevant fields to update"}), 200
     try:
+        # One UPDATE ... RETURNING checks ownership, writes and reads the row back.
+        plan = update_owned(FuturePlan, plan_id, current_user_id, values)
+        if plan is None:
+            db.session.rollback()
+            return _plan_access_error(ownership_status(FuturePlan, plan_id, current_user_id))
+        plan_data = plan.to_dict()
         db.session.commit()
-        return jsonify(plan.to_dict()), 200
+        return jsonify(plan_data), 200
     except Exception as e:
         db.session.rollback()
         current_app.logger.error(f"Error updating future plan: {e}", exc_info=True)
@@ -141,14 +145,11 @@ def update_future_plan(plan_id):
 @plans_bp.route('/<int:plan_id>', methods=['DELETE']) # Changed from '/future_plans/<id>' to '/<id>'
 @jwt_required()
 def delete_future_plan(plan_id):
-    current_user_id_str = get_jwt_identity()
-    try: current_user_id = int(current_user_id_str)
-    except ValueError: return jsonify({"error": "Invalid user identity in token"}), 400
-    plan = db.session.get(FuturePlan, plan_id)
-    if not plan: return jsonify({"error": "Future plan not found"}), 404
-    if plan.user_id != current_user_id: return jsonify({"error": "Forbidden"}), 403
+    current_user_id = current_user.id
     try:
-        db.session.delete(plan)
+        if not delete_owned(FuturePlan, plan_id, current_user_id):
+            db.session.rollback()
+            return _plan_access_error(ownership_status(FuturePlan, plan_id, current_user_id))
         db.session.commit()
         return '', 204
     except Exception as e:
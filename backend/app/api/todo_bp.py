@@ -1,8 +1,10 @@
 # /your_project_root/app/api/todo_bp.py
 # Blueprint for To-Do list related API endpoints.
 
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask import Blueprint, Response, current_app, request, jsonify, make_response, stream_with_context
+from flask_jwt_extended import jwt_required, current_user
+from sqlalchemy import and_, case, func, insert, select, tuple_, update
+from collections import defaultdict
 import datetime # For handling date conversions if needed
 
 # Import the TodoItem model and the db instance
@@ -12,6 +14,18 @@ from ..extensions import db
 # Import standardized API response utilities
 from ..utils.api_responses import api_success, api_error, api_validation_error
 from ..utils.request_validation import validate_json_request, validate_field_type, validate_enum_field
+from ..utils.pagination import DEFAULT_PAGE_SIZE, InvalidPageRequest, decode_cursor, page_meta, page_params
+from ..utils.owned_rows import ownership_status, update_owned
+from ..utils.todo_search import search_terms, search_todos
+from ..utils.todo_order import new_todo_positions, rebalance_todo_positions
+from ..utils.order_keys import InvalidOrderKey, key_between
+from ..utils.recurrence import InvalidRecurrence, RecurrenceRule
+from ..utils.todo_tree import MAX_SUBTASK_DEPTH, load_subtree, subtask_depths, subtree_depths, subtree_ids
+from ..utils.todo_tags import (normalize_tag, parse_tags, set_todo_tags, tag_facets, tagged_todo_ids, todo_dicts,
+                               todo_tag_names)
+from ..utils.todo_export import EXPORT_FORMATS, export_lines
+from ..utils.todo_sync import (InvalidSyncToken, SyncTokenExpired, changes_since, clear_tombstones,
+                               current_sync_version, next_sync_version, record_tombstones)
 
 # Create a Blueprint instance named 'todo'
 todo_bp = Blueprint('todo', __name__)
@@ -20,97 +34,483 @@ todo_bp = Blueprint('todo', __name__)
 ALLOWED_STATUSES = ['pending', 'in_progress', 'completed', 'deferred']
 ALLOWED_PRIORITIES = ['low', 'medium', 'high']
 
+# Operations accepted by POST /todos/batch, and the most it takes per request.
+BATCH_ACTIONS = ['create', 'update', 'delete']
+MAX_BATCH_OPERATIONS = 500
+
+# Most occurrences of one recurring item generated per GET /todos window.
+MAX_OCCURRENCES_PER_SERIES = 366
+
 @todo_bp.route('/ping', methods=['GET'])
 # This is a simple test route for the blueprint, not JWT protected for basic check
 def ping_todo():
     """Simple test route to check if the todo blueprint is registered."""
     return api_success(message="Todo API is alive!")
 
+# Sort keys for GET /todos: name -> (descending, sort expressions, row -> cursor values).
+# Every expression is non-null, so the keyset condition can be a single row-value comparison.
+_NO_DUE_DATE_ASC = datetime.date(9999, 12, 31) # Undated items sort after dated ones...
+_NO_DUE_DATE_DESC = datetime.date(1, 1, 1)     # ...in both directions.
+TODO_SORTS = {
+    # is_current_focus = True items first, then by created_at desc (id breaks ties).
+    'focus': (True, (TodoItem.is_current_focus, TodoItem.created_at, TodoItem.id),
+              lambda t: (t.is_current_focus, t.created_at, t.id)),
+    '-created_at': (True, (TodoItem.created_at, TodoItem.id), lambda t: (t.created_at, t.id)),
+    'created_at': (False, (TodoItem.created_at, TodoItem.id), lambda t: (t.created_at, t.id)),
+    'due_date': (False, (func.coalesce(TodoItem.due_date, _NO_DUE_DATE_ASC), TodoItem.id),
+                 lambda t: (t.due_date or _NO_DUE_DATE_ASC, t.id)),
+    '-due_date': (True, (func.coalesce(TodoItem.due_date, _NO_DUE_DATE_DESC), TodoItem.id),
+                  lambda t: (t.due_date or _NO_DUE_DATE_DESC, t.id)),
+    # Manual (drag-and-drop) order, see POST /todos/<id>/move.
+    'position': (False, (TodoItem.position, TodoItem.id), lambda t: (t.position, t.id)),
+}
+DEFAULT_TODO_SORT = 'focus'
+
+
+def _parse_choices(value, allowed, errors, field):
+    """Splits a comma-separated argument, recording an error if any value is not allowed."""
+    choices = [v.strip().lower() for v in value.split(',') if v.strip()]
+    invalid = [v for v in choices if v not in allowed]
+    if invalid or not choices:
+        errors[field] = [f"{field} must be one or more of: {', '.join(allowed)}"]
+    return choices
+
+
+def todo_list_query(user_id, args):
+    """
+    Builds the query behind GET /todos from its query-string arguments.
+    All filters run as SQL predicates and are served by the per-user
+    composite indexes on todo_items, which only hold live (untrashed) rows.
+
+    Args:
+        user_id: Owner of the listed items
+        args: Request arguments (status, priority, due_before, due_after,
+              is_current_focus, parent_id, tag, sort)
+
+    Returns:
+        (query, sort name, errors) - errors maps field names to messages
+        and is empty when every argument was valid
+    """
+    errors = {}
+    query = TodoItem.query.filter(TodoItem.user_id == user_id, TodoItem.deleted_at.is_(None))
+
+    if args.get('status'):
+        statuses = _parse_choices(args['status'], ALLOWED_STATUSES, errors, 'status')
+        query = query.filter(TodoItem.status.in_(statuses))
+    if args.get('priority'):
+        priorities = _parse_choices(args['priority'], ALLOWED_PRIORITIES, errors, 'priority')
+        query = query.filter(TodoItem.priority.in_(priorities))
+
+    # Inclusive date bounds; items without a due date never match them.
+    for field, compare in (('due_after', TodoItem.due_date.__ge__), ('due_before', TodoItem.due_date.__le__)):
+        if args.get(field):
+            try:
+                query = query.filter(compare(datetime.datetime.strptime(args[field], '%Y-%m-%d').date()))
+            except ValueError:
+                errors[field] = [f"{field} must be a date in YYYY-MM-DD format"]
+
+    if args.get('is_current_focus'):
+        focus = args['is_current_focus'].lower()
+        if focus not in ('true', 'false', '1', '0'):
+            errors['is_current_focus'] = ["is_current_focus must be true or false"]
+        query = query.filter(TodoItem.is_current_focus == (focus in ('true', '1')))
+
+    if args.get('parent_id'):
+        # 'none' lists top-level items only; an id lists that item's direct subtasks.
+        parent_id = args['parent_id'].lower()
+        if parent_id == 'none':
+            query = query.filter(TodoItem.parent_id.is_(None))
+        elif parent_id.isdigit():
+            query = query.filter(TodoItem.parent_id == int(parent_id))
+        else:
+            errors['parent_id'] = ["parent_id must be a to-do item id or none"]
+
+    if args.get('tag'):
+        # Items carrying every listed tag.
+        names = [normalize_tag(name) for name in args['tag'].split(',') if name.strip()]
+        if names:
+            query = query.filter(TodoItem.id.in_(tagged_todo_ids(user_id, names)))
+
+    sort = args.get('sort') or DEFAULT_TODO_SORT
+    if sort not in TODO_SORTS:
+        errors['sort'] = [f"sort must be one of: {', '.join(TODO_SORTS)}"]
+        sort = DEFAULT_TODO_SORT
+    descending, columns, _ = TODO_SORTS[sort]
+    query = query.order_by(*(column.desc() if descending else column.asc() for column in columns))
+    return query, sort, errors
+
+
+def virtual_occurrence(template, day):
+    """
+    An unsaved TodoItem standing for the occurrence of a recurring item on
+    day: the template's fields, due that day, with no id of its own.
+    """
+    return TodoItem(
+        user_id=template.user_id, title=template.title, description=template.description, due_date=day,
+        status=template.status, priority=template.priority, is_current_focus=template.is_current_focus,
+        position=template.position, sync_version=template.sync_version, created_at=template.created_at,
+        updated_at=template.updated_at, recurrence_id=template.id, occurrence_date=day,
+        subtask_count=0, subtask_done_count=0,
+    )
+
+
+def todo_occurrences(user_id, args, due_after, due_before):
+    """
+    Generates the occurrences of user_id's recurring items that fall in
+    [due_after, due_before] and have not been materialized. The templates
+    are filtered with the same status/priority/focus arguments as the list.
+
+    Costs two queries plus O(occurrences in the window): each series jumps
+    straight to the window and yields at most MAX_OCCURRENCES_PER_SERIES
+    occurrences, however long it has been running.
+
+    Returns:
+        (list of unsaved TodoItem occurrences, whether any series was truncated)
+    """
+    template_args = {k: v for k, v in args.items() if k not in ('due_after', 'due_before')}
+    query, _, _ = todo_list_query(user_id, template_args)
+    templates = query.filter(TodoItem.recurrence.is_not(None), TodoItem.due_date <= due_before).all()
+    if not templates:
+        return [], False
+
+    # Trashed occurrences count as materialized: deleting one skips that date of the series.
+    materialized = set(db.session.execute(
+        select(TodoItem.recurrence_id, TodoItem.occurrence_date).where(
+            TodoItem.recurrence_id.in_([template.id for template in templates]),
+            TodoItem.occurrence_date.between(due_after, due_before),
+        )
+    ).all())
+    occurrences, truncated = [], False
+    for template in templates:
+        rule = RecurrenceRule.parse(template.recurrence)
+        days = list(rule.between(template.due_date, due_after, due_before, limit=MAX_OCCURRENCES_PER_SERIES + 1))
+        truncated = truncated or len(days) > MAX_OCCURRENCES_PER_SERIES
+        occurrences += [virtual_occurrence(template, day) for day in days[:MAX_OCCURRENCES_PER_SERIES]
+                        if (template.id, day) not in materialized]
+    return occurrences, truncated
+
+
 @todo_bp.route('/todos', methods=['GET'])
 @jwt_required()
 def get_all_todos():
     """
-    Retrieves all to-do items for the currently authenticated user.
+    Retrieves the to-do items of the currently authenticated user.
+
+    Optional filters: status and priority (comma-separated values),
+    due_after / due_before (YYYY-MM-DD, inclusive), is_current_focus
+    (true/false), parent_id (an item's direct subtasks, or "none" for
+    top-level items), tag (comma-separated; items with all of them).
+    Optional sort: focus (default), created_at, -created_at,
+    due_date, -due_date, position (manual order).
+
+    Without ?limit/?cursor the full list is returned. With them, one page
+    of at most `limit` items is returned and meta.next_cursor points at the
+    next page; the cursor is a keyset position, so every page costs the same
+    regardless of depth. Send the same filters and sort with every page.
+
+    Recurring items: an unpaginated query with both due_after and due_before
+    returns the occurrences of recurring items in that window instead of
+    their template rows. Occurrences that were never edited are generated
+    on the fly and have "id": null, "recurrence_id" (the template) and
+    "occurrence_date"; edit or complete them through
+    PUT /todos/<recurrence_id>/occurrences/<occurrence_date>.
     """
-    current_user_id_str = get_jwt_identity()
+    current_user_id = current_user.id
+
+    query, sort, errors = todo_list_query(current_user_id, request.args)
+    if errors:
+        return api_validation_error(errors, message="Invalid query parameters")
+
     try:
-        current_user_id = int(current_user_id_str)
-    except ValueError:
-        return api_error("Invalid user identity in token", 400)
+        page = page_params()
+    except InvalidPageRequest as e:
+        return api_error(str(e), 400)
 
-    # is_current_focus = True items will be listed first, then by created_at desc.
-    user_todos = TodoItem.query.filter_by(user_id=current_user_id)\
-        .order_by(TodoItem.is_current_focus.desc(), TodoItem.created_at.desc())\
-        .all()
-    todos_list = [todo.to_dict() for todo in user_todos]
-    return api_success(data=todos_list)
+    if page is None and request.args.get('due_after') and request.args.get('due_before'):
+        due_after, due_before = (datetime.datetime.strptime(request.args[field], '%Y-%m-%d').date()
+                                 for field in ('due_after', 'due_before'))
+        todos = query.filter(TodoItem.recurrence.is_(None)).all()
+        occurrences, truncated = todo_occurrences(current_user_id, request.args, due_after, due_before)
+        if occurrences:
+            # Generated occurrences sort among the rows by the same key, with the template id as tiebreak.
+            descending, _, row_key = TODO_SORTS[sort]
+            todos = sorted(todos + occurrences, key=lambda t: (*row_key(t)[:-1], t.id or t.recurrence_id),
+                           reverse=descending)
+        meta = {'occurrences_truncated': True} if truncated else None
+        return api_success(data=todo_dicts(todos), meta=meta)
 
-@todo_bp.route('/todos', methods=['POST'])
-@jwt_required() # Protect this route
-@validate_json_request(required_fields=['title'])
-def create_todo():
-    """
-    Creates a new to-do item for the currently authenticated user.
-    The 'is_current_focus' field defaults to False in the model and is not typically set on creation.
-    """
-    current_user_id_str = get_jwt_identity()
+    if page is None:
+        todos_list = todo_dicts(query.all())
+        return api_success(data=todos_list)
+
+    descending, columns, row_key = TODO_SORTS[sort]
+    limit, cursor = page
+    if cursor is not None:
+        try:
+            # The cursor starts with its sort name, so it cannot be replayed against another sort.
+            position = decode_cursor(cursor, len(columns) + 1)
+            if position[0] != sort:
+                raise InvalidPageRequest("Cursor does not match the requested sort")
+        except InvalidPageRequest as e:
+            return api_error(str(e), 400)
+        after = tuple_(*columns) < tuple_(*position[1:]) if descending else tuple_(*columns) > tuple_(*position[1:])
+        query = query.filter(after)
+
+    rows, meta = page_meta(query.limit(limit + 1).all(), limit, key=lambda todo: (sort, *row_key(todo)))
+    return api_success(data=todo_dicts(rows), meta=meta)
+
+def _parse_due_date(value, message):
+    """Parses a YYYY-MM-DD due date; returns (date or None, error or None)."""
+    if value is None:
+        return None, None
+    if not isinstance(value, str):
+        return None, message
     try:
-        current_user_id = int(current_user_id_str)
+        return datetime.datetime.strptime(value, '%Y-%m-%d').date(), None
     except ValueError:
-        return api_error("Invalid user identity in token", 400)
+        return None, message
+
+
+def _parse_recurrence(value):
+    """Parses an RRULE; returns (canonical rule text or None, error or None)."""
+    try:
+        return RecurrenceRule.parse(value).to_string(), None
+    except InvalidRecurrence as e:
+        return None, str(e)
+
+
+def _parse_parent_id(value):
+    """Checks the type of a parent_id; returns (id or None, error or None). Ownership is checked later."""
+    if value is None or (isinstance(value, int) and not isinstance(value, bool)):
+        return value, None
+    return None, "parent_id must be a to-do item id or null"
 
-    data = request.get_json()
 
-    # Validate title
+def validate_todo_create(data):
+    """
+    Applies the create_todo rules to a request body.
+
+    Returns:
+        (column values for a new TodoItem, errors) - errors maps field names
+        to messages, in field order, and is empty when the data is valid
+    """
+    errors = {}
+
     title = data.get('title')
     if not title or not isinstance(title, str) or not title.strip():
-        return api_validation_error({"title": ["Title is required and must be a non-empty string"]})
+        errors['title'] = ["Title is required and must be a non-empty string"]
 
-    # Validate description
     description = data.get('description')
     description_error = validate_field_type(data, 'description', str)
     if description_error:
-        return api_validation_error({"description": [description_error]})
+        errors['description'] = [description_error]
 
-    # Validate due_date
-    due_date_str = data.get('due_date')
-    due_date_obj = None
-    if due_date_str:
-        try:
-            due_date_obj = datetime.datetime.strptime(due_date_str, '%Y-%m-%d').date()
-        except ValueError:
-            return api_validation_error({"due_date": ["Invalid date format. Please use YYYY-MM-DD."]})
+    due_date, due_date_error = _parse_due_date(data.get('due_date') or None,
+                                               "Invalid date format. Please use YYYY-MM-DD.")
+    if due_date_error:
+        errors['due_date'] = [due_date_error]
 
-    # Validate status
-    status = data.get('status', 'pending').lower()
     status_error = validate_enum_field(data, 'status', ALLOWED_STATUSES)
     if status_error:
-        return api_validation_error({"status": [status_error]})
+        errors['status'] = [status_error]
 
-    # Validate priority
-    priority = data.get('priority', 'medium').lower()
     priority_error = validate_enum_field(data, 'priority', ALLOWED_PRIORITIES)
     if priority_error:
-        return api_validation_error({"priority": [priority_error]})
+        errors['priority'] = [priority_error]
 
-    # Validate is_current_focus if provided
     is_current_focus = data.get('is_current_focus')
     if is_current_focus is not None and not isinstance(is_current_focus, bool):
-        return api_validation_error({"is_current_focus": ["Must be a boolean value"]})
+        errors['is_current_focus'] = ["Must be a boolean value"]
+
+    recurrence = data.get('recurrence')
+    if recurrence is not None:
+        recurrence, recurrence_error = _parse_recurrence(recurrence)
+        if recurrence_error:
+            errors['recurrence'] = [recurrence_error]
+        elif due_date is None and 'due_date' not in errors:
+            errors['recurrence'] = ["A recurring item needs a due_date (its first occurrence)"]
+
+    parent_id, parent_id_error = _parse_parent_id(data.get('parent_id'))
+    if parent_id_error:
+        errors['parent_id'] = [parent_id_error]
+
+    tags, tags_error = parse_tags(data.get('tags'))
+    if tags_error:
+        errors['tags'] = [tags_error]
+
+    if errors:
+        return None, errors
+    return {
+        'title': title.strip(),
+        'description': description.strip() if description else None,
+        'due_date': due_date,
+        'status': (data.get('status') or 'pending').lower(),
+        'priority': (data.get('priority') or 'medium').lower(),
+        'is_current_focus': is_current_focus if is_current_focus is not None else False,
+        'recurrence': recurrence,
+        'parent_id': parent_id,
+        'tags': tags, # Not a column: written with set_todo_tags
+    }, {}
+
+
+def validate_todo_update(data):
+    """
+    Applies the update_todo rules to a request body. Only the fields present
+    in data are returned, so an empty result means nothing to update.
+    Setting 'status' also requires updating completed_at (see completed_at_for);
+    'tags' is not a column and is written with set_todo_tags.
+
+    Returns:
+        (column values to change, errors) - errors maps field names to
+        messages, in field order, and is empty when the data is valid
+    """
+    values, errors = {}, {}
+
+    if 'title' in data:
+        title = data['title']
+        if not title or not isinstance(title, str) or not title.strip():
+            errors['title'] = ["Title must be a non-empty string if provided"]
+        else:
+            values['title'] = title.strip()
+
+    if 'description' in data:
+        description = data['description']
+        if description is not None and not isinstance(description, str):
+            errors['description'] = ["Description must be a string if provided"]
+        else:
+            values['description'] = description.strip() if description else None
+
+    if 'due_date' in data:
+        due_date_str = data['due_date']
+        if due_date_str is not None and not isinstance(due_date_str, str):
+            errors['due_date'] = ["due_date must be a string in YYYY-MM-DD format or null."]
+        else:
+            due_date, due_date_error = _parse_due_date(
+                due_date_str, "Invalid due_date format. Please use YYYY-MM-DD or null.")
+            if due_date_error:
+                errors['due_date'] = [due_date_error]
+            else:
+                values['due_date'] = due_date
+
+    if 'status' in data:
+        status = data['status'].lower() if isinstance(data['status'], str) else None
+        if status not in ALLOWED_STATUSES:
+            errors['status'] = [f"Invalid status. Allowed values are: {', '.join(ALLOWED_STATUSES)}"]
+        else:
+            values['status'] = status
+
+    if 'priority' in data:
+        priority = data['priority'].lower() if isinstance(data['priority'], str) else None
+        if priority not in ALLOWED_PRIORITIES:
+            errors['priority'] = [f"Invalid priority. Allowed values are: {', '.join(ALLOWED_PRIORITIES)}"]
+        else:
+            values['priority'] = priority
+
+    if 'is_current_focus' in data:
+        if not isinstance(data['is_current_focus'], bool):
+            errors['is_current_focus'] = ["is_current_focus must be a boolean"]
+        else:
+            values['is_current_focus'] = data['is_current_focus']
+
+    if 'recurrence' in data:
+        # null turns a recurring item back into a one-off item.
+        recurrence, recurrence_error = _parse_recurrence(data['recurrence']) if data['recurrence'] is not None \
+            else (None, None)
+        if recurrence_error:
+            errors['recurrence'] = [recurrence_error]
+        else:
+            values['recurrence'] = recurrence
+
+    if 'parent_id' in data:
+        # null moves a subtask to the top level.
+        parent_id, parent_id_error = _parse_parent_id(data['parent_id'])
+        if parent_id_error:
+            errors['parent_id'] = [parent_id_error]
+        else:
+            values['parent_id'] = parent_id
+
+    if 'tags' in data:
+        # Replaces the item's tags; null or [] removes them all.
+        tags, tags_error = parse_tags(data['tags'])
+        if tags_error:
+            errors['tags'] = [tags_error]
+        else:
+            values['tags'] = tags
+
+    if errors:
+        return None, errors
+    return values, {}
+
+
+def completed_at_for(status, now):
+    """
+    Returns the SQL value of completed_at for a status change: kept if the
+    item was already completed, set to now on completion, cleared otherwise.
+    """
+    return func.coalesce(TodoItem.completed_at, now) if status == 'completed' else None
+
+
+def parent_error(user_id, parent_id, todo_id=None):
+    """
+    Checks that user_id's item todo_id (None for a new item) can become a
+    subtask of parent_id: the parent must be the user's, must not be the
+    item or one of its own subtasks, and the item's subtree must still fit
+    within MAX_SUBTASK_DEPTH levels below it.
+
+    Returns:
+        Error message, or None if the parent is acceptable
+    """
+    parent_depth = subtask_depths(user_id, [parent_id]).get(parent_id)
+    if parent_depth is None:
+        return "Parent to-do item not found"
+    height = 0
+    if todo_id is not None:
+        subtree = subtree_depths(user_id, todo_id)
+        if parent_id in {item_id for item_id, _ in subtree}:
+            return "An item cannot be moved under itself or one of its subtasks"
+        height = max((depth for _, depth in subtree), default=0)
+    if parent_depth + 1 + height > MAX_SUBTASK_DEPTH:
+        return f"Subtasks can be nested at most {MAX_SUBTASK_DEPTH} levels deep"
+    return None
+
+
+def _todo_access_error(status, verb):
+    """Error response for a to-do item the user cannot write (status from ownership_status)."""
+    if status == 403:
+        return jsonify({"error": f"Forbidden: You do not have permission to {verb} this item"}), 403
+    return jsonify({"error": "To-do item not found"}), 404
+
+
+@todo_bp.route('/todos', methods=['POST'])
+@jwt_required() # Protect this route
+@validate_json_request(required_fields=['title'])
+def create_todo():
+    """
+    Creates a new to-do item for the currently authenticated user.
+    The 'is_current_focus' field defaults to False in the model and is not typically set on creation.
+    """
+    current_user_id = current_user.id
+
+    data = request.get_json()
+
+    values, errors = validate_todo_create(data)
+    if errors:
+        return api_validation_error(errors)
+    if values['parent_id'] is not None:
+        error = parent_error(current_user_id, values['parent_id'])
+        if error:
+            return api_validation_error({'parent_id': [error]})
 
     try:
-        new_todo = TodoItem(
-            user_id=current_user_id,
-            title=title.strip(),
-            description=description.strip() if description else None,
-            due_date=due_date_obj,
-            status=status,
-            priority=priority,
-            is_current_focus=is_current_focus if is_current_focus is not None else False
-        )
+        tags = values.pop('tags')
+        new_todo = TodoItem(user_id=current_user_id, sync_version=next_sync_version(current_user_id),
+                            position=new_todo_positions(current_user_id, 1)[0], **values)
         db.session.add(new_todo)
+        if tags:
+            db.session.flush()
+            set_todo_tags(current_user_id, {new_todo.id: tags})
         db.session.commit()
-        return api_success(data=new_todo.to_dict(), status_code=201,
+        return api_success(data=todo_dicts([new_todo])[0], status_code=201,
                           message="Todo item created successfully")
     except Exception as e:
         db.session.rollback()
@@ -123,21 +523,34 @@ def get_todo_by_id(todo_id):
     """
     Retrieves a specific to-do item by its ID for the currently authenticated user.
     """
-    current_user_id_str = get_jwt_identity()
-    try:
-        current_user_id = int(current_user_id_str)
-    except ValueError:
-        return api_error("Invalid user identity in token", 400)
+    current_user_id = current_user.id
 
     todo_item = db.session.get(TodoItem, todo_id)
 
-    if not todo_item:
+    if not todo_item or todo_item.deleted_at is not None: # Trashed items are only visible in the trash
         return api_error("To-do item not found", 404)
 
     if todo_item.user_id != current_user_id:
         return api_error("Forbidden: You do not have permission to access this item", 403)
 
-    return api_success(data=todo_item.to_dict())
+    return api_success(data=todo_dicts([todo_item])[0])
+
+
+@todo_bp.route('/todos/<int:todo_id>/tree', methods=['GET'])
+@jwt_required()
+def get_todo_tree(todo_id):
+    """
+    Retrieves a to-do item with all its subtasks, nested under "subtasks"
+    (each level in manual order), loaded by a single recursive query.
+    """
+    current_user_id = current_user.id
+
+    tree = load_subtree(current_user_id, todo_id)
+    if tree is None:
+        if ownership_status(TodoItem, todo_id, current_user_id) == 403:
+            return api_error("Forbidden: You do not have permission to access this item", 403)
+        return api_error("To-do item not found", 404)
+    return api_success(data=tree)
 
 
 @todo_bp.route('/todos/<int:todo_id>', methods=['PUT'])
@@ -146,117 +559,704 @@ def update_todo(todo_id):
     """
     Updates an existing to-do item for the currently authenticated user.
     Can update standard fields and the 'is_current_focus' flag.
+    The item is checked, changed and returned by a single UPDATE ... RETURNING.
     """
-    current_user_id_str = get_jwt_identity()
+    current_user_id = current_user.id
+
+    data = request.get_json()
+    if not data:
+        return jsonify({"error": "Request body must be JSON and cannot be empty"}), 400
+
+    values, errors = validate_todo_update(data)
+    if errors:
+        return jsonify({"error": next(iter(errors.values()))[0]}), 400
+
+    if not values: # Data was sent, but no recognized fields for update
+        status = ownership_status(TodoItem, todo_id, current_user_id)
+        if status != 200:
+            return _todo_access_error(status, 'update')
+        return jsonify({"message": "No relevant to-do fields provided for update."}), 200
+
+    if values.get('parent_id') is not None:
+        status = ownership_status(TodoItem, todo_id, current_user_id)
+        if status != 200:
+            return _todo_access_error(status, 'update')
+        error = parent_error(current_user_id, values['parent_id'], todo_id)
+        if error:
+            return jsonify({"error": error}), 400
+
+    if 'status' in values:
+        values['completed_at'] = completed_at_for(values['status'], datetime.datetime.now(datetime.timezone.utc))
+    tags = values.pop('tags', None)
+
     try:
-        current_user_id = int(current_user_id_str)
-    except ValueError:
-        return jsonify({"error": "Invalid user identity in token"}), 400
+        # With only tags to change, the UPDATE still checks ownership and stamps the item for sync.
+        values['sync_version'] = next_sync_version(current_user_id)
+        todo_item = update_owned(TodoItem, todo_id, current_user_id, values, TodoItem.deleted_at.is_(None))
+        if todo_item is None:
+            db.session.rollback()
+            return _todo_access_error(ownership_status(TodoItem, todo_id, current_user_id), 'update')
+        if tags is not None:
+            set_todo_tags(current_user_id, {todo_id: tags})
+        todo = todo_dicts([todo_item])[0] # Before the commit expires the RETURNING values
+        db.session.commit()
+        return jsonify(todo), 200
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error updating todo item: {e}")
+        return jsonify({"error": "An unexpected error occurred while updating the to-do item."}), 500
 
-    todo_item = db.session.get(TodoItem, todo_id)
 
-    if not todo_item:
-        return jsonify({"error": "To-do item not found"}), 404
+@todo_bp.route('/todos/<int:todo_id>', methods=['DELETE'])
+@jwt_required()
+def delete_todo(todo_id):
+    """
+    Moves a specific to-do item of the currently authenticated user to the
+    trash with a single UPDATE, together with its subtasks (the whole
+    subtree) and the materialized occurrences of a recurring item. Trashed
+    items are restorable through POST /todos/<id>/restore until the purge
+    job removes them; tombstones record them as deleted for GET /todos/changes.
+    """
+    current_user_id = current_user.id
+    now = datetime.datetime.now(datetime.timezone.utc)
 
-    if todo_item.user_id != current_user_id:
-        return jsonify({"error": "Forbidden: You do not have permission to update this item"}), 403
+    try:
+        # Reserved first: the rollup trigger stamps the parent with the current version.
+        version = next_sync_version(current_user_id)
+        deleted_ids = db.session.scalars(
+            update(TodoItem).where(TodoItem.user_id == current_user_id,
+                                   TodoItem.id.in_(subtree_ids(current_user_id, [todo_id])))
+            .values(deleted_at=now, sync_version=version, updated_at=now)
+            .returning(TodoItem.id).execution_options(synchronize_session=False)
+        ).all()
+        if todo_id not in deleted_ids:
+            db.session.rollback()
+            return _todo_access_error(ownership_status(TodoItem, todo_id, current_user_id), 'delete')
+        record_tombstones(current_user_id, deleted_ids, version, now)
+        db.session.commit()
+        return '', 204
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error deleting todo item: {e}")
+        return jsonify({"error": "An unexpected error occurred while deleting the to-do item."}), 500
 
-    data = request.get_json()
-    if not data:
-        return jsonify({"error": "Request body must be JSON and cannot be empty"}), 400
 
-    updated_fields = False # Flag to track if any updatable field was actually sent
+@todo_bp.route('/todos/trash', methods=['GET'])
+@jwt_required()
+def get_todo_trash():
+    """
+    Lists the current user's trashed to-do items, most recently deleted
+    first, served by the partial index on trashed rows. Paginated like
+    GET /todos with ?limit= and ?cursor=; without them the whole trash is
+    returned. Items stay here until they are restored or purged
+    (TODO_TRASH_RETENTION_DAYS after their deletion).
+    """
+    current_user_id = current_user.id
 
-    if 'title' in data:
-        title = data['title']
-        if not title or not isinstance(title, str) or not title.strip():
-            return jsonify({"error": "Title must be a non-empty string if provided"}), 400
-        todo_item.title = title.strip()
-        updated_fields = True
+    query = TodoItem.query.filter(TodoItem.user_id == current_user_id, TodoItem.deleted_at.isnot(None)) \
+        .order_by(TodoItem.deleted_at.desc(), TodoItem.id.desc())
+    try:
+        page = page_params()
+        if page is None:
+            return api_success(data=todo_dicts(query.all()))
+        limit, cursor = page
+        if cursor is not None:
+            deleted_at, last_id = decode_cursor(cursor, 2)
+            query = query.filter(tuple_(TodoItem.deleted_at, TodoItem.id) < tuple_(deleted_at, last_id))
+    except InvalidPageRequest as e:
+        return api_error(str(e), 400)
 
-    if 'description' in data:
-        description = data['description']
-        if description is not None and not isinstance(description, str):
-             return jsonify({"error": "Description must be a string if provided"}), 400
-        todo_item.description = description.strip() if description else None
-        updated_fields = True
+    rows, meta = page_meta(query.limit(limit + 1).all(), limit, key=lambda todo: (todo.deleted_at, todo.id))
+    return api_success(data=todo_dicts(rows), meta=meta)
 
-    if 'due_date' in data:
-        due_date_str = data['due_date']
-        if due_date_str is None:
-            todo_item.due_date = None
-        elif isinstance(due_date_str, str):
-            try:
-                todo_item.due_date = datetime.datetime.strptime(due_date_str, '%Y-%m-%d').date()
-            except ValueError:
-                return jsonify({"error": "Invalid due_date format. Please use YYYY-MM-DD or null."}), 400
+
+@todo_bp.route('/todos/<int:todo_id>/restore', methods=['POST'])
+@jwt_required()
+def restore_todo(todo_id):
+    """
+    Restores a trashed to-do item with everything that was trashed along
+    with it (its subtasks and occurrences, i.e. the rows deleted by the same
+    request), in a single UPDATE. If the item's parent is no longer live,
+    it is restored as a top-level item. The restored items come back as
+    changed in GET /todos/changes, and their tombstones are dropped.
+    """
+    current_user_id = current_user.id
+
+    root = db.session.execute(
+        select(TodoItem.deleted_at, TodoItem.parent_id)
+        .where(TodoItem.id == todo_id, TodoItem.user_id == current_user_id, TodoItem.deleted_at.isnot(None))
+    ).one_or_none()
+    if root is None:
+        return _todo_access_error(ownership_status(TodoItem, todo_id, current_user_id), 'restore')
+
+    try:
+        version = next_sync_version(current_user_id)
+        now = datetime.datetime.now(datetime.timezone.utc)
+        restored_ids = db.session.scalars(
+            update(TodoItem).where(TodoItem.user_id == current_user_id,
+                                   TodoItem.id.in_(subtree_ids(current_user_id, [todo_id], trashed_at=root.deleted_at)))
+            .values(deleted_at=None, sync_version=version, updated_at=now)
+            .returning(TodoItem.id).execution_options(synchronize_session=False)
+        ).all()
+        if root.parent_id is not None and not db.session.scalar(
+                select(TodoItem.id).where(TodoItem.id == root.parent_id, TodoItem.deleted_at.is_(None))):
+            update_owned(TodoItem, todo_id, current_user_id, {'parent_id': None})
+        clear_tombstones(current_user_id, restored_ids)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error restoring todo item: {e}")
+        return jsonify({"error": "An unexpected error occurred while restoring the to-do item."}), 500
+
+    return api_success(data=load_subtree(current_user_id, todo_id), message="To-do item restored",
+                       meta={'restored_ids': restored_ids})
+
+
+@todo_bp.route('/todos/<int:todo_id>/occurrences/<occurrence_date>', methods=['PUT'])
+@jwt_required()
+@validate_json_request()
+def update_todo_occurrence(todo_id, occurrence_date):
+    """
+    Edits or completes one occurrence (YYYY-MM-DD) of the recurring item
+    todo_id. Body: the update_todo fields, except recurrence and parent_id.
+
+    The first change materializes the occurrence as a row of its own
+    (recurrence_id, occurrence_date), copied from the template (201), tags
+    included unless the body sets its own; later changes update that row
+    (200). Occurrences that are never touched stay generated and cost no
+    storage.
+    """
+    current_user_id = current_user.id
+    data = request.get_json()
+
+    values, errors = validate_todo_update(data if isinstance(data, dict) else {})
+    if errors:
+        return api_validation_error(errors)
+    if 'recurrence' in values:
+        return api_validation_error({'recurrence': ["An occurrence cannot have a recurrence of its own"]})
+    if 'parent_id' in values:
+        return api_validation_error({'parent_id': ["An occurrence cannot be moved to another parent"]})
+    if not values:
+        return api_validation_error({'body': ["No relevant to-do fields provided for update"]})
+    day, day_error = _parse_due_date(occurrence_date, "occurrence_date must be in YYYY-MM-DD format")
+    if day_error:
+        return api_validation_error({'occurrence_date': [day_error]})
+
+    template = db.session.scalar(select(TodoItem).where(TodoItem.id == todo_id, TodoItem.user_id == current_user_id,
+                                                        TodoItem.deleted_at.is_(None)))
+    if template is None:
+        return _todo_access_error(ownership_status(TodoItem, todo_id, current_user_id), 'update')
+    if not template.recurrence or not template.due_date or \
+            not RecurrenceRule.parse(template.recurrence).occurs_on(template.due_date, day):
+        return api_error("This item has no occurrence on that date", 404)
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+    tags = values.pop('tags', None)
+    try:
+        version = next_sync_version(current_user_id)
+        occurrence = db.session.execute(
+            select(TodoItem.id, TodoItem.deleted_at)
+            .where(TodoItem.recurrence_id == todo_id, TodoItem.occurrence_date == day)).one_or_none()
+        if occurrence is not None and occurrence.deleted_at is not None:
+            # A deleted occurrence is skipped by the series until it is restored from the trash.
+            db.session.rollback()
+            return api_error("This item has no occurrence on that date", 404)
+        if occurrence is not None:
+            if 'status' in values:
+                values['completed_at'] = completed_at_for(values['status'], now)
+            occurrence = update_owned(TodoItem, occurrence.id, current_user_id, dict(values, sync_version=version))
+            status_code = 200
         else:
-            return jsonify({"error": "due_date must be a string in YYYY-MM-DD format or null."}), 400
-        updated_fields = True
+            fields = dict(
+                title=template.title, description=template.description, due_date=day, status=template.status,
+                priority=template.priority, is_current_focus=template.is_current_focus,
+                position=template.position, recurrence_id=todo_id, occurrence_date=day,
+            )
+            fields.update(values)
+            if fields['status'] == 'completed':
+                fields['completed_at'] = now
+            occurrence = TodoItem(user_id=current_user_id, sync_version=version, **fields)
+            db.session.add(occurrence)
+            db.session.flush()
+            if tags is None:
+                # The occurrence starts with the recurring item's tags, as with its other fields.
+                tags = todo_tag_names([todo_id]).get(todo_id, [])
+            status_code = 201
+        if tags is not None:
+            set_todo_tags(current_user_id, {occurrence.id: tags})
+        occurrence_dict = todo_dicts([occurrence])[0]
+        db.session.commit()
+        return api_success(data=occurrence_dict, status_code=status_code, message="Occurrence updated successfully")
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error updating occurrence {occurrence_date} of todo item {todo_id}: {e}")
+        return api_error("An unexpected error occurred while updating the occurrence.", 500)
 
-    if 'status' in data:
-        status = data['status'].lower()
-        if status not in ALLOWED_STATUSES:
-            return jsonify({"error": f"Invalid status. Allowed values are: {', '.join(ALLOWED_STATUSES)}"}), 400
-        todo_item.status = status
-        if status == 'completed' and todo_item.completed_at is None:
-            todo_item.completed_at = datetime.datetime.now(datetime.timezone.utc)
-        elif status != 'completed':
-            todo_item.completed_at = None
-        updated_fields = True
 
-    if 'priority' in data:
-        priority = data['priority'].lower()
-        if priority not in ALLOWED_PRIORITIES:
-            return jsonify({"error": f"Invalid priority. Allowed values are: {', '.join(ALLOWED_PRIORITIES)}"}), 400
-        todo_item.priority = priority
-        updated_fields = True
+@todo_bp.route('/todos/<int:todo_id>/move', methods=['POST'])
+@jwt_required()
+@validate_json_request()
+def move_todo(todo_id):
+    """
+    Moves a to-do item to a new place in the manual order (sort=position).
 
-    # Handle 'is_current_focus' update
-    if 'is_current_focus' in data:
-        is_focus = data['is_current_focus']
-        if not isinstance(is_focus, bool):
-            return jsonify({"error": "is_current_focus must be a boolean"}), 400
-        todo_item.is_current_focus = is_focus
-        updated_fields = True
+    Body: {"after": <id or null>, "before": <id or null>} - the items that
+    will be right above and right below it; null (or missing) "after" means
+    the top of the list and null "before" the bottom. The item gets a
+    fractional position between the two, so only its own row is rewritten.
+    """
+    current_user_id = current_user.id
+    data = request.get_json()
+
+    errors, neighbours = {}, {}
+    for field in ('after', 'before'):
+        value = data.get(field)
+        if value is None:
+            continue
+        if not isinstance(value, int) or isinstance(value, bool):
+            errors[field] = [f"{field} must be a to-do item id or null"]
+        elif value == todo_id:
+            errors[field] = [f"{field} cannot be the item being moved"]
+        else:
+            neighbours[field] = value
+    if errors:
+        return api_validation_error(errors)
 
-    if not updated_fields and data: # Data was sent, but no recognized fields for update
-         return jsonify({"message": "No relevant to-do fields provided for update."}), 200
+    def neighbour_keys():
+        rows = db.session.execute(
+            select(TodoItem.id, TodoItem.position)
+            .where(TodoItem.user_id == current_user_id, TodoItem.id.in_(neighbours.values()),
+                   TodoItem.deleted_at.is_(None))
+        ).all() if neighbours else []
+        keys = {row.id: (row.position, row.id) for row in rows}
+        return {field: keys.get(neighbour_id) for field, neighbour_id in neighbours.items()}
+
+    keys = neighbour_keys()
+    errors = {field: ["To-do item not found"] for field, key in keys.items() if key is None}
+    if errors:
+        return api_validation_error(errors)
+    after, before = keys.get('after'), keys.get('before')
+    if after and before and after >= before:
+        return api_validation_error({'before': ["before must come after 'after' in the list order"]})
 
     try:
+        version = next_sync_version(current_user_id)
+        if after and before and after[0] == before[0]:
+            # Neighbours share a key (e.g. rows created without a position): renumber
+            # the user's list once so there is room between them.
+            rebalance_todo_positions(current_user_id, version)
+            keys = neighbour_keys()
+            after, before = keys['after'], keys['before']
+        position = key_between(after[0] if after else None, before[0] if before else None)
+        todo = update_owned(TodoItem, todo_id, current_user_id, {'position': position, 'sync_version': version},
+                            TodoItem.deleted_at.is_(None))
+        if todo is None:
+            db.session.rollback()
+            return _todo_access_error(ownership_status(TodoItem, todo_id, current_user_id), 'move')
+        todo_dict = todo_dicts([todo])[0]
         db.session.commit()
-        return jsonify(todo_item.to_dict()), 200
+        return api_success(data=todo_dict, message="Todo item moved successfully")
+    except InvalidOrderKey as e:
+        db.session.rollback()
+        return api_error(f"Cannot place the item there: {e}", 409)
     except Exception as e:
         db.session.rollback()
-        print(f"Error updating todo item: {e}")
-        return jsonify({"error": "An unexpected error occurred while updating the to-do item."}), 500
+        print(f"Error moving todo item {todo_id}: {e}")
+        return api_error("An unexpected error occurred while moving the to-do item.", 500)
 
 
-@todo_bp.route('/todos/<int:todo_id>', methods=['DELETE'])
+@todo_bp.route('/todos/<int:todo_id>/focus', methods=['POST'])
 @jwt_required()
-def delete_todo(todo_id):
+def focus_todo(todo_id):
     """
-    Deletes a specific to-do item for the currently authenticated user.
+    Marks a to-do item as a current focus. With ?exclusive=true it becomes
+    the user's only focus: every other focused item is cleared in the same
+    transaction, by one set-based UPDATE however many there are (found
+    through ix_todo_items_user_focus_created). meta.unfocused_ids lists the
+    items that were cleared.
     """
-    current_user_id_str = get_jwt_identity()
+    current_user_id = current_user.id
+
+    exclusive = request.args.get('exclusive', 'false').lower()
+    if exclusive not in ('true', 'false', '1', '0'):
+        return api_validation_error({'exclusive': ["exclusive must be true or false"]})
+
+    now = datetime.datetime.now(datetime.timezone.utc)
     try:
-        current_user_id = int(current_user_id_str)
-    except ValueError:
-        return jsonify({"error": "Invalid user identity in token"}), 400
+        version = next_sync_version(current_user_id)
+        todo = update_owned(TodoItem, todo_id, current_user_id, {'is_current_focus': True, 'sync_version': version},
+                            TodoItem.deleted_at.is_(None))
+        if todo is None:
+            db.session.rollback()
+            return _todo_access_error(ownership_status(TodoItem, todo_id, current_user_id), 'focus')
+        unfocused_ids = []
+        if exclusive in ('true', '1'):
+            unfocused_ids = db.session.scalars(
+                update(TodoItem).where(TodoItem.user_id == current_user_id, TodoItem.is_current_focus == True,
+                                       TodoItem.deleted_at.is_(None), TodoItem.id != todo_id)
+                .values(is_current_focus=False, sync_version=version, updated_at=now)
+                .returning(TodoItem.id).execution_options(synchronize_session=False)
+            ).all()
+        todo_dict = todo_dicts([todo])[0]
+        db.session.commit()
+        return api_success(data=todo_dict, meta={'unfocused_ids': sorted(unfocused_ids)},
+                           message="Todo item focused successfully")
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error focusing todo item {todo_id}: {e}")
+        return api_error("An unexpected error occurred while focusing the to-do item.", 500)
 
-    todo_item = db.session.get(TodoItem, todo_id)
 
-    if not todo_item:
-        return jsonify({"error": "To-do item not found"}), 404
+def _validate_batch_operation(operation):
+    """Validates one POST /todos/batch operation; returns (action, todo id, values, errors)."""
+    if not isinstance(operation, dict):
+        return None, None, None, {'': ["Operation must be an object"]}
+    action = operation.get('action')
+    if action not in BATCH_ACTIONS:
+        return None, None, None, {'action': [f"action must be one of: {', '.join(BATCH_ACTIONS)}"]}
 
-    if todo_item.user_id != current_user_id:
-        return jsonify({"error": "Forbidden: You do not have permission to delete this item"}), 403
+    todo_id = operation.get('id')
+    if action == 'create':
+        todo_id = None
+    elif not isinstance(todo_id, int) or isinstance(todo_id, bool):
+        return action, None, None, {'id': ["id must be an integer"]}
+    if action == 'delete':
+        return action, todo_id, None, {}
+
+    data = operation.get('data')
+    if not isinstance(data, dict) or not data:
+        return action, todo_id, None, {'data': ["data must be a non-empty object"]}
+    if action == 'create':
+        values, errors = validate_todo_create(data)
+    else:
+        values, errors = validate_todo_update(data)
+        if not errors and not values:
+            errors = {'data': ["No relevant to-do fields provided for update."]}
+        elif not errors and 'parent_id' in values:
+            # Re-parenting needs the per-item cycle and depth checks of PUT /todos/<id>.
+            errors = {'parent_id': ["parent_id cannot be changed in a batch; use PUT /todos/<id>"]}
+    return action, todo_id, values, errors
+
+
+@todo_bp.route('/todos/batch', methods=['POST'])
+@jwt_required()
+@validate_json_request(required_fields=['operations'])
+def batch_todos():
+    """
+    Applies a list of create, update and delete operations in one transaction.
+
+    Body: {"operations": [
+        {"action": "create", "data": {...create_todo fields...}},
+        {"action": "update", "id": 12, "data": {...update_todo fields...}},
+        {"action": "delete", "id": 13}
+    ]}
+
+    Every operation is validated with the create_todo / update_todo rules and
+    the targeted items (and the parent_id of created items) must belong to
+    the user; if any operation fails, none
+    is applied and the errors are reported as "operations[i].field". Otherwise
+    creates run as one INSERT, updates with the same changes as one UPDATE
+    each, and deletes (to the trash) as one more UPDATE, followed by a
+    single commit. Returns the
+    per-operation results in request order.
+    """
+    current_user_id = current_user.id
+    operations = request.get_json()['operations']
+    if not isinstance(operations, list) or not operations:
+        return api_validation_error({'operations': ["operations must be a non-empty list"]})
+    if len(operations) > MAX_BATCH_OPERATIONS:
+        return api_validation_error({'operations': [f"At most {MAX_BATCH_OPERATIONS} operations per batch"]})
+
+    errors, parsed, seen_ids = {}, [], set()
+    for index, operation in enumerate(operations):
+        action, todo_id, values, operation_errors = _validate_batch_operation(operation)
+        if todo_id is not None and not operation_errors:
+            if todo_id in seen_ids:
+                operation_errors = {'id': ["Each to-do item may appear in only one operation"]}
+            seen_ids.add(todo_id)
+        for field, messages in operation_errors.items():
+            errors[f"operations[{index}].{field}".rstrip('.')] = messages
+        parsed.append((action, todo_id, values))
+
+    # One query checks the ownership of every targeted item (other users' items look missing).
+    if seen_ids:
+        owned = set(db.session.scalars(
+            select(TodoItem.id).where(TodoItem.user_id == current_user_id, TodoItem.id.in_(seen_ids),
+                                      TodoItem.deleted_at.is_(None))
+        ))
+        for index, (_, todo_id, _) in enumerate(parsed):
+            if todo_id is not None and todo_id not in owned:
+                errors.setdefault(f"operations[{index}].id", ["To-do item not found"])
+    # And one more checks the parents of created subtasks (ownership and depth).
+    parent_ids = {values['parent_id'] for action, _, values in parsed
+                  if action == 'create' and values and values['parent_id'] is not None}
+    if parent_ids:
+        depths = subtask_depths(current_user_id, parent_ids)
+        for index, (action, _, values) in enumerate(parsed):
+            if action != 'create' or not values or values['parent_id'] is None:
+                continue
+            depth = depths.get(values['parent_id'])
+            if depth is None:
+                errors.setdefault(f"operations[{index}].parent_id", ["Parent to-do item not found"])
+            elif depth + 1 > MAX_SUBTASK_DEPTH:
+                errors.setdefault(f"operations[{index}].parent_id",
+                                  [f"Subtasks can be nested at most {MAX_SUBTASK_DEPTH} levels deep"])
+    if errors:
+        return api_validation_error(errors, message="Batch rejected; no operations were applied")
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+    creates = [values for action, _, values in parsed if action == 'create']
+    create_tags = [values.pop('tags') for values in creates]
+    updates = defaultdict(list) # identical changes -> ids, so each distinct change is one UPDATE
+    update_tags = {}
+    for action, todo_id, values in parsed:
+        if action == 'update':
+            if 'tags' in values:
+                update_tags[todo_id] = values.pop('tags')
+            updates[tuple(sorted(values.items()))].append(todo_id)
+    deletes = [todo_id for action, todo_id, _ in parsed if action == 'delete']
 
     try:
-        db.session.delete(todo_item)
+        version = next_sync_version(current_user_id) # One version for the whole batch
+        created_ids = []
+        if creates:
+            # A single multi-row INSERT assigns increasing ids in VALUES order, so sorting the
+            # returned ids matches them to the operations. (sort_by_parameter_order would make
+            # SQLAlchemy fall back to one INSERT per row on SQLite, which has no insert sentinel.)
+            positions = new_todo_positions(current_user_id, len(creates))
+            created_ids = sorted(db.session.scalars(
+                insert(TodoItem).returning(TodoItem.id),
+                [dict(values, user_id=current_user_id, sync_version=version, position=position,
+                      created_at=now, updated_at=now)
+                 for values, position in zip(creates, positions)]
+            ).all())
+        for changes, ids in updates.items():
+            values = dict(changes, sync_version=version, updated_at=now)
+            if 'status' in values:
+                values['completed_at'] = completed_at_for(values['status'], now)
+            db.session.execute(
+                update(TodoItem).where(TodoItem.user_id == current_user_id, TodoItem.id.in_(ids))
+                .values(**values).execution_options(synchronize_session=False)
+            )
+        # Every tag change of the batch is written together.
+        update_tags.update((todo_id, tags) for todo_id, tags in zip(created_ids, create_tags) if tags)
+        set_todo_tags(current_user_id, update_tags)
+        if deletes:
+            # Deleting an item also trashes its subtasks and, if it recurs, its materialized occurrences.
+            deleted_ids = db.session.scalars(
+                update(TodoItem).where(TodoItem.user_id == current_user_id,
+                                       TodoItem.id.in_(subtree_ids(current_user_id, deletes)))
+                .values(deleted_at=now, sync_version=version, updated_at=now)
+                .returning(TodoItem.id).execution_options(synchronize_session=False)
+            ).all()
+            record_tombstones(current_user_id, deleted_ids, version, now)
+
+        changed_ids = created_ids + [todo_id for ids in updates.values() for todo_id in ids]
+        todos = {}
+        if changed_ids:
+            changed = TodoItem.query.filter(TodoItem.id.in_(changed_ids), TodoItem.deleted_at.is_(None)) \
+                .execution_options(populate_existing=True).all()
+            todos = {todo['id']: todo for todo in todo_dicts(changed)}
+        if len(todos) < len(changed_ids):
+            # Items created or updated inside a subtree that the batch also deletes went with it.
+            db.session.rollback()
+            new_ids = iter(created_ids)
+            lost = {f"operations[{index}].{'parent_id' if action == 'create' else 'id'}":
+                    ["Item is deleted with its parent by this batch"]
+                    for index, (action, todo_id, _) in enumerate(parsed) if action != 'delete'
+                    and (next(new_ids) if action == 'create' else todo_id) not in todos}
+            return api_validation_error(lost, message="Batch rejected; no operations were applied")
         db.session.commit()
-        return '', 204
     except Exception as e:
         db.session.rollback()
-        print(f"Error deleting todo item: {e}")
-        return jsonify({"error": "An unexpected error occurred while deleting the to-do item."}), 500
+        print(f"Error applying todo batch: {e}")
+        return api_error("An unexpected error occurred while applying the batch.", 500)
+
+    results, new_ids = [], iter(created_ids)
+    for index, (action, todo_id, _) in enumerate(parsed):
+        if action == 'create':
+            todo_id = next(new_ids)
+        result = {'index': index, 'action': action, 'id': todo_id}
+        if action != 'delete':
+            result['data'] = todos[todo_id]
+        results.append(result)
+    return api_success(data=results, message=f"Applied {len(results)} operations")
+
+
+def todo_stats(user_id, today):
+    """
+    Counts user_id's live to-do items by status and priority, plus overdue items
+    (due before today and not completed) and items completed since the
+    Monday of today's week, in a single aggregate query: one pass over the
+    user's rows instead of loading every item.
+    """
+    week_start = datetime.datetime.combine(today - datetime.timedelta(days=today.weekday()), datetime.time.min)
+
+    def count_if(condition):
+        return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+    columns = [func.count(TodoItem.id).label('total')]
+    columns += [count_if(TodoItem.status == status).label(f'status_{status}') for status in ALLOWED_STATUSES]
+    columns += [count_if(TodoItem.priority == priority).label(f'priority_{priority}')
+                for priority in ALLOWED_PRIORITIES]
+    columns += [
+        count_if(and_(TodoItem.due_date < today, TodoItem.status != 'completed')).label('overdue'),
+        count_if(TodoItem.completed_at >= week_start).label('completed_this_week'),
+    ]
+    # Recurring templates stand for a series, not an item, so they are not counted.
+    row = db.session.execute(select(*columns).where(TodoItem.user_id == user_id, TodoItem.deleted_at.is_(None),
+                                                    TodoItem.recurrence.is_(None))).one()
+
+    return {
+        'total': row.total,
+        'by_status': {status: row._mapping[f'status_{status}'] for status in ALLOWED_STATUSES},
+        'by_priority': {priority: row._mapping[f'priority_{priority}'] for priority in ALLOWED_PRIORITIES},
+        'overdue': row.overdue,
+        'completed_this_week': row.completed_this_week,
+        'as_of': today.isoformat(),
+        'week_start': week_start.date().isoformat(),
+    }
+
+
+@todo_bp.route('/todos/stats', methods=['GET'])
+@jwt_required()
+def get_todo_stats():
+    """
+    Returns dashboard counts for the current user's to-do items: total,
+    by_status, by_priority, overdue and completed_this_week (dates in UTC).
+
+    The response carries an ETag built from the user id, their sync version and
+    today's date, so it stays valid until their next to-do write (or
+    midnight). Send it back in If-None-Match to get 304 Not Modified at
+    the cost of one primary-key lookup.
+    """
+    current_user_id = current_user.id
+
+    today = datetime.datetime.now(datetime.timezone.utc).date()
+    etag = f'todo-stats-{current_user_id}-{current_sync_version(current_user_id)}-{today.isoformat()}'
+    if etag in request.if_none_match:
+        response = make_response('', 304)
+    else:
+        response, _ = api_success(data=todo_stats(current_user_id, today))
+    response.set_etag(etag)
+    # Per-user data: browsers may keep it but must revalidate every time.
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+@todo_bp.route('/todos/tags', methods=['GET'])
+@jwt_required()
+def get_todo_tags():
+    """
+    Tag counts for the current user's to-do items (e.g. a sidebar), most
+    used first: [{"name": ..., "count": ...}]. Accepts the filters of
+    GET /todos (including tag), in which case only the matching items are
+    counted; the counts come from one grouped query either way. Items in
+    the trash are not counted.
+    """
+    current_user_id = current_user.id
+
+    query, _, errors = todo_list_query(current_user_id, request.args)
+    if errors:
+        return api_validation_error(errors, message="Invalid query parameters")
+
+    # Trashed items keep their tag links (for a restore), so the counts always go through the live list.
+    todo_ids = query.with_entities(TodoItem.id).order_by(None).scalar_subquery()
+    return api_success(data=tag_facets(current_user_id, todo_ids))
+
+
+@todo_bp.route('/todos/export', methods=['GET'])
+@jwt_required()
+def export_todos():
+    """
+    Downloads the current user's to-do items as ?format=ndjson (default,
+    one to_dict() object per line) or csv (a header row, tags joined with
+    commas). Accepts the filters and sort of GET /todos; recurring items
+    are exported as their template rows and trashed items are left out.
+
+    The body is streamed from a server-side cursor, TODO_EXPORT_BATCH_SIZE
+    rows at a time, so memory stays flat however many items the user has.
+    """
+    current_user_id = current_user.id
+
+    fmt = request.args.get('format', 'ndjson')
+    if fmt not in EXPORT_FORMATS:
+        return api_error(f"Unsupported export format '{fmt}' (expected one of: {', '.join(EXPORT_FORMATS)})", 400)
+    query, _, errors = todo_list_query(current_user_id, request.args)
+    if errors:
+        return api_validation_error(errors, message="Invalid query parameters")
+
+    filename = f"todos-{datetime.datetime.now(datetime.timezone.utc).date().isoformat()}.{fmt}"
+    lines = export_lines(query, fmt, batch_size=current_app.config['TODO_EXPORT_BATCH_SIZE'])
+    response = Response(stream_with_context(lines), mimetype=EXPORT_FORMATS[fmt])
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response.headers['Cache-Control'] = 'private, no-store'
+    return response
+
+
+@todo_bp.route('/todos/search', methods=['GET'])
+@jwt_required()
+def search_todo_items():
+    """
+    Searches the titles and descriptions of the current user's to-do items.
+
+    ?q= holds one or more whitespace-separated terms; an item matches when
+    every term occurs in its title or description (case-insensitive
+    substring match, so it also works for text without spaces, e.g. Chinese).
+    Results are ranked by relevance (bm25, title hits weigh more) and always
+    paginated: ?limit= (default 50) and ?cursor= from meta.next_cursor.
+    Terms shorter than three characters are matched with LIKE instead of the
+    full-text index; those results put title matches first, newest first.
+    """
+    current_user_id = current_user.id
+
+    terms = search_terms(request.args.get('q', ''))
+    if not terms:
+        return api_validation_error({'q': ["q must contain at least one search term"]})
+
+    try:
+        limit, cursor = page_params() or (DEFAULT_PAGE_SIZE, None)
+        # The cursor carries (mode, rank, tiebreak) of the last row on the previous page.
+        after = decode_cursor(cursor, 3) if cursor is not None else None
+        mode, rows = search_todos(current_user_id, terms, limit + 1, after)
+    except ValueError as e: # InvalidPageRequest or a cursor from the other search mode
+        return api_error(str(e), 400)
+
+    rows, meta = page_meta(rows, limit, key=lambda row: (mode, row.rank, row.tiebreak))
+    meta['search_mode'] = mode
+    return api_success(data=todo_dicts([row.TodoItem for row in rows]), meta=meta)
+
+
+@todo_bp.route('/todos/changes', methods=['GET'])
+@jwt_required()
+def get_todo_changes():
+    """
+    Returns the to-do items created, updated or deleted since a sync token.
+
+    ?since=<sync_token> from the previous response (omit it, or send 0, for a
+    full snapshot). The response carries 'changed' (full items), 'deleted'
+    (item ids) and the 'sync_token' to send next time. Apply 'deleted' before
+    'changed': a deleted item's id can come back as a new item.
+
+    An unchanged list costs a single primary-key lookup. A token older than
+    the tombstone retention window gets 410 SYNC_TOKEN_EXPIRED; the client
+    then starts over with a full snapshot.
+    """
+    current_user_id = current_user.id
+
+    since = request.args.get('since', '0')
+    if not since.isdigit():
+        return api_validation_error({'since': ["since must be a sync token returned by this endpoint"]})
+
+    try:
+        changes = changes_since(current_user_id, int(since))
+    except InvalidSyncToken as e:
+        return api_validation_error({'since': [str(e)]})
+    except SyncTokenExpired as e:
+        return api_error(str(e), 410, error_code='SYNC_TOKEN_EXPIRED')
+
+    return api_success(data={
+        'changed': todo_dicts(changes['changed']),
+        'deleted': changes['deleted'],
+        'sync_token': changes['sync_token'],
+    })
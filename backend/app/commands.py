@@ -0,0 +1,95 @@
+# /your_project_root/app/commands.py
+# Custom `flask` CLI commands (maintenance jobs that can also run from cron).
+
+import time
+
+import click
+from flask import Flask, current_app
+from flask.cli import AppGroup
+
+from .utils.db_maintenance import (compact_todo_tombstones, purge_expired_tokens, purge_todo_trash,
+                                   rebalance_long_todo_positions)
+from .utils.user_import import detect_format, import_users
+
+blocklist_cli = AppGroup('blocklist', help='Token blocklist maintenance.')
+users_cli = AppGroup('users', help='User account administration.')
+todos_cli = AppGroup('todos', help='To-do list maintenance.')
+
+
+@blocklist_cli.command('purge')
+@click.option('--batch-size', type=int, default=None, help='Rows deleted per transaction.')
+@click.option('--pause', type=float, default=None, help='Seconds to sleep between batches.')
+def purge_blocklist_command(batch_size, pause):
+    """Deletes blocklist rows whose token has already expired."""
+    batch_size = batch_size or current_app.config['BLOCKLIST_PURGE_BATCH_SIZE']
+    pause = current_app.config['BLOCKLIST_PURGE_PAUSE'] if pause is None else pause
+    started = time.perf_counter()
+    deleted = purge_expired_tokens(batch_size=batch_size, pause=pause)
+    click.echo(f"Purged {deleted} expired blocklist rows in {time.perf_counter() - started:.2f}s")
+
+
+@users_cli.command('import')
+@click.argument('source', type=click.File('r', encoding='utf-8-sig'))
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'ndjson']), default=None,
+              help='Input format (default: guessed from the file extension).')
+@click.option('--batch-size', type=int, default=None, help='Users inserted per transaction.')
+@click.option('--workers', type=int, default=None, help='Hashing processes (default: one per CPU).')
+def import_users_command(source, fmt, batch_size, workers):
+    """Creates users from a CSV or NDJSON file with username, email and password fields."""
+    try:
+        fmt = fmt or detect_format(filename=source.name)
+    except ValueError as e:
+        raise click.UsageError(str(e))
+    config = current_app.config
+    result = import_users(
+        source, fmt,
+        batch_size=batch_size or config['USER_IMPORT_BATCH_SIZE'],
+        workers=workers or config['USER_IMPORT_WORKERS'],
+        log_rounds=config['BCRYPT_LOG_ROUNDS'],
+    )
+    for error in result['errors']:
+        click.echo(f"line {error['line']}: {error['error']}", err=True)
+    click.echo(f"Created {result['created']} users, skipped {result['skipped']} "
+               f"in {result['seconds']:.2f}s ({result['users_per_second']} users/s)")
+
+
+@todos_cli.command('compact-tombstones')
+@click.option('--retention-days', type=int, default=None, help='Keep tombstones newer than this many days.')
+def compact_tombstones_command(retention_days):
+    """Deletes to-do tombstones older than the delta-sync retention window."""
+    config = current_app.config
+    retention_days = config['TODO_TOMBSTONE_RETENTION_DAYS'] if retention_days is None else retention_days
+    started = time.perf_counter()
+    deleted = compact_todo_tombstones(retention_days, batch_size=config['TODO_TOMBSTONE_COMPACT_BATCH_SIZE'],
+                                      pause=config['MAINTENANCE_BATCH_PAUSE'])
+    click.echo(f"Compacted {deleted} to-do tombstones in {time.perf_counter() - started:.2f}s")
+
+
+@todos_cli.command('purge-trash')
+@click.option('--retention-days', type=int, default=None, help='Keep items trashed less than this many days ago.')
+def purge_trash_command(retention_days):
+    """Permanently deletes to-do items that have been in the trash past the retention window."""
+    config = current_app.config
+    retention_days = config['TODO_TRASH_RETENTION_DAYS'] if retention_days is None else retention_days
+    started = time.perf_counter()
+    deleted = purge_todo_trash(retention_days, batch_size=config['TODO_TRASH_PURGE_BATCH_SIZE'],
+                               pause=config['MAINTENANCE_BATCH_PAUSE'])
+    click.echo(f"Purged {deleted} trashed to-do items in {time.perf_counter() - started:.2f}s")
+
+
+@todos_cli.command('rebalance-positions')
+@click.option('--max-length', type=int, default=None, help='Renumber users with a position key longer than this.')
+def rebalance_positions_command(max_length):
+    """Renumbers the manual to-do order of users whose position keys grew long."""
+    config = current_app.config
+    max_length = config['TODO_POSITION_MAX_LENGTH'] if max_length is None else max_length
+    started = time.perf_counter()
+    users = rebalance_long_todo_positions(max_length, pause=config['MAINTENANCE_BATCH_PAUSE'])
+    click.echo(f"Rebalanced the to-do positions of {users} users in {time.perf_counter() - started:.2f}s")
+
+
+def register_commands(app: Flask) -> None:
+    """Registers the CLI command groups with the app."""
+    app.cli.add_command(blocklist_cli)
+    app.cli.add_command(users_cli)
+    app.cli.add_command(todos_cli)
@@ -28,11 +28,103 @@ class Config:
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'another-fallback-jwt-secret'
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
+    # Cache verified claims by token digest until 'exp' so repeat requests skip the HS256 check.
+    JWT_DECODE_CACHE_ENABLED = os.environ.get('JWT_DECODE_CACHE_ENABLED', 'false').lower() == 'true'
+    JWT_DECODE_CACHE_MAX_SIZE = int(os.environ.get('JWT_DECODE_CACHE_MAX_SIZE', 10000))
+
+    # --- Password Hashing ---
+    # bcrypt work factor. Existing hashes made at another cost are upgraded on the next successful login.
+    BCRYPT_LOG_ROUNDS = int(os.environ.get('BCRYPT_LOG_ROUNDS', 12))
+
+    # --- Password Hashing Pool (bcrypt runs off the request thread) ---
+    REQUEST_THREADS = int(os.environ.get('REQUEST_THREADS', 4)) # gunicorn --threads per worker process (see Dockerfile)
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 2)) # Concurrent bcrypt operations per process
+    # Waiting operations before 429. Workers + queue must stay below REQUEST_THREADS, or every
+    # thread blocks on bcrypt before the queue fills; the default keeps one thread free.
+    PASSWORD_HASH_QUEUE_SIZE = int(os.environ.get('PASSWORD_HASH_QUEUE_SIZE',
+                                                  max(0, REQUEST_THREADS - PASSWORD_HASH_WORKERS - 1)))
+    PASSWORD_HASH_TIMEOUT = 30 # Seconds a request waits for its hash before giving up with 429
+    PASSWORD_HASH_RETRY_AFTER = 1 # Seconds, sent in the Retry-After header of 429 responses
+
+    # --- Rate Limiting (sliding window, shared by all workers through a SQLite file) ---
+    RATELIMIT_ENABLED = True
+    # Defaults to <instance_path>/ratelimit.sqlite when unset.
+    RATELIMIT_STORAGE_FILE = os.environ.get('RATELIMIT_STORAGE_FILE')
+    # Per endpoint: key -> (max requests, window in seconds). Keys: 'ip', 'email'.
+    RATELIMIT_LIMITS = {
+        'auth.login': {'ip': (30, 60), 'email': (5, 60)},
+        'auth.register': {'ip': (10, 3600)},
+    }
+    RATELIMIT_PRUNE_INTERVAL = 600 # Seconds between deletions of expired hits; 0 disables
+    # Reverse proxies in front of the app whose X-Forwarded-For/-Proto are trusted (ProxyFix).
+    # 0 uses the socket address; behind the shipped nginx every client would share its IP.
+    RATELIMIT_TRUSTED_PROXIES = int(os.environ.get('RATELIMIT_TRUSTED_PROXIES', 0))
 
     # --- JWT Blocklist Configuration (for logout) ---
     JWT_BLOCKLIST_ENABLED = True
     JWT_BLOCKLIST_TOKEN_CHECKS = ['access', 'refresh']
 
+    # --- Revocation Cache (in-process cache in front of the blocklist lookup) ---
+    REVOCATION_CACHE_ENABLED = True
+    REVOCATION_CACHE_MAX_SIZE = int(os.environ.get('REVOCATION_CACHE_MAX_SIZE', 10000))
+    REVOCATION_CACHE_TTL = int(os.environ.get('REVOCATION_CACHE_TTL', 300)) # Seconds; caps negative answers
+    REVOCATION_EPOCH_CACHE_TTL = int(os.environ.get('REVOCATION_EPOCH_CACHE_TTL', 300)) # Seconds; per-user token epoch
+    # Shared file used to tell other gunicorn workers that a token was revoked.
+    # Defaults to <instance_path>/revocation.gen when unset.
+    REVOCATION_SYNC_FILE = os.environ.get('REVOCATION_SYNC_FILE')
+
+    # --- Identity Cache (current-user snapshot behind each JWT identity) ---
+    IDENTITY_CACHE_ENABLED = True
+    IDENTITY_CACHE_MAX_SIZE = int(os.environ.get('IDENTITY_CACHE_MAX_SIZE', 10000))
+    IDENTITY_CACHE_TTL = int(os.environ.get('IDENTITY_CACHE_TTL', 30)) # Seconds
+    # Shared file used to tell other workers that a user changed.
+    # Defaults to <instance_path>/identity.gen when unset.
+    IDENTITY_SYNC_FILE = os.environ.get('IDENTITY_SYNC_FILE')
+
+    # --- Blocklist Bloom Filter (skips the jti query for tokens that were never revoked) ---
+    BLOCKLIST_BLOOM_ENABLED = True
+    BLOCKLIST_BLOOM_CAPACITY = int(os.environ.get('BLOCKLIST_BLOOM_CAPACITY', 1000000)) # ~1.2 MB at 1% error
+    BLOCKLIST_BLOOM_ERROR_RATE = 0.01
+    BLOCKLIST_BLOOM_REBUILD_INTERVAL = int(os.environ.get('BLOCKLIST_BLOOM_REBUILD_INTERVAL', 3600)) # Seconds
+    BLOCKLIST_BLOOM_BUILD_ASYNC = True # Build in a background thread; queries go to the table until ready
+
+    # --- Blocklist Purge (`flask blocklist purge`, or an in-app timer when the interval is > 0) ---
+    BLOCKLIST_PURGE_INTERVAL = int(os.environ.get('BLOCKLIST_PURGE_INTERVAL', 0)) # Seconds; 0 disables the timer
+    BLOCKLIST_PURGE_BATCH_SIZE = 1000 # Rows deleted per transaction
+    BLOCKLIST_PURGE_PAUSE = 0.05 # Seconds between batches so requests can take the write lock
+
+    # --- To-do Maintenance Jobs (`flask todos ...` and the in-app timers below) ---
+    MAINTENANCE_BATCH_PAUSE = 0.05 # Seconds between batches so requests can take the write lock
+
+    # --- To-do Delta Sync (GET /api/v1/todo/todos/changes; `flask todos compact-tombstones`) ---
+    TODO_TOMBSTONE_RETENTION_DAYS = int(os.environ.get('TODO_TOMBSTONE_RETENTION_DAYS', 30)) # Older sync tokens get 410
+    TODO_TOMBSTONE_COMPACT_INTERVAL = int(os.environ.get('TODO_TOMBSTONE_COMPACT_INTERVAL', 0)) # Seconds; 0 disables the timer
+    TODO_TOMBSTONE_COMPACT_BATCH_SIZE = 1000 # Tombstones deleted per transaction
+
+    # --- To-do Trash (DELETE /api/v1/todo/todos/<id>, GET /api/v1/todo/todos/trash; `flask todos purge-trash`) ---
+    TODO_TRASH_RETENTION_DAYS = int(os.environ.get('TODO_TRASH_RETENTION_DAYS', 30)) # Older trashed items are purged
+    TODO_TRASH_PURGE_INTERVAL = int(os.environ.get('TODO_TRASH_PURGE_INTERVAL', 0)) # Seconds; 0 disables the timer
+    TODO_TRASH_PURGE_BATCH_SIZE = 500 # Items deleted per transaction
+
+    # --- To-do Export (GET /api/v1/todo/todos/export) ---
+    TODO_EXPORT_BATCH_SIZE = 1000 # Rows fetched from the cursor and streamed per chunk
+
+    # --- To-do Manual Order (POST /api/v1/todo/todos/<id>/move; `flask todos rebalance-positions`) ---
+    TODO_POSITION_MAX_LENGTH = int(os.environ.get('TODO_POSITION_MAX_LENGTH', 24)) # Longer keys get renumbered
+    TODO_POSITION_REBALANCE_INTERVAL = int(os.environ.get('TODO_POSITION_REBALANCE_INTERVAL', 0)) # Seconds; 0 disables the timer
+
+    # --- Bulk User Import (`flask users import`, POST /api/v1/admin/users/import) ---
+    USER_IMPORT_BATCH_SIZE = 500 # Users inserted per transaction
+    USER_IMPORT_WORKERS = int(os.environ.get('USER_IMPORT_WORKERS', 0)) or None # Hashing processes; None = one per CPU
+    # Records accepted by the admin endpoint, which imports inside the request (bcrypt at
+    # BCRYPT_LOG_ROUNDS=12 is ~0.25s per password per core; gunicorn times out at 120s).
+    USER_IMPORT_MAX_REQUEST_ROWS = int(os.environ.get('USER_IMPORT_MAX_REQUEST_ROWS', 200))
+    # Accounts allowed to call the /api/v1/admin endpoints (comma-separated emails).
+    ADMIN_EMAILS = [e.strip() for e in os.environ.get('ADMIN_EMAILS', '').split(',') if e.strip()]
+
+    # --- Metrics ---
+    METRICS_ENABLED = True
+
 
     @staticmethod
     def init_app(app):
@@ -61,6 +153,16 @@ class TestingConfig(Config):
     SQLALCHEMY_DATABASE_URI = os.environ.get('TEST_DATABASE_URL') or \
         f'sqlite:///{db_path}'
 
+    # Build the bloom filter inline so tests are deterministic (in-memory SQLite
+    # shares a single connection, which must not be used from two threads).
+    BLOCKLIST_BLOOM_BUILD_ASYNC = False
+
+    # Tests log in many times from one address; limiter tests turn it back on.
+    RATELIMIT_ENABLED = False
+
+    # Minimum bcrypt cost; keeps the suite fast.
+    BCRYPT_LOG_ROUNDS = 4
+
     # Increased token expiry times for testing
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(seconds=30)  # Increased from 5
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(minutes=1) # Increased from 10 seconds
@@ -88,6 +190,8 @@ class ProductionConfig(Config):
     db_path = os.path.abspath(os.path.join(basedir, 'instance', 'prod.sqlite'))
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or \
         f'sqlite:///{db_path}'
+    # The shipped deployment runs behind one nginx (frontend/nginx.conf).
+    RATELIMIT_TRUSTED_PROXIES = int(os.environ.get('RATELIMIT_TRUSTED_PROXIES', 1))
 
     @classmethod
     def init_app(cls, app):
@@ -5,9 +5,16 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_bcrypt import Bcrypt
-from flask_jwt_extended import JWTManager
 from flask_cors import CORS # CORS is often initialized directly in create_app
 
+from .utils.token_revocation import RevocationCache
+from .utils.bloom_filter import BlocklistFilter
+from .utils.background import BackgroundScheduler
+from .utils.password_hashing import PasswordHasher
+from .utils.rate_limit import RateLimiter
+from .utils.identity_cache import IdentityCache
+from .utils.jwt_decode_cache import CachingJWTManager
+
 # Initialize SQLAlchemy - This object will be used to interact with the database.
 # We don't associate it with the app here; that happens in the app factory.
 db = SQLAlchemy()
@@ -19,8 +26,27 @@ migrate = Migrate()
 # Initialize Flask-Bcrypt - Used for hashing passwords securely.
 bcrypt = Bcrypt()
 
+# Bounded worker pool that runs the bcrypt work above off the request thread.
+password_hasher = PasswordHasher(bcrypt)
+
 # Initialize Flask-JWT-Extended - Manages JWT creation, verification, etc.
-jwt = JWTManager()
+# The subclass can cache verified claims per token (JWT_DECODE_CACHE_ENABLED).
+jwt = CachingJWTManager()
+
+# In-process cache in front of the token blocklist lookup (see utils/token_revocation.py).
+revocation_cache = RevocationCache()
+
+# Per-worker cache of the current-user snapshot behind each JWT identity.
+identity_cache = IdentityCache()
+
+# Bloom filter over blocklisted JTIs; only filter hits fall through to the jti query.
+blocklist_filter = BlocklistFilter()
+
+# Sliding-window limits on login/registration, shared by all workers through a SQLite file.
+rate_limiter = RateLimiter()
+
+# Periodic maintenance jobs (purges) run in daemon threads inside the workers.
+scheduler = BackgroundScheduler()
 
 # Note: Flask-CORS is typically initialized directly within the create_app factory
 # because its configuration (like allowed origins) might depend on the app config.
@@ -8,6 +8,10 @@ from ..extensions import db
 from .user import User
 from .token_blocklist import TokenBlocklist
 from .todo_item import TodoItem
+from .todo_sync_state import TodoSyncState
+from .todo_tombstone import TodoTombstone
+from .tag import Tag
+from .todo_tag import TodoTag
 from .user_profile import UserProfile
 from .achievement import Achievement
 # from .current_focus_item import CurrentFocusItem # REMOVE THIS LINE
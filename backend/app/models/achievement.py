@@ -12,6 +12,10 @@ class Achievement(BaseModel):
     Inherits common fields and methods from BaseModel.
     """
     __tablename__ = 'achievements'
+    __table_args__ = (
+        # Serves GET /achievements: scanned backwards it yields date_achieved DESC NULLS LAST, created_at DESC.
+        db.Index('ix_achievements_user_date_created', 'user_id', 'date_achieved', 'created_at'),
+    )
 
     id = db.Column(db.Integer, primary_key=True) # SERIAL PRIMARY KEY
     user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
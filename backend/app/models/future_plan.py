@@ -13,6 +13,10 @@ class FuturePlan(BaseModel):
     Inherits common fields and methods from BaseModel.
     """
     __tablename__ = 'future_plans'
+    __table_args__ = (
+        # Serves GET /plans: per-user rows already in list order (target_date ASC NULLS LAST, created_at DESC).
+        db.Index('ix_future_plans_user_target_created', 'user_id', 'target_date', db.text('created_at DESC')),
+    )
 
     id = db.Column(db.Integer, primary_key=True) # SERIAL PRIMARY KEY
     user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
@@ -0,0 +1,35 @@
+# /your_project_root/app/models/tag.py
+# Defines the Tag model (user-defined labels for to-do items).
+
+from ..extensions import db
+import datetime
+from typing import Dict, Any
+
+class Tag(db.Model):
+    """
+    A user's tag. Names are stored normalized (trimmed, lower-cased, see
+    utils/todo_tags.py), so each name exists once per user; items are linked
+    to tags through TodoTag.
+    """
+    __tablename__ = 'tags'
+    __table_args__ = (
+        # One row per (user, name); also resolves a tag filter's names to ids.
+        db.UniqueConstraint('user_id', 'name', name='uq_tags_user_name'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    name = db.Column(db.String(50), nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False,
+                           default=lambda: datetime.datetime.now(datetime.timezone.utc))
+
+    def __repr__(self) -> str:
+        """String representation of the Tag object."""
+        return f'<Tag {self.id}: {self.name}>'
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Converts the Tag instance to a dictionary."""
+        return {
+            'id': self.id,
+            'name': self.name,
+        }
@@ -2,16 +2,47 @@
 # Defines the TodoItem database model.
 
 from ..extensions import db
+from sqlalchemy import event
 import datetime
 from .base import BaseModel
+from ..utils.order_keys import FIRST_KEY
 from typing import Dict, Any
 
+# Partial index conditions: live (not trashed) and trashed rows.
+_LIVE = db.text('deleted_at IS NULL')
+_TRASHED = db.text('deleted_at IS NOT NULL')
+
+
 class TodoItem(BaseModel):
     """
     TodoItem model for storing individual to-do tasks.
     Inherits common fields and methods from BaseModel.
     """
     __tablename__ = 'todo_items'
+    __table_args__ = (
+        # The list indexes only hold live rows (partial, WHERE deleted_at IS NULL), so
+        # trashed items cost list reads nothing; queries on them must say deleted_at IS NULL.
+        # Serves GET /todos: per-user rows in list order, and keyset pagination on the same key.
+        db.Index('ix_todo_items_user_focus_created', 'user_id', 'is_current_focus', 'created_at', 'id',
+                 sqlite_where=_LIVE, postgresql_where=_LIVE),
+        # Filters and sorts of GET /todos (the rowid at the end of each index breaks created_at ties).
+        db.Index('ix_todo_items_user_created', 'user_id', 'created_at', sqlite_where=_LIVE, postgresql_where=_LIVE),
+        db.Index('ix_todo_items_user_status_created', 'user_id', 'status', 'created_at',
+                 sqlite_where=_LIVE, postgresql_where=_LIVE),
+        db.Index('ix_todo_items_user_due_date', 'user_id', 'due_date', sqlite_where=_LIVE, postgresql_where=_LIVE),
+        # Serves GET /todos/changes: a user's items changed after a sync version.
+        db.Index('ix_todo_items_user_sync_version', 'user_id', 'sync_version'),
+        # Serves sort=position and the first/neighbour lookups of manual ordering.
+        db.Index('ix_todo_items_user_position', 'user_id', 'position', sqlite_where=_LIVE, postgresql_where=_LIVE),
+        # The trash: GET /todos/trash per user, and the purge of old entries across users.
+        db.Index('ix_todo_items_user_deleted', 'user_id', 'deleted_at',
+                 sqlite_where=_TRASHED, postgresql_where=_TRASHED),
+        db.Index('ix_todo_items_deleted', 'deleted_at', sqlite_where=_TRASHED, postgresql_where=_TRASHED),
+        # One materialized row per occurrence of a recurring item.
+        db.Index('ux_todo_items_recurrence_occurrence', 'recurrence_id', 'occurrence_date', unique=True),
+        # Walks a subtree down one level per step of the recursive CTE in utils/todo_tree.py.
+        db.Index('ix_todo_items_parent', 'parent_id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True) # SERIAL PRIMARY KEY
     user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
@@ -29,8 +60,44 @@ class TodoItem(BaseModel):
     # completed_at is specific to TodoItem, not in BaseModel
     completed_at = db.Column(db.DateTime, nullable=True)
 
+    # Per-user version of the last change to this item (see utils/todo_sync.py)
+    sync_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+
+    # Manual (drag-and-drop) order: a fractional key from utils/order_keys.py,
+    # compared as a plain string; ties are broken by id. Rows created without
+    # one get FIRST_KEY, so they keep their creation order among themselves.
+    position = db.Column(db.Text, nullable=False, default=FIRST_KEY, server_default=FIRST_KEY)
+
+    # Recurring items: the template row holds an RRULE (utils/recurrence.py) and
+    # its due_date is the first occurrence. Occurrences are generated on
+    # demand; one becomes a row (recurrence_id -> template, occurrence_date)
+    # only once it is edited or completed. recurrence_id has no FOREIGN KEY so
+    # SQLite can add and drop it in place; deleting a template deletes its
+    # occurrences explicitly (see delete_todo).
+    recurrence = db.Column(db.Text, nullable=True)
+    recurrence_id = db.Column(db.Integer, nullable=True)
+    occurrence_date = db.Column(db.Date, nullable=True)
+
+    # Subtasks: parent_id points at the parent item (no FOREIGN KEY, like
+    # recurrence_id). The parent's subtask_count / subtask_done_count roll up
+    # its direct children and are kept current by the triggers below, so a
+    # list shows "done/total" without loading the tree.
+    parent_id = db.Column(db.Integer, nullable=True)
+    subtask_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    subtask_done_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+
+    # Soft delete: DELETE /todos/<id> moves the item to the trash by setting
+    # deleted_at; it can be restored until the purge job removes it (see
+    # purge_todo_trash in utils/db_maintenance.py). Every read of live items
+    # filters on deleted_at IS NULL.
+    deleted_at = db.Column(db.DateTime, nullable=True)
+
     # user = db.relationship('User', backref=db.backref('todo_items', lazy=True))
 
+    # Tag names (not a column): set by utils/todo_tags.todo_dicts, which loads
+    # the tags of a whole response in one query, for to_dict to return.
+    tag_names = None
+
     def __repr__(self) -> str:
         """String representation of the TodoItem object."""
         return f'<TodoItem {self.id}: {self.title[:30]}>'
@@ -48,5 +115,88 @@ class TodoItem(BaseModel):
             'is_current_focus': self.is_current_focus,
             'created_at': self.format_datetime(self.created_at),
             'updated_at': self.format_datetime(self.updated_at),
-            'completed_at': self.format_datetime(self.completed_at)
+            'completed_at': self.format_datetime(self.completed_at),
+            'sync_version': self.sync_version,
+            'position': self.position,
+            'recurrence': self.recurrence,
+            'recurrence_id': self.recurrence_id,
+            'occurrence_date': self.format_date(self.occurrence_date),
+            'parent_id': self.parent_id,
+            'subtask_count': self.subtask_count,
+            'subtask_done_count': self.subtask_done_count,
+            'tags': list(self.tag_names or []),
+            'deleted_at': self.format_datetime(self.deleted_at),
         }
+
+
+# Full-text index over title/description for GET /todos/search (SQLite only;
+# other databases use the LIKE fallback in utils/todo_search.py). An external-
+# content FTS5 table stores only the index; triggers keep it in step with
+# todo_items. The trigram tokenizer matches substrings, which also works for
+# CJK text without word breaks. The 'owner' column holds an owner token
+# ('u<user_id>u', see fts_owner_token) so a search matches one user's rows in
+# the index itself; the todo_items_fts_content view supplies it for rebuilds.
+# Migration d8b1f6a2c934 creates the same objects.
+TODO_FTS_DDL = [
+    "CREATE VIEW IF NOT EXISTS todo_items_fts_content AS "
+    "SELECT id, 'u' || user_id || 'u' AS owner, title, description FROM todo_items",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS todo_items_fts USING fts5("
+    "owner, title, description, content='todo_items_fts_content', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS todo_items_fts_insert AFTER INSERT ON todo_items BEGIN "
+    "INSERT INTO todo_items_fts(rowid, owner, title, description) "
+    "VALUES (new.id, 'u' || new.user_id || 'u', new.title, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS todo_items_fts_delete AFTER DELETE ON todo_items BEGIN "
+    "INSERT INTO todo_items_fts(todo_items_fts, rowid, owner, title, description) "
+    "VALUES ('delete', old.id, 'u' || old.user_id || 'u', old.title, old.description); END",
+    # Only text (and owner) changes touch the index; status/priority/focus updates skip it.
+    "CREATE TRIGGER IF NOT EXISTS todo_items_fts_update AFTER UPDATE OF user_id, title, description ON todo_items BEGIN "
+    "INSERT INTO todo_items_fts(todo_items_fts, rowid, owner, title, description) "
+    "VALUES ('delete', old.id, 'u' || old.user_id || 'u', old.title, old.description); "
+    "INSERT INTO todo_items_fts(rowid, owner, title, description) "
+    "VALUES (new.id, 'u' || new.user_id || 'u', new.title, new.description); END",
+]
+
+
+def fts_owner_token(user_id: int) -> str:
+    """The owner-column token of user_id's rows in todo_items_fts (delimited, so 'u1u' never matches 'u12u')."""
+    return f'u{user_id}u'
+
+
+for _statement in TODO_FTS_DDL:
+    event.listen(TodoItem.__table__, 'after_create', db.DDL(_statement).execute_if(dialect='sqlite'))
+event.listen(TodoItem.__table__, 'before_drop',
+             db.DDL("DROP TABLE IF EXISTS todo_items_fts").execute_if(dialect='sqlite'))
+event.listen(TodoItem.__table__, 'before_drop',
+             db.DDL("DROP VIEW IF EXISTS todo_items_fts_content").execute_if(dialect='sqlite'))
+
+
+# Subtask rollups: SQLite triggers, like the FTS index above (on other
+# databases the counters stay 0); migration e2b9c4d7a018 creates them and
+# c3f7a9e4b512 the current version. Each write adjusts the parent's
+# counters by the child's delta, whatever code path made it (single writes,
+# batches, subtree deletes), and stamps the parent with the user's current
+# sync version so delta sync clients get the new counts. Trashed children
+# do not count. An UPDATE only fires for status, parent_id or deleted_at
+# changes.
+_ROLLUP_SET = (
+    "subtask_count = subtask_count {sign} ({row}.deleted_at IS NULL), "
+    "subtask_done_count = subtask_done_count {sign} ({row}.status = 'completed' AND {row}.deleted_at IS NULL), "
+    "sync_version = coalesce((SELECT version FROM todo_sync_state WHERE user_id = {row}.user_id), sync_version)"
+)
+TODO_ROLLUP_DDL = [
+    "CREATE TRIGGER IF NOT EXISTS todo_items_rollup_insert AFTER INSERT ON todo_items "
+    "WHEN new.parent_id IS NOT NULL BEGIN "
+    f"UPDATE todo_items SET {_ROLLUP_SET.format(sign='+', row='new')} WHERE id = new.parent_id; END",
+    "CREATE TRIGGER IF NOT EXISTS todo_items_rollup_delete AFTER DELETE ON todo_items "
+    "WHEN old.parent_id IS NOT NULL BEGIN "
+    f"UPDATE todo_items SET {_ROLLUP_SET.format(sign='-', row='old')} WHERE id = old.parent_id; END",
+    "CREATE TRIGGER IF NOT EXISTS todo_items_rollup_update AFTER UPDATE OF status, parent_id, deleted_at ON todo_items "
+    "WHEN (old.parent_id IS NOT NULL OR new.parent_id IS NOT NULL) "
+    "AND (old.parent_id IS NOT new.parent_id OR old.status IS NOT new.status "
+    "OR old.deleted_at IS NOT new.deleted_at) BEGIN "
+    f"UPDATE todo_items SET {_ROLLUP_SET.format(sign='-', row='old')} WHERE id = old.parent_id; "
+    f"UPDATE todo_items SET {_ROLLUP_SET.format(sign='+', row='new')} WHERE id = new.parent_id; END",
+]
+
+for _statement in TODO_ROLLUP_DDL:
+    event.listen(TodoItem.__table__, 'after_create', db.DDL(_statement).execute_if(dialect='sqlite'))
@@ -0,0 +1,29 @@
+# /your_project_root/app/models/todo_sync_state.py
+# Defines the TodoSyncState model (per-user delta sync counter for to-do items).
+
+from ..extensions import db
+from typing import Dict, Any
+
+class TodoSyncState(db.Model):
+    """
+    One row per user: the latest sync version handed out for the user's
+    to-do items, and the newest version whose tombstones were compacted away.
+    A sync token older than compacted_through can no longer be served as a delta.
+    """
+    __tablename__ = 'todo_sync_state'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    compacted_through = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        """String representation of the TodoSyncState object."""
+        return f'<TodoSyncState user_id={self.user_id} version={self.version}>'
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Converts the TodoSyncState instance to a dictionary."""
+        return {
+            'user_id': self.user_id,
+            'version': self.version,
+            'compacted_through': self.compacted_through,
+        }
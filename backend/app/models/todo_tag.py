@@ -0,0 +1,37 @@
+# /your_project_root/app/models/todo_tag.py
+# Defines the TodoTag model (the many-to-many link between to-do items and tags).
+
+from ..extensions import db
+from sqlalchemy import event
+
+class TodoTag(db.Model):
+    """
+    Links a to-do item to one of its tags. user_id is copied from the item so
+    a user's links can be read per tag straight from one index.
+    """
+    __tablename__ = 'todo_tags'
+    __table_args__ = (
+        # Serves the tag filter of GET /todos (one range per tag, intersected by
+        # todo_id) and the tag counts of GET /todos/tags; covering for both.
+        db.Index('ix_todo_tags_user_tag_todo', 'user_id', 'tag_id', 'todo_id'),
+    )
+
+    # The primary key serves the other direction: the tags of given items.
+    todo_id = db.Column(db.Integer, db.ForeignKey('todo_items.id', ondelete='CASCADE'), primary_key=True)
+    tag_id = db.Column(db.Integer, db.ForeignKey('tags.id', ondelete='CASCADE'), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+
+    def __repr__(self) -> str:
+        """String representation of the TodoTag object."""
+        return f'<TodoTag todo_id={self.todo_id} tag_id={self.tag_id}>'
+
+
+# SQLite does not enforce ON DELETE CASCADE here (foreign keys are off), so a
+# trigger drops an item's links when the item is deleted, whichever statement
+# deletes it (single, batch or subtree deletes stay one DELETE). Migration
+# b5e8d2f1c947 creates the same trigger.
+TODO_TAGS_DELETE_DDL = (
+    "CREATE TRIGGER IF NOT EXISTS todo_items_tags_delete AFTER DELETE ON todo_items BEGIN "
+    "DELETE FROM todo_tags WHERE todo_id = old.id; END"
+)
+event.listen(TodoTag.__table__, 'after_create', db.DDL(TODO_TAGS_DELETE_DDL).execute_if(dialect='sqlite'))
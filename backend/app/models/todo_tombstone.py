@@ -0,0 +1,36 @@
+# /your_project_root/app/models/todo_tombstone.py
+# Defines the TodoTombstone model (records of deleted to-do items for delta sync).
+
+from ..extensions import db
+from typing import Dict, Any
+
+class TodoTombstone(db.Model):
+    """
+    Marks a deleted to-do item so GET /todos/changes can report the deletion.
+    Tombstones older than the retention window are compacted (see
+    compact_todo_tombstones in utils/db_maintenance.py).
+    """
+    __tablename__ = 'todo_tombstones'
+    __table_args__ = (
+        # Serves GET /todos/changes: a user's deletions after a sync version.
+        db.Index('ix_todo_tombstones_user_sync_version', 'user_id', 'sync_version'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    # Not a foreign key: the item is gone. SQLite may reuse the id for a later item.
+    todo_id = db.Column(db.Integer, nullable=False)
+    sync_version = db.Column(db.Integer, nullable=False)
+    deleted_at = db.Column(db.DateTime, nullable=False, index=True)
+
+    def __repr__(self) -> str:
+        """String representation of the TodoTombstone object."""
+        return f'<TodoTombstone todo_id={self.todo_id} version={self.sync_version}>'
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Converts the TodoTombstone instance to a dictionary."""
+        return {
+            'todo_id': self.todo_id,
+            'sync_version': self.sync_version,
+            'deleted_at': self.deleted_at.isoformat() + 'Z',
+        }
@@ -12,11 +12,16 @@ class TokenBlocklist(BaseModel):
     Inherits common fields and methods from BaseModel.
     """
     __tablename__ = 'token_blocklist'
+    # AUTOINCREMENT keeps ids monotonic even after purges delete the newest
+    # rows; the bloom filter catches up on new rows by id.
+    __table_args__ = {'sqlite_autoincrement': True}
 
     id = db.Column(db.Integer, primary_key=True)
     jti = db.Column(db.String(36), nullable=False, unique=True, index=True)
     token_type = db.Column(db.String(10), nullable=False)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    # When the revoked token itself expires; after that the row can be purged.
+    expires_at = db.Column(db.DateTime, nullable=True, index=True)
 
     # No need for updated_at in this model, so we'll override it to None
     updated_at = None
@@ -35,4 +40,5 @@ class TokenBlocklist(BaseModel):
             'token_type': self.token_type,
             'user_id': self.user_id,
             'created_at': self.format_datetime(self.created_at),
+            'expires_at': self.format_datetime(self.expires_at),
         }
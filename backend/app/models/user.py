@@ -1,11 +1,39 @@
 # /your_project_root/app/models/user.py
 # Defines the User database model.
 
-from ..extensions import db, bcrypt
+from ..extensions import db, password_hasher, identity_cache
+from flask import current_app
 import datetime
+import itertools
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import BinaryExpression, BindParameter, BooleanClauseList
 from .base import BaseModel
 from .user_profile import UserProfile
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Set
+
+class UserSnapshot:
+    """
+    Detached, read-only copy of a User row (and its profile), as returned by
+    the JWT user_lookup_loader. Safe to cache across requests because it
+    holds no session state; load the User itself when it must be modified.
+    """
+    __slots__ = ('id', 'username', 'email', 'created_at', 'updated_at', 'profile')
+
+    def __init__(self, user: 'User'):
+        self.id = user.id
+        self.username = user.username
+        self.email = user.email
+        self.created_at = user.created_at
+        self.updated_at = user.updated_at
+        # Profile fields as served by the anchor API, or None if the profile row is missing.
+        self.profile = user.profile.to_dict() if user.profile else None
+
+    def __repr__(self) -> str:
+        """String representation of the UserSnapshot object."""
+        return f'<UserSnapshot {self.username}>'
+
 
 class User(BaseModel):
     """
@@ -18,6 +46,9 @@ class User(BaseModel):
     username = db.Column(db.String(80), unique=True, nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
     password_hash = db.Column(db.String(128), nullable=False)
+    # Embedded in every JWT as the 'epoch' claim; bumping it revokes all of the
+    # user's outstanding tokens at once ("log out all devices").
+    token_epoch = db.Column(db.Integer, nullable=False, default=0, server_default='0')
 
     # --- Relationship to UserProfile (One-to-One) ---
     # 'profile' attribute will allow access to the UserProfile record.
@@ -39,12 +70,49 @@ class User(BaseModel):
         self.profile = UserProfile()
 
     def set_password(self, password: str) -> None:
-        """Hashes the provided password and stores it."""
-        self.password_hash = bcrypt.generate_password_hash(password).decode('utf-8')
+        """
+        Hashes the provided password and stores it.
+        The bcrypt work runs on the bounded hashing pool and may raise
+        PasswordHashingBusy when the pool is saturated.
+        """
+        self.password_hash = password_hasher.hash(password)
 
     def check_password(self, password: str) -> bool:
-        """Checks if the provided password matches the stored hash."""
-        return bcrypt.check_password_hash(self.password_hash, password)
+        """
+        Checks if the provided password matches the stored hash.
+        Runs on the bounded hashing pool (may raise PasswordHashingBusy).
+        """
+        return password_hasher.verify(self.password_hash, password)
+
+    def password_needs_rehash(self) -> bool:
+        """Checks if the stored hash was made with a bcrypt cost other than BCRYPT_LOG_ROUNDS."""
+        return password_hasher.needs_rehash(self.password_hash)
+
+    def rehash_password_later(self, password: str):
+        """
+        Re-hashes the (already verified) password at the configured cost in the
+        background and stores it, without holding up the current request.
+        The write only applies if the stored hash is still the one that was
+        verified, so a concurrent password change is never overwritten.
+        Returns the pending Future, or None if the pool had no room.
+        """
+        app = current_app._get_current_object()
+        user_id, old_hash = self.id, self.password_hash
+
+        def store(new_hash: str) -> None:
+            with app.app_context():
+                db.session.execute(
+                    db.update(User)
+                    .where(User.id == user_id, User.password_hash == old_hash)
+                    .values(password_hash=new_hash)
+                )
+                db.session.commit()
+
+        return password_hasher.hash_later(password, store)
+
+    def snapshot(self) -> UserSnapshot:
+        """Returns a detached copy of this user for the identity cache."""
+        return UserSnapshot(self)
 
     def __repr__(self) -> str:
         """String representation of the User object."""
@@ -67,3 +135,66 @@ class User(BaseModel):
         user_data = self.to_dict()
         user_data['profile'] = profile_data
         return user_data
+
+
+# --- Identity Cache Invalidation ---
+# Every committed change to a users or user_profiles row drops the cached
+# UserSnapshot of that user in all workers; a rollback forgets the changes.
+_CHANGED_USERS = 'identity_cache_changed_users' # Session.info key; a None member means "every user"
+
+
+def _bulk_target_ids(orm_execute_state) -> Optional[Set[Any]]:
+    """
+    The ids a bulk UPDATE/DELETE is limited to by an `id == value` or
+    `id IN (...)` condition of its WHERE clause, or None if it may touch any row.
+    """
+    id_column = orm_execute_state.bind_mapper.local_table.c.id
+    where = orm_execute_state.statement.whereclause
+    if isinstance(where, BooleanClauseList) and where.operator is operators.and_:
+        conditions = where.clauses
+    else:
+        conditions = [where]
+    for condition in conditions:
+        if (isinstance(condition, BinaryExpression) and isinstance(condition.right, BindParameter)
+                and condition.left.compare(id_column)):
+            if condition.operator is operators.eq:
+                return {condition.right.value}
+            if condition.operator is operators.in_op:
+                return set(condition.right.value)
+    return None
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _collect_bulk_user_changes(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None or mapper.class_ not in (User, UserProfile):
+        return
+    ids = _bulk_target_ids(orm_execute_state)
+    orm_execute_state.session.info.setdefault(_CHANGED_USERS, set()).update(ids if ids is not None else {None})
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_flushed_user_changes(session, flush_context):
+    changed = {obj.id for obj in itertools.chain(session.new, session.dirty, session.deleted)
+               if isinstance(obj, (User, UserProfile))}
+    if changed:
+        session.info.setdefault(_CHANGED_USERS, set()).update(changed)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_changed_users(session):
+    changed = session.info.pop(_CHANGED_USERS, None)
+    if not changed:
+        return
+    if None in changed:
+        identity_cache.invalidate()
+        return
+    for user_id in changed:
+        identity_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_changed_users(session):
+    session.info.pop(_CHANGED_USERS, None)
@@ -0,0 +1,145 @@
+# /your_project_root/app/utils/background.py
+# Periodic in-app maintenance jobs (purges, compaction) run in daemon threads.
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from flask import Flask
+
+from .metrics import register_metrics_source
+
+try:  # fcntl is POSIX-only; without it every worker runs exclusive jobs.
+    import fcntl
+except ImportError:  # pragma: no cover - exercised only on Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class _Job:
+    def __init__(self, name: str, interval: float, func: Callable[[], Any], exclusive: bool):
+        self.name = name
+        self.interval = interval
+        self.func = func
+        self.exclusive = exclusive
+        self.runs = 0
+        self.skipped = 0
+        self.failures = 0
+        self.last_duration: Optional[float] = None
+        self.last_result: Any = None
+
+
+class BackgroundScheduler:
+    """
+    Runs registered jobs every N seconds inside an application context.
+
+    Jobs are only started once the app serves its first request, so CLI
+    invocations (flask db upgrade, flask blocklist purge, ...) never spawn
+    timers. Exclusive jobs take a non-blocking file lock in the instance
+    folder, so with several gunicorn workers only one of them runs a given
+    job at a time; the others skip that round.
+    """
+
+    def __init__(self, app: Optional[Flask] = None):
+        self._app: Optional[Flask] = None
+        self._jobs: List[_Job] = []
+        self._started = False
+        self._start_lock = threading.Lock()
+        self._stop = threading.Event()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        """Binds the scheduler to the app and starts jobs on the first request."""
+        self._app = app
+        self._jobs = []
+        self._started = False
+        self._stop = threading.Event()
+        app.extensions['background_scheduler'] = self
+        app.before_request(self._ensure_started)
+        register_metrics_source(app, 'background_jobs', self.stats)
+
+    def every(self, interval: float, name: str, func: Callable[[], Any], exclusive: bool = True) -> None:
+        """
+        Registers func to run every interval seconds. A non-positive interval
+        disables the job, so callers can pass a config value straight through.
+        """
+        if not interval or interval <= 0:
+            return
+        self._jobs.append(_Job(name, interval, func, exclusive))
+
+    def stop(self) -> None:
+        """Asks every job thread to exit after its current run."""
+        self._stop.set()
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns per-job run counters."""
+        return {
+            job.name: {
+                'interval': job.interval,
+                'runs': job.runs,
+                'skipped': job.skipped,
+                'failures': job.failures,
+                'last_duration': job.last_duration,
+                'last_result': job.last_result,
+            }
+            for job in self._jobs
+        }
+
+    def _ensure_started(self) -> None:
+        if self._started:
+            return
+        with self._start_lock:
+            if self._started:
+                return
+            self._started = True
+            for job in self._jobs:
+                thread = threading.Thread(target=self._loop, args=(job,), name=f"job-{job.name}", daemon=True)
+                thread.start()
+
+    def _loop(self, job: _Job) -> None:
+        while not self._stop.wait(job.interval):
+            self.run_now(job.name)
+
+    def run_now(self, name: str) -> Any:
+        """Runs the named job immediately in the calling thread."""
+        job = next(j for j in self._jobs if j.name == name)
+        lock_fd = self._acquire(job) if job.exclusive else None
+        if job.exclusive and lock_fd is False:
+            job.skipped += 1
+            return None
+        started = time.perf_counter()
+        try:
+            with self._app.app_context():
+                job.last_result = job.func()
+            job.runs += 1
+            return job.last_result
+        except Exception as e:
+            job.failures += 1
+            logger.exception("Background job %s failed: %s", job.name, e)
+            return None
+        finally:
+            job.last_duration = round(time.perf_counter() - started, 4)
+            if lock_fd:
+                self._release(lock_fd)
+
+    def _acquire(self, job: _Job):
+        if fcntl is None:
+            return None
+        path = os.path.join(self._app.instance_path, f"{job.name}.lock")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        return fd
+
+    @staticmethod
+    def _release(fd: int) -> None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
@@ -0,0 +1,233 @@
+# /your_project_root/app/utils/bloom_filter.py
+# Bloom filter used to answer "this JTI is definitely not revoked" without a query.
+
+import hashlib
+import logging
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from flask import Flask
+
+from .metrics import register_metrics_source
+
+logger = logging.getLogger(__name__)
+
+# Loader signature: rows_since(after_id) -> iterable of (row_id, jti) with row_id > after_id
+RowsLoader = Callable[[int], Iterable[Tuple[int, str]]]
+
+
+class BloomFilter:
+    """
+    Compact probabilistic set: no false negatives, tunable false-positive rate.
+    Uses double hashing over a single blake2b digest to derive the k probes.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(int(capacity), 1)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _probes(self, item: str):
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, item: str) -> None:
+        """Adds item to the set."""
+        for bit in self._probes(item):
+            self._bits[bit >> 3] |= 1 << (bit & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        bits = self._bits
+        for bit in self._probes(item):
+            if not bits[bit >> 3] & (1 << (bit & 7)):
+                return False
+        return True
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self._bits)
+
+
+class BlocklistFilter:
+    """
+    Keeps a BloomFilter over the JTIs in the token blocklist so that the
+    (overwhelmingly common) "not revoked" answer needs no database query.
+
+    - Built from the table on first use in each worker, in a background
+      thread unless BLOCKLIST_BLOOM_BUILD_ASYNC is False.
+    - Updated immediately on local revocations (add()).
+    - Caught up incrementally (rows with a higher id) whenever the shared
+      revocation generation changes, i.e. another worker revoked a token.
+    - Rebuilt from scratch in a background thread every
+      BLOCKLIST_BLOOM_REBUILD_INTERVAL seconds so that it can be resized.
+
+    Until the first build has completed every check answers "maybe", which
+    simply sends the caller to the database.
+    """
+
+    # Re-scan a few ids below the high-water mark on catch-up: on databases
+    # with sequences (e.g. PostgreSQL) ids may become visible out of order.
+    CATCH_UP_OVERLAP = 256
+
+    def __init__(self, app: Optional[Flask] = None):
+        self.enabled = False
+        self.capacity = 1000000
+        self.error_rate = 0.01
+        self.rebuild_interval = 3600
+        self.build_async = True
+        self._app: Optional[Flask] = None
+        self._filter: Optional[BloomFilter] = None
+        self._max_id = 0
+        self._generation: Optional[int] = None
+        self._next_rebuild = 0.0
+        self._rebuilding = False
+        self._lock = threading.Lock()
+        self.checks = 0
+        self.negatives = 0
+        self.rebuilds = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        """Configures the filter from the app config and registers its metrics."""
+        self._app = app
+        self.enabled = app.config.get('BLOCKLIST_BLOOM_ENABLED', True)
+        self.capacity = app.config.get('BLOCKLIST_BLOOM_CAPACITY', 1000000)
+        self.error_rate = app.config.get('BLOCKLIST_BLOOM_ERROR_RATE', 0.01)
+        self.rebuild_interval = app.config.get('BLOCKLIST_BLOOM_REBUILD_INTERVAL', 3600)
+        self.build_async = app.config.get('BLOCKLIST_BLOOM_BUILD_ASYNC', True)
+        self.reset()
+        app.extensions['blocklist_filter'] = self
+        register_metrics_source(app, 'blocklist_filter', self.stats)
+
+    def reset(self) -> None:
+        """Discards the filter; the next check rebuilds it from the table."""
+        with self._lock:
+            self._filter = None
+            self._max_id = 0
+            self._generation = None
+            self.checks = self.negatives = self.rebuilds = 0
+
+    def might_contain(self, jti: str, generation: int, rows_since: RowsLoader) -> bool:
+        """
+        Returns False only if jti is definitely not in the blocklist.
+
+        Args:
+            jti: The token identifier to test
+            generation: Current shared revocation generation
+            rows_since: Loader for blocklist rows with an id above a given id
+        """
+        if not self.enabled:
+            return True
+        self.checks += 1
+
+        if self._filter is None:
+            if self.build_async:
+                self._schedule_rebuild(rows_since)
+                return True
+            self._build(rows_since)
+            self._generation = generation
+        elif generation != self._generation:
+            self._catch_up(rows_since)
+            self._generation = generation
+
+        if self.rebuild_interval and time.monotonic() >= self._next_rebuild:
+            self._schedule_rebuild(rows_since)
+
+        current = self._filter
+        if current is None or jti in current:
+            return True
+        self.negatives += 1
+        return False
+
+    def add(self, jti: str) -> None:
+        """Adds a freshly revoked JTI (already committed to the table)."""
+        current = self._filter
+        if current is not None:
+            current.add(jti)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns sizing information and how many checks skipped the database."""
+        current = self._filter
+        return {
+            'enabled': self.enabled,
+            'ready': current is not None,
+            'entries': current.count if current else 0,
+            'size_bytes': current.size_bytes if current else 0,
+            'checks': self.checks,
+            'negatives': self.negatives,
+            'rebuilds': self.rebuilds,
+        }
+
+    def _load(self, rows_since: RowsLoader, after_id: int, target: BloomFilter) -> int:
+        max_id = after_id
+        for row_id, jti in rows_since(after_id):
+            target.add(jti)
+            if row_id > max_id:
+                max_id = row_id
+        return max_id
+
+    def _load_full(self, rows_since: RowsLoader) -> Tuple[BloomFilter, int]:
+        new_filter = BloomFilter(self.capacity, self.error_rate)
+        max_id = self._load(rows_since, 0, new_filter)
+        if new_filter.count > new_filter.capacity:
+            # Undersized: a second pass into a filter with headroom keeps the
+            # false-positive rate at the configured level.
+            new_filter = BloomFilter(new_filter.count * 2, self.error_rate)
+            max_id = self._load(rows_since, 0, new_filter)
+        return new_filter, max_id
+
+    def _build(self, rows_since: RowsLoader) -> None:
+        with self._lock:
+            if self._filter is not None:
+                return
+            try:
+                new_filter, max_id = self._load_full(rows_since)
+            except Exception as e:
+                logger.warning("Could not build blocklist bloom filter: %s", e)
+                return
+            self._filter, self._max_id = new_filter, max_id
+            self._next_rebuild = time.monotonic() + (self.rebuild_interval or 0)
+            self.rebuilds += 1
+
+    def _catch_up(self, rows_since: RowsLoader) -> None:
+        with self._lock:
+            current = self._filter
+            if current is None:
+                return
+            after_id = max(0, self._max_id - self.CATCH_UP_OVERLAP)
+            self._max_id = max(self._max_id, self._load(rows_since, after_id, current))
+
+    def _schedule_rebuild(self, rows_since: RowsLoader) -> None:
+        with self._lock:
+            if self._rebuilding or self._app is None:
+                return
+            self._rebuilding = True
+            self._next_rebuild = time.monotonic() + (self.rebuild_interval or 0)
+        app = self._app
+        thread = threading.Thread(target=self._rebuild_in_background, args=(app, rows_since), daemon=True)
+        thread.start()
+
+    def _rebuild_in_background(self, app: Flask, rows_since: RowsLoader) -> None:
+        try:
+            with app.app_context():
+                new_filter, max_id = self._load_full(rows_since)
+            with self._lock:
+                self._filter, self._max_id = new_filter, max_id
+                # Force a catch-up for rows committed while we were loading.
+                self._generation = None
+                self.rebuilds += 1
+        except Exception as e:
+            logger.warning("Background rebuild of blocklist bloom filter failed: %s", e)
+        finally:
+            self._rebuilding = False
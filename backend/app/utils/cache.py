@@ -0,0 +1,184 @@
+# /your_project_root/app/utils/cache.py
+# Small in-process caching primitives shared by the auth and API layers.
+
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+try:  # fcntl is POSIX-only; on Windows the generation bump is best-effort.
+    import fcntl
+except ImportError:  # pragma: no cover - exercised only on Windows
+    fcntl = None
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Bounded, thread-safe LRU cache whose entries expire after a per-entry TTL.
+
+    Each gunicorn worker holds its own instance, so the cache never needs a
+    network hop. Hit/miss/eviction counters are kept for the metrics endpoint.
+    """
+
+    def __init__(self, max_size: int = 10000, default_ttl: float = 60.0):
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self._data: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Returns the cached value for key, or default if absent or expired."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            value, expires_at = entry
+            if expires_at <= now:
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Stores value under key for ttl seconds (default_ttl if not given)."""
+        ttl = self.default_ttl if ttl is None else ttl
+        if ttl <= 0 or self.max_size <= 0:
+            return
+        expires_at = time.monotonic() + ttl
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        """Removes key from the cache if present."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Drops every entry (counters are preserved)."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the counters and current size of the cache."""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._data),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else None,
+        }
+
+
+class SharedGeneration:
+    """
+    A 64-bit counter in a memory-mapped file shared by every worker process,
+    followed by a ring log of the keys changed by the last LOG_SIZE bumps.
+
+    Reading the counter is a plain memory read, so it is cheap enough to do on
+    every request. A worker that changes shared state (e.g. revokes a token)
+    calls bump(key); other workers notice the new value on their next read
+    and, through changes(), drop just the keys that changed instead of
+    everything they cached locally.
+    """
+
+    _FORMAT = '<Q'
+    _SIZE = struct.calcsize(_FORMAT)
+    # Each log slot: the generation it belongs to, the key length, then the key (UTF-8).
+    _SLOT_HEADER = '<QH'
+    _SLOT_HEADER_SIZE = struct.calcsize(_SLOT_HEADER)
+    _SLOT_SIZE = 64
+    _MAX_KEY = _SLOT_SIZE - _SLOT_HEADER_SIZE
+    _NO_KEY = 0xFFFF # Key length of a bump that did not name a key
+    LOG_SIZE = 256
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        length = self._SIZE + self.LOG_SIZE * self._SLOT_SIZE
+        if os.fstat(self._fd).st_size < length:
+            os.ftruncate(self._fd, length)
+        self._map = mmap.mmap(self._fd, length)
+        self._lock = threading.Lock()
+
+    def read(self) -> int:
+        """Returns the current generation."""
+        return struct.unpack_from(self._FORMAT, self._map, 0)[0]
+
+    def bump(self, key: Optional[str] = None) -> int:
+        """
+        Atomically increments the generation and returns the new value.
+        key names what changed; without one (or if it is too long for a log
+        slot) readers have to assume everything changed.
+        """
+        encoded = key.encode('utf-8') if key is not None else b''
+        if len(encoded) > self._MAX_KEY:
+            key, encoded = None, b''
+        with self._lock:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                value = self.read() + 1
+                # The slot is written before the counter, so a reader never sees a generation without its key.
+                offset = self._slot(value)
+                length = len(encoded) if key is not None else self._NO_KEY
+                struct.pack_into(self._SLOT_HEADER, self._map, offset, value, length)
+                start = offset + self._SLOT_HEADER_SIZE
+                self._map[start:start + len(encoded)] = encoded
+                struct.pack_into(self._FORMAT, self._map, 0, value)
+                return value
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def changes(self, seen: int, current: int) -> Optional[List[str]]:
+        """
+        Returns the keys changed by generations seen+1 .. current, or None if
+        they are unknown (a bump without a key, or more than LOG_SIZE bumps
+        ago, so the slot was reused): the caller then drops everything.
+        """
+        if current - seen > self.LOG_SIZE or current < seen:
+            return None
+        keys = []
+        for generation in range(seen + 1, current + 1):
+            offset = self._slot(generation)
+            stored, length = struct.unpack_from(self._SLOT_HEADER, self._map, offset)
+            if stored != generation or length == self._NO_KEY:
+                return None
+            start = offset + self._SLOT_HEADER_SIZE
+            try:
+                keys.append(bytes(self._map[start:start + length]).decode('utf-8'))
+            except UnicodeDecodeError: # Torn read of a slot being reused
+                return None
+        return keys
+
+    def _slot(self, generation: int) -> int:
+        return self._SIZE + (generation % self.LOG_SIZE) * self._SLOT_SIZE
+
+    def close(self) -> None:
+        """Releases the mapping and file descriptor."""
+        self._map.close()
+        os.close(self._fd)
@@ -0,0 +1,139 @@
+# /your_project_root/app/utils/db_maintenance.py
+# Batched housekeeping deletes that keep write locks short on SQLite.
+
+import datetime
+import time
+from typing import Any
+
+from sqlalchemy import delete, func, select, update
+
+from ..extensions import db
+
+
+def delete_in_batches(model: Any, *criteria: Any, batch_size: int = 1000, pause: float = 0.0) -> int:
+    """
+    Deletes rows of model matching criteria, batch_size rows per transaction.
+
+    Each batch is committed on its own, so SQLite's database-wide write lock
+    is only held for one small DELETE at a time and requests can interleave.
+
+    Args:
+        model: Mapped class with an integer 'id' primary key
+        criteria: SQLAlchemy filter expressions selecting the rows to delete
+        batch_size: Maximum number of rows deleted per transaction
+        pause: Seconds to sleep between batches to let other writers in
+
+    Returns:
+        Total number of rows deleted
+    """
+    total = 0
+    while True:
+        batch_ids = select(model.id).where(*criteria).limit(batch_size)
+        result = db.session.execute(
+            delete(model).where(model.id.in_(batch_ids)).execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        deleted = result.rowcount or 0
+        total += deleted
+        if deleted < batch_size:
+            return total
+        if pause:
+            time.sleep(pause)
+
+
+def purge_expired_tokens(batch_size: int = 1000, pause: float = 0.0) -> int:
+    """
+    Removes blocklist rows whose token has expired (the JWT itself would be
+    rejected anyway, so the row is dead weight in the table and its index).
+
+    Returns:
+        Number of rows deleted
+    """
+    from ..models.token_blocklist import TokenBlocklist
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return delete_in_batches(
+        TokenBlocklist,
+        TokenBlocklist.expires_at.is_not(None),
+        TokenBlocklist.expires_at <= now,
+        batch_size=batch_size,
+        pause=pause,
+    )
+
+
+def compact_todo_tombstones(retention_days: int, batch_size: int = 1000, pause: float = 0.0) -> int:
+    """
+    Removes to-do tombstones older than retention_days.
+
+    Each affected user's compacted_through first moves up to the newest
+    version being removed, so sync tokens from before it get 410 (full
+    resync) instead of a delta that silently misses deletions.
+
+    Returns:
+        Number of tombstones deleted
+    """
+    from ..models.todo_sync_state import TodoSyncState
+    from ..models.todo_tombstone import TodoTombstone
+
+    cutoff = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=retention_days)
+    expired_version = select(func.max(TodoTombstone.sync_version)).where(
+        TodoTombstone.user_id == TodoSyncState.user_id, TodoTombstone.deleted_at < cutoff
+    ).scalar_subquery()
+    db.session.execute(
+        update(TodoSyncState)
+        .where(TodoSyncState.user_id.in_(select(TodoTombstone.user_id).where(TodoTombstone.deleted_at < cutoff)))
+        .values(compacted_through=expired_version)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return delete_in_batches(TodoTombstone, TodoTombstone.deleted_at < cutoff, batch_size=batch_size, pause=pause)
+
+
+def purge_todo_trash(retention_days: int, batch_size: int = 1000, pause: float = 0.0) -> int:
+    """
+    Permanently deletes to-do items that have been in the trash for more
+    than retention_days, batch_size rows per transaction (the rows are found
+    through the partial index on trashed rows). Their tombstones were
+    written when they were trashed, so sync clients need nothing more.
+
+    Returns:
+        Number of items deleted
+    """
+    from ..models.todo_item import TodoItem
+
+    cutoff = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=retention_days)
+    return delete_in_batches(
+        TodoItem,
+        TodoItem.deleted_at.is_not(None),
+        TodoItem.deleted_at < cutoff,
+        batch_size=batch_size,
+        pause=pause,
+    )
+
+
+def rebalance_long_todo_positions(max_length: int, pause: float = 0.0) -> int:
+    """
+    Renumbers the manual order of every user with a to-do position longer
+    than max_length characters. Repeated moves into the same gap lengthen
+    keys by about one character per move; renumbering keeps the order and
+    makes every key short again. Each user is one transaction with its own
+    sync version, so clients pick up the new positions on their next sync.
+
+    Returns:
+        Number of users rebalanced
+    """
+    from ..models.todo_item import TodoItem
+    from .todo_order import rebalance_todo_positions
+    from .todo_sync import next_sync_version
+
+    user_ids = db.session.scalars(
+        select(TodoItem.user_id)
+        .where(func.length(TodoItem.position) > max_length, TodoItem.deleted_at.is_(None)).distinct()
+    ).all()
+    db.session.commit()
+    for n, user_id in enumerate(user_ids):
+        if n and pause:
+            time.sleep(pause)
+        rebalance_todo_positions(user_id, next_sync_version(user_id))
+        db.session.commit()
+    return len(user_ids)
@@ -0,0 +1,119 @@
+# /your_project_root/app/utils/identity_cache.py
+# Short-TTL cache of the user behind a JWT identity, shared by requests of one worker.
+
+import os
+from typing import Any, Callable, Dict, Optional
+
+from flask import Flask
+
+from .cache import TTLCache, SharedGeneration
+from .metrics import register_metrics_source
+
+
+class IdentityCache:
+    """
+    Caches the current-user snapshot for each JWT identity ('sub') so that
+    the JWT user_lookup_loader does not SELECT the user on every request.
+
+    Entries live for IDENTITY_CACHE_TTL seconds. Committed changes to a
+    user or profile row (update, delete, or a bulk UPDATE/DELETE) call
+    invalidate() automatically (see app.models.user); the shared generation
+    log then makes every gunicorn worker drop that user's snapshot, as
+    RevocationCache does, so a deleted user or a reused id is never served.
+    """
+
+    def __init__(self, app: Optional[Flask] = None):
+        self.enabled = False
+        self.db_lookups = 0
+        self._cache = TTLCache()
+        self._generation: Optional[SharedGeneration] = None
+        self._seen_generation = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        """Configures the cache from the app config and registers its metrics."""
+        self.enabled = app.config.get('IDENTITY_CACHE_ENABLED', True)
+        self._cache = TTLCache(
+            max_size=app.config.get('IDENTITY_CACHE_MAX_SIZE', 10000),
+            default_ttl=app.config.get('IDENTITY_CACHE_TTL', 30),
+        )
+        self.db_lookups = 0
+
+        sync_file = app.config.get('IDENTITY_SYNC_FILE') or \
+            os.path.join(app.instance_path, 'identity.gen')
+        if self._generation is not None:
+            self._generation.close()
+        self._generation = SharedGeneration(sync_file)
+        self._seen_generation = self._generation.read()
+
+        app.extensions['identity_cache'] = self
+        register_metrics_source(app, 'identity_cache', self.stats)
+
+    def load(self, identity: str, loader: Callable[[str], Any]) -> Any:
+        """
+        Returns the cached value for identity, calling loader on a miss.
+        A None result (unknown user) is not cached.
+        """
+        if not self.enabled:
+            return loader(identity)
+
+        self.sync()
+        cached = self._cache.get(identity)
+        if cached is not None:
+            return cached
+
+        value = loader(identity)
+        self.db_lookups += 1
+        if value is not None:
+            self._cache.set(identity, value)
+        return value
+
+    def invalidate(self, user_id: Any = None) -> None:
+        """
+        Drops the cached snapshot of a user that was just changed (after the
+        commit), or every snapshot if user_id is None, and tells the other
+        workers to do the same.
+        """
+        if user_id is None:
+            self._cache.clear()
+        else:
+            self._cache.delete(str(user_id))
+        if self._generation is not None:
+            self._generation.bump(None if user_id is None else str(user_id))
+            self.sync()
+
+    def sync(self) -> bool:
+        """
+        Drops the local snapshots of the users that a worker (this one
+        included) has invalidated since the last sync: only those users, or
+        everything if they are no longer known.
+
+        Returns:
+            True if anything changed
+        """
+        if self._generation is None:
+            return False
+        current = self._generation.read()
+        if current == self._seen_generation:
+            return False
+        user_ids = self._generation.changes(self._seen_generation, current)
+        if user_ids is None:
+            self._cache.clear()
+        else:
+            for user_id in user_ids:
+                self._cache.delete(user_id)
+        self._seen_generation = current
+        return True
+
+    def clear(self) -> None:
+        """Drops every cached snapshot in this worker."""
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the hit/miss counters and the number of database lookups."""
+        stats = self._cache.stats()
+        stats['enabled'] = self.enabled
+        stats['db_lookups'] = self.db_lookups
+        stats['generation'] = self._seen_generation
+        return stats
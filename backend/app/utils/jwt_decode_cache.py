@@ -0,0 +1,88 @@
+# /your_project_root/app/utils/jwt_decode_cache.py
+# JWTManager that remembers already-verified claims of recently seen tokens.
+
+import hashlib
+import time
+from typing import Any, Dict, Optional
+
+from flask import Flask
+from flask_jwt_extended import JWTManager
+
+from .cache import TTLCache
+from .metrics import register_metrics_source
+
+
+class CachingJWTManager(JWTManager):
+    """
+    JWTManager whose token decoding skips signature verification and claim
+    parsing for tokens it has already verified.
+
+    A SPA sends the same access token on every request for up to an hour,
+    so the HS256 check and JSON parsing are redone for identical input. With
+    JWT_DECODE_CACHE_ENABLED the verified claims are kept in a bounded LRU
+    keyed by the SHA-256 digest of the full encoded token (header, claims
+    and signature), so a token that differs in any byte still goes through
+    the full decode. Entries expire at the token's 'exp' claim.
+
+    Only decoding is cached. The blocklist and epoch checks, and the user
+    lookup, still run on every request, so a revoked token is rejected
+    even if its claims are cached. forget() also evicts a revoked token's
+    entry in this worker so it does not take up space.
+    """
+
+    def __init__(self, app: Optional[Flask] = None, add_context_processor: bool = False):
+        self.decode_cache_enabled = False
+        self._decoded = TTLCache()
+        self._digests_by_jti = TTLCache()
+        self.full_decodes = 0
+        super().__init__(app, add_context_processor)
+
+    def init_app(self, app: Flask, add_context_processor: bool = False) -> None:
+        """Registers the JWT callbacks and configures the decode cache."""
+        super().init_app(app, add_context_processor)
+        self.decode_cache_enabled = app.config.get('JWT_DECODE_CACHE_ENABLED', False)
+        max_size = app.config.get('JWT_DECODE_CACHE_MAX_SIZE', 10000)
+        self._decoded = TTLCache(max_size=max_size)
+        self._digests_by_jti = TTLCache(max_size=max_size)
+        self.full_decodes = 0
+        register_metrics_source(app, 'jwt_decode_cache', self.decode_cache_stats)
+
+    def _decode_jwt_from_config(self, encoded_token: str, csrf_value=None, allow_expired: bool = False) -> dict:
+        # CSRF double-submit checks and expired-token decoding always take the full path.
+        if not self.decode_cache_enabled or csrf_value is not None or allow_expired:
+            self.full_decodes += 1
+            return super()._decode_jwt_from_config(encoded_token, csrf_value, allow_expired)
+
+        digest = hashlib.sha256(encoded_token.encode('utf-8')).digest()
+        claims = self._decoded.get(digest)
+        if claims is not None:
+            return dict(claims)
+
+        self.full_decodes += 1
+        claims = super()._decode_jwt_from_config(encoded_token, csrf_value, allow_expired)
+        exp = claims.get('exp')
+        if exp is not None:
+            ttl = exp - time.time()
+            self._decoded.set(digest, claims, ttl)
+            if claims.get('jti'):
+                self._digests_by_jti.set(claims['jti'], digest, ttl)
+        return dict(claims)
+
+    def forget(self, jti: str) -> None:
+        """Evicts the cached claims of a token that has just been revoked."""
+        digest = self._digests_by_jti.get(jti)
+        if digest is not None:
+            self._decoded.delete(digest)
+            self._digests_by_jti.delete(jti)
+
+    def clear_decode_cache(self) -> None:
+        """Drops every cached token in this worker."""
+        self._decoded.clear()
+        self._digests_by_jti.clear()
+
+    def decode_cache_stats(self) -> Dict[str, Any]:
+        """Returns the hit/miss counters and the number of full decodes."""
+        stats = self._decoded.stats()
+        stats['enabled'] = self.decode_cache_enabled
+        stats['full_decodes'] = self.full_decodes
+        return stats
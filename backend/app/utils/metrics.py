@@ -0,0 +1,40 @@
+# /your_project_root/app/utils/metrics.py
+# Lightweight registry of in-process metrics sources.
+#
+# Components (caches, worker pools, ...) register a zero-argument callable that
+# returns a dict of counters. The metrics blueprint collects them on demand.
+# Values are per worker process; aggregate them in your scraper if needed.
+
+import os
+from typing import Any, Callable, Dict
+
+from flask import Flask, current_app
+
+_EXTENSION_KEY = 'metrics_sources'
+
+
+def register_metrics_source(app: Flask, name: str, provider: Callable[[], Dict[str, Any]]) -> None:
+    """
+    Registers a metrics provider under the given name for this app.
+
+    Args:
+        app: The Flask application instance
+        name: Key under which the provider's counters are published
+        provider: Callable returning a dictionary of counters
+    """
+    app.extensions.setdefault(_EXTENSION_KEY, {})[name] = provider
+
+
+def collect_metrics(app: Flask = None) -> Dict[str, Any]:
+    """
+    Collects the counters of every registered provider.
+
+    Returns:
+        Dictionary mapping provider names to their counters, plus the worker pid
+    """
+    app = app or current_app._get_current_object()
+    sources = app.extensions.get(_EXTENSION_KEY, {})
+    metrics: Dict[str, Any] = {'pid': os.getpid()}
+    for name, provider in sources.items():
+        metrics[name] = provider()
+    return metrics
@@ -0,0 +1,173 @@
+# /your_project_root/app/utils/order_keys.py
+# Fractional order keys: strings that sort between any two neighbours, so a move rewrites one row.
+
+from typing import List, Optional
+
+# Base-62 digits in ASCII order, so keys compare correctly as plain strings
+# (byte-wise, i.e. SQLite's default BINARY collation).
+DIGITS = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'
+_ZERO = DIGITS[0]
+# The smallest integer part; keys below it can only grow their fraction.
+_SMALLEST_INTEGER = 'A' + _ZERO * 26
+
+FIRST_KEY = 'a' + _ZERO
+
+
+class InvalidOrderKey(ValueError):
+    """Raised for a malformed key, or for neighbours that are not in ascending order."""
+
+
+# A key is an integer part followed by an optional fraction. The integer part
+# is a head letter giving its length ('a'..'z': 1..26 digits, 'A'..'Z': 26..1
+# digits for the negative side) and that many base-62 digits. Appending or
+# prepending only increments/decrements the integer part, so keys at the ends
+# of a list grow logarithmically; moves between two neighbours extend the
+# fraction by about one digit per halving of the gap.
+
+
+def _integer_length(head: str) -> int:
+    if 'a' <= head <= 'z':
+        return ord(head) - ord('a') + 2
+    if 'A' <= head <= 'Z':
+        return ord('Z') - ord(head) + 2
+    raise InvalidOrderKey(f"Invalid order key head: {head!r}")
+
+
+def _split(key: str):
+    if not key:
+        raise InvalidOrderKey("Order key is empty")
+    length = _integer_length(key[0])
+    integer, fraction = key[:length], key[length:]
+    if len(integer) < length or any(d not in DIGITS for d in key[1:]):
+        raise InvalidOrderKey(f"Invalid order key: {key!r}")
+    if key == _SMALLEST_INTEGER or fraction.endswith(_ZERO):
+        raise InvalidOrderKey(f"Invalid order key: {key!r}")
+    return integer, fraction
+
+
+def _midpoint(a: str, b: Optional[str]) -> str:
+    """Fraction digits strictly between fractions a and b (b None means 1)."""
+    if b is not None:
+        # Carry over the common prefix (a padded with zeros).
+        n = 0
+        while n < len(b) and (a[n] if n < len(a) else _ZERO) == b[n]:
+            n += 1
+        if n:
+            return b[:n] + _midpoint(a[n:], b[n:])
+    digit_a = DIGITS.index(a[0]) if a else 0
+    digit_b = DIGITS.index(b[0]) if b is not None else len(DIGITS)
+    if digit_b - digit_a > 1:
+        return DIGITS[(digit_a + digit_b) // 2]
+    # Adjacent digits: b's first digit alone is in between if b goes on,
+    # otherwise keep a's digit and look for room in the next position.
+    if b is not None and len(b) > 1:
+        return b[0]
+    return DIGITS[digit_a] + _midpoint(a[1:], None)
+
+
+def _increment_integer(integer: str) -> Optional[str]:
+    head, digits = integer[0], list(integer[1:])
+    for i in reversed(range(len(digits))):
+        d = DIGITS.index(digits[i]) + 1
+        if d < len(DIGITS):
+            digits[i] = DIGITS[d]
+            return head + ''.join(digits)
+        digits[i] = _ZERO
+    # Carried out of every digit: move to the next (longer or shorter) length.
+    if head == 'Z':
+        return 'a' + _ZERO
+    if head == 'z':
+        return None
+    head = chr(ord(head) + 1)
+    if head > 'a':
+        digits.append(_ZERO)
+    else:
+        digits.pop()
+    return head + ''.join(digits)
+
+
+def _decrement_integer(integer: str) -> Optional[str]:
+    head, digits = integer[0], list(integer[1:])
+    for i in reversed(range(len(digits))):
+        d = DIGITS.index(digits[i]) - 1
+        if d >= 0:
+            digits[i] = DIGITS[d]
+            return head + ''.join(digits)
+        digits[i] = DIGITS[-1]
+    if head == 'a':
+        return 'Z' + DIGITS[-1]
+    if head == 'A':
+        return None
+    head = chr(ord(head) - 1)
+    if head < 'Z':
+        digits.append(DIGITS[-1])
+    else:
+        digits.pop()
+    return head + ''.join(digits)
+
+
+def key_between(a: Optional[str], b: Optional[str]) -> str:
+    """
+    Returns a key that sorts strictly between a and b.
+
+    Args:
+        a: Key of the item before the slot, or None for the start of the list
+        b: Key of the item after the slot, or None for the end of the list
+
+    Raises:
+        InvalidOrderKey: if a key is malformed or a >= b
+    """
+    if a is not None:
+        integer_a, fraction_a = _split(a)
+    if b is not None:
+        integer_b, fraction_b = _split(b)
+    if a is not None and b is not None and a >= b:
+        raise InvalidOrderKey(f"{a!r} does not sort before {b!r}")
+
+    if a is None and b is None:
+        return FIRST_KEY
+    if a is None:
+        if integer_b == _SMALLEST_INTEGER:
+            return integer_b + _midpoint('', fraction_b)
+        if integer_b < b:
+            return integer_b
+        integer = _decrement_integer(integer_b)
+        if integer is None:
+            raise InvalidOrderKey("Cannot create a key before the smallest key")
+        return integer
+    if b is None:
+        integer = _increment_integer(integer_a)
+        return integer_a + _midpoint(fraction_a, None) if integer is None else integer
+    if integer_a == integer_b:
+        return integer_a + _midpoint(fraction_a, fraction_b)
+    integer = _increment_integer(integer_a)
+    if integer is not None and integer < b:
+        return integer
+    return integer_a + _midpoint(fraction_a, None)
+
+
+def keys_between(a: Optional[str], b: Optional[str], count: int) -> List[str]:
+    """
+    Returns count ascending keys between a and b.
+
+    With b None the keys are consecutive integers after a (short keys, used
+    to renumber a whole list); otherwise the gap is bisected recursively, so
+    the keys stay as short as the gap allows.
+    """
+    if count <= 0:
+        return []
+    if b is None:
+        keys = []
+        for _ in range(count):
+            a = key_between(a, None)
+            keys.append(a)
+        return keys
+    if a is None:
+        keys = []
+        for _ in range(count):
+            b = key_between(None, b)
+            keys.append(b)
+        return keys[::-1]
+    middle = count // 2
+    key = key_between(a, b)
+    return keys_between(a, key, middle) + [key] + keys_between(key, b, count - middle - 1)
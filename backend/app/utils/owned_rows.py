@@ -0,0 +1,51 @@
+# /your_project_root/app/utils/owned_rows.py
+# Single-statement UPDATE/DELETE of rows that belong to a user (id + user_id).
+
+from typing import Any, Dict, Optional
+
+from sqlalchemy import delete, select, update
+
+from ..extensions import db
+
+
+def update_owned(model: Any, row_id: int, user_id: int, values: Dict[str, Any], *criteria: Any) -> Optional[Any]:
+    """
+    Runs UPDATE model SET values WHERE id = :row_id AND user_id = :user_id
+    RETURNING *, so loading, the ownership check and the write are one
+    round trip. Extra criteria narrow the match further (e.g. live rows only).
+
+    Returns:
+        The updated instance, populated from RETURNING (call to_dict() before
+        committing, or the commit expires it and to_dict() reloads it), or None
+        if no row matched; then use ownership_status to tell 404 from 403.
+    """
+    return db.session.scalars(
+        update(model).where(model.id == row_id, model.user_id == user_id, *criteria).values(**values).returning(model)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    ).one_or_none()
+
+
+def delete_owned(model: Any, row_id: int, user_id: int) -> bool:
+    """
+    Runs DELETE FROM model WHERE id = :row_id AND user_id = :user_id.
+
+    Returns:
+        True if a row was deleted; False otherwise (see ownership_status)
+    """
+    result = db.session.execute(
+        delete(model).where(model.id == row_id, model.user_id == user_id)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+def ownership_status(model: Any, row_id: int, user_id: int) -> int:
+    """
+    Tells why a row is not writable by user_id: 404 if it does not exist,
+    403 if it belongs to someone else, 200 if it is actually the user's.
+    Only needed off the fast path, after update_owned/delete_owned missed.
+    """
+    owner_id = db.session.scalar(select(model.user_id).where(model.id == row_id))
+    if owner_id is None:
+        return 404
+    return 200 if owner_id == user_id else 403
@@ -0,0 +1,104 @@
+# /your_project_root/app/utils/pagination.py
+# Keyset (cursor) pagination helpers for list endpoints.
+
+import base64
+import datetime
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from flask import request
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class InvalidPageRequest(ValueError):
+    """Raised for a malformed 'limit' or 'cursor' query parameter (HTTP 400)."""
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Encodes the sort-key values of the last row of a page as an opaque,
+    URL-safe cursor. Datetimes and dates are tagged so they round-trip exactly.
+    """
+    encoded = [_encode_value(v) for v in values]
+    raw = json.dumps(encoded, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode('ascii')
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """
+    Decodes a cursor produced by encode_cursor.
+
+    Raises:
+        InvalidPageRequest: if the cursor is malformed or has the wrong number of values
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != size:
+            raise ValueError("wrong cursor size")
+        return [_decode_value(v) for v in values]
+    except (ValueError, TypeError, KeyError):
+        raise InvalidPageRequest("Invalid cursor")
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime.datetime):
+        return {'dt': value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {'d': value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if not isinstance(value, dict):
+        return value
+    if 'dt' in value:
+        return datetime.datetime.fromisoformat(value['dt'])
+    return datetime.date.fromisoformat(value['d'])
+
+
+def page_params() -> Optional[Tuple[int, Optional[str]]]:
+    """
+    Reads ?limit= and ?cursor= from the request.
+
+    Returns:
+        (limit, cursor) if the client asked for a page, or None if neither
+        parameter was given (the endpoint then returns the full list)
+
+    Raises:
+        InvalidPageRequest: if limit is not an integer between 1 and MAX_PAGE_SIZE
+    """
+    limit = request.args.get('limit')
+    cursor = request.args.get('cursor') or None
+    if limit is None and cursor is None:
+        return None
+    if limit is None:
+        return DEFAULT_PAGE_SIZE, cursor
+    try:
+        limit = int(limit)
+    except ValueError:
+        raise InvalidPageRequest("limit must be an integer")
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise InvalidPageRequest(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    return limit, cursor
+
+
+def page_meta(rows: List[Any], limit: int, key: Any) -> Tuple[List[Any], Dict[str, Any]]:
+    """
+    Trims a result fetched with limit + 1 rows to one page and builds the
+    pagination meta for api_success.
+
+    Args:
+        rows: Query results (up to limit + 1 of them)
+        limit: Page size requested by the client
+        key: Callable returning the sort-key values of a row, in order
+
+    Returns:
+        (page rows, meta dict with 'limit', 'has_more' and 'next_cursor')
+    """
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = encode_cursor(key(rows[-1])) if has_more and rows else None
+    return rows, {'limit': limit, 'has_more': has_more, 'next_cursor': next_cursor}
@@ -0,0 +1,187 @@
+# /your_project_root/app/utils/password_hashing.py
+# Bounded worker pool for bcrypt hashing and verification.
+
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Optional
+
+from flask import Flask
+
+from .metrics import register_metrics_source
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordHashingBusy(Exception):
+    """Raised when the hashing queue is full; the request should be retried later (HTTP 429)."""
+
+    def __init__(self, retry_after: int = 1):
+        super().__init__("Password hashing queue is full")
+        self.retry_after = retry_after
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt work on a small thread pool instead of inline in the request.
+
+    bcrypt releases the GIL, so with threaded gunicorn workers the request
+    thread simply waits on the future while other threads keep serving
+    cheap requests. At most PASSWORD_HASH_WORKERS hashes run concurrently
+    per process and at most PASSWORD_HASH_QUEUE_SIZE more may wait; beyond
+    that PasswordHashingBusy is raised so the caller can shed load with 429
+    instead of piling up stalled workers. Workers plus queue must be fewer
+    than the request threads of the process (REQUEST_THREADS), otherwise the
+    threads run out before the queue is ever full.
+
+    Before init_app() is called (scripts, shell sessions) work runs inline.
+    """
+
+    def __init__(self, bcrypt: Any, app: Optional[Flask] = None):
+        self._bcrypt = bcrypt
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots: Optional[threading.BoundedSemaphore] = None
+        self._lock = threading.Lock()
+        self.timeout = 30.0
+        self.retry_after = 1
+        self.log_rounds = 12
+        self._reset_counters()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        """Creates the worker pool from the app config and registers its metrics."""
+        workers = app.config.get('PASSWORD_HASH_WORKERS', 2)
+        queue_size = app.config.get('PASSWORD_HASH_QUEUE_SIZE', 8)
+        self.timeout = app.config.get('PASSWORD_HASH_TIMEOUT', 30.0)
+        self.retry_after = app.config.get('PASSWORD_HASH_RETRY_AFTER', 1)
+        self.log_rounds = app.config.get('BCRYPT_LOG_ROUNDS', 12)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        threads = app.config.get('REQUEST_THREADS')
+        if threads and workers + queue_size >= threads:
+            logger.warning("PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE_SIZE (%d) is not below REQUEST_THREADS (%d); "
+                           "the hashing queue can never fill, so bursts block every request thread",
+                           workers + queue_size, threads)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='bcrypt')
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self.workers = workers
+        self.queue_size = queue_size
+        self._reset_counters()
+        app.extensions['password_hasher'] = self
+        register_metrics_source(app, 'password_hasher', self.stats)
+
+    def hash(self, password: str) -> str:
+        """Returns the bcrypt hash of password."""
+        return self.run(lambda: self._bcrypt.generate_password_hash(password).decode('utf-8'))
+
+    def verify(self, password_hash: str, password: str) -> bool:
+        """Checks password against a stored bcrypt hash."""
+        return self.run(lambda: self._bcrypt.check_password_hash(password_hash, password))
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        """True if password_hash was made with a cost other than BCRYPT_LOG_ROUNDS."""
+        # Modular crypt format: $2b$<cost>$<salt+digest>
+        parts = (password_hash or '').split('$')
+        if len(parts) < 4 or not parts[2].isdigit():
+            return False
+        return int(parts[2]) != self.log_rounds
+
+    def hash_later(self, password: str, callback: Callable[[str], Any]) -> Optional[Future]:
+        """
+        Hashes password on the pool without waiting for it and passes the new
+        hash to callback on the worker thread.
+
+        Meant for optional work such as rehashing on login: when the pool is
+        full the work is dropped and None is returned instead of raising.
+        """
+        def job():
+            return callback(self._bcrypt.generate_password_hash(password).decode('utf-8'))
+
+        if self._executor is None:
+            job()
+            return None
+        if not self._slots.acquire(blocking=False):
+            return None
+        with self._lock:
+            self.submitted += 1
+            self.deferred += 1
+        try:
+            future = self._executor.submit(self._timed, job, time.perf_counter())
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(self._finish_deferred)
+        return future
+
+    def run(self, func: Callable[[], Any]) -> Any:
+        """
+        Runs func on the pool and waits for its result.
+
+        Raises:
+            PasswordHashingBusy: if the pool and its queue are already full
+        """
+        if self._executor is None:
+            return func()
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise PasswordHashingBusy(self.retry_after)
+
+        enqueued = time.perf_counter()
+        with self._lock:
+            self.submitted += 1
+        try:
+            future = self._executor.submit(self._timed, func, enqueued)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise PasswordHashingBusy(self.retry_after)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns queue depth, throughput and latency counters."""
+        with self._lock:
+            done = self.completed or 1
+            return {
+                'workers': getattr(self, 'workers', 0),
+                'queue_size': getattr(self, 'queue_size', 0),
+                'queue_depth': self.submitted - self.started,
+                'in_flight': self.started - self.completed,
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'deferred': self.deferred,
+                'avg_wait_ms': round(self._wait_total / done * 1000, 2),
+                'avg_run_ms': round(self._run_total / done * 1000, 2),
+                'max_wait_ms': round(self._wait_max * 1000, 2),
+                'max_run_ms': round(self._run_max * 1000, 2),
+            }
+
+    def _finish_deferred(self, future: Future) -> None:
+        self._slots.release()
+        if future.exception() is not None:
+            logger.error("Deferred password hashing failed: %s", future.exception())
+
+    def _timed(self, func: Callable[[], Any], enqueued: float) -> Any:
+        started = time.perf_counter()
+        with self._lock:
+            self.started += 1
+        try:
+            return func()
+        finally:
+            finished = time.perf_counter()
+            with self._lock:
+                self.completed += 1
+                self._wait_total += started - enqueued
+                self._run_total += finished - started
+                self._wait_max = max(self._wait_max, started - enqueued)
+                self._run_max = max(self._run_max, finished - started)
+
+    def _reset_counters(self) -> None:
+        self.submitted = self.started = self.completed = self.rejected = self.deferred = 0
+        self._wait_total = self._run_total = 0.0
+        self._wait_max = self._run_max = 0.0
@@ -0,0 +1,180 @@
+# /your_project_root/app/utils/rate_limit.py
+# Sliding-window rate limiter whose state is shared by all gunicorn workers.
+
+import functools
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from flask import Flask, request
+
+from .metrics import register_metrics_source
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a request is over one of its limits (HTTP 429)."""
+
+    def __init__(self, retry_after: int = 1):
+        super().__init__("Rate limit exceeded")
+        self.retry_after = retry_after
+
+
+def client_ip() -> Optional[str]:
+    """Key function: the remote address of the request."""
+    return request.remote_addr
+
+
+def json_email() -> Optional[str]:
+    """Key function: the normalized 'email' field of the JSON body, if any."""
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not isinstance(data.get('email'), str):
+        return None
+    return data['email'].strip().lower() or None
+
+
+class RateLimiter:
+    """
+    Sliding-window log limiter backed by a small SQLite file.
+
+    Every allowed hit is stored as (key, timestamp). A hit is rejected if
+    its key already has `limit` hits in the last `window` seconds. Rejected
+    hits are not stored, so each key holds at most `limit` rows. SQLite
+    (WAL, BEGIN IMMEDIATE) serializes the check-and-insert across worker
+    processes, so the limits hold for the whole server and not per worker.
+
+    Limits are configured per endpoint in RATELIMIT_LIMITS:
+
+        {'auth.login': {'ip': (20, 60), 'email': (5, 60)}}
+
+    meaning at most 20 requests per minute from one IP address and at most
+    5 per minute for one email address. Decorate a view with
+    @rate_limiter.limit to enforce its entry; the check runs before the
+    view body, so rejected requests never reach the password check.
+    """
+
+    KEY_FUNCS: Dict[str, Callable[[], Optional[str]]] = {
+        'ip': client_ip,
+        'email': json_email,
+    }
+
+    def __init__(self, app: Optional[Flask] = None):
+        self.enabled = False
+        self.limits: Dict[str, Dict[str, Tuple[int, int]]] = {}
+        self.path: Optional[str] = None
+        self.allowed = 0
+        self.rejected = 0
+        self._local = threading.local()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        """Reads the limits from the app config, creates the state file and registers metrics."""
+        self.enabled = app.config.get('RATELIMIT_ENABLED', True)
+        self.limits = self._validate_limits(app.config.get('RATELIMIT_LIMITS', {}))
+        self.path = app.config.get('RATELIMIT_STORAGE_FILE') or \
+            os.path.join(app.instance_path, 'ratelimit.sqlite')
+        self.allowed = self.rejected = 0
+        self._local = threading.local()
+        if self.enabled:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = self._connection()
+            conn.execute("CREATE TABLE IF NOT EXISTS rate_limit_hits (key TEXT NOT NULL, ts REAL NOT NULL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_rate_limit_hits_key_ts ON rate_limit_hits (key, ts)")
+        app.extensions['rate_limiter'] = self
+        register_metrics_source(app, 'rate_limiter', self.stats)
+
+    @classmethod
+    def _validate_limits(cls, limits: Dict[str, Dict[str, Tuple[int, int]]]) -> Dict[str, Dict[str, Tuple[int, int]]]:
+        """Checks every RATELIMIT_LIMITS rule; raises ValueError at startup rather than failing requests."""
+        for endpoint, rules in limits.items():
+            for key_name, (limit, window) in rules.items():
+                if key_name not in cls.KEY_FUNCS:
+                    raise ValueError(f"RATELIMIT_LIMITS[{endpoint!r}]: unknown key {key_name!r}")
+                if limit < 1 or window < 1:
+                    raise ValueError(f"RATELIMIT_LIMITS[{endpoint!r}][{key_name!r}]: "
+                                     f"limit and window must be at least 1, got ({limit}, {window})")
+        return limits
+
+    def limit(self, view: Callable) -> Callable:
+        """View decorator enforcing the RATELIMIT_LIMITS entry of the view's endpoint."""
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            if self.enabled:
+                rules = self.limits.get(request.endpoint, {})
+                checks = []
+                for key_name, (limit, window) in rules.items():
+                    value = self.KEY_FUNCS[key_name]()
+                    if value is not None:
+                        checks.append((f"{request.endpoint}:{key_name}:{value}", limit, window))
+                self.hit(checks)
+            return view(*args, **kwargs)
+        return wrapper
+
+    def hit(self, checks: Iterable[Tuple[str, int, int]], now: Optional[float] = None) -> None:
+        """
+        Records one hit against every (key, limit, window) in checks, or none
+        of them if any key is over its limit.
+
+        Raises:
+            RateLimitExceeded: with the seconds until the first key frees up
+        """
+        checks = list(checks)
+        if not checks:
+            return
+        now = time.time() if now is None else now
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            retry_after = 0.0
+            for key, limit, window in checks:
+                conn.execute("DELETE FROM rate_limit_hits WHERE key = ? AND ts <= ?", (key, now - window))
+                count, oldest = conn.execute(
+                    "SELECT COUNT(*), MIN(ts) FROM rate_limit_hits WHERE key = ?", (key,)
+                ).fetchone()
+                if count >= limit:
+                    # No hit to wait for (a limit below 1): the whole window.
+                    retry_after = max(retry_after, window if oldest is None else oldest + window - now)
+            if retry_after:
+                conn.execute("COMMIT")
+                self.rejected += 1
+                raise RateLimitExceeded(max(1, int(retry_after + 0.999)))
+            conn.executemany("INSERT INTO rate_limit_hits (key, ts) VALUES (?, ?)",
+                             [(key, now) for key, _, _ in checks])
+            conn.execute("COMMIT")
+            self.allowed += 1
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """Deletes hits older than the longest configured window; returns the row count."""
+        if not self.enabled:
+            return 0
+        windows = [window for rules in self.limits.values() for _, window in rules.values()]
+        if not windows:
+            return 0
+        now = time.time() if now is None else now
+        cursor = self._connection().execute("DELETE FROM rate_limit_hits WHERE ts <= ?", (now - max(windows),))
+        return cursor.rowcount
+
+    def reset(self) -> None:
+        """Forgets every recorded hit."""
+        if self.enabled:
+            self._connection().execute("DELETE FROM rate_limit_hits")
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns allowed/rejected counters for this worker."""
+        return {'enabled': self.enabled, 'allowed': self.allowed, 'rejected': self.rejected}
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread, reopened after a fork (gunicorn --preload).
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
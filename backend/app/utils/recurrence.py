@@ -0,0 +1,179 @@
+# /your_project_root/app/utils/recurrence.py
+# RRULE-style recurrence for to-do items, expanded on demand for a date window.
+
+import calendar
+import datetime
+from typing import Dict, Iterator, List, Optional
+
+FREQUENCIES = ['DAILY', 'WEEKLY', 'MONTHLY', 'YEARLY']
+WEEKDAYS = ['MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU']
+MAX_INTERVAL = 1000
+MAX_COUNT = 100000
+
+
+class InvalidRecurrence(ValueError):
+    """Raised for a recurrence rule outside the supported RRULE subset (HTTP 400)."""
+
+
+class RecurrenceRule:
+    """
+    A date-only subset of RFC 5545 RRULE:
+
+        FREQ=DAILY|WEEKLY|MONTHLY|YEARLY[;INTERVAL=n][;BYDAY=MO,WE,..][;COUNT=n|;UNTIL=YYYYMMDD]
+
+    BYDAY is only allowed with WEEKLY (weeks start on Monday). MONTHLY and
+    YEARLY repeat the start date's day of month; in shorter months the
+    occurrence falls on the last day of the month (RFC 5545 would skip the
+    month instead). The series starts at the item's due date.
+
+    Every period (day, week, month or year step) has a fixed number of
+    occurrences, so the first occurrence of a window is found arithmetically
+    and expanding a window costs O(occurrences in it), however long the
+    series has been running.
+    """
+
+    def __init__(self, freq: str, interval: int = 1, byday: Optional[List[int]] = None,
+                 count: Optional[int] = None, until: Optional[datetime.date] = None):
+        self.freq = freq
+        self.interval = interval
+        self.byday = sorted(set(byday)) if byday else None
+        self.count = count
+        self.until = until
+
+    @classmethod
+    def parse(cls, text: str) -> 'RecurrenceRule':
+        """
+        Parses an RRULE string (an optional 'RRULE:' prefix is ignored).
+
+        Raises:
+            InvalidRecurrence: if the rule is malformed or uses unsupported parts
+        """
+        if not isinstance(text, str) or not text.strip():
+            raise InvalidRecurrence("Recurrence must be a non-empty RRULE string")
+        body = text.strip()
+        if body.upper().startswith('RRULE:'):
+            body = body[len('RRULE:'):]
+        parts: Dict[str, str] = {}
+        for part in body.split(';'):
+            name, sep, value = part.partition('=')
+            name = name.strip().upper()
+            if not sep or not name or name in parts:
+                raise InvalidRecurrence(f"Malformed recurrence part: {part!r}")
+            parts[name] = value.strip().upper()
+
+        unsupported = set(parts) - {'FREQ', 'INTERVAL', 'BYDAY', 'COUNT', 'UNTIL'}
+        if unsupported:
+            raise InvalidRecurrence(f"Unsupported recurrence parts: {', '.join(sorted(unsupported))}")
+        freq = parts.get('FREQ')
+        if freq not in FREQUENCIES:
+            raise InvalidRecurrence(f"FREQ must be one of: {', '.join(FREQUENCIES)}")
+
+        interval = cls._parse_int(parts.get('INTERVAL', '1'), 'INTERVAL', MAX_INTERVAL)
+        count = cls._parse_int(parts['COUNT'], 'COUNT', MAX_COUNT) if 'COUNT' in parts else None
+        until = None
+        if 'UNTIL' in parts:
+            try:
+                until = datetime.datetime.strptime(parts['UNTIL'][:8], '%Y%m%d').date()
+            except ValueError:
+                raise InvalidRecurrence("UNTIL must be a date in YYYYMMDD format")
+        if count is not None and until is not None:
+            raise InvalidRecurrence("COUNT and UNTIL cannot be used together")
+
+        byday = None
+        if 'BYDAY' in parts:
+            if freq != 'WEEKLY':
+                raise InvalidRecurrence("BYDAY is only supported with FREQ=WEEKLY")
+            days = [d.strip() for d in parts['BYDAY'].split(',')]
+            if not days or any(d not in WEEKDAYS for d in days):
+                raise InvalidRecurrence(f"BYDAY must be a list of: {', '.join(WEEKDAYS)}")
+            byday = [WEEKDAYS.index(d) for d in days]
+        return cls(freq, interval, byday, count, until)
+
+    @staticmethod
+    def _parse_int(value: str, name: str, maximum: int) -> int:
+        if not value.isdigit() or not 1 <= int(value) <= maximum:
+            raise InvalidRecurrence(f"{name} must be an integer between 1 and {maximum}")
+        return int(value)
+
+    def to_string(self) -> str:
+        """Canonical RRULE text (what is stored on the item)."""
+        parts = [f'FREQ={self.freq}']
+        if self.interval != 1:
+            parts.append(f'INTERVAL={self.interval}')
+        if self.byday:
+            parts.append('BYDAY=' + ','.join(WEEKDAYS[d] for d in self.byday))
+        if self.count is not None:
+            parts.append(f'COUNT={self.count}')
+        if self.until is not None:
+            parts.append(f'UNTIL={self.until.strftime("%Y%m%d")}')
+        return ';'.join(parts)
+
+    # --- Expansion ---
+
+    def _period(self, start: datetime.date, period: int) -> List[datetime.date]:
+        """The occurrences of period number `period` (period 0 contains start), unfiltered."""
+        if self.freq == 'DAILY':
+            return [start + datetime.timedelta(days=period * self.interval)]
+        if self.freq == 'WEEKLY':
+            if not self.byday:
+                return [start + datetime.timedelta(weeks=period * self.interval)]
+            monday = start - datetime.timedelta(days=start.weekday()) + datetime.timedelta(weeks=period * self.interval)
+            return [monday + datetime.timedelta(days=d) for d in self.byday]
+        months = period * self.interval * (12 if self.freq == 'YEARLY' else 1)
+        year, month = divmod(start.month - 1 + months, 12)
+        year += start.year
+        if year > datetime.MAXYEAR:
+            raise OverflowError
+        return [datetime.date(year, month + 1, min(start.day, calendar.monthrange(year, month + 1)[1]))]
+
+    def _first_period_from(self, start: datetime.date, day: datetime.date) -> int:
+        """A period number whose occurrences are all >= day's period start, never past day's period."""
+        if day <= start:
+            return 0
+        if self.freq == 'DAILY':
+            return (day - start).days // self.interval
+        if self.freq == 'WEEKLY' and not self.byday:
+            return (day - start).days // (7 * self.interval)
+        if self.freq == 'WEEKLY':
+            monday = start - datetime.timedelta(days=start.weekday())
+            return (day - monday).days // 7 // self.interval
+        months = (day.year - start.year) * 12 + day.month - start.month
+        return months // (self.interval * (12 if self.freq == 'YEARLY' else 1))
+
+    def _index(self, start: datetime.date, period: int, slot: int) -> int:
+        """0-based position in the series of slot `slot` of period `period` (for COUNT)."""
+        if not self.byday:
+            return period
+        # Days of the first week before the start date are not occurrences.
+        skipped = sum(1 for d in self.byday if d < start.weekday())
+        return period * len(self.byday) + slot - skipped
+
+    def between(self, start: datetime.date, after: datetime.date, before: datetime.date,
+                limit: Optional[int] = None) -> Iterator[datetime.date]:
+        """
+        Yields the occurrences of a series starting at start that fall in
+        [after, before], in order, at most limit of them.
+        """
+        produced = 0
+        period = self._first_period_from(start, after)
+        while limit is None or produced < limit:
+            try:
+                days = self._period(start, period)
+            except OverflowError:
+                return
+            for slot, day in enumerate(days):
+                if day < start or day < after:
+                    continue
+                if day > before or (self.until is not None and day > self.until):
+                    return
+                if self.count is not None and self._index(start, period, slot) >= self.count:
+                    return
+                yield day
+                produced += 1
+                if limit is not None and produced >= limit:
+                    return
+            period += 1
+
+    def occurs_on(self, start: datetime.date, day: datetime.date) -> bool:
+        """Whether day is an occurrence of the series starting at start (O(1))."""
+        return next(self.between(start, day, day, limit=1), None) == day
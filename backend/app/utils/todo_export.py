@@ -0,0 +1,74 @@
+# /your_project_root/app/utils/todo_export.py
+# Streaming export of a user's to-do items as NDJSON or CSV.
+
+import csv
+import io
+import json
+from typing import Any, Dict, Iterator, List
+
+from ..extensions import db
+from .todo_tags import todo_tag_names
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+# Rows fetched from the database cursor (and written out) per chunk; see TODO_EXPORT_BATCH_SIZE.
+EXPORT_BATCH_SIZE = 1000
+# CSV columns, in order; each is a key of TodoItem.to_dict(). Tags are joined with commas.
+CSV_COLUMNS = (
+    'id', 'title', 'description', 'due_date', 'status', 'priority', 'is_current_focus',
+    'created_at', 'updated_at', 'completed_at', 'position', 'recurrence', 'recurrence_id',
+    'occurrence_date', 'parent_id', 'subtask_count', 'subtask_done_count', 'tags',
+)
+
+
+def export_chunks(query, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Runs query (a TodoItem query, e.g. from todo_list_query) on a
+    server-side cursor and yields the rows as lists of to_dict() dicts,
+    batch_size at a time, with the tags of each batch loaded in one query.
+    Only one batch is held in memory at a time, so the export costs the
+    same memory whatever the number of rows.
+    """
+    statement = query.statement.execution_options(yield_per=batch_size)
+    for todos in db.session.scalars(statement).partitions():
+        names = todo_tag_names(todo.id for todo in todos)
+        for todo in todos:
+            todo.tag_names = names.get(todo.id, [])
+        yield [todo.to_dict() for todo in todos]
+
+
+def ndjson_lines(chunks: Iterator[List[Dict[str, Any]]]) -> Iterator[str]:
+    """Encodes each chunk of rows as NDJSON, one JSON object per line."""
+    for rows in chunks:
+        yield ''.join(json.dumps(row, ensure_ascii=False, separators=(',', ':')) + '\n' for row in rows)
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, list):
+        return ','.join(value)
+    return value
+
+
+def csv_lines(chunks: Iterator[List[Dict[str, Any]]]) -> Iterator[str]:
+    """Encodes each chunk of rows as CSV text, after a header row of CSV_COLUMNS."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_COLUMNS)
+    yield buffer.getvalue()
+    for rows in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_csv_value(row[column]) for column in CSV_COLUMNS] for row in rows)
+        yield buffer.getvalue()
+
+
+def export_lines(query, fmt: str, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[str]:
+    """The body of an export of query's rows in fmt ('ndjson' or 'csv'), as a stream of text chunks."""
+    chunks = export_chunks(query, batch_size)
+    return ndjson_lines(chunks) if fmt == 'ndjson' else csv_lines(chunks)
@@ -0,0 +1,47 @@
+# /your_project_root/app/utils/todo_order.py
+# Manual ordering of to-do items (TodoItem.position).
+
+from typing import List
+
+from sqlalchemy import bindparam, func, select, update
+
+from ..extensions import db
+from ..models.todo_item import TodoItem
+from .order_keys import keys_between
+
+
+def new_todo_positions(user_id: int, count: int) -> List[str]:
+    """
+    Positions for count new items of user_id, in creation order. New items go
+    to the top of the manual order, the latest one first (like the default
+    newest-first list), so each key sorts before the previous one.
+    """
+    first = db.session.scalar(
+        select(func.min(TodoItem.position)).where(TodoItem.user_id == user_id, TodoItem.deleted_at.is_(None))
+    )
+    return keys_between(None, first, count)[::-1]
+
+
+def rebalance_todo_positions(user_id: int, version: int) -> int:
+    """
+    Renumbers user_id's positions as consecutive short keys in their current
+    order (position, id), stamping the rewritten rows with sync version.
+    Trashed items keep their keys. Runs in the caller's transaction.
+
+    Returns:
+        Number of items renumbered
+    """
+    ids = db.session.scalars(
+        select(TodoItem.id).where(TodoItem.user_id == user_id, TodoItem.deleted_at.is_(None))
+        .order_by(TodoItem.position, TodoItem.id)
+    ).all()
+    if ids:
+        rows = [{'row_id': todo_id, 'new_position': key} for todo_id, key in zip(ids, keys_between(None, None, len(ids)))]
+        # Core UPDATE run as executemany: one statement, one parameter set per row.
+        table = TodoItem.__table__
+        db.session.execute(
+            update(table).where(table.c.id == bindparam('row_id'))
+            .values(position=bindparam('new_position'), sync_version=version),
+            rows,
+        )
+    return len(ids)
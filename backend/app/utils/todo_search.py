@@ -0,0 +1,118 @@
+# /your_project_root/app/utils/todo_search.py
+# Full-text search over to-do titles and descriptions.
+
+from typing import Any, List, Tuple
+
+from sqlalchemy import and_, case, column, func, literal_column, or_, select, table, tuple_
+
+from ..extensions import db
+from ..models.todo_item import TodoItem, fts_owner_token
+
+MAX_SEARCH_TERMS = 10
+# The trigram tokenizer cannot match terms shorter than three characters;
+# those (e.g. two-character Chinese words) go through the LIKE fallback.
+MIN_FTS_TERM_LENGTH = 3
+
+# Search modes; the cursor starts with its mode so a page of one cannot continue the other.
+FTS_MODE = 'fts'
+LIKE_MODE = 'like'
+
+# bm25 weights per FTS column: the owner token does not rank, and a hit in the
+# title counts twice a hit in the description.
+_OWNER_WEIGHT, _TITLE_WEIGHT, _DESCRIPTION_WEIGHT = 0.0, 2.0, 1.0
+
+# The FTS5 table created with todo_items (see models/todo_item.py); the bare
+# table name is what MATCH and bm25() take as their argument.
+todo_items_fts = table('todo_items_fts', column('rowid'))
+_fts = literal_column('todo_items_fts')
+
+
+def search_terms(q: str) -> List[str]:
+    """Splits a search string into distinct whitespace-separated terms (at most MAX_SEARCH_TERMS)."""
+    terms = []
+    for term in q.split():
+        if term not in terms:
+            terms.append(term)
+    return terms[:MAX_SEARCH_TERMS]
+
+
+def search_mode(terms: List[str]) -> str:
+    """FTS_MODE when the FTS5 index can answer terms, LIKE_MODE otherwise."""
+    if db.engine.dialect.name != 'sqlite':
+        return LIKE_MODE
+    return FTS_MODE if all(len(term) >= MIN_FTS_TERM_LENGTH for term in terms) else LIKE_MODE
+
+
+def fts_match_expression(user_id: int, terms: List[str]) -> str:
+    # The owner token limits the match to user_id's rows inside the index.
+    # Each term becomes a quoted phrase, so FTS5 operators typed by the user
+    # (AND, OR, NEAR, *, column filters) are matched literally; adjacent
+    # phrases are ANDed and only searched in the text columns.
+    phrases = ' '.join('"' + term.replace('"', '""') + '"' for term in terms)
+    return f'owner : "{fts_owner_token(user_id)}" AND {{title description}} : ({phrases})'
+
+
+def _like_pattern(term: str) -> str:
+    escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'%{escaped}%'
+
+
+def todo_search_query(user_id: int, terms: List[str], mode: str) -> Tuple[Any, Tuple[Any, Any]]:
+    """
+    Builds the search over user_id's live to-do items; every term must match
+    the title or the description.
+
+    FTS_MODE ranks by bm25 through the todo_items_fts index, whose owner
+    column keeps the lookup to user_id's own matches. LIKE_MODE scans
+    the user's items (served by ix_todo_items_user_created) and puts title
+    matches first, newest first within each group.
+
+    Returns:
+        (select of (TodoItem, rank, tiebreak) ordered by (rank, tiebreak)
+        ascending, the (rank, tiebreak) key expressions for a keyset filter)
+    """
+    if mode == FTS_MODE:
+        rank = func.bm25(_fts, _OWNER_WEIGHT, _TITLE_WEIGHT, _DESCRIPTION_WEIGHT)
+        tiebreak = TodoItem.id
+        query = (
+            select(TodoItem, rank.label('rank'), tiebreak.label('tiebreak'))
+            .join_from(todo_items_fts, TodoItem, todo_items_fts.c.rowid == TodoItem.id)
+            .where(_fts.op('MATCH')(fts_match_expression(user_id, terms)), TodoItem.user_id == user_id,
+                   TodoItem.deleted_at.is_(None))
+        )
+    else:
+        patterns = [_like_pattern(term) for term in terms]
+        in_title = [TodoItem.title.ilike(p, escape='\\') for p in patterns]
+        rank = case((and_(*in_title), 0), else_=1)
+        tiebreak = -TodoItem.id
+        query = select(TodoItem, rank.label('rank'), tiebreak.label('tiebreak')).where(
+            TodoItem.user_id == user_id,
+            TodoItem.deleted_at.is_(None),
+            *(or_(title, TodoItem.description.ilike(p, escape='\\')) for title, p in zip(in_title, patterns)),
+        )
+    return query.order_by(rank, tiebreak), (rank, tiebreak)
+
+
+def search_todos(user_id: int, terms: List[str], limit: int, after: Any = None) -> Tuple[str, List[Any]]:
+    """
+    Runs one page of a search.
+
+    Args:
+        user_id: Owner of the searched items
+        terms: Output of search_terms (non-empty)
+        limit: Number of rows to fetch (the caller asks for page size + 1)
+        after: Decoded cursor (mode, rank, tiebreak) of the previous page, or None
+
+    Returns:
+        (mode, rows) where each row has .TodoItem, .rank and .tiebreak
+
+    Raises:
+        ValueError: if the cursor belongs to a different search mode
+    """
+    mode = search_mode(terms)
+    query, key = todo_search_query(user_id, terms, mode)
+    if after is not None:
+        if after[0] != mode:
+            raise ValueError("Cursor does not match the search")
+        query = query.where(tuple_(*key) > tuple_(*after[1:]))
+    return mode, db.session.execute(query.limit(limit)).all()
@@ -0,0 +1,140 @@
+# /your_project_root/app/utils/todo_tags.py
+# Tags of to-do items: parsing, assignment, the tag filter of GET /todos and tag counts.
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, intersect, select
+
+from ..extensions import db
+from ..models.tag import Tag
+from ..models.todo_item import TodoItem
+from ..models.todo_tag import TodoTag
+
+MAX_TAGS_PER_TODO = 20
+MAX_TAG_LENGTH = 50
+
+
+def normalize_tag(name: str) -> str:
+    """The stored form of a tag name: trimmed and lower-cased."""
+    return name.strip().lower()
+
+
+def parse_tags(value: Any) -> Tuple[Optional[List[str]], Optional[str]]:
+    """
+    Parses the tags of a request body (a list of names; null means none).
+
+    Returns:
+        (distinct normalized names in request order, or None; error or None)
+    """
+    if value is None:
+        return [], None
+    if not isinstance(value, list) or not all(isinstance(name, str) for name in value):
+        return None, "tags must be a list of strings"
+    names = []
+    for name in map(normalize_tag, value):
+        if not name or len(name) > MAX_TAG_LENGTH or ',' in name:
+            return None, f"Each tag must be 1 to {MAX_TAG_LENGTH} characters long and contain no commas"
+        if name not in names:
+            names.append(name)
+    if len(names) > MAX_TAGS_PER_TODO:
+        return None, f"An item can have at most {MAX_TAGS_PER_TODO} tags"
+    return names, None
+
+
+def _tag_ids(user_id: int, names: Iterable[str]) -> Dict[str, int]:
+    """Ids of user_id's tags named names, creating the missing ones (one SELECT, at most one INSERT)."""
+    names = set(names)
+    if not names:
+        return {}
+    ids = dict(db.session.execute(
+        select(Tag.name, Tag.id).where(Tag.user_id == user_id, Tag.name.in_(names))
+    ).all())
+    missing = sorted(names - set(ids))
+    if missing:
+        ids.update(db.session.execute(
+            insert(Tag).returning(Tag.name, Tag.id),
+            [{'user_id': user_id, 'name': name} for name in missing],
+        ).all())
+    return ids
+
+
+def set_todo_tags(user_id: int, tags_by_todo: Dict[int, List[str]]) -> None:
+    """
+    Replaces the tags of each item in tags_by_todo (id -> names) in the
+    caller's transaction: one DELETE of their links and one multi-row INSERT
+    of the new ones, whatever the number of items.
+    """
+    if not tags_by_todo:
+        return
+    ids = _tag_ids(user_id, (name for names in tags_by_todo.values() for name in names))
+    db.session.execute(delete(TodoTag).where(TodoTag.todo_id.in_(list(tags_by_todo))))
+    rows = [{'todo_id': todo_id, 'tag_id': ids[name], 'user_id': user_id}
+            for todo_id, names in tags_by_todo.items() for name in names]
+    if rows:
+        db.session.execute(insert(TodoTag), rows)
+
+
+def todo_tag_names(todo_ids: Iterable[int]) -> Dict[int, List[str]]:
+    """The tag names of each of todo_ids (sorted), from one query on the todo_tags primary key."""
+    todo_ids = list(todo_ids)
+    names: Dict[int, List[str]] = {}
+    if todo_ids:
+        rows = db.session.execute(
+            select(TodoTag.todo_id, Tag.name).join(Tag, Tag.id == TodoTag.tag_id)
+            .where(TodoTag.todo_id.in_(todo_ids)).order_by(Tag.name)
+        )
+        for todo_id, name in rows:
+            names.setdefault(todo_id, []).append(name)
+    return names
+
+
+def todo_dicts(todos: List[TodoItem]) -> List[Dict[str, Any]]:
+    """
+    to_dict() of each item with its tags, loaded for all of them in one
+    query. Generated occurrences (no id of their own) show their recurring
+    item's tags.
+    """
+    names = todo_tag_names({todo.id or todo.recurrence_id for todo in todos})
+    for todo in todos:
+        todo.tag_names = names.get(todo.id or todo.recurrence_id, [])
+    return [todo.to_dict() for todo in todos]
+
+
+def tagged_todo_ids(user_id: int, names: List[str]):
+    """
+    Select of the ids of user_id's items tagged with every one of names.
+    Each name is one range of ix_todo_tags_user_tag_todo, already in
+    todo_id order, and the ranges are combined with INTERSECT, so the filter
+    never reads the items themselves.
+    """
+    branches = [
+        select(TodoTag.todo_id).where(
+            TodoTag.user_id == user_id,
+            TodoTag.tag_id == select(Tag.id).where(Tag.user_id == user_id, Tag.name == name).scalar_subquery(),
+        )
+        for name in names
+    ]
+    return branches[0] if len(branches) == 1 else intersect(*branches)
+
+
+def tag_facets(user_id: int, todo_ids=None) -> List[Dict[str, Any]]:
+    """
+    Counts user_id's items per tag in one grouped query, most used first.
+
+    Args:
+        todo_ids: Optional select of item ids to count (e.g. a filtered list);
+            all of the user's items when None
+
+    Returns:
+        [{'name': ..., 'count': ...}, ...] for the tags with at least one item
+    """
+    count = func.count(TodoTag.todo_id)
+    query = (
+        select(Tag.name, count.label('count'))
+        .select_from(TodoTag).join(Tag, Tag.id == TodoTag.tag_id)
+        .where(TodoTag.user_id == user_id)
+    )
+    if todo_ids is not None:
+        query = query.where(TodoTag.todo_id.in_(todo_ids))
+    query = query.group_by(TodoTag.tag_id, Tag.name).order_by(count.desc(), Tag.name)
+    return [{'name': name, 'count': total} for name, total in db.session.execute(query)]
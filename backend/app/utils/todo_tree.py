@@ -0,0 +1,117 @@
+# /your_project_root/app/utils/todo_tree.py
+# Subtask hierarchies of to-do items (TodoItem.parent_id), walked with recursive CTEs.
+
+import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, literal, or_, select
+from sqlalchemy.orm import aliased
+
+from ..extensions import db
+from ..models.todo_item import TodoItem
+from .todo_tags import todo_dicts
+
+# Deepest subtask level below a top-level item (a top-level item is depth 0).
+# Also bounds every recursive walk, so a corrupted parent_id cycle cannot loop.
+MAX_SUBTASK_DEPTH = 8
+
+
+def subtree_cte(user_id: int, root_ids: Iterable[int], with_occurrences: bool = False, nesting: bool = False,
+                trashed_at: Optional[datetime.datetime] = None):
+    """
+    Recursive CTE (id, depth) of user_id's live items root_ids and
+    everything below them, one level per step through ix_todo_items_parent.
+
+    Args:
+        with_occurrences: Also follow materialized occurrences of recurring
+            items (recurrence_id), i.e. every row that goes with the subtree
+            when it is deleted
+        nesting: Render the CTE inside the enclosing statement (needed when
+            it is used in the WHERE clause of an UPDATE or DELETE, so the
+            statement still starts with UPDATE or DELETE)
+        trashed_at: Walk the rows moved to the trash at this time instead of
+            live ones (what a single delete trashed together, for a restore)
+    """
+    root_ids = list(root_ids)
+    state = TodoItem.deleted_at.is_(None) if trashed_at is None else TodoItem.deleted_at == trashed_at
+    base = TodoItem.id.in_(root_ids)
+    if with_occurrences:
+        base = or_(base, TodoItem.recurrence_id.in_(root_ids))
+    subtree = (
+        select(TodoItem.id, literal(0).label('depth'))
+        .where(TodoItem.user_id == user_id, base, state)
+        .cte('subtree', recursive=True, nesting=nesting)
+    )
+    child = aliased(TodoItem)
+    link = child.parent_id == subtree.c.id
+    if with_occurrences:
+        link = or_(link, child.recurrence_id == subtree.c.id)
+    child_state = child.deleted_at.is_(None) if trashed_at is None else child.deleted_at == trashed_at
+    return subtree.union_all(
+        select(child.id, subtree.c.depth + 1)
+        .where(link, child.user_id == user_id, child_state, subtree.c.depth < MAX_SUBTASK_DEPTH)
+    )
+
+
+def subtree_ids(user_id: int, root_ids: Iterable[int], trashed_at: Optional[datetime.datetime] = None):
+    """
+    Subquery selecting the ids of root_ids' subtrees and their occurrences,
+    for a single UPDATE that trashes (or, with trashed_at, restores) them.
+    """
+    subtree = subtree_cte(user_id, root_ids, with_occurrences=True, nesting=True, trashed_at=trashed_at)
+    return select(subtree.c.id).scalar_subquery()
+
+
+def load_subtree(user_id: int, root_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Loads user_id's item root_id with all its subtasks in one query (plus
+    one for their tags).
+
+    Returns:
+        The root's to_dict() with a 'subtasks' list on every node (each level
+        in manual order: position, then id), or None if the user has no such
+        item
+    """
+    subtree = subtree_cte(user_id, [root_id])
+    rows = db.session.execute(
+        select(TodoItem, subtree.c.depth)
+        .join(subtree, TodoItem.id == subtree.c.id)
+        .order_by(subtree.c.depth, TodoItem.position, TodoItem.id)
+    ).all()
+    todos = [todo for todo, _ in rows]
+    nodes: Dict[int, Dict[str, Any]] = {}
+    for todo, todo_dict in zip(todos, todo_dicts(todos)):
+        # Rows arrive level by level, so a parent is always placed before its children.
+        node = nodes[todo.id] = dict(todo_dict, subtasks=[])
+        if todo.id != root_id:
+            nodes[todo.parent_id]['subtasks'].append(node)
+    return nodes.get(root_id)
+
+
+def subtree_depths(user_id: int, root_id: int) -> List[Tuple[int, int]]:
+    """(id, depth below root_id) of every item in user_id's subtree of root_id, root first."""
+    subtree = subtree_cte(user_id, [root_id])
+    return [tuple(row) for row in db.session.execute(select(subtree.c.id, subtree.c.depth).order_by(subtree.c.depth))]
+
+
+def subtask_depths(user_id: int, todo_ids: Iterable[int]) -> Dict[int, int]:
+    """
+    The depth of each of todo_ids (0 for a top-level item) in one query,
+    walking up the parent_id chain. Ids the user does not own, or that are
+    in the trash, are left out, so the result doubles as an ownership check.
+    """
+    todo_ids = list(todo_ids)
+    if not todo_ids:
+        return {}
+    chain = (
+        select(TodoItem.id.label('origin'), TodoItem.parent_id, literal(0).label('depth'))
+        .where(TodoItem.user_id == user_id, TodoItem.id.in_(todo_ids), TodoItem.deleted_at.is_(None))
+        .cte('chain', recursive=True)
+    )
+    parent = aliased(TodoItem)
+    chain = chain.union_all(
+        select(chain.c.origin, parent.parent_id, chain.c.depth + 1)
+        .where(parent.id == chain.c.parent_id, chain.c.depth <= MAX_SUBTASK_DEPTH)
+    )
+    rows = db.session.execute(select(chain.c.origin, func.max(chain.c.depth)).group_by(chain.c.origin))
+    return {origin: depth for origin, depth in rows}
@@ -0,0 +1,209 @@
+# /your_project_root/app/utils/token_revocation.py
+# In-process cache in front of the JWT blocklist lookup.
+
+import os
+import time
+from typing import Any, Callable, Dict, Optional
+
+from flask import Flask
+
+from .cache import TTLCache, SharedGeneration
+from .metrics import register_metrics_source
+
+
+class RevocationCache:
+    """
+    Caches "is this JTI revoked?" answers so that the blocklist loader does not
+    hit the database on every JWT-protected request.
+
+    Both positive and negative answers are cached. An entry never outlives the
+    token it describes: its TTL is capped at the token's remaining lifetime.
+    Negative answers are additionally capped at REVOCATION_CACHE_TTL seconds.
+
+    It also caches each user's token epoch. Every token carries the epoch
+    that was current when it was issued; bumping the user's epoch ("log out
+    all devices") revokes all older tokens at once.
+
+    Revocations made by another gunicorn worker are picked up through a shared
+    generation counter (see SharedGeneration): whenever a worker revokes a
+    token or bumps an epoch it bumps the counter with that JTI or user as the
+    key, and every worker drops just that entry as soon as it sees the new
+    value (everything, if it fell too far behind to tell which keys changed).
+    """
+
+    EPOCH_CLAIM = 'epoch'
+    # Key prefixes in the shared change log.
+    _JTI_KEY = 'jti:'
+    _EPOCH_KEY = 'epoch:'
+
+    def __init__(self, app: Optional[Flask] = None):
+        self.enabled = False
+        self.db_lookups = 0
+        self._cache = TTLCache()
+        self._epochs = TTLCache()
+        self._generation: Optional[SharedGeneration] = None
+        self._seen_generation = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        """Configures the cache from the app config and registers its metrics."""
+        self.enabled = app.config.get('REVOCATION_CACHE_ENABLED', True)
+        self._cache = TTLCache(
+            max_size=app.config.get('REVOCATION_CACHE_MAX_SIZE', 10000),
+            default_ttl=app.config.get('REVOCATION_CACHE_TTL', 300),
+        )
+        self._epochs = TTLCache(
+            max_size=app.config.get('REVOCATION_CACHE_MAX_SIZE', 10000),
+            default_ttl=app.config.get('REVOCATION_EPOCH_CACHE_TTL', 300),
+        )
+        self.db_lookups = 0
+
+        sync_file = app.config.get('REVOCATION_SYNC_FILE') or \
+            os.path.join(app.instance_path, 'revocation.gen')
+        if self._generation is not None:
+            self._generation.close()
+        self._generation = SharedGeneration(sync_file)
+        self._seen_generation = self._generation.read()
+
+        app.extensions['revocation_cache'] = self
+        register_metrics_source(app, 'revocation_cache', self.stats)
+
+    def is_revoked(self, jwt_payload: Dict[str, Any], lookup: Callable[[Dict[str, Any]], bool]) -> bool:
+        """
+        Returns whether the token described by jwt_payload has been revoked.
+
+        Args:
+            jwt_payload: The decoded JWT claims
+            lookup: Fallback that consults the database; called on a cache miss
+
+        Returns:
+            True if the token is revoked
+        """
+        if not self.enabled:
+            return lookup(jwt_payload)
+
+        self.sync()
+        jti = jwt_payload['jti']
+        cached = self._cache.get(jti)
+        if cached is not None:
+            return cached
+
+        revoked = lookup(jwt_payload)
+        self.db_lookups += 1
+        self._cache.set(jti, revoked, self._ttl_for(jwt_payload, revoked))
+        return revoked
+
+    def is_epoch_revoked(self, jwt_payload: Dict[str, Any], lookup: Callable[[str], Optional[int]]) -> bool:
+        """
+        Returns whether the token predates its user's current token epoch.
+
+        Args:
+            jwt_payload: The decoded JWT claims
+            lookup: Returns the user's current epoch (None if the user is gone);
+                called on a cache miss
+
+        Returns:
+            True if the token was issued before the user's last epoch bump
+        """
+        user_id = jwt_payload.get('sub')
+        if user_id is None:
+            return False
+        if not self.enabled:
+            current = lookup(user_id)
+        else:
+            self.sync()
+            current = self._epochs.get(user_id)
+            if current is None:
+                current = lookup(user_id)
+                if current is not None:
+                    self._epochs.set(user_id, current)
+        if current is None:
+            return False
+        return jwt_payload.get(self.EPOCH_CLAIM, 0) < current
+
+    def forget_epoch(self, user_id: Any) -> None:
+        """
+        Drops the cached epoch of a user whose epoch was just bumped (after
+        the commit) and tells the other workers to do the same.
+        """
+        self._epochs.delete(str(user_id))
+        self.notify_change(self._EPOCH_KEY + str(user_id))
+
+    def mark_revoked(self, jti: str, expires_at: Optional[float] = None) -> None:
+        """
+        Records a revocation that has just been committed to the database.
+        Must be called after the commit so that other workers re-reading the
+        database after the generation bump see the new row.
+        """
+        if not self.enabled:
+            return
+        self.notify_change(self._JTI_KEY + jti)
+        # Cached after this worker has caught up with its own bump, so the next sync() keeps it.
+        self._cache.set(jti, True, self._remaining(expires_at))
+
+    def notify_change(self, key: Optional[str] = None) -> None:
+        """
+        Tells every worker (including this one) to drop cached answers: the
+        one for key ('jti:<jti>' or 'epoch:<user id>'), or all of them.
+        """
+        if self._generation is not None:
+            self._generation.bump(key)
+            self.sync()
+
+    def generation(self) -> int:
+        """Returns the current shared revocation generation."""
+        return self._generation.read() if self._generation is not None else 0
+
+    def sync(self) -> bool:
+        """
+        Drops the local answers that a worker (this one included) has changed
+        since the last sync: only the changed keys, or everything if they are
+        no longer known.
+
+        Returns:
+            True if anything changed
+        """
+        if self._generation is None:
+            return False
+        current = self._generation.read()
+        if current == self._seen_generation:
+            return False
+        keys = self._generation.changes(self._seen_generation, current)
+        if keys is None:
+            self._cache.clear()
+            self._epochs.clear()
+        else:
+            for key in keys:
+                if key.startswith(self._JTI_KEY):
+                    self._cache.delete(key[len(self._JTI_KEY):])
+                elif key.startswith(self._EPOCH_KEY):
+                    self._epochs.delete(key[len(self._EPOCH_KEY):])
+        self._seen_generation = current
+        return True
+
+    def clear(self) -> None:
+        """Drops every cached answer in this worker."""
+        self._cache.clear()
+        self._epochs.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the hit/miss counters and the number of database lookups."""
+        stats = self._cache.stats()
+        stats['enabled'] = self.enabled
+        stats['db_lookups'] = self.db_lookups
+        stats['generation'] = self._seen_generation
+        stats['epochs'] = self._epochs.stats()
+        return stats
+
+    @staticmethod
+    def _remaining(expires_at: Optional[float]) -> float:
+        if expires_at is None:
+            return float('inf')
+        return expires_at - time.time()
+
+    def _ttl_for(self, jwt_payload: Dict[str, Any], revoked: bool) -> float:
+        remaining = self._remaining(jwt_payload.get('exp'))
+        if revoked:
+            return remaining
+        return min(self._cache.default_ttl, remaining)
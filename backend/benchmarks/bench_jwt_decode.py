@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cost of decoding the same access token on every request.
+
+Compares the stock Flask-JWT-Extended decode path (HS256 verification plus
+claim parsing on every call) with the verified-claims cache enabled by
+JWT_DECODE_CACHE_ENABLED:
+
+  - decode:      decode_token() on one token, repeated
+  - end-to-end:  GET /api/v1/auth/me through the test client
+
+Usage:
+    python benchmarks/bench_jwt_decode.py [--requests 20000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def report(label, seconds, count):
+    print(f"{label:<28} {seconds / count * 1e6:10.1f} us/request  ({count} requests)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=20000, help='decodes per measurement')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench-jwt-')
+    os.environ['REVOCATION_SYNC_FILE'] = os.path.join(workdir, 'revocation.gen')
+
+    from app import create_app
+    from app.extensions import db, jwt
+    from app.models.user import User
+    from flask_jwt_extended import create_access_token, decode_token
+
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        user = User(username='bench', email='bench@example.com', password='bench-password')
+        db.session.add(user)
+        db.session.commit()
+        token = create_access_token(identity=str(user.id))
+        headers = {'Authorization': f'Bearer {token}'}
+        client = app.test_client()
+
+        for label, enabled in (('uncached', False), ('cached', True)):
+            jwt.decode_cache_enabled = enabled
+            jwt.clear_decode_cache()
+            decode_token(token)
+            started = time.perf_counter()
+            for _ in range(args.requests):
+                decode_token(token)
+            report(f'decode {label}', time.perf_counter() - started, args.requests)
+
+        count = min(args.requests, 5000)
+        for label, enabled in (('uncached', False), ('cached', True)):
+            jwt.decode_cache_enabled = enabled
+            jwt.clear_decode_cache()
+            client.get('/api/v1/auth/me', headers=headers)
+            started = time.perf_counter()
+            for _ in range(count):
+                client.get('/api/v1/auth/me', headers=headers)
+            report(f'end-to-end {label}', time.perf_counter() - started, count)
+
+        print(f"\njwt_decode_cache: {jwt.decode_cache_stats()}")
+
+
+if __name__ == '__main__':
+    main()
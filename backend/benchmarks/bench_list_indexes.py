@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-user list latency with and without the composite list indexes.
+
+Seeds a throwaway SQLite database with U users owning R rows each in
+todo_items, future_plans and achievements (10k x 1k by default, i.e. 10M rows
+per table), then measures, for random users:
+
+  - query:       the list endpoint's ORM query alone (filter + order_by + .all())
+  - end-to-end:  GET of the list endpoint through the test client
+
+first with the per-user indexes dropped (a full table scan plus a sort per
+request) and then with them recreated.
+
+The default size needs several GB of disk and a long seeding run; use
+--users/--rows for a quicker look (the gap grows with the number of users).
+
+Usage:
+    python benchmarks/bench_list_indexes.py [--users 10000] [--rows 1000] [--requests 20]
+"""
+
+import argparse
+import datetime
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def report(label, seconds, count):
+    print(f"{label:<42} {seconds / count * 1e3:10.2f} ms/request  ({count} requests)")
+
+
+def seed(db, tables, users, rows):
+    """Inserts users x rows rows into every owned table, one user per transaction chunk."""
+    todo_items, future_plans, achievements = tables
+    base = datetime.datetime(2024, 1, 1)
+    statuses = ('pending', 'in_progress', 'completed')
+    chunk_users = max(1, 50000 // rows)
+    for first in range(1, users + 1, chunk_users):
+        todos, plans, achs = [], [], []
+        for user_id in range(first, min(first + chunk_users, users + 1)):
+            for i in range(rows):
+                created = base + datetime.timedelta(minutes=i)
+                day = None if i % 10 == 0 else datetime.date(2024, 1, 1) + datetime.timedelta(days=i % 365)
+                todos.append({'user_id': user_id, 'title': f'todo {i}', 'status': statuses[i % 3],
+                              'priority': 'medium', 'is_current_focus': i % 50 == 0, 'due_date': day,
+                              'created_at': created, 'updated_at': created})
+                plans.append({'user_id': user_id, 'title': f'plan {i}', 'description': 'benchmark',
+                              'status': 'active', 'target_date': day, 'created_at': created, 'updated_at': created})
+                achs.append({'user_id': user_id, 'title': f'achievement {i}', 'date_achieved': day,
+                             'created_at': created, 'updated_at': created})
+        db.session.execute(todo_items.insert(), todos)
+        db.session.execute(future_plans.insert(), plans)
+        db.session.execute(achievements.insert(), achs)
+        db.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=10000, help='number of users to seed')
+    parser.add_argument('--rows', type=int, default=1000, help='rows per user in each owned table')
+    parser.add_argument('--requests', type=int, default=20, help='list requests per measurement')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench-list-indexes-')
+    os.environ['TEST_DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'bench.sqlite')}"
+
+    from app import create_app
+    from app.extensions import db, bcrypt
+    from app.models.user import User
+    from app.models.todo_item import TodoItem
+    from app.models.future_plan import FuturePlan
+    from app.models.achievement import Achievement
+    from app.api.todo_bp import todo_list_query
+    from app.api.plans_bp import PLAN_LIST_ORDER
+    from app.api.achievements_bp import ACHIEVEMENT_LIST_ORDER
+    from flask_jwt_extended import create_access_token
+
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        password_hash = bcrypt.generate_password_hash('bench-password').decode('utf-8')
+        now = datetime.datetime.now(datetime.timezone.utc)
+
+        print(f"Seeding {args.users} users x {args.rows} rows per table into {workdir} ...")
+        started = time.perf_counter()
+        db.session.execute(User.__table__.insert(), [
+            {'id': user_id, 'username': f'user{user_id}', 'email': f'user{user_id}@example.com',
+             'password_hash': password_hash, 'token_epoch': 0, 'created_at': now, 'updated_at': now}
+            for user_id in range(1, args.users + 1)])
+        tables = (TodoItem.__table__, FuturePlan.__table__, Achievement.__table__)
+        seed(db, tables, args.users, args.rows)
+        db.session.execute(db.text('ANALYZE'))
+        db.session.commit()
+        print(f"Seeded in {time.perf_counter() - started:.1f}s\n")
+
+        user_ids = [random.randint(1, args.users) for _ in range(args.requests)]
+        with app.test_request_context():
+            tokens = {uid: create_access_token(identity=str(uid)) for uid in set(user_ids)}
+        client = app.test_client()
+        lists = [
+            ('todos', '/api/v1/todo/todos', lambda uid: todo_list_query(uid, {})[0]),
+            ('plans', '/api/v1/plans/',
+             lambda uid: FuturePlan.query.filter_by(user_id=uid).order_by(*PLAN_LIST_ORDER)),
+            ('achievements', '/api/v1/achievements/',
+             lambda uid: Achievement.query.filter_by(user_id=uid).order_by(*ACHIEVEMENT_LIST_ORDER)),
+        ]
+        indexes = [index for table in tables for index in table.indexes]
+
+        for phase in ('without indexes', 'with indexes'):
+            if phase == 'without indexes':
+                for index in indexes:
+                    index.drop(db.engine)
+            else:
+                started = time.perf_counter()
+                for index in indexes:
+                    index.create(db.engine)
+                print(f"{'index build':<42} {time.perf_counter() - started:10.2f} s")
+            db.session.execute(db.text('ANALYZE'))
+            db.session.commit()
+
+            for name, url, build_query in lists:
+                build_query(user_ids[0]).all() # warm the page cache
+                started = time.perf_counter()
+                for uid in user_ids:
+                    build_query(uid).all()
+                    db.session.expunge_all()
+                report(f"{name} query, {phase}", time.perf_counter() - started, len(user_ids))
+
+                started = time.perf_counter()
+                for uid in user_ids:
+                    response = client.get(url, headers={'Authorization': f'Bearer {tokens[uid]}'})
+                    assert response.status_code == 200, response.data
+                report(f"{name} end-to-end, {phase}", time.perf_counter() - started, len(user_ids))
+            print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark: memory and throughput of GET /todos/export for one user with many items.
+
+Seeds a throwaway SQLite database with one user owning N to-do items (1M by
+default, every tenth one tagged), then streams the export through the test
+client without buffering the body and reports, per format:
+
+  - peak:        peak Python heap while the response is produced (tracemalloc)
+  - throughput:  rows and megabytes written per second (tracing slows the
+                 export several times over, so take these as relative numbers)
+
+The peak should stay flat as --rows grows: only one cursor batch
+(TODO_EXPORT_BATCH_SIZE rows) is materialized at a time. --baseline also
+measures the unpaginated GET /todos, which builds the whole list in memory,
+for comparison (slow and memory-hungry at the default size).
+
+Usage:
+    python benchmarks/bench_todo_export.py [--rows 1000000] [--batch-size 1000] [--baseline]
+"""
+
+import argparse
+import datetime
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def seed(db, tables, user_id, rows):
+    """Inserts rows to-do items for user_id, 50k per transaction, tagging every tenth one."""
+    todo_items, tags, todo_tags = tables
+    db.session.execute(tags.insert(), [{'id': n, 'user_id': user_id, 'name': f'tag{n}'} for n in (1, 2)])
+    base = datetime.datetime(2024, 1, 1)
+    statuses = ('pending', 'in_progress', 'completed')
+    for first in range(1, rows + 1, 50000):
+        todos, links = [], []
+        for todo_id in range(first, min(first + 50000, rows + 1)):
+            created = base + datetime.timedelta(seconds=todo_id)
+            todos.append({'id': todo_id, 'user_id': user_id, 'title': f'todo {todo_id}',
+                          'description': 'exported by the benchmark', 'status': statuses[todo_id % 3],
+                          'priority': 'medium', 'is_current_focus': False, 'created_at': created,
+                          'updated_at': created})
+            if todo_id % 10 == 0:
+                links += [{'todo_id': todo_id, 'tag_id': tag_id, 'user_id': user_id} for tag_id in (1, 2)]
+        db.session.execute(todo_items.insert(), todos)
+        db.session.execute(todo_tags.insert(), links)
+        db.session.commit()
+
+
+def measure(label, client, url, headers, rows):
+    """Consumes one response chunk by chunk; prints its peak heap and throughput."""
+    tracemalloc.start()
+    started = time.perf_counter()
+    response = client.get(url, headers=headers, buffered=False)
+    assert response.status_code == 200, response.status_code
+    size = sum(len(chunk) for chunk in response.response)
+    response.close()
+    seconds = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<24} peak {peak / 2**20:9.1f} MiB   {rows / seconds:10.0f} rows/s   "
+          f"{size / 2**20 / seconds:7.1f} MiB/s   ({size / 2**20:.0f} MiB in {seconds:.1f}s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000000, help='number of to-do items to seed')
+    parser.add_argument('--batch-size', type=int, default=None, help='TODO_EXPORT_BATCH_SIZE override')
+    parser.add_argument('--baseline', action='store_true', help='also measure the unpaginated GET /todos')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench-todo-export-')
+    os.environ['TEST_DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'bench.sqlite')}"
+
+    from app import create_app
+    from app.extensions import db, bcrypt
+    from app.models.user import User
+    from app.models.todo_item import TodoItem
+    from app.models.tag import Tag
+    from app.models.todo_tag import TodoTag
+    from flask_jwt_extended import create_access_token
+
+    app = create_app('testing')
+    if args.batch_size:
+        app.config['TODO_EXPORT_BATCH_SIZE'] = args.batch_size
+    with app.app_context():
+        db.create_all()
+        now = datetime.datetime.now(datetime.timezone.utc)
+        db.session.execute(User.__table__.insert(), [{
+            'id': 1, 'username': 'exporter', 'email': 'exporter@example.com',
+            'password_hash': bcrypt.generate_password_hash('bench-password').decode('utf-8'),
+            'token_epoch': 0, 'created_at': now, 'updated_at': now}])
+
+        print(f"Seeding {args.rows} to-do items into {workdir} ...")
+        started = time.perf_counter()
+        seed(db, (TodoItem.__table__, Tag.__table__, TodoTag.__table__), 1, args.rows)
+        db.session.execute(db.text('ANALYZE'))
+        db.session.commit()
+        print(f"Seeded in {time.perf_counter() - started:.1f}s "
+              f"(batch size {app.config['TODO_EXPORT_BATCH_SIZE']})\n")
+
+        def headers():
+            # A fresh token per run: one run at the default size outlasts the testing token lifetime.
+            with app.test_request_context():
+                return {'Authorization': f"Bearer {create_access_token(identity='1')}"}
+
+        client = app.test_client()
+        for fmt in ('ndjson', 'csv'):
+            measure(f"export {fmt}", client, f'/api/v1/todo/todos/export?format={fmt}', headers(), args.rows)
+        if args.baseline:
+            measure("GET /todos (buffered)", client, '/api/v1/todo/todos', headers(), args.rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-request auth overhead of the token blocklist check.
+
+Seeds a throwaway SQLite database with N blocklisted JTIs (1M by default) and
+measures the time spent in the blocklist loader for tokens that were never
+revoked, which is what almost every request carries:
+
+  - db-only:      the original indexed `jti` query on every request
+  - bloom:        Bloom filter first, query only on a filter hit (cold cache)
+  - bloom+cache:  the full loader with a warm in-process revocation cache
+  - end-to-end:   GET /api/v1/auth/me through the test client, both paths
+
+Usage:
+    python benchmarks/bench_token_blocklist.py [--rows 1000000] [--requests 5000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def report(label, seconds, count):
+    print(f"{label:<28} {seconds / count * 1e6:10.1f} us/request  ({count} requests)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000000, help='number of blocklisted JTIs to seed')
+    parser.add_argument('--requests', type=int, default=5000, help='lookups per measurement')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench-blocklist-')
+    os.environ['TEST_DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'bench.sqlite')}"
+    os.environ['REVOCATION_SYNC_FILE'] = os.path.join(workdir, 'revocation.gen')
+
+    from app import create_app
+    from app.extensions import db, revocation_cache, blocklist_filter
+    from app.models.user import User
+    from app.models.token_blocklist import TokenBlocklist
+    from app.api.auth_bp import check_if_token_is_revoked
+    from flask_jwt_extended import create_access_token
+
+    app = create_app('testing')
+    app.config['REVOCATION_SYNC_FILE'] = os.environ['REVOCATION_SYNC_FILE']
+    with app.app_context():
+        db.create_all()
+        user = User(username='bench', email='bench@example.com', password='bench-password')
+        db.session.add(user)
+        db.session.commit()
+
+        print(f"Seeding {args.rows} blocklisted JTIs into {workdir} ...")
+        started = time.perf_counter()
+        table = TokenBlocklist.__table__
+        chunk = 50000
+        for offset in range(0, args.rows, chunk):
+            rows = [{'jti': str(uuid.uuid4()), 'token_type': 'access', 'user_id': user.id}
+                    for _ in range(min(chunk, args.rows - offset))]
+            db.session.execute(table.insert(), rows)
+            db.session.commit()
+        print(f"Seeded in {time.perf_counter() - started:.1f}s\n")
+
+        exp = time.time() + 3600
+        payloads = [{'jti': str(uuid.uuid4()), 'exp': exp, 'type': 'access'} for _ in range(args.requests)]
+
+        # 1. Original path: indexed jti query per request.
+        started = time.perf_counter()
+        for payload in payloads:
+            TokenBlocklist.query.filter_by(jti=payload['jti']).one_or_none()
+        report('db-only', time.perf_counter() - started, len(payloads))
+
+        # 2. Bloom filter in front of the query (build excluded, cache disabled).
+        revocation_cache.enabled = False
+        blocklist_filter.build_async = False
+        started = time.perf_counter()
+        check_if_token_is_revoked(None, {'jti': 'warm-up', 'exp': exp})
+        print(f"{'bloom build':<28} {time.perf_counter() - started:10.2f} s  "
+              f"({blocklist_filter.stats()['size_bytes'] / 1e6:.1f} MB)")
+        started = time.perf_counter()
+        for payload in payloads:
+            check_if_token_is_revoked(None, payload)
+        report('bloom', time.perf_counter() - started, len(payloads))
+
+        # 3. Full loader with a warm revocation cache (same token every request).
+        revocation_cache.enabled = True
+        payload = payloads[0]
+        check_if_token_is_revoked(None, payload)
+        started = time.perf_counter()
+        for _ in range(args.requests):
+            check_if_token_is_revoked(None, payload)
+        report('bloom+cache (warm)', time.perf_counter() - started, args.requests)
+
+        # 4. End-to-end request overhead, with and without the fast paths.
+        token = create_access_token(identity=str(user.id))
+        headers = {'Authorization': f'Bearer {token}'}
+        client = app.test_client()
+        count = min(args.requests, 2000)
+        for label, enabled in (('end-to-end db-only', False), ('end-to-end bloom+cache', True)):
+            revocation_cache.enabled = enabled
+            blocklist_filter.enabled = enabled
+            client.get('/api/v1/auth/me', headers=headers)
+            started = time.perf_counter()
+            for _ in range(count):
+                client.get('/api/v1/auth/me', headers=headers)
+            report(label, time.perf_counter() - started, count)
+
+        print(f"\nrevocation_cache: {revocation_cache.stats()}")
+        print(f"blocklist_filter: {blocklist_filter.stats()}")
+
+
+if __name__ == '__main__':
+    main()
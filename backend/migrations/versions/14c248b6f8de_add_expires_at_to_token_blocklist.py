@@ -0,0 +1,31 @@
+"""Add expires_at to token_blocklist
+
+Revision ID: 14c248b6f8de
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-17 09:12:41.402117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '14c248b6f8de'
+down_revision = 'a1b2c3d4e5f6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Recreate the table with AUTOINCREMENT so purged ids are never reused
+    # (the blocklist bloom filter catches up on new rows by id).
+    with op.batch_alter_table('token_blocklist', schema=None, recreate='always',
+                              table_kwargs={'sqlite_autoincrement': True}) as batch_op:
+        batch_op.add_column(sa.Column('expires_at', sa.DateTime(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_token_blocklist_expires_at'), ['expires_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('token_blocklist', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_token_blocklist_expires_at'))
+        batch_op.drop_column('expires_at')
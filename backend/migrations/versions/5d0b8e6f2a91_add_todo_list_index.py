@@ -0,0 +1,27 @@
+"""Add per-user list index to todo_items
+
+Revision ID: 5d0b8e6f2a91
+Revises: 7c7be460528e
+Create Date: 2026-10-17 11:20:41.372916
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d0b8e6f2a91'
+down_revision = '7c7be460528e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('todo_items', schema=None) as batch_op:
+        batch_op.create_index('ix_todo_items_user_focus_created',
+                              ['user_id', 'is_current_focus', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('todo_items', schema=None) as batch_op:
+        batch_op.drop_index('ix_todo_items_user_focus_created')
@@ -0,0 +1,26 @@
+"""Add token_epoch to users
+
+Revision ID: 7c7be460528e
+Revises: 14c248b6f8de
+Create Date: 2026-10-17 10:03:18.559201
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c7be460528e'
+down_revision = '14c248b6f8de'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('token_epoch', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('token_epoch')
@@ -0,0 +1,56 @@
+"""Add an FTS5 full-text index over todo titles and descriptions
+
+SQLite only; on other databases GET /todos/search uses its LIKE fallback
+and this migration does nothing. The triggers live on todo_items, so a later
+batch_alter_table that recreates todo_items drops them: recreate them (and
+rebuild the index) in that migration.
+
+Revision ID: 9a2e5b7c1d34
+Revises: f1c3a8e2d457
+Create Date: 2026-10-17 16:02:47.318560
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a2e5b7c1d34'
+down_revision = 'f1c3a8e2d457'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute(
+        "CREATE VIRTUAL TABLE todo_items_fts USING fts5("
+        "title, description, content='todo_items', content_rowid='id', tokenize='trigram')"
+    )
+    op.execute(
+        "CREATE TRIGGER todo_items_fts_insert AFTER INSERT ON todo_items BEGIN "
+        "INSERT INTO todo_items_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END"
+    )
+    op.execute(
+        "CREATE TRIGGER todo_items_fts_delete AFTER DELETE ON todo_items BEGIN "
+        "INSERT INTO todo_items_fts(todo_items_fts, rowid, title, description) "
+        "VALUES ('delete', old.id, old.title, old.description); END"
+    )
+    op.execute(
+        "CREATE TRIGGER todo_items_fts_update AFTER UPDATE OF title, description ON todo_items BEGIN "
+        "INSERT INTO todo_items_fts(todo_items_fts, rowid, title, description) "
+        "VALUES ('delete', old.id, old.title, old.description); "
+        "INSERT INTO todo_items_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END"
+    )
+    # Index the rows that already exist.
+    op.execute("INSERT INTO todo_items_fts(todo_items_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute("DROP TRIGGER IF EXISTS todo_items_fts_update")
+    op.execute("DROP TRIGGER IF EXISTS todo_items_fts_delete")
+    op.execute("DROP TRIGGER IF EXISTS todo_items_fts_insert")
+    op.execute("DROP TABLE IF EXISTS todo_items_fts")
@@ -0,0 +1,56 @@
+"""Add tags and the todo_tags link table
+
+The trigger that drops an item's links when it is deleted is SQLite only
+(SQLite runs with foreign keys off, so ON DELETE CASCADE does not fire
+there); other databases rely on the cascade.
+
+Revision ID: b5e8d2f1c947
+Revises: e2b9c4d7a018
+Create Date: 2026-10-17 21:03:58.119264
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5e8d2f1c947'
+down_revision = 'e2b9c4d7a018'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('tags',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'name', name='uq_tags_user_name')
+    )
+    op.create_table('todo_tags',
+    sa.Column('todo_id', sa.Integer(), nullable=False),
+    sa.Column('tag_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['tag_id'], ['tags.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['todo_id'], ['todo_items.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('todo_id', 'tag_id')
+    )
+    op.create_index('ix_todo_tags_user_tag_todo', 'todo_tags', ['user_id', 'tag_id', 'todo_id'])
+
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute(
+            "CREATE TRIGGER todo_items_tags_delete AFTER DELETE ON todo_items BEGIN "
+            "DELETE FROM todo_tags WHERE todo_id = old.id; END"
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS todo_items_tags_delete")
+    op.drop_index('ix_todo_tags_user_tag_todo', table_name='todo_tags')
+    op.drop_table('todo_tags')
+    op.drop_table('tags')
@@ -0,0 +1,30 @@
+"""Add filter and sort indexes to todo_items
+
+Revision ID: b83e4c1f9d27
+Revises: 5d0b8e6f2a91
+Create Date: 2026-10-17 11:58:06.114520
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b83e4c1f9d27'
+down_revision = '5d0b8e6f2a91'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('todo_items', schema=None) as batch_op:
+        batch_op.create_index('ix_todo_items_user_created', ['user_id', 'created_at'], unique=False)
+        batch_op.create_index('ix_todo_items_user_status_created', ['user_id', 'status', 'created_at'], unique=False)
+        batch_op.create_index('ix_todo_items_user_due_date', ['user_id', 'due_date'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('todo_items', schema=None) as batch_op:
+        batch_op.drop_index('ix_todo_items_user_due_date')
+        batch_op.drop_index('ix_todo_items_user_status_created')
+        batch_op.drop_index('ix_todo_items_user_created')
@@ -0,0 +1,101 @@
+"""Add soft delete (deleted_at) and the trash indexes to todo items
+
+The list indexes become partial (WHERE deleted_at IS NULL) so trashed rows
+stay out of every list read, and two partial indexes on the trashed rows
+serve GET /todos/trash and the purge job. Plain ALTER TABLE (no batch
+recreate) so the FTS and tag triggers survive; the rollup triggers are
+recreated so trashed children stop counting.
+
+Revision ID: c3f7a9e4b512
+Revises: b5e8d2f1c947
+Create Date: 2026-10-17 23:05:41.318260
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3f7a9e4b512'
+down_revision = 'b5e8d2f1c947'
+branch_labels = None
+depends_on = None
+
+LIVE = sa.text('deleted_at IS NULL')
+TRASHED = sa.text('deleted_at IS NOT NULL')
+
+LIST_INDEXES = [
+    ('ix_todo_items_user_focus_created', ['user_id', 'is_current_focus', 'created_at', 'id']),
+    ('ix_todo_items_user_created', ['user_id', 'created_at']),
+    ('ix_todo_items_user_status_created', ['user_id', 'status', 'created_at']),
+    ('ix_todo_items_user_due_date', ['user_id', 'due_date']),
+    ('ix_todo_items_user_position', ['user_id', 'position']),
+]
+
+
+def _rollup(sign, row, trash):
+    live = f" AND {row}.deleted_at IS NULL" if trash else ""
+    count = f"({row}.deleted_at IS NULL)" if trash else "1"
+    return (
+        f"UPDATE todo_items SET subtask_count = subtask_count {sign} {count}, "
+        f"subtask_done_count = subtask_done_count {sign} ({row}.status = 'completed'{live}), "
+        f"sync_version = coalesce((SELECT version FROM todo_sync_state WHERE user_id = {row}.user_id), sync_version) "
+        f"WHERE id = {row}.parent_id; "
+    )
+
+
+def _create_rollup_triggers(trash):
+    columns = "status, parent_id, deleted_at" if trash else "status, parent_id"
+    changed = "old.parent_id IS NOT new.parent_id OR old.status IS NOT new.status"
+    if trash:
+        changed += " OR old.deleted_at IS NOT new.deleted_at"
+    op.execute(
+        "CREATE TRIGGER todo_items_rollup_insert AFTER INSERT ON todo_items "
+        "WHEN new.parent_id IS NOT NULL BEGIN " + _rollup('+', 'new', trash) + "END"
+    )
+    op.execute(
+        "CREATE TRIGGER todo_items_rollup_delete AFTER DELETE ON todo_items "
+        "WHEN old.parent_id IS NOT NULL BEGIN " + _rollup('-', 'old', trash) + "END"
+    )
+    op.execute(
+        f"CREATE TRIGGER todo_items_rollup_update AFTER UPDATE OF {columns} ON todo_items "
+        "WHEN (old.parent_id IS NOT NULL OR new.parent_id IS NOT NULL) "
+        f"AND ({changed}) BEGIN "
+        + _rollup('-', 'old', trash) + _rollup('+', 'new', trash) + "END"
+    )
+
+
+def _drop_rollup_triggers():
+    op.execute("DROP TRIGGER IF EXISTS todo_items_rollup_update")
+    op.execute("DROP TRIGGER IF EXISTS todo_items_rollup_delete")
+    op.execute("DROP TRIGGER IF EXISTS todo_items_rollup_insert")
+
+
+def upgrade():
+    op.add_column('todo_items', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    for name, columns in LIST_INDEXES:
+        op.drop_index(name, table_name='todo_items')
+        op.create_index(name, 'todo_items', columns, sqlite_where=LIVE, postgresql_where=LIVE)
+    op.create_index('ix_todo_items_user_deleted', 'todo_items', ['user_id', 'deleted_at'],
+                    sqlite_where=TRASHED, postgresql_where=TRASHED)
+    op.create_index('ix_todo_items_deleted', 'todo_items', ['deleted_at'],
+                    sqlite_where=TRASHED, postgresql_where=TRASHED)
+
+    if op.get_bind().dialect.name == 'sqlite':
+        _drop_rollup_triggers()
+        _create_rollup_triggers(trash=True)
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'sqlite':
+        _drop_rollup_triggers()
+    # Trashed rows would reappear as live ones without the column.
+    op.execute("DELETE FROM todo_items WHERE deleted_at IS NOT NULL")
+    op.drop_index('ix_todo_items_deleted', table_name='todo_items')
+    op.drop_index('ix_todo_items_user_deleted', table_name='todo_items')
+    for name, columns in LIST_INDEXES:
+        op.drop_index(name, table_name='todo_items')
+        op.create_index(name, 'todo_items', columns, unique=False)
+    op.drop_column('todo_items', 'deleted_at')
+    if op.get_bind().dialect.name == 'sqlite':
+        _create_rollup_triggers(trash=False)
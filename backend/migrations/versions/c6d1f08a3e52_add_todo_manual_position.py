@@ -0,0 +1,61 @@
+"""Add a manual-order position to todo items
+
+Existing items are numbered per user in their current newest-first order,
+using the same consecutive keys as utils/order_keys.keys_between.
+
+Revision ID: c6d1f08a3e52
+Revises: 9a2e5b7c1d34
+Create Date: 2026-10-17 17:21:05.604219
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c6d1f08a3e52'
+down_revision = '9a2e5b7c1d34'
+branch_labels = None
+depends_on = None
+
+_DIGITS = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'
+
+
+def _nth_key(n):
+    # Keys a0..az, then b00..bzz, c000..: head letter = number of digits.
+    length = 1
+    while n >= len(_DIGITS) ** length:
+        n -= len(_DIGITS) ** length
+        length += 1
+    digits = ''
+    for _ in range(length):
+        n, d = divmod(n, len(_DIGITS))
+        digits = _DIGITS[d] + digits
+    return chr(ord('a') + length - 1) + digits
+
+
+def upgrade():
+    # Plain ALTER TABLE rather than batch_alter_table: on SQLite a batch
+    # recreate of todo_items would drop its FTS triggers (see 9a2e5b7c1d34).
+    op.add_column('todo_items', sa.Column('position', sa.Text(), server_default='a0', nullable=False))
+
+    bind = op.get_bind()
+    todo_items = sa.table('todo_items', sa.column('id', sa.Integer), sa.column('user_id', sa.Integer),
+                          sa.column('created_at', sa.DateTime), sa.column('position', sa.Text))
+    rows = bind.execute(sa.select(todo_items.c.id, todo_items.c.user_id)
+                        .order_by(todo_items.c.user_id, todo_items.c.created_at.desc(), todo_items.c.id.desc()))
+    params, user_id, n = [], None, 0
+    for row in rows:
+        n = n + 1 if row.user_id == user_id else 0
+        user_id = row.user_id
+        params.append({'row_id': row.id, 'new_position': _nth_key(n)})
+    if params:
+        bind.execute(todo_items.update().where(todo_items.c.id == sa.bindparam('row_id'))
+                     .values(position=sa.bindparam('new_position')), params)
+
+    op.create_index('ix_todo_items_user_position', 'todo_items', ['user_id', 'position'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_todo_items_user_position', table_name='todo_items')
+    op.drop_column('todo_items', 'position') # Needs SQLite 3.35+ for ALTER TABLE DROP COLUMN
@@ -0,0 +1,92 @@
+"""Add an owner column to the todo full-text index so searches match per user
+
+The FTS5 table gains an 'owner' column holding 'u<user_id>u' and GET
+/todos/search puts that token into its MATCH, so the index lookup, bm25
+ranking and paging only see the caller's rows. The external content comes
+from the todo_items_fts_content view, which derives the token from
+todo_items.user_id. SQLite only, like 9a2e5b7c1d34.
+
+Revision ID: d8b1f6a2c934
+Revises: c3f7a9e4b512
+Create Date: 2026-10-18 10:12:36.904215
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8b1f6a2c934'
+down_revision = 'c3f7a9e4b512'
+branch_labels = None
+depends_on = None
+
+OWNER = "'u' || {row}.user_id || 'u'"
+
+
+def _drop_index():
+    op.execute("DROP TRIGGER IF EXISTS todo_items_fts_update")
+    op.execute("DROP TRIGGER IF EXISTS todo_items_fts_delete")
+    op.execute("DROP TRIGGER IF EXISTS todo_items_fts_insert")
+    op.execute("DROP TABLE IF EXISTS todo_items_fts")
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    _drop_index()
+    op.execute(
+        "CREATE VIEW todo_items_fts_content AS "
+        "SELECT id, 'u' || user_id || 'u' AS owner, title, description FROM todo_items"
+    )
+    op.execute(
+        "CREATE VIRTUAL TABLE todo_items_fts USING fts5("
+        "owner, title, description, content='todo_items_fts_content', content_rowid='id', tokenize='trigram')"
+    )
+    new, old = OWNER.format(row='new'), OWNER.format(row='old')
+    op.execute(
+        "CREATE TRIGGER todo_items_fts_insert AFTER INSERT ON todo_items BEGIN "
+        "INSERT INTO todo_items_fts(rowid, owner, title, description) "
+        f"VALUES (new.id, {new}, new.title, new.description); END"
+    )
+    op.execute(
+        "CREATE TRIGGER todo_items_fts_delete AFTER DELETE ON todo_items BEGIN "
+        "INSERT INTO todo_items_fts(todo_items_fts, rowid, owner, title, description) "
+        f"VALUES ('delete', old.id, {old}, old.title, old.description); END"
+    )
+    op.execute(
+        "CREATE TRIGGER todo_items_fts_update AFTER UPDATE OF user_id, title, description ON todo_items BEGIN "
+        "INSERT INTO todo_items_fts(todo_items_fts, rowid, owner, title, description) "
+        f"VALUES ('delete', old.id, {old}, old.title, old.description); "
+        "INSERT INTO todo_items_fts(rowid, owner, title, description) "
+        f"VALUES (new.id, {new}, new.title, new.description); END"
+    )
+    op.execute("INSERT INTO todo_items_fts(todo_items_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    _drop_index()
+    op.execute("DROP VIEW IF EXISTS todo_items_fts_content")
+    # The index of 9a2e5b7c1d34.
+    op.execute(
+        "CREATE VIRTUAL TABLE todo_items_fts USING fts5("
+        "title, description, content='todo_items', content_rowid='id', tokenize='trigram')"
+    )
+    op.execute(
+        "CREATE TRIGGER todo_items_fts_insert AFTER INSERT ON todo_items BEGIN "
+        "INSERT INTO todo_items_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END"
+    )
+    op.execute(
+        "CREATE TRIGGER todo_items_fts_delete AFTER DELETE ON todo_items BEGIN "
+        "INSERT INTO todo_items_fts(todo_items_fts, rowid, title, description) "
+        "VALUES ('delete', old.id, old.title, old.description); END"
+    )
+    op.execute(
+        "CREATE TRIGGER todo_items_fts_update AFTER UPDATE OF title, description ON todo_items BEGIN "
+        "INSERT INTO todo_items_fts(todo_items_fts, rowid, title, description) "
+        "VALUES ('delete', old.id, old.title, old.description); "
+        "INSERT INTO todo_items_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END"
+    )
+    op.execute("INSERT INTO todo_items_fts(todo_items_fts) VALUES ('rebuild')")
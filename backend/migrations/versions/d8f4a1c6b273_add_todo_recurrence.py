@@ -0,0 +1,35 @@
+"""Add recurrence rules and materialized occurrences to todo items
+
+Plain ALTER TABLE (no batch recreate) so the FTS triggers on todo_items
+survive; recurrence_id has no FOREIGN KEY for the same reason, since SQLite
+cannot drop a column that is part of one.
+
+Revision ID: d8f4a1c6b273
+Revises: c6d1f08a3e52
+Create Date: 2026-10-17 18:40:13.271904
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8f4a1c6b273'
+down_revision = 'c6d1f08a3e52'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('todo_items', sa.Column('recurrence', sa.Text(), nullable=True))
+    op.add_column('todo_items', sa.Column('recurrence_id', sa.Integer(), nullable=True))
+    op.add_column('todo_items', sa.Column('occurrence_date', sa.Date(), nullable=True))
+    op.create_index('ux_todo_items_recurrence_occurrence', 'todo_items', ['recurrence_id', 'occurrence_date'],
+                    unique=True)
+
+
+def downgrade():
+    op.drop_index('ux_todo_items_recurrence_occurrence', table_name='todo_items')
+    op.drop_column('todo_items', 'occurrence_date')
+    op.drop_column('todo_items', 'recurrence_id')
+    op.drop_column('todo_items', 'recurrence')
@@ -0,0 +1,65 @@
+"""Add subtasks (parent_id) and subtask rollup counts to todo items
+
+Plain ALTER TABLE (no batch recreate) so the FTS triggers on todo_items
+survive; parent_id has no FOREIGN KEY for the same reason. The rollup
+triggers are SQLite only, like the FTS ones; a later batch_alter_table that
+recreates todo_items must recreate them too.
+
+Revision ID: e2b9c4d7a018
+Revises: d8f4a1c6b273
+Create Date: 2026-10-17 20:12:36.504817
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2b9c4d7a018'
+down_revision = 'd8f4a1c6b273'
+branch_labels = None
+depends_on = None
+
+
+def _rollup(sign, row):
+    return (
+        f"UPDATE todo_items SET subtask_count = subtask_count {sign} 1, "
+        f"subtask_done_count = subtask_done_count {sign} ({row}.status = 'completed'), "
+        f"sync_version = coalesce((SELECT version FROM todo_sync_state WHERE user_id = {row}.user_id), sync_version) "
+        f"WHERE id = {row}.parent_id; "
+    )
+
+
+def upgrade():
+    op.add_column('todo_items', sa.Column('parent_id', sa.Integer(), nullable=True))
+    op.add_column('todo_items', sa.Column('subtask_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('todo_items', sa.Column('subtask_done_count', sa.Integer(), nullable=False, server_default='0'))
+    op.create_index('ix_todo_items_parent', 'todo_items', ['parent_id'])
+
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute(
+        "CREATE TRIGGER todo_items_rollup_insert AFTER INSERT ON todo_items "
+        "WHEN new.parent_id IS NOT NULL BEGIN " + _rollup('+', 'new') + "END"
+    )
+    op.execute(
+        "CREATE TRIGGER todo_items_rollup_delete AFTER DELETE ON todo_items "
+        "WHEN old.parent_id IS NOT NULL BEGIN " + _rollup('-', 'old') + "END"
+    )
+    op.execute(
+        "CREATE TRIGGER todo_items_rollup_update AFTER UPDATE OF status, parent_id ON todo_items "
+        "WHEN (old.parent_id IS NOT NULL OR new.parent_id IS NOT NULL) "
+        "AND (old.parent_id IS NOT new.parent_id OR old.status IS NOT new.status) BEGIN "
+        + _rollup('-', 'old') + _rollup('+', 'new') + "END"
+    )
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS todo_items_rollup_update")
+        op.execute("DROP TRIGGER IF EXISTS todo_items_rollup_delete")
+        op.execute("DROP TRIGGER IF EXISTS todo_items_rollup_insert")
+    op.drop_index('ix_todo_items_parent', table_name='todo_items')
+    op.drop_column('todo_items', 'subtask_done_count')
+    op.drop_column('todo_items', 'subtask_count')
+    op.drop_column('todo_items', 'parent_id')
@@ -0,0 +1,34 @@
+"""Add per-user list indexes to future_plans and achievements
+
+Revision ID: e4a7c2d9b610
+Revises: b83e4c1f9d27
+Create Date: 2026-10-17 13:20:41.582301
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4a7c2d9b610'
+down_revision = 'b83e4c1f9d27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('future_plans', schema=None) as batch_op:
+        batch_op.create_index('ix_future_plans_user_target_created',
+                              ['user_id', 'target_date', sa.text('created_at DESC')], unique=False)
+
+    with op.batch_alter_table('achievements', schema=None) as batch_op:
+        batch_op.create_index('ix_achievements_user_date_created',
+                              ['user_id', 'date_achieved', 'created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('achievements', schema=None) as batch_op:
+        batch_op.drop_index('ix_achievements_user_date_created')
+
+    with op.batch_alter_table('future_plans', schema=None) as batch_op:
+        batch_op.drop_index('ix_future_plans_user_target_created')
@@ -0,0 +1,55 @@
+"""Add delta sync versions and tombstones for todo items
+
+Revision ID: f1c3a8e2d457
+Revises: e4a7c2d9b610
+Create Date: 2026-10-17 14:36:12.904117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1c3a8e2d457'
+down_revision = 'e4a7c2d9b610'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('todo_sync_state',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('compacted_through', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    op.create_table('todo_tombstones',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('todo_id', sa.Integer(), nullable=False),
+    sa.Column('sync_version', sa.Integer(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('todo_tombstones', schema=None) as batch_op:
+        batch_op.create_index('ix_todo_tombstones_user_sync_version', ['user_id', 'sync_version'], unique=False)
+        batch_op.create_index(batch_op.f('ix_todo_tombstones_deleted_at'), ['deleted_at'], unique=False)
+
+    with op.batch_alter_table('todo_items', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('sync_version', sa.Integer(), server_default='0', nullable=False))
+        batch_op.create_index('ix_todo_items_user_sync_version', ['user_id', 'sync_version'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('todo_items', schema=None) as batch_op:
+        batch_op.drop_index('ix_todo_items_user_sync_version')
+        batch_op.drop_column('sync_version')
+
+    with op.batch_alter_table('todo_tombstones', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_todo_tombstones_deleted_at'))
+        batch_op.drop_index('ix_todo_tombstones_user_sync_version')
+
+    op.drop_table('todo_tombstones')
+    op.drop_table('todo_sync_state')
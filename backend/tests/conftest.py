@@ -0,0 +1,89 @@
+# /your_project_root/tests/conftest.py
+# Shared pytest fixtures and helpers for the API test modules.
+# A module that defines its own test_app/client fixtures (e.g. with a different config) overrides these.
+
+import pytest
+import json
+import re
+from contextlib import contextmanager
+from sqlalchemy import event
+from app import create_app
+from app.extensions import db
+from app.models.user import User
+from app.models.user_profile import UserProfile
+from app.models.todo_item import TodoItem
+from app.models.todo_sync_state import TodoSyncState
+from app.models.todo_tombstone import TodoTombstone
+from app.models.tag import Tag
+from app.models.todo_tag import TodoTag
+from app.models.future_plan import FuturePlan
+from app.models.achievement import Achievement
+
+# Tables emptied by the auth fixture, children before parents.
+CLEARED_MODELS = (TodoTag, Tag, TodoTombstone, TodoSyncState, TodoItem, FuturePlan, Achievement, UserProfile, User)
+
+# --- Helpers ---
+
+def login(client, username):
+    """Registers and logs in a user; returns (user_id, headers)."""
+    email = f'{username}@example.com'
+    client.post('/api/v1/auth/register', data=json.dumps(
+        {'username': username, 'email': email, 'password': 'password123'}), content_type='application/json')
+    response = client.post('/api/v1/auth/login', data=json.dumps(
+        {'email': email, 'password': 'password123'}), content_type='application/json')
+    user_id = User.query.filter_by(email=email).one().id
+    return user_id, {'Authorization': f"Bearer {json.loads(response.data)['access_token']}"}
+
+
+@contextmanager
+def statements_on(table, writes_only=False):
+    """
+    Collects the SQL statements that mention table (a regex, e.g. 'todo_items'
+    or '(todo_items|todo_tags)'). With writes_only, only the INSERTs, UPDATEs
+    and DELETEs whose target is table are kept.
+    """
+    pattern = re.compile(rf'(INSERT INTO|UPDATE|DELETE FROM) {table}\b' if writes_only else rf'\b{table}\b')
+    find = pattern.match if writes_only else pattern.search
+    statements = []
+    def collect(conn, cursor, statement, parameters, context, executemany):
+        if find(statement):
+            statements.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', collect)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', collect)
+
+
+def verbs(statements):
+    """The leading SQL keyword (SELECT, UPDATE, ...) of each statement."""
+    return [statement.split()[0].upper() for statement in statements]
+
+# --- Fixtures ---
+
+@pytest.fixture(scope='module')
+def test_app():
+    """Creates an app instance using the 'testing' configuration."""
+    flask_app = create_app(config_name='testing')
+    with flask_app.app_context():
+        db.create_all()
+        yield flask_app
+        db.session.remove()
+        db.drop_all()
+        db.engine.dispose()
+
+
+@pytest.fixture(scope='module')
+def client(test_app):
+    """Provides a test client for the app."""
+    with test_app.test_client() as testing_client:
+        yield testing_client
+
+
+@pytest.fixture(scope='function')
+def auth(client, test_app):
+    """Clears the tables, then registers and logs in a user. Returns (user_id, headers)."""
+    for model in CLEARED_MODELS:
+        model.query.delete()
+    db.session.commit()
+    return login(client, 'owner')
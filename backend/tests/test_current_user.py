@@ -0,0 +1,165 @@
+# /your_project_root/tests/test_current_user.py
+# Pytest test cases for the JWT current-user loader and its identity cache.
+
+import pytest
+import json
+from flask import Flask
+from app import create_app
+from app.config import TestingConfig
+from app.extensions import db, identity_cache, revocation_cache
+from app.models.user import User
+from app.models.user_profile import UserProfile
+from app.models.token_blocklist import TokenBlocklist
+from app.utils.identity_cache import IdentityCache
+from flask_jwt_extended import create_access_token
+from tests.conftest import login, statements_on
+
+# --- Test Fixtures ---
+
+@pytest.fixture(scope='module')
+def test_app(tmp_path_factory):
+    """Creates a testing app whose identity cache syncs through a private file."""
+    sync_file = tmp_path_factory.mktemp('identity') / 'identity.gen'
+    patch = pytest.MonkeyPatch()
+    patch.setattr(TestingConfig, 'IDENTITY_SYNC_FILE', str(sync_file), raising=False)
+    flask_app = create_app(config_name='testing')
+    patch.undo()
+    with flask_app.app_context():
+        db.create_all()
+        yield flask_app
+        db.session.remove()
+        db.drop_all()
+        db.engine.dispose()
+
+
+@pytest.fixture(scope='module')
+def client(test_app):
+    """Provides a test client for the app."""
+    with test_app.test_client() as testing_client:
+        yield testing_client
+
+
+@pytest.fixture(scope='function')
+def clean_db(test_app):
+    """Clears users, profiles and blocklist rows (which drops their cached identities) before each test."""
+    TokenBlocklist.query.delete()
+    UserProfile.query.delete()
+    User.query.delete()
+    db.session.commit()
+    db.session.expunge_all()
+    revocation_cache.clear()
+    yield
+
+
+@pytest.fixture(scope='function')
+def auth_headers(client, clean_db):
+    """Registers and logs in a user, returning fresh Authorization headers."""
+    return login(client, 'viewer')[1]
+
+
+@pytest.fixture(scope='function')
+def user_queries(test_app):
+    """Collects every SQL statement that reads the users table."""
+    with statements_on('users') as statements:
+        yield statements
+
+
+def make_standalone_cache(tmp_path):
+    """Builds an IdentityCache bound to a throwaway app and a shared sync file."""
+    app = Flask(__name__, instance_path=str(tmp_path))
+    app.config['IDENTITY_SYNC_FILE'] = str(tmp_path / 'identity.gen')
+    return IdentityCache(app)
+
+
+# --- Test Cases ---
+
+class TestCurrentUserLoader:
+    """Test suite for resolving the JWT identity to a cached user snapshot."""
+
+    def test_warm_requests_do_not_select_user(self, client, auth_headers, user_queries):
+        assert client.get('/api/v1/auth/me', headers=auth_headers).status_code == 200
+        user_queries.clear()
+        for _ in range(3):
+            assert client.get('/api/v1/todo/todos', headers=auth_headers).status_code == 200
+            response = client.get('/api/v1/auth/me', headers=auth_headers)
+            assert json.loads(response.data)['username'] == 'viewer'
+        assert user_queries == []
+
+    def test_profile_update_is_visible_immediately(self, client, auth_headers):
+        assert client.get('/api/v1/anchor/profile', headers=auth_headers).status_code == 200
+        response = client.put('/api/v1/anchor/profile', headers=auth_headers,
+                              data=json.dumps({'professional_title': 'Engineer'}), content_type='application/json')
+        assert response.status_code == 200
+
+        response = client.get('/api/v1/anchor/profile', headers=auth_headers)
+        assert json.loads(response.data)['professional_title'] == 'Engineer'
+
+    def test_password_change_invalidates_snapshot(self, client, auth_headers):
+        client.get('/api/v1/auth/me', headers=auth_headers)
+        before = identity_cache.db_lookups
+        response = client.post('/api/v1/auth/change-password', headers=auth_headers,
+                               data=json.dumps({'new_password': 'new-password'}), content_type='application/json')
+        assert response.status_code == 200
+        client.get('/api/v1/auth/me', headers=auth_headers)
+        assert identity_cache.db_lookups == before + 1
+
+    def test_deleted_user_is_not_served_from_the_cache(self, client, auth_headers):
+        assert client.get('/api/v1/auth/me', headers=auth_headers).status_code == 200
+        db.session.delete(User.query.filter_by(username='viewer').one())
+        db.session.commit()
+
+        response = client.get('/api/v1/auth/me', headers=auth_headers)
+        assert response.status_code == 404
+
+    def test_reused_id_resolves_to_the_new_user(self, client, auth_headers):
+        old_id = User.query.filter_by(username='viewer').one().id
+        assert client.get('/api/v1/auth/me', headers=auth_headers).status_code == 200
+        UserProfile.query.delete()
+        User.query.delete()
+        db.session.commit()
+
+        new_id, headers = login(client, 'successor')
+        assert new_id == old_id # SQLite hands out the freed id again
+        response = client.get('/api/v1/auth/me', headers=headers)
+        assert json.loads(response.data)['username'] == 'successor'
+
+    def test_unknown_user_is_rejected(self, client, clean_db):
+        headers = {'Authorization': f"Bearer {create_access_token(identity='999999')}"}
+        response = client.get('/api/v1/todo/todos', headers=headers)
+        assert response.status_code == 404
+        assert json.loads(response.data)['error'] == 'User not found'
+
+    def test_invalidation_reaches_other_workers(self, tmp_path):
+        worker_a, worker_b = make_standalone_cache(tmp_path), make_standalone_cache(tmp_path)
+        loads = []
+
+        def loader(identity):
+            loads.append(identity)
+            return {'id': identity}
+
+        worker_b.load('1', loader)
+        worker_b.load('1', loader)
+        assert loads == ['1']
+
+        worker_a.invalidate(1)
+        worker_b.load('1', loader)
+        assert loads == ['1', '1']
+
+    def test_invalidation_drops_only_that_user(self, tmp_path):
+        worker_a, worker_b = make_standalone_cache(tmp_path), make_standalone_cache(tmp_path)
+        loads = []
+
+        def loader(identity):
+            loads.append(identity)
+            return {'id': identity}
+
+        for worker in (worker_a, worker_b):
+            worker.load('1', loader)
+            worker.load('2', loader)
+        loads.clear()
+
+        worker_a.invalidate(1)
+        for worker in (worker_a, worker_b):
+            worker.load('1', loader)
+            worker.load('2', loader)
+        assert loads == ['1', '1']
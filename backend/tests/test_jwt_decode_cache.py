@@ -0,0 +1,99 @@
+# /your_project_root/tests/test_jwt_decode_cache.py
+# Pytest test cases for the verified-JWT decode cache.
+
+import pytest
+import json
+import time
+import datetime
+from app import create_app
+from app.config import TestingConfig
+from app.extensions import db, jwt, revocation_cache
+from app.models.user import User
+from app.models.user_profile import UserProfile
+from app.models.token_blocklist import TokenBlocklist
+from flask_jwt_extended import create_access_token, decode_token
+
+# --- Test Fixtures ---
+
+@pytest.fixture(scope='module')
+def test_app():
+    """Creates a testing app with the decode cache switched on."""
+    patch = pytest.MonkeyPatch()
+    patch.setattr(TestingConfig, 'JWT_DECODE_CACHE_ENABLED', True, raising=False)
+    flask_app = create_app(config_name='testing')
+    patch.undo()
+    with flask_app.app_context():
+        db.create_all()
+        yield flask_app
+        db.session.remove()
+        db.drop_all()
+        db.engine.dispose()
+
+
+@pytest.fixture(scope='module')
+def client(test_app):
+    """Provides a test client for the app."""
+    with test_app.test_client() as testing_client:
+        yield testing_client
+
+
+@pytest.fixture(scope='function')
+def user(test_app):
+    """Creates a fresh user and empties the caches."""
+    TokenBlocklist.query.delete()
+    UserProfile.query.delete()
+    User.query.delete()
+    db.session.commit()
+    revocation_cache.clear()
+    jwt.clear_decode_cache()
+    user = User(username='decoder', email='decoder@example.com', password='password123')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def bearer(token):
+    return {'Authorization': f'Bearer {token}'}
+
+
+# --- Test Cases ---
+
+class TestJWTDecodeCache:
+    """Test suite for skipping signature verification of already-verified tokens."""
+
+    def test_repeat_requests_skip_full_decode(self, client, user):
+        token = create_access_token(identity=str(user.id))
+        before = jwt.full_decodes
+        for _ in range(5):
+            assert client.get('/api/v1/auth/me', headers=bearer(token)).status_code == 200
+        assert jwt.full_decodes - before == 1
+        assert jwt.decode_cache_stats()['hits'] >= 4
+
+    def test_tampered_token_is_not_served_from_cache(self, client, user):
+        token = create_access_token(identity=str(user.id))
+        assert client.get('/api/v1/auth/me', headers=bearer(token)).status_code == 200
+
+        header, payload, signature = token.split('.')
+        forged = f"{header}.{payload}.{signature[:-2]}{'AA' if signature[-2:] != 'AA' else 'BB'}"
+        assert client.get('/api/v1/auth/me', headers=bearer(forged)).status_code == 422
+
+    def test_cached_claims_are_a_copy(self, test_app, user):
+        token = create_access_token(identity=str(user.id))
+        decode_token(token)['sub'] = 'someone-else'
+        assert decode_token(token)['sub'] == str(user.id)
+
+    def test_entry_expires_with_token(self, client, user):
+        token = create_access_token(identity=str(user.id), expires_delta=datetime.timedelta(seconds=1))
+        assert client.get('/api/v1/auth/me', headers=bearer(token)).status_code == 200
+        time.sleep(1.1)
+        response = client.get('/api/v1/auth/me', headers=bearer(token))
+        assert response.status_code == 401
+        assert 'expired' in json.loads(response.data)['msg'].lower()
+
+    def test_logout_evicts_and_revokes(self, client, user):
+        token = create_access_token(identity=str(user.id))
+        assert client.get('/api/v1/auth/me', headers=bearer(token)).status_code == 200
+        size = jwt.decode_cache_stats()['size']
+        assert client.post('/api/v1/auth/logout', headers=bearer(token)).status_code == 200
+        assert jwt.decode_cache_stats()['size'] == size - 1
+        assert client.get('/api/v1/auth/me', headers=bearer(token)).status_code == 401
@@ -0,0 +1,106 @@
+# /your_project_root/tests/test_list_indexes.py
+# Pytest test cases checking that the per-user list endpoints are served by their indexes.
+
+import pytest
+import json
+import datetime
+from app import create_app
+from app.extensions import db
+from app.models.user import User
+from app.models.user_profile import UserProfile
+from app.models.future_plan import FuturePlan
+from app.models.achievement import Achievement
+from app.api.plans_bp import PLAN_LIST_ORDER
+from app.api.achievements_bp import ACHIEVEMENT_LIST_ORDER
+
+# --- Test Fixtures ---
+
+@pytest.fixture(scope='module')
+def test_app():
+    """Creates an app instance using the 'testing' configuration."""
+    flask_app = create_app(config_name='testing')
+    with flask_app.app_context():
+        db.create_all()
+        yield flask_app
+        db.session.remove()
+        db.drop_all()
+        db.engine.dispose()
+
+
+@pytest.fixture(scope='module')
+def client(test_app):
+    """Provides a test client for the app."""
+    with test_app.test_client() as testing_client:
+        yield testing_client
+
+
+@pytest.fixture(scope='function')
+def auth(client, test_app):
+    """Clears the tables, then registers and logs in a user. Returns (user_id, headers)."""
+    FuturePlan.query.delete()
+    Achievement.query.delete()
+    UserProfile.query.delete()
+    User.query.delete()
+    db.session.commit()
+    client.post('/api/v1/auth/register', data=json.dumps(
+        {'username': 'indexed', 'email': 'indexed@example.com', 'password': 'password123'}),
+        content_type='application/json')
+    response = client.post('/api/v1/auth/login', data=json.dumps(
+        {'email': 'indexed@example.com', 'password': 'password123'}), content_type='application/json')
+    user_id = User.query.filter_by(email='indexed@example.com').one().id
+    return user_id, {'Authorization': f"Bearer {json.loads(response.data)['access_token']}"}
+
+
+def query_plan(query):
+    """Returns SQLite's EXPLAIN QUERY PLAN text for an ORM query."""
+    compiled = query.statement.compile(db.engine)
+    params = tuple(compiled.params[name] for name in compiled.positiontup)
+    rows = db.session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params).all()
+    return ' '.join(row[-1] for row in rows)
+
+
+DATES = [datetime.date(2024, 5, 1), None, datetime.date(2024, 3, 1), None, datetime.date(2024, 5, 1)]
+
+
+# --- Test Cases ---
+
+class TestPlanListIndex:
+    """GET /plans reads ix_future_plans_user_target_created in list order."""
+
+    def test_list_query_needs_no_sort(self, auth):
+        user_id, _ = auth
+        plan = query_plan(FuturePlan.query.filter_by(user_id=user_id).order_by(*PLAN_LIST_ORDER))
+        assert 'ix_future_plans_user_target_created (user_id=?)' in plan
+        assert 'TEMP B-TREE' not in plan
+
+    def test_order_puts_undated_plans_last(self, client, auth):
+        user_id, headers = auth
+        base = datetime.datetime(2024, 1, 1)
+        for i, target in enumerate(DATES):
+            db.session.add(FuturePlan(user_id=user_id, title=f'plan {i}', description='d', target_date=target,
+                                      created_at=base + datetime.timedelta(hours=i)))
+        db.session.commit()
+
+        plans = json.loads(client.get('/api/v1/plans/', headers=headers).data)
+        assert [p['title'] for p in plans] == ['plan 2', 'plan 4', 'plan 0', 'plan 3', 'plan 1']
+
+
+class TestAchievementListIndex:
+    """GET /achievements reads ix_achievements_user_date_created backwards."""
+
+    def test_list_query_needs_no_sort(self, auth):
+        user_id, _ = auth
+        plan = query_plan(Achievement.query.filter_by(user_id=user_id).order_by(*ACHIEVEMENT_LIST_ORDER))
+        assert 'ix_achievements_user_date_created (user_id=?)' in plan
+        assert 'TEMP B-TREE' not in plan
+
+    def test_order_puts_undated_achievements_last(self, client, auth):
+        user_id, headers = auth
+        base = datetime.datetime(2024, 1, 1)
+        for i, achieved in enumerate(DATES):
+            db.session.add(Achievement(user_id=user_id, title=f'ach {i}', date_achieved=achieved,
+                                       created_at=base + datetime.timedelta(hours=i)))
+        db.session.commit()
+
+        achievements = json.loads(client.get('/api/v1/achievements/', headers=headers).data)
+        assert [a['title'] for a in achievements] == ['ach 4', 'ach 0', 'ach 2', 'ach 3', 'ach 1']
@@ -0,0 +1,110 @@
+# /your_project_root/tests/test_owned_rows.py
+# Pytest test cases for the single-statement update/delete paths of owned rows.
+
+import pytest
+import json
+from app.extensions import db
+from app.models.todo_item import TodoItem
+from app.models.future_plan import FuturePlan
+from app.models.achievement import Achievement
+from tests.conftest import login, statements_on, verbs
+
+# --- Test Fixtures ---
+
+@pytest.fixture(scope='function')
+def users(client, auth):
+    """Clears the tables and logs in two users. Returns ((owner id, headers), (other id, headers))."""
+    return auth, login(client, 'stranger')
+
+
+@pytest.fixture(scope='function')
+def rows(users):
+    """Creates one todo, plan and achievement for the owner. Returns their URLs."""
+    (owner_id, _), _ = users
+    todo = TodoItem(user_id=owner_id, title='todo')
+    plan = FuturePlan(user_id=owner_id, title='plan', description='d')
+    achievement = Achievement(user_id=owner_id, title='achievement')
+    db.session.add_all([todo, plan, achievement])
+    db.session.commit()
+    return {
+        'todo_items': f'/api/v1/todo/todos/{todo.id}',
+        'future_plans': f'/api/v1/plans/{plan.id}',
+        'achievements': f'/api/v1/achievements/{achievement.id}',
+    }
+
+
+
+def put(client, url, headers, body):
+    return client.put(url, headers=headers, data=json.dumps(body), content_type='application/json')
+
+
+UPDATES = {
+    'todo_items': {'status': 'completed'},
+    'future_plans': {'status': 'achieved'},
+    'achievements': {'title': 'renamed'},
+}
+
+# --- Test Cases ---
+
+class TestSingleStatementMutations:
+    """Update and delete run as one statement against the owned table."""
+
+    @pytest.mark.parametrize('table', ['todo_items', 'future_plans', 'achievements'])
+    def test_update_is_one_update_returning(self, client, users, rows, table):
+        (_, headers), _ = users
+        with statements_on(table) as statements:
+            response = put(client, rows[table], headers, UPDATES[table])
+
+        assert response.status_code == 200, response.data
+        assert verbs(statements) == ['UPDATE']
+        body = json.loads(response.data)
+        field, value = next(iter(UPDATES[table].items()))
+        assert body[field] == value
+
+    @pytest.mark.parametrize('table, statement', [
+        ('todo_items', 'UPDATE'), # To-do items go to the trash (soft delete)
+        ('future_plans', 'DELETE'),
+        ('achievements', 'DELETE'),
+    ])
+    def test_delete_is_one_statement(self, client, users, rows, table, statement):
+        (_, headers), _ = users
+        with statements_on(table) as statements:
+            response = client.delete(rows[table], headers=headers)
+
+        assert response.status_code == 204
+        assert verbs(statements) == [statement]
+        assert client.delete(rows[table], headers=headers).status_code == 404
+
+    def test_completing_a_todo_sets_completed_at(self, client, users, rows):
+        (_, headers), _ = users
+        body = json.loads(put(client, rows['todo_items'], headers, {'status': 'completed'}).data)
+        assert body['completed_at'] is not None
+        body = json.loads(put(client, rows['todo_items'], headers, {'status': 'pending'}).data)
+        assert body['completed_at'] is None
+
+
+class TestOwnershipErrors:
+    """A write that matches no row is reported as 404 or 403, as before."""
+
+    @pytest.mark.parametrize('table', ['todo_items', 'future_plans', 'achievements'])
+    def test_other_users_row_is_forbidden(self, client, users, rows, table):
+        _, (_, stranger) = users
+        assert put(client, rows[table], stranger, UPDATES[table]).status_code == 403
+        assert client.delete(rows[table], headers=stranger).status_code == 403
+        # A body with no updatable fields must not reveal someone else's row either.
+        assert put(client, rows[table], stranger, {'unknown': 1}).status_code == 403
+
+    @pytest.mark.parametrize('table', ['todo_items', 'future_plans', 'achievements'])
+    def test_missing_row_is_not_found(self, client, users, rows, table):
+        (_, headers), _ = users
+        missing = rows[table].rsplit('/', 1)[0] + '/999999'
+        assert put(client, missing, headers, UPDATES[table]).status_code == 404
+        assert client.delete(missing, headers=headers).status_code == 404
+
+    def test_failed_todo_write_does_not_advance_sync_token(self, client, users, rows):
+        _, (_, stranger) = users
+        put(client, rows['todo_items'], stranger, {'status': 'completed'})
+        client.delete(rows['todo_items'], headers=stranger)
+        # The version reserved for the failed write is rolled back with it.
+        body = json.loads(client.get('/api/v1/todo/todos/changes', headers=stranger).data)
+        assert body['data']['sync_token'] == 0
@@ -0,0 +1,231 @@
+# /your_project_root/tests/test_password_hashing.py
+# Pytest test cases for the bounded bcrypt pool and its use by the auth endpoints.
+
+import pytest
+import json
+import threading
+import time
+from flask import Flask
+from flask_bcrypt import Bcrypt
+from app import create_app
+from app.extensions import db, password_hasher
+from app.models.user import User
+from app.models.user_profile import UserProfile
+from app.models.token_blocklist import TokenBlocklist
+from app.utils.password_hashing import PasswordHasher, PasswordHashingBusy
+
+# --- Test Fixtures ---
+
+@pytest.fixture(scope='module')
+def test_app():
+    """Creates an app instance using the 'testing' configuration."""
+    flask_app = create_app(config_name='testing')
+    flask_app.config['ADMIN_EMAILS'] = ['metric@example.com']
+    with flask_app.app_context():
+        db.create_all()
+        yield flask_app
+        db.session.remove()
+        db.drop_all()
+        db.engine.dispose()
+
+
+@pytest.fixture(scope='module')
+def client(test_app):
+    """Provides a test client for the app."""
+    with test_app.test_client() as testing_client:
+        yield testing_client
+
+
+@pytest.fixture(scope='function')
+def clean_db(test_app):
+    """Clears users, profiles and blocklist rows before each test."""
+    TokenBlocklist.query.delete()
+    UserProfile.query.delete()
+    User.query.delete()
+    db.session.commit()
+    yield
+
+
+@pytest.fixture(scope='function')
+def registered_user(clean_db):
+    """Creates a user while the hashing pool is still free."""
+    user = User(username='busy', email='busy@example.com', password='irrelevant')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+@pytest.fixture(scope='function')
+def saturated_pool(monkeypatch):
+    """Makes the app's hashing pool report that every slot is taken."""
+    slots = threading.BoundedSemaphore(1)
+    slots.acquire()
+    monkeypatch.setattr(password_hasher, '_slots', slots)
+    yield
+
+
+def post_json(client, url, payload, headers=None):
+    return client.post(url, data=json.dumps(payload), content_type='application/json', headers=headers)
+
+
+def make_hasher(**config):
+    """Builds a PasswordHasher bound to a throwaway app."""
+    app = Flask(__name__)
+    app.config['BCRYPT_LOG_ROUNDS'] = 4
+    app.config.update(config)
+    bcrypt = Bcrypt(app)
+    return PasswordHasher(bcrypt, app)
+
+
+# --- Test Cases ---
+
+class TestPasswordHasher:
+    """Test suite for the bounded hashing pool."""
+
+    def test_hash_and_verify_on_pool(self):
+        hasher = make_hasher()
+        hashed = hasher.hash('s3cret')
+        assert hasher.verify(hashed, 's3cret') is True
+        assert hasher.verify(hashed, 'wrong') is False
+        stats = hasher.stats()
+        assert stats['completed'] == 3
+        assert stats['queue_depth'] == 0
+        assert stats['in_flight'] == 0
+
+    def test_full_queue_is_rejected(self):
+        hasher = make_hasher(PASSWORD_HASH_WORKERS=1, PASSWORD_HASH_QUEUE_SIZE=0)
+        release = threading.Event()
+        running = threading.Event()
+
+        def blocker():
+            running.set()
+            release.wait(5)
+
+        worker = threading.Thread(target=hasher.run, args=(blocker,))
+        worker.start()
+        running.wait(5)
+        try:
+            with pytest.raises(PasswordHashingBusy):
+                hasher.hash('another')
+        finally:
+            release.set()
+            worker.join()
+        assert hasher.stats()['rejected'] == 1
+
+    def test_needs_rehash_compares_cost(self):
+        hasher = make_hasher()
+        assert hasher.needs_rehash(hasher.hash('pw')) is False
+        assert hasher.needs_rehash(Bcrypt().generate_password_hash('pw', rounds=5).decode('utf-8')) is True
+        assert hasher.needs_rehash('not-a-bcrypt-hash') is False
+
+    def test_hash_later_is_dropped_when_pool_is_full(self, monkeypatch):
+        hasher = make_hasher()
+        slots = threading.BoundedSemaphore(1)
+        slots.acquire()
+        monkeypatch.setattr(hasher, '_slots', slots)
+        results = []
+        assert hasher.hash_later('pw', results.append) is None
+        assert results == []
+
+
+class TestRehashOnLogin:
+    """Test suite for upgrading hashes made at another bcrypt cost."""
+
+    @pytest.fixture
+    def pending_rehashes(self, monkeypatch):
+        """Records the futures of deferred rehashes so tests can wait on them."""
+        futures = []
+        original = password_hasher.hash_later
+
+        def recording(password, callback):
+            future = original(password, callback)
+            futures.append(future)
+            return future
+
+        monkeypatch.setattr(password_hasher, 'hash_later', recording)
+        return futures
+
+    def test_old_cost_hash_is_upgraded_after_login(self, client, clean_db, pending_rehashes):
+        user = User(username='legacy', email='legacy@example.com', password='placeholder')
+        user.password_hash = Bcrypt().generate_password_hash('password123', rounds=5).decode('utf-8')
+        db.session.add(user)
+        db.session.commit()
+
+        response = post_json(client, '/api/v1/auth/login', {'email': 'legacy@example.com', 'password': 'password123'})
+        assert response.status_code == 200
+        assert len(pending_rehashes) == 1
+        pending_rehashes[0].result(timeout=10)
+
+        db.session.expire_all()
+        stored = db.session.get(User, user.id)
+        assert stored.password_hash.startswith('$2b$04$')
+        assert stored.check_password('password123')
+
+    def test_current_cost_hash_is_left_alone(self, client, registered_user, pending_rehashes):
+        post_json(client, '/api/v1/auth/login', {'email': 'busy@example.com', 'password': 'irrelevant'})
+        assert pending_rehashes == []
+
+    def test_rehash_does_not_overwrite_a_newer_password(self, test_app, clean_db, pending_rehashes):
+        user = User(username='racer', email='racer@example.com', password='placeholder')
+        user.password_hash = Bcrypt().generate_password_hash('old-password', rounds=5).decode('utf-8')
+        db.session.add(user)
+        db.session.commit()
+
+        future = user.rehash_password_later('old-password')
+        user.set_password('new-password')
+        db.session.commit()
+        # The deferred write targets the old hash; it must not apply after the change above.
+        future.result(timeout=10)
+
+        db.session.expire_all()
+        assert db.session.get(User, user.id).check_password('new-password')
+
+
+class TestAuthLoadShedding:
+    """Test suite for 429 responses from the auth endpoints."""
+
+    def test_login_returns_429_when_pool_is_full(self, client, clean_db, registered_user, saturated_pool):
+        response = post_json(client, '/api/v1/auth/login', {'email': 'busy@example.com', 'password': 'x'})
+        assert response.status_code == 429
+        assert response.headers['Retry-After'] == '1'
+
+    def test_default_queue_fills_before_the_request_threads_run_out(self, client, test_app, clean_db):
+        # All but one of the shipped request threads are waiting on bcrypt; the last one gets the 429.
+        threads = test_app.config['REQUEST_THREADS']
+        busy = password_hasher.workers + password_hasher.queue_size
+        assert busy < threads
+        release = threading.Event()
+        holders = [threading.Thread(target=password_hasher.run, args=(lambda: release.wait(5),))
+                   for _ in range(busy)]
+        for holder in holders:
+            holder.start()
+        try:
+            deadline = time.monotonic() + 5
+            while password_hasher.stats()['in_flight'] + password_hasher.stats()['queue_depth'] < busy:
+                assert time.monotonic() < deadline
+                time.sleep(0.01)
+            response = post_json(client, '/api/v1/auth/register',
+                                 {'username': 'burst', 'email': 'burst@example.com', 'password': 'password123'})
+        finally:
+            release.set()
+            for holder in holders:
+                holder.join()
+        assert response.status_code == 429
+        assert response.headers['Retry-After'] == str(test_app.config['PASSWORD_HASH_RETRY_AFTER'])
+
+    def test_register_returns_429_without_creating_user(self, client, clean_db, saturated_pool):
+        response = post_json(client, '/api/v1/auth/register',
+                             {'username': 'newbie', 'email': 'newbie@example.com', 'password': 'password123'})
+        assert response.status_code == 429
+        assert User.query.filter_by(email='newbie@example.com').first() is None
+
+    def test_metrics_expose_pool_counters(self, client, clean_db):
+        post_json(client, '/api/v1/auth/register',
+                  {'username': 'metric', 'email': 'metric@example.com', 'password': 'password123'})
+        token = json.loads(post_json(client, '/api/v1/auth/login',
+                                     {'email': 'metric@example.com', 'password': 'password123'}).data)['access_token']
+        response = client.get('/api/v1/metrics', headers={'Authorization': f'Bearer {token}'})
+        data = json.loads(response.data)['data']
+        assert data['password_hasher']['completed'] >= 1
+        assert 'queue_depth' in data['password_hasher']
+        assert 'avg_run_ms' in data['password_hasher']
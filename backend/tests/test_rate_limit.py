@@ -0,0 +1,178 @@
+# /your_project_root/tests/test_rate_limit.py
+# Pytest test cases for the shared sliding-window rate limiter on login/registration.
+
+import pytest
+import json
+from flask import Flask
+from app import create_app
+from app.config import TestingConfig
+from app.extensions import db, rate_limiter
+from app.models.user import User
+from app.models.user_profile import UserProfile
+from app.utils.rate_limit import RateLimiter, RateLimitExceeded
+
+# --- Test Fixtures ---
+
+@pytest.fixture(scope='module')
+def test_app(tmp_path_factory):
+    """Creates a testing app with the rate limiter switched on."""
+    storage = tmp_path_factory.mktemp('ratelimit') / 'ratelimit.sqlite'
+    patch = pytest.MonkeyPatch()
+    patch.setattr(TestingConfig, 'RATELIMIT_ENABLED', True, raising=False)
+    patch.setattr(TestingConfig, 'RATELIMIT_STORAGE_FILE', str(storage), raising=False)
+    patch.setattr(TestingConfig, 'RATELIMIT_TRUSTED_PROXIES', 1, raising=False)
+    patch.setattr(TestingConfig, 'RATELIMIT_LIMITS', {
+        'auth.login': {'ip': (10, 60), 'email': (3, 60)},
+        'auth.register': {'ip': (2, 3600)},
+    }, raising=False)
+    flask_app = create_app(config_name='testing')
+    patch.undo()
+    with flask_app.app_context():
+        db.create_all()
+        yield flask_app
+        db.session.remove()
+        db.drop_all()
+        db.engine.dispose()
+
+
+@pytest.fixture(scope='module')
+def client(test_app):
+    """Provides a test client for the app."""
+    with test_app.test_client() as testing_client:
+        yield testing_client
+
+
+@pytest.fixture(scope='function')
+def clean_state(test_app):
+    """Clears users and recorded hits before each test."""
+    UserProfile.query.delete()
+    User.query.delete()
+    db.session.commit()
+    rate_limiter.reset()
+    yield
+
+
+@pytest.fixture(scope='function')
+def password_checks(monkeypatch):
+    """Counts calls to User.check_password."""
+    calls = []
+    original = User.check_password
+
+    def counting(self, password):
+        calls.append(password)
+        return original(self, password)
+
+    monkeypatch.setattr(User, 'check_password', counting)
+    return calls
+
+
+def make_limiter(path, **limits):
+    """Builds a RateLimiter on its own app, as a separate worker process would."""
+    app = Flask(__name__)
+    app.config['RATELIMIT_STORAGE_FILE'] = str(path)
+    app.config['RATELIMIT_LIMITS'] = limits
+    return RateLimiter(app)
+
+
+def login(client, email, password='wrong-password'):
+    return client.post('/api/v1/auth/login', data=json.dumps({'email': email, 'password': password}),
+                       content_type='application/json')
+
+
+# --- Test Cases ---
+
+class TestRateLimiter:
+    """Test suite for the sliding-window limiter itself."""
+
+    def test_limit_is_enforced_within_window(self, tmp_path):
+        limiter = make_limiter(tmp_path / 'rl.sqlite')
+        for i in range(3):
+            limiter.hit([('k', 3, 60)], now=1000 + i)
+        with pytest.raises(RateLimitExceeded) as excinfo:
+            limiter.hit([('k', 3, 60)], now=1010)
+        # The oldest hit (t=1000) leaves the window at t=1060.
+        assert excinfo.value.retry_after == 50
+        assert limiter.stats() == {'enabled': True, 'allowed': 3, 'rejected': 1}
+
+    def test_window_slides(self, tmp_path):
+        limiter = make_limiter(tmp_path / 'rl.sqlite')
+        limiter.hit([('k', 2, 60)], now=1000)
+        limiter.hit([('k', 2, 60)], now=1030)
+        limiter.hit([('k', 2, 60)], now=1061)
+        with pytest.raises(RateLimitExceeded):
+            limiter.hit([('k', 2, 60)], now=1070)
+
+    def test_rejected_hit_is_not_recorded_for_other_keys(self, tmp_path):
+        limiter = make_limiter(tmp_path / 'rl.sqlite')
+        limiter.hit([('email', 1, 60)], now=1000)
+        with pytest.raises(RateLimitExceeded):
+            limiter.hit([('ip', 1, 60), ('email', 1, 60)], now=1001)
+        limiter.hit([('ip', 1, 60)], now=1002)
+
+    def test_state_is_shared_between_instances(self, tmp_path):
+        path = tmp_path / 'rl.sqlite'
+        worker_a, worker_b = make_limiter(path), make_limiter(path)
+        worker_a.hit([('k', 2, 60)], now=1000)
+        worker_b.hit([('k', 2, 60)], now=1001)
+        with pytest.raises(RateLimitExceeded):
+            worker_a.hit([('k', 2, 60)], now=1002)
+
+    def test_zero_limit_rejects_with_the_window_as_retry_after(self, tmp_path):
+        limiter = make_limiter(tmp_path / 'rl.sqlite')
+        with pytest.raises(RateLimitExceeded) as excinfo:
+            limiter.hit([('k', 0, 60)], now=1000)
+        assert excinfo.value.retry_after == 60
+
+    @pytest.mark.parametrize('rule', [(0, 60), (5, 0)])
+    def test_configured_limits_below_one_are_rejected(self, tmp_path, rule):
+        with pytest.raises(ValueError):
+            make_limiter(tmp_path / 'rl.sqlite', **{'auth.login': {'ip': rule}})
+
+    def test_prune_removes_expired_hits(self, tmp_path):
+        limiter = make_limiter(tmp_path / 'rl.sqlite', **{'auth.login': {'ip': (5, 60)}})
+        limiter.hit([('a', 5, 60)], now=1000)
+        limiter.hit([('b', 5, 60)], now=1050)
+        assert limiter.prune(now=1070) == 1
+
+
+class TestAuthRateLimits:
+    """Test suite for the limits applied to the auth endpoints."""
+
+    def test_login_is_limited_per_email_before_password_check(self, client, clean_state, password_checks):
+        db.session.add(User(username='victim', email='victim@example.com', password='password123'))
+        db.session.commit()
+
+        for _ in range(3):
+            assert login(client, 'victim@example.com').status_code == 401
+        response = login(client, 'Victim@Example.com', 'password123')
+        assert response.status_code == 429
+        assert int(response.headers['Retry-After']) > 0
+        assert len(password_checks) == 3
+
+    def test_login_is_limited_per_ip_across_emails(self, client, clean_state, password_checks):
+        for i in range(10):
+            assert login(client, f'user{i}@example.com').status_code == 401
+        assert login(client, 'another@example.com').status_code == 429
+
+    def test_forwarded_clients_get_their_own_buckets(self, client, clean_state):
+        # Behind the proxy every request comes from its address; X-Forwarded-For names the client.
+        def login_from(address, email):
+            return client.post('/api/v1/auth/login', data=json.dumps({'email': email, 'password': 'wrong'}),
+                               content_type='application/json', headers={'X-Forwarded-For': address})
+
+        for i in range(10):
+            assert login_from('203.0.113.1', f'user{i}@example.com').status_code == 401
+        assert login_from('203.0.113.1', 'another@example.com').status_code == 429
+        assert login_from('203.0.113.2', 'another@example.com').status_code == 401
+
+    def test_register_is_limited_per_ip(self, client, clean_state):
+        for i in range(2):
+            response = client.post('/api/v1/auth/register', data=json.dumps(
+                {'username': f'new{i}', 'email': f'new{i}@example.com', 'password': 'password123'}),
+                content_type='application/json')
+            assert response.status_code == 201
+        response = client.post('/api/v1/auth/register', data=json.dumps(
+            {'username': 'new2', 'email': 'new2@example.com', 'password': 'password123'}),
+            content_type='application/json')
+        assert response.status_code == 429
+        assert User.query.filter_by(email='new2@example.com').first() is None
@@ -0,0 +1,128 @@
+# /your_project_root/tests/test_todo_batch.py
+# Pytest test cases for POST /api/v1/todo/todos/batch.
+
+import pytest
+import json
+from app.extensions import db
+from app.models.todo_item import TodoItem
+from tests.conftest import login, statements_on, verbs
+
+BATCH_URL = '/api/v1/todo/todos/batch'
+
+# --- Test Fixtures ---
+
+def seed(user_id, count, **fields):
+    todos = [TodoItem(user_id=user_id, title=f'todo {i}', **fields) for i in range(count)]
+    db.session.add_all(todos)
+    db.session.commit()
+    return [todo.id for todo in todos]
+
+
+def post_batch(client, headers, operations):
+    response = client.post(BATCH_URL, headers=headers, data=json.dumps({'operations': operations}),
+                           content_type='application/json')
+    return response.status_code, json.loads(response.data)
+
+
+# --- Test Cases ---
+
+class TestTodoBatch:
+    """Test suite for the transactional todo batch endpoint."""
+
+    def test_mixed_operations_return_results_in_order(self, client, auth):
+        user_id, headers = auth
+        keep, drop = seed(user_id, 2)
+        status, body = post_batch(client, headers, [
+            {'action': 'create', 'data': {'title': 'new one', 'priority': 'high', 'due_date': '2024-06-01'}},
+            {'action': 'update', 'id': keep, 'data': {'status': 'Completed', 'title': ' renamed '}},
+            {'action': 'delete', 'id': drop},
+        ])
+
+        assert status == 200
+        created, updated, deleted = body['data']
+        assert created['action'] == 'create' and created['data']['priority'] == 'high'
+        assert created['data']['due_date'] == '2024-06-01'
+        assert updated == {'index': 1, 'action': 'update', 'id': keep, 'data': updated['data']}
+        assert updated['data']['title'] == 'renamed'
+        assert updated['data']['completed_at'] is not None
+        assert deleted == {'index': 2, 'action': 'delete', 'id': drop}
+        assert TodoItem.query.filter_by(id=drop, deleted_at=None).count() == 0
+        assert TodoItem.query.filter_by(user_id=user_id, deleted_at=None).count() == 2
+
+    def test_any_invalid_operation_rejects_the_whole_batch(self, client, auth):
+        user_id, headers = auth
+        (todo_id,) = seed(user_id, 1)
+        status, body = post_batch(client, headers, [
+            {'action': 'create', 'data': {'title': 'fine'}},
+            {'action': 'update', 'id': todo_id, 'data': {'priority': 'urgent'}},
+            {'action': 'create', 'data': {'title': ''}},
+            {'action': 'archive', 'id': todo_id},
+        ])
+
+        assert status == 400
+        errors = body['details']['validation_errors']
+        assert set(errors) == {'operations[1].priority', 'operations[2].title', 'operations[3].action'}
+        assert TodoItem.query.filter_by(user_id=user_id).count() == 1
+        assert db.session.get(TodoItem, todo_id).priority == 'medium'
+
+    def test_other_users_items_are_not_found(self, client, auth):
+        _, headers = auth
+        other_id, _ = login(client, 'other')
+        (foreign,) = seed(other_id, 1)
+        status, body = post_batch(client, headers, [{'action': 'delete', 'id': foreign}])
+
+        assert status == 400
+        assert body['details']['validation_errors'] == {'operations[0].id': ["To-do item not found"]}
+        assert db.session.get(TodoItem, foreign) is not None
+
+    def test_same_item_twice_is_rejected(self, client, auth):
+        user_id, headers = auth
+        (todo_id,) = seed(user_id, 1)
+        status, body = post_batch(client, headers, [
+            {'action': 'update', 'id': todo_id, 'data': {'status': 'completed'}},
+            {'action': 'delete', 'id': todo_id},
+        ])
+        assert status == 400
+        assert 'operations[1].id' in body['details']['validation_errors']
+
+    @pytest.mark.parametrize('operations', [[], 'delete everything', [{'action': 'update', 'id': 1, 'data': {}}]])
+    def test_malformed_batches_are_rejected(self, client, auth, operations):
+        _, headers = auth
+        status, _ = post_batch(client, headers, operations)
+        assert status == 400
+
+    def test_uncompleting_clears_completed_at_and_keeps_existing_completion(self, client, auth):
+        user_id, headers = auth
+        done, reopened = seed(user_id, 2)
+        post_batch(client, headers, [{'action': 'update', 'id': done, 'data': {'status': 'completed'}}])
+        first_completion = db.session.get(TodoItem, done).completed_at
+
+        _, body = post_batch(client, headers, [
+            {'action': 'update', 'id': done, 'data': {'status': 'completed'}},
+            {'action': 'update', 'id': reopened, 'data': {'status': 'pending'}},
+        ])
+        db.session.expire_all()
+        assert db.session.get(TodoItem, done).completed_at == first_completion
+        assert body['data'][1]['data']['completed_at'] is None
+
+    def test_statements_are_set_based(self, client, auth, test_app):
+        user_id, headers = auth
+        ids = seed(user_id, 60)
+        operations = ([{'action': 'update', 'id': i, 'data': {'status': 'completed'}} for i in ids[:50]]
+                      + [{'action': 'delete', 'id': i} for i in ids[50:]]
+                      + [{'action': 'create', 'data': {'title': f'created {n}'}} for n in range(20)])
+
+        with statements_on('todo_items', writes_only=True) as writes:
+            status, body = post_batch(client, headers, operations)
+        statements = verbs(writes)
+
+        assert status == 200
+        assert len(body['data']) == 80
+        assert [r['data']['title'] for r in body['data'][60:]] == [f'created {n}' for n in range(20)]
+        # On todo_items: 50 completions share one UPDATE, 10 deletes (to the trash) one more UPDATE,
+        # 20 creates one INSERT.
+        assert statements.count('UPDATE') == 2
+        assert statements.count('DELETE') == 0
+        assert statements.count('INSERT') == 1
+        assert TodoItem.query.filter_by(user_id=user_id, status='completed').count() == 50
+        assert TodoItem.query.filter_by(user_id=user_id, deleted_at=None).count() == 70
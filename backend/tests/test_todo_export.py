@@ -0,0 +1,129 @@
+# /your_project_root/tests/test_todo_export.py
+# Pytest test cases for GET /api/v1/todo/todos/export (streamed NDJSON/CSV).
+
+import pytest
+import csv
+import io
+import json
+import datetime
+import tracemalloc
+from app.extensions import db
+from app.models.todo_item import TodoItem
+from tests.conftest import login, statements_on
+
+TODOS_URL = '/api/v1/todo/todos'
+EXPORT_URL = f'{TODOS_URL}/export'
+
+# --- Test Fixtures ---
+
+def create(client, headers, **fields):
+    response = client.post(TODOS_URL, data=json.dumps(fields), headers=headers, content_type='application/json')
+    return json.loads(response.data)['data']['id']
+
+
+@pytest.fixture(scope='function')
+def todos(client, auth):
+    """Three items of the user (one trashed) and one of a stranger. Returns the ids by title."""
+    _, headers = auth
+    ids = {
+        'report': create(client, headers, title='report, "final"', tags=['work', 'urgent'], due_date='2024-05-01'),
+        'novel': create(client, headers, title='novel', description='chapter 1', status='completed'),
+        'trashed': create(client, headers, title='trashed'),
+    }
+    client.delete(f"{TODOS_URL}/{ids['trashed']}", headers=headers)
+    _, stranger = login(client, 'stranger')
+    ids['foreign'] = create(client, stranger, title='foreign')
+    return ids
+
+
+def seed(user_id, count):
+    """Inserts count plain items for user_id in one statement."""
+    now = datetime.datetime(2024, 1, 1)
+    db.session.execute(TodoItem.__table__.insert(), [
+        {'user_id': user_id, 'title': f'todo {n}', 'description': 'x' * 200, 'status': 'pending',
+         'priority': 'medium', 'is_current_focus': False, 'created_at': now, 'updated_at': now}
+        for n in range(count)])
+    db.session.commit()
+
+
+def export_peak(client, headers):
+    """Peak heap (bytes) while a streamed export is produced and consumed chunk by chunk."""
+    tracemalloc.start()
+    response = client.get(EXPORT_URL, headers=headers, buffered=False)
+    lines = sum(chunk.count(b'\n') for chunk in response.response)
+    response.close()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return lines, peak
+
+# --- Test Cases ---
+
+class TestExportFormats:
+    """The export carries every live item of the user, in either format."""
+
+    def test_ndjson_has_one_object_per_line(self, client, auth, todos):
+        _, headers = auth
+        response = client.get(EXPORT_URL, headers=headers)
+
+        assert response.status_code == 200
+        assert response.mimetype == 'application/x-ndjson'
+        assert response.headers['Content-Disposition'].startswith('attachment; filename="todos-')
+        rows = [json.loads(line) for line in response.data.decode('utf-8').splitlines()]
+        assert [row['title'] for row in rows] == ['novel', 'report, "final"']
+        assert rows[1]['tags'] == ['urgent', 'work']
+        assert rows[1]['due_date'] == '2024-05-01'
+
+    def test_csv_has_a_header_and_quoted_fields(self, client, auth, todos):
+        _, headers = auth
+        response = client.get(EXPORT_URL, headers=headers, query_string={'format': 'csv'})
+
+        assert response.status_code == 200
+        assert response.mimetype == 'text/csv'
+        rows = list(csv.DictReader(io.StringIO(response.data.decode('utf-8'))))
+        assert [row['title'] for row in rows] == ['novel', 'report, "final"']
+        assert rows[0]['description'] == 'chapter 1' and rows[0]['status'] == 'completed'
+        assert rows[1]['tags'] == 'urgent,work'
+        assert rows[1]['is_current_focus'] == 'false' and rows[1]['completed_at'] == ''
+
+    def test_list_filters_and_sort_apply(self, client, auth, todos):
+        _, headers = auth
+        response = client.get(EXPORT_URL, headers=headers, query_string={'tag': 'work'})
+        assert [json.loads(line)['id'] for line in response.data.splitlines()] == [todos['report']]
+        response = client.get(EXPORT_URL, headers=headers, query_string={'sort': 'created_at'})
+        assert [json.loads(line)['id'] for line in response.data.splitlines()] == [todos['report'], todos['novel']]
+
+    def test_invalid_requests(self, client, auth, todos):
+        _, headers = auth
+        assert client.get(EXPORT_URL, headers=headers, query_string={'format': 'xml'}).status_code == 400
+        assert client.get(EXPORT_URL, headers=headers, query_string={'status': 'bogus'}).status_code == 400
+        assert client.get(EXPORT_URL).status_code == 401
+
+
+class TestExportStreaming:
+    """The body is streamed from a server-side cursor, one batch at a time."""
+
+    def test_rows_are_streamed_in_batches(self, client, test_app, auth, monkeypatch):
+        user_id, headers = auth
+        seed(user_id, 10)
+        monkeypatch.setitem(test_app.config, 'TODO_EXPORT_BATCH_SIZE', 4)
+        with statements_on('(todo_items|todo_tags)') as statements:
+            response = client.get(EXPORT_URL, headers=headers, buffered=False)
+            assert response.is_streamed
+            chunks = [chunk for chunk in response.response if chunk]
+            response.close()
+
+        assert [chunk.count(b'\n') for chunk in chunks] == [4, 4, 2]
+        # One cursor over the items, one tag lookup per batch.
+        assert ['tags' if 'todo_tags' in s else 'items' for s in statements] == ['items', 'tags', 'tags', 'tags']
+
+    def test_memory_does_not_grow_with_the_row_count(self, client, test_app, auth, monkeypatch):
+        user_id, headers = auth
+        monkeypatch.setitem(test_app.config, 'TODO_EXPORT_BATCH_SIZE', 100)
+        seed(user_id, 500)
+        small_lines, small_peak = export_peak(client, headers)
+        seed(user_id, 4500)
+        large_lines, large_peak = export_peak(client, headers)
+
+        assert (small_lines, large_lines) == (500, 5000)
+        # Ten times the rows, about the same peak: only one batch is ever held.
+        assert large_peak < small_peak * 1.5
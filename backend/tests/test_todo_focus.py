@@ -0,0 +1,88 @@
+# /your_project_root/tests/test_todo_focus.py
+# Pytest test cases for POST /todos/<id>/focus (exclusive focus).
+
+import pytest
+import json
+from app.extensions import db
+from app.models.todo_item import TodoItem
+from tests.conftest import login, statements_on, verbs
+
+TODOS_URL = '/api/v1/todo/todos'
+
+# --- Test Fixtures ---
+
+def focus(client, headers, todo_id, query=''):
+    response = client.post(f'{TODOS_URL}/{todo_id}/focus{query}', headers=headers)
+    return response.status_code, json.loads(response.data)
+
+
+def focused_titles(user_id):
+    return sorted(t.title for t in TodoItem.query.filter_by(user_id=user_id, is_current_focus=True))
+
+
+@pytest.fixture(scope='function')
+def todos(auth):
+    """Five items, 'a' and 'c' already focused. Returns the ids by title."""
+    user_id, _ = auth
+    items = {title: TodoItem(user_id=user_id, title=title, is_current_focus=title in ('a', 'c')) for title in 'abcde'}
+    db.session.add_all(items.values())
+    db.session.commit()
+    return {title: todo.id for title, todo in items.items()}
+
+
+# --- Test Cases ---
+
+class TestFocus:
+    """Focusing one item, alone or alongside the others."""
+
+    def test_focus_keeps_other_focused_items(self, client, auth, todos):
+        user_id, headers = auth
+        status, body = focus(client, headers, todos['b'])
+        assert status == 200 and body['data']['is_current_focus'] is True
+        assert body['meta']['unfocused_ids'] == []
+        assert focused_titles(user_id) == ['a', 'b', 'c']
+
+    def test_exclusive_focus_clears_the_others(self, client, auth, todos):
+        user_id, headers = auth
+        status, body = focus(client, headers, todos['b'], '?exclusive=true')
+        assert status == 200
+        assert body['meta']['unfocused_ids'] == sorted([todos['a'], todos['c']])
+        assert focused_titles(user_id) == ['b']
+        # Focusing the item that already is the only focus changes nothing else.
+        status, body = focus(client, headers, todos['b'], '?exclusive=true')
+        assert status == 200 and body['meta']['unfocused_ids'] == []
+
+    def test_exclusive_focus_is_two_updates(self, client, auth, todos):
+        _, headers = auth
+        with statements_on('todo_items') as statements:
+            focus(client, headers, todos['e'], '?exclusive=true')
+        assert verbs(statements) == ['UPDATE', 'UPDATE']
+
+    def test_cleared_items_reach_delta_sync(self, client, auth, todos):
+        _, headers = auth
+        token = json.loads(client.get(f'{TODOS_URL}/changes', headers=headers).data)['data']['sync_token']
+        focus(client, headers, todos['d'], '?exclusive=1')
+        changes = json.loads(client.get(f'{TODOS_URL}/changes?since={token}', headers=headers).data)['data']
+        changed = {todo['id']: todo['is_current_focus'] for todo in changes['changed']}
+        assert changed == {todos['a']: False, todos['c']: False, todos['d']: True}
+
+
+class TestFocusErrors:
+    """Nothing changes when the item cannot be focused."""
+
+    def test_other_users_item_is_forbidden_and_clears_nothing(self, client, auth, todos):
+        user_id, _ = auth
+        _, stranger = login(client, 'stranger')
+        status, _ = focus(client, stranger, todos['b'], '?exclusive=true')
+        assert status == 403
+        assert focused_titles(user_id) == ['a', 'c']
+
+    def test_missing_item_is_not_found(self, client, auth, todos):
+        user_id, headers = auth
+        assert focus(client, headers, 999999, '?exclusive=true')[0] == 404
+        assert focused_titles(user_id) == ['a', 'c']
+
+    def test_invalid_exclusive_flag(self, client, auth, todos):
+        _, headers = auth
+        status, body = focus(client, headers, todos['b'], '?exclusive=maybe')
+        assert status == 400 and 'exclusive' in body['details']['validation_errors']
@@ -0,0 +1,241 @@
+# /your_project_root/tests/test_todo_listing.py
+# Pytest test cases for listing to-do items (pagination, query plans).
+
+import pytest
+import json
+import datetime
+from sqlalchemy import text
+from app import create_app
+from app.extensions import db
+from app.models.user import User
+from app.models.user_profile import UserProfile
+from app.models.todo_item import TodoItem
+from app.api.todo_bp import todo_list_query
+
+# --- Test Fixtures ---
+
+@pytest.fixture(scope='module')
+def test_app():
+    """Creates an app instance using the 'testing' configuration."""
+    flask_app = create_app(config_name='testing')
+    with flask_app.app_context():
+        db.create_all()
+        yield flask_app
+        db.session.remove()
+        db.drop_all()
+        db.engine.dispose()
+
+
+@pytest.fixture(scope='module')
+def client(test_app):
+    """Provides a test client for the app."""
+    with test_app.test_client() as testing_client:
+        yield testing_client
+
+
+@pytest.fixture(scope='function')
+def auth(client, test_app):
+    """Clears the tables, then registers and logs in a user. Returns (user_id, headers)."""
+    TodoItem.query.delete()
+    UserProfile.query.delete()
+    User.query.delete()
+    db.session.commit()
+    client.post('/api/v1/auth/register', data=json.dumps(
+        {'username': 'lister', 'email': 'lister@example.com', 'password': 'password123'}),
+        content_type='application/json')
+    response = client.post('/api/v1/auth/login', data=json.dumps(
+        {'email': 'lister@example.com', 'password': 'password123'}), content_type='application/json')
+    user_id = User.query.filter_by(email='lister@example.com').one().id
+    return user_id, {'Authorization': f"Bearer {json.loads(response.data)['access_token']}"}
+
+
+def seed_todos(user_id, count, focus_every=0, same_timestamp=False):
+    """Inserts count todos with distinct (or, optionally, identical) creation times."""
+    base = datetime.datetime(2024, 1, 1, 12, 0, 0)
+    for i in range(count):
+        created = base if same_timestamp else base + datetime.timedelta(minutes=i)
+        db.session.add(TodoItem(user_id=user_id, title=f'todo {i}', created_at=created,
+                                is_current_focus=bool(focus_every and i % focus_every == 0)))
+    db.session.commit()
+
+
+def query_plan(user_id, **args):
+    """Returns SQLite's EXPLAIN QUERY PLAN text for the GET /todos query built from args."""
+    query, _, errors = todo_list_query(user_id, args)
+    assert not errors
+    compiled = query.statement.compile(db.engine, compile_kwargs={'render_postcompile': True})
+    params = tuple(str(compiled.params[name]) for name in compiled.positiontup)
+    rows = db.session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params).all()
+    return ' '.join(row[-1] for row in rows)
+
+
+def list_ids(client, headers, query=''):
+    response = client.get(f'/api/v1/todo/todos?{query}', headers=headers)
+    assert response.status_code == 200, response.data
+    return [todo['id'] for todo in json.loads(response.data)['data']]
+
+
+def fetch_all_pages(client, headers, limit, query=''):
+    """Follows next_cursor until the last page; returns the ids in order and the page count."""
+    ids, pages, cursor = [], 0, None
+    while True:
+        url = f'/api/v1/todo/todos?limit={limit}&{query}' + (f'&cursor={cursor}' if cursor else '')
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200
+        body = json.loads(response.data)
+        ids.extend(todo['id'] for todo in body['data'])
+        pages += 1
+        cursor = body['meta']['next_cursor']
+        if not cursor:
+            return ids, pages
+
+
+# --- Test Cases ---
+
+class TestTodoPagination:
+    """Test suite for keyset pagination of GET /todos."""
+
+    def test_without_limit_returns_full_list(self, client, auth):
+        user_id, headers = auth
+        seed_todos(user_id, 7)
+        body = json.loads(client.get('/api/v1/todo/todos', headers=headers).data)
+        assert len(body['data']) == 7
+        assert 'meta' not in body
+
+    def test_pages_follow_full_list_order(self, client, auth):
+        user_id, headers = auth
+        seed_todos(user_id, 23, focus_every=5)
+        full = [t['id'] for t in json.loads(client.get('/api/v1/todo/todos', headers=headers).data)['data']]
+
+        ids, pages = fetch_all_pages(client, headers, limit=5)
+        assert ids == full
+        assert pages == 5
+        # Focus items come first.
+        assert all(t['is_current_focus'] for t in json.loads(
+            client.get('/api/v1/todo/todos?limit=5', headers=headers).data)['data'])
+
+    def test_ties_on_created_at_are_broken_by_id(self, client, auth):
+        user_id, headers = auth
+        seed_todos(user_id, 9, same_timestamp=True)
+        ids, _ = fetch_all_pages(client, headers, limit=4)
+        assert ids == sorted(ids, reverse=True)
+        assert len(set(ids)) == 9
+
+    def test_last_page_has_no_cursor(self, client, auth):
+        user_id, headers = auth
+        seed_todos(user_id, 3)
+        meta = json.loads(client.get('/api/v1/todo/todos?limit=3', headers=headers).data)['meta']
+        assert meta == {'limit': 3, 'has_more': False, 'next_cursor': None}
+
+    @pytest.mark.parametrize('query', ['limit=0', 'limit=abc', 'limit=1000', 'cursor=not-a-cursor'])
+    def test_invalid_parameters_are_rejected(self, client, auth, query):
+        _, headers = auth
+        assert client.get(f'/api/v1/todo/todos?{query}', headers=headers).status_code == 400
+
+    def test_keyset_query_uses_list_index(self, test_app, auth):
+        user_id, _ = auth
+        plan = db.session.execute(text(
+            "EXPLAIN QUERY PLAN SELECT id FROM todo_items WHERE user_id = :uid AND deleted_at IS NULL "
+            "AND (is_current_focus, created_at, id) < (:f, :c, :i) "
+            "ORDER BY is_current_focus DESC, created_at DESC, id DESC LIMIT 51"
+        ), {'uid': user_id, 'f': 1, 'c': '2024-01-01 12:00:00', 'i': 10}).all()
+        detail = ' '.join(row[-1] for row in plan)
+        assert 'ix_todo_items_user_focus_created' in detail
+        # The cursor is a range seek on the index, not a filter over skipped rows.
+        assert '(is_current_focus,created_at' in detail
+        assert 'TEMP B-TREE' not in detail
+
+
+class TestTodoFilters:
+    """Test suite for server-side filtering and sorting of GET /todos."""
+
+    @pytest.fixture
+    def todos(self, auth):
+        """Seeds a small, varied set of todos; returns (headers, {title: id})."""
+        user_id, headers = auth
+        specs = [
+            ('a', 'pending', 'high', datetime.date(2024, 3, 1), False),
+            ('b', 'completed', 'low', datetime.date(2024, 3, 10), False),
+            ('c', 'pending', 'low', None, True),
+            ('d', 'in_progress', 'medium', datetime.date(2024, 2, 20), False),
+            ('e', 'pending', 'medium', datetime.date(2024, 3, 10), False),
+        ]
+        base = datetime.datetime(2024, 1, 1)
+        ids = {}
+        for i, (title, status, priority, due, focus) in enumerate(specs):
+            todo = TodoItem(user_id=user_id, title=title, status=status, priority=priority, due_date=due,
+                            is_current_focus=focus, created_at=base + datetime.timedelta(hours=i))
+            db.session.add(todo)
+            db.session.flush()
+            ids[title] = todo.id
+        db.session.commit()
+        return headers, ids
+
+    def test_status_and_priority_filters(self, client, todos):
+        headers, ids = todos
+        assert list_ids(client, headers, 'status=pending&sort=created_at') == [ids['a'], ids['c'], ids['e']]
+        assert list_ids(client, headers, 'status=pending,in_progress&priority=medium&sort=created_at') == \
+            [ids['d'], ids['e']]
+
+    def test_due_date_range_is_inclusive(self, client, todos):
+        headers, ids = todos
+        assert list_ids(client, headers, 'due_after=2024-03-01&due_before=2024-03-10&sort=created_at') == \
+            [ids['a'], ids['b'], ids['e']]
+
+    def test_focus_filter(self, client, todos):
+        headers, ids = todos
+        assert list_ids(client, headers, 'is_current_focus=true') == [ids['c']]
+        assert ids['c'] not in list_ids(client, headers, 'is_current_focus=false')
+
+    def test_due_date_sort_puts_undated_last(self, client, todos):
+        headers, ids = todos
+        assert list_ids(client, headers, 'sort=due_date') == [ids['d'], ids['a'], ids['b'], ids['e'], ids['c']]
+        assert list_ids(client, headers, 'sort=-due_date') == [ids['e'], ids['b'], ids['a'], ids['d'], ids['c']]
+
+    @pytest.mark.parametrize('sort', ['due_date', '-due_date', 'created_at', '-created_at', 'focus'])
+    def test_pagination_works_with_every_sort(self, client, todos, sort):
+        headers, _ = todos
+        ids, _ = fetch_all_pages(client, headers, limit=2, query=f'sort={sort}')
+        assert ids == list_ids(client, headers, f'sort={sort}')
+
+    def test_cursor_from_other_sort_is_rejected(self, client, todos):
+        headers, _ = todos
+        cursor = json.loads(client.get('/api/v1/todo/todos?limit=2&sort=created_at',
+                                       headers=headers).data)['meta']['next_cursor']
+        response = client.get(f'/api/v1/todo/todos?limit=2&sort=due_date&cursor={cursor}', headers=headers)
+        assert response.status_code == 400
+
+    @pytest.mark.parametrize('query', ['status=done', 'priority=', 'due_before=03/01/2024',
+                                       'is_current_focus=maybe', 'sort=title'])
+    def test_invalid_filters_are_rejected(self, client, auth, query):
+        _, headers = auth
+        response = client.get(f'/api/v1/todo/todos?{query}', headers=headers)
+        if query == 'priority=':
+            assert response.status_code == 200 # An empty parameter means "no filter".
+        else:
+            assert response.status_code == 400
+            field = query.split('=')[0]
+            assert field in json.loads(response.data)['details']['validation_errors']
+
+    def test_status_filter_uses_status_index(self, auth):
+        user_id, _ = auth
+        plan = query_plan(user_id, status='pending', sort='-created_at')
+        assert 'ix_todo_items_user_status_created (user_id=? AND status=?)' in plan
+        assert 'TEMP B-TREE' not in plan
+
+    def test_due_range_uses_due_date_index(self, auth):
+        user_id, _ = auth
+        plan = query_plan(user_id, due_after='2024-01-01', due_before='2024-12-31')
+        assert 'ix_todo_items_user_due_date (user_id=? AND due_date>? AND due_date<?)' in plan
+
+    def test_focus_filter_uses_list_index(self, auth):
+        user_id, _ = auth
+        plan = query_plan(user_id, is_current_focus='true')
+        assert 'ix_todo_items_user_focus_created (user_id=? AND is_current_focus=?)' in plan
+        assert 'TEMP B-TREE' not in plan
+
+    def test_created_sort_reads_index_in_order(self, auth):
+        user_id, _ = auth
+        plan = query_plan(user_id, sort='created_at')
+        assert 'ix_todo_items_user_created (user_id=?)' in plan
+        assert 'TEMP B-TREE' not in plan
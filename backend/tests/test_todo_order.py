@@ -0,0 +1,170 @@
+# /your_project_root/tests/test_todo_order.py
+# Pytest test cases for manual to-do ordering (fractional positions and POST /todos/<id>/move).
+
+import pytest
+import json
+import random
+from app.extensions import db
+from app.models.todo_item import TodoItem
+from app.utils.order_keys import InvalidOrderKey, key_between, keys_between
+from app.utils.db_maintenance import rebalance_long_todo_positions
+from tests.conftest import login, statements_on, verbs
+
+TODOS_URL = '/api/v1/todo/todos'
+
+# --- Test Fixtures ---
+
+def create(client, headers, *titles):
+    ids = []
+    for title in titles:
+        response = client.post(TODOS_URL, headers=headers, data=json.dumps({'title': title}),
+                               content_type='application/json')
+        ids.append(json.loads(response.data)['data']['id'])
+    return ids
+
+
+def move(client, headers, todo_id, **neighbours):
+    response = client.post(f'{TODOS_URL}/{todo_id}/move', headers=headers, data=json.dumps(neighbours),
+                           content_type='application/json')
+    return response.status_code, json.loads(response.data)
+
+
+def manual_order(client, headers):
+    body = json.loads(client.get(TODOS_URL, headers=headers, query_string={'sort': 'position'}).data)
+    return [todo['title'] for todo in body['data']]
+
+
+# --- Test Cases ---
+
+class TestOrderKeys:
+    """Test suite for the fractional key generator."""
+
+    def test_random_inserts_stay_sorted(self):
+        rng = random.Random(7)
+        keys = [key_between(None, None)]
+        for _ in range(2000):
+            slot = rng.randint(0, len(keys))
+            before = keys[slot - 1] if slot else None
+            after = keys[slot] if slot < len(keys) else None
+            keys.insert(slot, key_between(before, after))
+        assert keys == sorted(keys)
+        assert len(set(keys)) == len(keys)
+
+    def test_appending_grows_keys_logarithmically(self):
+        key = key_between(None, None)
+        for _ in range(10000):
+            key = key_between(key, None)
+        assert len(key) <= 4
+        assert keys_between(None, None, 3) == ['a0', 'a1', 'a2']
+
+    @pytest.mark.parametrize('a, b', [('a1', 'a0'), ('a0', 'a0'), ('a00', None), ('', None), ('a!', None)])
+    def test_invalid_keys_are_rejected(self, a, b):
+        with pytest.raises(InvalidOrderKey):
+            key_between(a, b)
+
+
+class TestTodoMove:
+    """Test suite for moving to-do items in the manual order."""
+
+    def test_new_items_go_on_top(self, client, auth):
+        _, headers = auth
+        create(client, headers, 'first', 'second', 'third')
+        assert manual_order(client, headers) == ['third', 'second', 'first']
+
+        client.post(f'{TODOS_URL}/batch', headers=headers, content_type='application/json', data=json.dumps(
+            {'operations': [{'action': 'create', 'data': {'title': 'fourth'}},
+                            {'action': 'create', 'data': {'title': 'fifth'}}]}))
+        assert manual_order(client, headers) == ['fifth', 'fourth', 'third', 'second', 'first']
+
+    def test_move_between_to_top_and_to_bottom(self, client, auth):
+        _, headers = auth
+        c, b, a = create(client, headers, 'c', 'b', 'a')  # listed as a, b, c
+
+        status, body = move(client, headers, a, after=b, before=c)
+        assert status == 200
+        assert body['data']['id'] == a
+        assert manual_order(client, headers) == ['b', 'a', 'c']
+
+        move(client, headers, c, after=None, before=b)
+        assert manual_order(client, headers) == ['c', 'b', 'a']
+        move(client, headers, c, after=a)
+        assert manual_order(client, headers) == ['b', 'a', 'c']
+
+    def test_move_rewrites_one_row(self, client, auth):
+        _, headers = auth
+        ids = create(client, headers, *[f'todo {n}' for n in range(20)])
+
+        with statements_on('todo_items', writes_only=True) as writes:
+            status, _ = move(client, headers, ids[0], after=ids[10], before=ids[9])
+
+        assert status == 200
+        assert verbs(writes) == ['UPDATE']
+
+    def test_move_is_a_synced_change(self, client, auth):
+        _, headers = auth
+        low, high = create(client, headers, 'low', 'high')
+        token = json.loads(client.get(f'{TODOS_URL}/changes', headers=headers).data)['data']['sync_token']
+        move(client, headers, high, after=low)
+        body = json.loads(client.get(f'{TODOS_URL}/changes', headers=headers, query_string={'since': token}).data)
+        assert [todo['id'] for todo in body['data']['changed']] == [high]
+
+    def test_tied_neighbours_are_renumbered(self, client, auth):
+        user_id, headers = auth
+        # Rows inserted without a position all share the default key.
+        db.session.add_all([TodoItem(user_id=user_id, title=title) for title in ('x', 'y', 'z')])
+        db.session.commit()
+        x, y, z = [t.id for t in TodoItem.query.filter_by(user_id=user_id).order_by(TodoItem.id)]
+
+        status, _ = move(client, headers, z, after=x, before=y)
+        assert status == 200
+        assert manual_order(client, headers) == ['x', 'z', 'y']
+        positions = [t.position for t in TodoItem.query.filter_by(user_id=user_id)]
+        assert len(set(positions)) == 3
+
+    def test_invalid_moves(self, client, auth):
+        _, headers = auth
+        c, b, a = create(client, headers, 'c', 'b', 'a')
+        other_id, other_headers = login(client, 'other')
+        (foreign,) = create(client, other_headers, 'foreign')
+
+        assert move(client, headers, a, after=c, before=b)[0] == 400  # neighbours out of order
+        assert 'after' in move(client, headers, a, after=a)[1]['details']['validation_errors']
+        assert 'before' in move(client, headers, a, before='b')[1]['details']['validation_errors']
+        assert move(client, headers, a, after=foreign)[1]['details']['validation_errors'] == {
+            'after': ["To-do item not found"]}
+        assert move(client, other_headers, a, after=foreign)[0] == 403
+        assert move(client, headers, 999999, after=a)[0] == 404
+        assert manual_order(client, headers) == ['a', 'b', 'c']
+
+    def test_position_pagination(self, client, auth):
+        _, headers = auth
+        create(client, headers, *[f'todo {n}' for n in range(5)])
+        page = json.loads(client.get(TODOS_URL, headers=headers, query_string={'sort': 'position', 'limit': 3}).data)
+        rest = json.loads(client.get(TODOS_URL, headers=headers, query_string={
+            'sort': 'position', 'limit': 3, 'cursor': page['meta']['next_cursor']}).data)
+        assert [t['title'] for t in page['data'] + rest['data']] == [f'todo {n}' for n in reversed(range(5))]
+
+
+class TestPositionRebalance:
+    """Test suite for renumbering long position keys."""
+
+    def test_long_keys_are_renumbered_in_order(self, client, auth, test_app):
+        _, headers = auth
+        top, bottom = create(client, headers, 'bottom', 'top')[::-1]
+        # Repeatedly dropping items right below the top item lengthens their keys.
+        below = bottom
+        for n in range(30):
+            (todo_id,) = create(client, headers, f'moved {n}')
+            move(client, headers, todo_id, after=top, before=below)
+            below = todo_id
+        order = manual_order(client, headers)
+        assert max(len(t.position) for t in TodoItem.query) > 5
+
+        assert rebalance_long_todo_positions(max_length=5) == 1
+        assert rebalance_long_todo_positions(max_length=5) == 0
+        assert manual_order(client, headers) == order
+        assert max(len(t.position) for t in TodoItem.query) == 2
+
+        result = test_app.test_cli_runner().invoke(args=['todos', 'rebalance-positions'])
+        assert result.exit_code == 0, result.output
+        assert 'Rebalanced the to-do positions of 0 users' in result.output
@@ -0,0 +1,173 @@
+# /your_project_root/tests/test_todo_recurrence.py
+# Pytest test cases for recurring to-do items and their lazily materialized occurrences.
+
+import pytest
+import json
+import datetime
+from app.models.todo_item import TodoItem
+from app.utils.recurrence import InvalidRecurrence, RecurrenceRule
+from tests.conftest import login, statements_on
+
+TODOS_URL = '/api/v1/todo/todos'
+D = datetime.date
+
+# --- Test Fixtures ---
+
+def create(client, headers, **fields):
+    response = client.post(TODOS_URL, headers=headers, data=json.dumps(fields), content_type='application/json')
+    return response.status_code, json.loads(response.data)
+
+
+def window(client, headers, after, before, query=''):
+    response = client.get(f'{TODOS_URL}?due_after={after}&due_before={before}&sort=due_date{query}', headers=headers)
+    return json.loads(response.data)
+
+
+def put_occurrence(client, headers, todo_id, day, body):
+    response = client.put(f'{TODOS_URL}/{todo_id}/occurrences/{day}', headers=headers, data=json.dumps(body),
+                          content_type='application/json')
+    return response.status_code, json.loads(response.data)
+
+
+# --- Test Cases ---
+
+class TestRecurrenceRule:
+    """Test suite for the RRULE subset."""
+
+    def test_weekly_byday_with_count(self):
+        rule = RecurrenceRule.parse('RRULE:freq=weekly;byday=fr,mo;count=3')
+        assert rule.to_string() == 'FREQ=WEEKLY;BYDAY=MO,FR;COUNT=3'
+        # 2024-01-03 is a Wednesday, so the Monday of the first week is not an occurrence.
+        assert list(rule.between(D(2024, 1, 3), D(2024, 1, 1), D(2024, 12, 31))) == \
+            [D(2024, 1, 5), D(2024, 1, 8), D(2024, 1, 12)]
+
+    def test_monthly_falls_back_to_the_last_day(self):
+        rule = RecurrenceRule.parse('FREQ=MONTHLY;INTERVAL=1')
+        assert list(rule.between(D(2024, 1, 31), D(2024, 1, 1), D(2024, 4, 30))) == \
+            [D(2024, 1, 31), D(2024, 2, 29), D(2024, 3, 31), D(2024, 4, 30)]
+
+    def test_far_windows_jump_straight_to_the_window(self):
+        rule = RecurrenceRule.parse('FREQ=DAILY;UNTIL=99991231')
+        days = list(rule.between(D(1900, 1, 1), D(9999, 12, 30), D(9999, 12, 31)))
+        assert days == [D(9999, 12, 30), D(9999, 12, 31)]
+        assert rule.occurs_on(D(1900, 1, 1), D(5000, 6, 15))
+        assert not RecurrenceRule.parse('FREQ=DAILY;INTERVAL=2').occurs_on(D(1900, 1, 1), D(5000, 6, 15))
+
+    @pytest.mark.parametrize('text', ['', 'FREQ=HOURLY', 'FREQ=DAILY;BYDAY=MO', 'FREQ=DAILY;COUNT=0',
+                                      'FREQ=DAILY;COUNT=2;UNTIL=20240101', 'FREQ=WEEKLY;BYSETPOS=1', 'FREQ'])
+    def test_unsupported_rules_are_rejected(self, text):
+        with pytest.raises(InvalidRecurrence):
+            RecurrenceRule.parse(text)
+
+
+class TestRecurringTodos:
+    """Test suite for recurring items in the to-do API."""
+
+    def test_create_validates_the_rule(self, client, auth):
+        _, headers = auth
+        status, body = create(client, headers, title='standup', recurrence='FREQ=SECONDLY', due_date='2024-01-01')
+        assert status == 400 and 'recurrence' in body['details']['validation_errors']
+        status, body = create(client, headers, title='standup', recurrence='FREQ=DAILY')
+        assert status == 400 and 'due_date' in body['details']['validation_errors']['recurrence'][0]
+        status, body = create(client, headers, title='standup', recurrence='rrule:freq=daily', due_date='2024-01-01')
+        assert status == 201 and body['data']['recurrence'] == 'FREQ=DAILY'
+
+    def test_window_lists_generated_occurrences(self, client, auth):
+        _, headers = auth
+        _, body = create(client, headers, title='review', due_date='2024-01-05', recurrence='FREQ=WEEKLY')
+        review = body['data']['id']
+        create(client, headers, title='one-off', due_date='2024-01-10')
+        create(client, headers, title='outside', due_date='2024-03-01')
+
+        body = window(client, headers, '2024-01-01', '2024-01-20')
+        assert [(t['title'], t['due_date']) for t in body['data']] == [
+            ('review', '2024-01-05'), ('one-off', '2024-01-10'), ('review', '2024-01-12'), ('review', '2024-01-19')]
+        generated = body['data'][0]
+        assert generated['id'] is None and generated['recurrence_id'] == review
+        assert generated['occurrence_date'] == '2024-01-05'
+        assert 'meta' not in body
+        # Without a window the template itself is listed, as before.
+        listed = json.loads(client.get(TODOS_URL, headers=headers).data)['data']
+        assert sorted(t['title'] for t in listed) == ['one-off', 'outside', 'review']
+
+    def test_window_applies_the_other_filters_to_series(self, client, auth):
+        _, headers = auth
+        create(client, headers, title='gym', due_date='2024-01-01', recurrence='FREQ=DAILY', priority='low')
+        assert window(client, headers, '2024-01-01', '2024-01-03', '&priority=high')['data'] == []
+        assert len(window(client, headers, '2024-01-01', '2024-01-03', '&priority=low')['data']) == 3
+
+    def test_editing_an_occurrence_materializes_only_that_one(self, client, auth):
+        _, headers = auth
+        _, body = create(client, headers, title='standup', due_date='2024-01-01', recurrence='FREQ=DAILY;COUNT=5')
+        standup = body['data']['id']
+
+        status, body = put_occurrence(client, headers, standup, '2024-01-03', {'status': 'completed'})
+        assert status == 201
+        occurrence = body['data']
+        assert occurrence['id'] is not None and occurrence['completed_at'] is not None
+        assert (occurrence['recurrence_id'], occurrence['occurrence_date']) == (standup, '2024-01-03')
+        assert TodoItem.query.count() == 2
+
+        status, body = put_occurrence(client, headers, standup, '2024-01-03', {'title': 'standup (remote)'})
+        assert status == 200 and body['data']['id'] == occurrence['id']
+        assert body['data']['status'] == 'completed'
+
+        days = window(client, headers, '2024-01-01', '2024-01-31')['data']
+        assert [(t['id'], t['due_date']) for t in days] == [
+            (None, '2024-01-01'), (None, '2024-01-02'), (occurrence['id'], '2024-01-03'),
+            (None, '2024-01-04'), (None, '2024-01-05')]
+
+    def test_moved_occurrence_is_not_generated_again(self, client, auth):
+        _, headers = auth
+        _, body = create(client, headers, title='call', due_date='2024-01-01', recurrence='FREQ=WEEKLY')
+        put_occurrence(client, headers, body['data']['id'], '2024-01-08', {'due_date': '2024-02-01'})
+        days = window(client, headers, '2024-01-01', '2024-01-15')['data']
+        assert [t['due_date'] for t in days] == ['2024-01-01', '2024-01-15']
+
+    def test_occurrence_errors(self, client, auth):
+        _, headers = auth
+        _, body = create(client, headers, title='weekly', due_date='2024-01-01', recurrence='FREQ=WEEKLY')
+        weekly = body['data']['id']
+        _, body = create(client, headers, title='once', due_date='2024-01-01')
+        once = body['data']['id']
+        _, stranger = login(client, 'stranger')
+
+        assert put_occurrence(client, headers, weekly, '2024-01-02', {'status': 'completed'})[0] == 404
+        assert put_occurrence(client, headers, weekly, '2023-12-25', {'status': 'completed'})[0] == 404
+        assert put_occurrence(client, headers, once, '2024-01-01', {'status': 'completed'})[0] == 404
+        assert put_occurrence(client, headers, weekly, 'monday', {'status': 'completed'})[0] == 400
+        assert put_occurrence(client, headers, weekly, '2024-01-08', {'recurrence': 'FREQ=DAILY'})[0] == 400
+        assert put_occurrence(client, headers, weekly, '2024-01-08', {})[0] == 400
+        assert put_occurrence(client, stranger, weekly, '2024-01-08', {'status': 'completed'})[0] == 403
+        assert TodoItem.query.count() == 2
+
+    def test_deleting_a_series_deletes_its_occurrences(self, client, auth):
+        _, headers = auth
+        _, body = create(client, headers, title='series', due_date='2024-01-01', recurrence='FREQ=DAILY')
+        series = body['data']['id']
+        token = json.loads(client.get(f'{TODOS_URL}/changes', headers=headers).data)['data']['sync_token']
+        occurrence = put_occurrence(client, headers, series, '2024-01-02', {'status': 'completed'})[1]['data']['id']
+
+        assert client.delete(f'{TODOS_URL}/{series}', headers=headers).status_code == 204
+        assert TodoItem.query.filter_by(deleted_at=None).count() == 0
+        body = json.loads(client.get(f'{TODOS_URL}/changes', headers=headers, query_string={'since': token}).data)
+        assert sorted(body['data']['deleted']) == sorted([series, occurrence])
+
+    def test_window_cost_is_bounded(self, client, auth):
+        user_id, headers = auth
+        create(client, headers, title='forever', due_date='2000-01-01', recurrence='FREQ=DAILY')
+
+        with statements_on('todo_items') as statements:
+            body = window(client, headers, '2090-01-01', '2099-12-31')
+
+        # The rows, the series and their materialized occurrences: three queries, no per-day work in SQL.
+        assert len(statements) == 3
+        assert len(body['data']) == 366
+        assert body['data'][0]['due_date'] == '2090-01-01'
+        assert body['meta'] == {'occurrences_truncated': True}
+
+    def test_stats_do_not_count_series(self, client, auth):
+        _, headers = auth
+        create(client, headers, title='series', due_date='2000-01-01', recurrence='FREQ=DAILY')
+        stats = json.loads(client.get(f'{TODOS_URL}/stats', headers=headers).data)['data']
+        assert stats['total'] == 0 and stats['overdue'] == 0
@@ -0,0 +1,146 @@
+# /your_project_root/tests/test_todo_search.py
+# Pytest test cases for GET /api/v1/todo/todos/search and its FTS5 index.
+
+import pytest
+import json
+from app.extensions import db
+from app.models.todo_item import TodoItem
+from app.utils.todo_search import fts_match_expression, todo_search_query
+from tests.conftest import login
+
+SEARCH_URL = '/api/v1/todo/todos/search'
+
+# --- Test Fixtures ---
+
+def seed(user_id, *items):
+    """Creates (title, description) items for user_id; returns their ids."""
+    todos = [TodoItem(user_id=user_id, title=title, description=description) for title, description in items]
+    db.session.add_all(todos)
+    db.session.commit()
+    return [todo.id for todo in todos]
+
+
+def search(client, headers, q, **params):
+    response = client.get(SEARCH_URL, headers=headers, query_string={'q': q, **params})
+    return response.status_code, json.loads(response.data)
+
+
+def titles(body):
+    return [todo['title'] for todo in body['data']]
+
+
+# --- Test Cases ---
+
+class TestTodoSearch:
+    """Test suite for full-text to-do search."""
+
+    def test_results_are_ranked_and_every_term_must_match(self, client, auth):
+        user_id, headers = auth
+        seed(user_id, ('Call the plumber', 'kitchen sink leaks'),
+                      ('Buy groceries', 'milk, eggs and a new kitchen sponge'),
+                      ('Kitchen sink', 'replace the kitchen sink tap'),
+                      ('Walk the dog', None))
+
+        status, body = search(client, headers, 'kitchen')
+        assert status == 200
+        assert body['meta']['search_mode'] == 'fts'
+        # Title hits rank first.
+        assert titles(body)[0] == 'Kitchen sink'
+        assert set(titles(body)) == {'Kitchen sink', 'Call the plumber', 'Buy groceries'}
+
+        _, body = search(client, headers, 'SINK kitchen')
+        assert set(titles(body)) == {'Kitchen sink', 'Call the plumber'}
+
+    def test_substring_and_cjk_terms(self, client, auth):
+        user_id, headers = auth
+        seed(user_id, ('写周报告', '整理本周工作'), ('Refactoring notes', None))
+
+        _, body = search(client, headers, '周报告')
+        assert body['meta']['search_mode'] == 'fts' and titles(body) == ['写周报告']
+        _, body = search(client, headers, 'factor')
+        assert titles(body) == ['Refactoring notes']
+        # Two-character terms are below the trigram length and use the LIKE fallback.
+        _, body = search(client, headers, '工作')
+        assert body['meta']['search_mode'] == 'like' and titles(body) == ['写周报告']
+
+    def test_query_syntax_is_matched_literally(self, client, auth):
+        user_id, headers = auth
+        seed(user_id, ('50% off "deal"', None), ('Apples OR pears', None), ('Apples', None))
+
+        assert titles(search(client, headers, 'apples OR pears')[1]) == ['Apples OR pears']
+        assert titles(search(client, headers, '"deal"')[1]) == ['50% off "deal"']
+        assert titles(search(client, headers, '0%')[1]) == ['50% off "deal"']
+        assert search(client, headers, 'NEAR(')[0] == 200
+
+    def test_results_are_per_user(self, client, auth):
+        user_id, headers = auth
+        other_id, other_headers = login(client, 'other')
+        seed(user_id, ('secret project', None))
+        seed(other_id, ('other project', None))
+
+        assert titles(search(client, headers, 'project')[1]) == ['secret project']
+        assert titles(search(client, other_headers, 'project')[1]) == ['other project']
+        assert titles(search(client, other_headers, 'pr')[1]) == ['other project']
+
+    def test_index_lookup_is_per_user(self, client, auth):
+        user_id, headers = auth
+        other_id, _ = login(client, 'other')
+        mine = seed(user_id, ('shared term', None), ('notes', 'the shared plan'))
+        seed(other_id, *[(f'shared {n}', None) for n in range(5)])
+
+        # The MATCH itself only yields the user's rows, before any join on todo_items.
+        rowids = db.session.execute(db.text("SELECT rowid FROM todo_items_fts WHERE todo_items_fts MATCH :q"),
+                                    {'q': fts_match_expression(user_id, ['shared'])}).scalars().all()
+        assert sorted(rowids) == sorted(mine)
+        assert titles(search(client, headers, 'shared')[1]) == ['shared term', 'notes']
+
+    @pytest.mark.parametrize('q', ['fts', 'ab'])
+    def test_pagination_walks_every_match_once(self, client, auth, q):
+        user_id, headers = auth
+        seed(user_id, *[(f'{q} item {n}', 'fts ab ' * (n % 4)) for n in range(7)])
+
+        seen, cursor = [], None
+        while True:
+            params = {'limit': 3, **({'cursor': cursor} if cursor else {})}
+            status, body = search(client, headers, q, **params)
+            assert status == 200
+            seen += titles(body)
+            cursor = body['meta']['next_cursor']
+            if not cursor:
+                break
+        assert sorted(seen) == sorted(f'{q} item {n}' for n in range(7))
+
+    def test_index_follows_updates_and_deletes(self, client, auth):
+        user_id, headers = auth
+        renamed, deleted = seed(user_id, ('draft budget', None), ('budget review', None))
+
+        client.put(f'/api/v1/todo/todos/{renamed}', headers=headers, data=json.dumps({'title': 'final forecast'}),
+                   content_type='application/json')
+        client.delete(f'/api/v1/todo/todos/{deleted}', headers=headers)
+        client.post('/api/v1/todo/todos/batch', headers=headers, content_type='application/json', data=json.dumps(
+            {'operations': [{'action': 'create', 'data': {'title': 'budget v2'}}]}))
+
+        assert titles(search(client, headers, 'budget')[1]) == ['budget v2']
+        assert titles(search(client, headers, 'forecast')[1]) == ['final forecast']
+
+    @pytest.mark.parametrize('params', [{'q': '   '}, {}])
+    def test_missing_query_is_rejected(self, client, auth, params):
+        _, headers = auth
+        response = client.get(SEARCH_URL, headers=headers, query_string=params)
+        assert response.status_code == 400
+        assert 'q' in json.loads(response.data)['details']['validation_errors']
+
+    def test_cursor_from_the_other_mode_is_rejected(self, client, auth):
+        user_id, headers = auth
+        seed(user_id, *[('milk', None)] * 3)
+        cursor = search(client, headers, 'milk', limit=1)[1]['meta']['next_cursor']
+        assert search(client, headers, 'mi', limit=1, cursor=cursor)[0] == 400
+        assert search(client, headers, 'milk', cursor='garbage')[0] == 400
+
+    def test_fts_plan_uses_the_index(self, client, auth):
+        user_id, _ = auth
+        query, _ = todo_search_query(user_id, ['milk'], 'fts')
+        sql = str(query.compile(db.engine, compile_kwargs={'literal_binds': True}))
+        plan = ' '.join(row[3] for row in db.session.execute(db.text(f'EXPLAIN QUERY PLAN {sql}')))
+        assert 'VIRTUAL TABLE' in plan
+        assert 'SEARCH todo_items USING INTEGER PRIMARY KEY' in plan
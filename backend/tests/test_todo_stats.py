@@ -0,0 +1,79 @@
+# /your_project_root/tests/test_todo_stats.py
+# Pytest test cases for GET /api/v1/todo/todos/stats.
+
+import json
+import datetime
+from app.extensions import db
+from app.models.todo_item import TodoItem
+from tests.conftest import login, statements_on
+
+STATS_URL = '/api/v1/todo/todos/stats'
+
+# --- Test Cases ---
+
+class TestTodoStats:
+    """Test suite for the to-do statistics endpoint."""
+
+    def test_counts(self, client, auth):
+        user_id, headers = auth
+        now = datetime.datetime.now(datetime.timezone.utc)
+        today = now.date()
+        last_week = now - datetime.timedelta(days=today.weekday() + 1)
+        db.session.add_all([
+            TodoItem(user_id=user_id, title='late', priority='high', due_date=today - datetime.timedelta(days=1)),
+            TodoItem(user_id=user_id, title='due today', status='in_progress', due_date=today),
+            TodoItem(user_id=user_id, title='done late', status='completed', priority='low',
+                     due_date=today - datetime.timedelta(days=3), completed_at=now),
+            TodoItem(user_id=user_id, title='done before', status='completed', completed_at=last_week),
+            TodoItem(user_id=user_id, title='parked', status='deferred', due_date=today - datetime.timedelta(days=9)),
+        ])
+        db.session.commit()
+        other_id, _ = login(client, 'other')
+        db.session.add(TodoItem(user_id=other_id, title='not mine', due_date=today - datetime.timedelta(days=1)))
+        db.session.commit()
+
+        response = client.get(STATS_URL, headers=headers)
+        assert response.status_code == 200
+        stats = json.loads(response.data)['data']
+        assert stats['total'] == 5
+        assert stats['by_status'] == {'pending': 1, 'in_progress': 1, 'completed': 2, 'deferred': 1}
+        assert stats['by_priority'] == {'low': 1, 'medium': 3, 'high': 1}
+        assert stats['overdue'] == 2
+        assert stats['completed_this_week'] == 1
+        assert stats['as_of'] == today.isoformat()
+        assert datetime.date.fromisoformat(stats['week_start']).weekday() == 0
+
+    def test_empty_list_counts_zero(self, client, auth):
+        _, headers = auth
+        stats = json.loads(client.get(STATS_URL, headers=headers).data)['data']
+        assert stats['total'] == 0 and stats['overdue'] == 0 and stats['completed_this_week'] == 0
+        assert set(stats['by_status'].values()) == {0}
+
+    def test_one_aggregate_query(self, client, auth):
+        user_id, headers = auth
+        db.session.add_all([TodoItem(user_id=user_id, title=f'todo {n}') for n in range(30)])
+        db.session.commit()
+
+        with statements_on('todo_items') as statements:
+            response = client.get(STATS_URL, headers=headers)
+
+        assert json.loads(response.data)['data']['total'] == 30
+        assert len(statements) == 1
+        assert 'count(todo_items.id)' in statements[0]
+
+    def test_etag_holds_until_the_next_write(self, client, auth):
+        _, headers = auth
+        first = client.get(STATS_URL, headers=headers)
+        etag = first.headers['ETag']
+        assert first.headers['Cache-Control'] == 'private, no-cache'
+
+        cached = client.get(STATS_URL, headers={**headers, 'If-None-Match': etag})
+        assert cached.status_code == 304
+        assert cached.headers['ETag'] == etag
+
+        client.post('/api/v1/todo/todos', headers=headers, data=json.dumps({'title': 'new'}),
+                    content_type='application/json')
+        fresh = client.get(STATS_URL, headers={**headers, 'If-None-Match': etag})
+        assert fresh.status_code == 200
+        assert fresh.headers['ETag'] != etag
+        assert json.loads(fresh.data)['data']['total'] == 1
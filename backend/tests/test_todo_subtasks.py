@@ -0,0 +1,231 @@
+# /your_project_root/tests/test_todo_subtasks.py
+# Pytest test cases for subtasks: tree loading, rollup counts and subtree deletes.
+
+import pytest
+import json
+from app.models.todo_item import TodoItem
+from app.models.todo_tombstone import TodoTombstone
+from app.utils.todo_tree import MAX_SUBTASK_DEPTH
+from tests.conftest import login, statements_on, verbs
+
+TODOS_URL = '/api/v1/todo/todos'
+
+# --- Test Fixtures ---
+
+def create(client, headers, **fields):
+    response = client.post(TODOS_URL, headers=headers, data=json.dumps(fields), content_type='application/json')
+    return response.status_code, json.loads(response.data)
+
+
+def create_id(client, headers, title, parent_id=None):
+    status, body = create(client, headers, title=title, parent_id=parent_id)
+    assert status == 201, body
+    return body['data']['id']
+
+
+def put(client, headers, todo_id, body):
+    response = client.put(f'{TODOS_URL}/{todo_id}', headers=headers, data=json.dumps(body),
+                          content_type='application/json')
+    return response.status_code, json.loads(response.data)
+
+
+def get(client, headers, todo_id):
+    return json.loads(client.get(f'{TODOS_URL}/{todo_id}', headers=headers).data)['data']
+
+
+def batch(client, headers, operations):
+    response = client.post(f'{TODOS_URL}/batch', headers=headers, data=json.dumps({'operations': operations}),
+                           content_type='application/json')
+    return response.status_code, json.loads(response.data)
+
+
+def counts(client, headers, todo_id):
+    todo = get(client, headers, todo_id)
+    return todo['subtask_done_count'], todo['subtask_count']
+
+
+@pytest.fixture(scope='function')
+def project(client, auth):
+    """project > (design > (sketch, review), build). Returns the ids by title."""
+    _, headers = auth
+    ids = {'project': create_id(client, headers, 'project')}
+    ids['design'] = create_id(client, headers, 'design', ids['project'])
+    ids['build'] = create_id(client, headers, 'build', ids['project'])
+    ids['sketch'] = create_id(client, headers, 'sketch', ids['design'])
+    ids['review'] = create_id(client, headers, 'review', ids['design'])
+    return ids
+
+
+# --- Test Cases ---
+
+class TestTree:
+    """GET /todos/<id>/tree returns the whole subtree from one query."""
+
+    def test_tree_is_nested_in_manual_order(self, client, auth, project):
+        _, headers = auth
+        response = client.get(f"{TODOS_URL}/{project['project']}/tree", headers=headers)
+        assert response.status_code == 200
+        tree = json.loads(response.data)['data']
+
+        def shape(node):
+            return node['title'], [shape(child) for child in node['subtasks']]
+        # New items go on top of the manual order, so later siblings come first.
+        assert shape(tree) == ('project', [('build', []), ('design', [('review', []), ('sketch', [])])])
+
+    def test_tree_is_loaded_with_one_query(self, client, auth, project):
+        _, headers = auth
+        with statements_on('todo_items') as statements:
+            client.get(f"{TODOS_URL}/{project['project']}/tree", headers=headers)
+        assert len(statements) == 1
+        assert statements[0].lstrip().upper().startswith('WITH RECURSIVE')
+
+    def test_subtree_of_a_subtask(self, client, auth, project):
+        _, headers = auth
+        tree = json.loads(client.get(f"{TODOS_URL}/{project['design']}/tree", headers=headers).data)['data']
+        assert tree['parent_id'] == project['project']
+        assert sorted(child['title'] for child in tree['subtasks']) == ['review', 'sketch']
+
+    def test_missing_and_foreign_trees(self, client, auth, project):
+        _, headers = auth
+        _, stranger = login(client, 'stranger')
+        assert client.get(f"{TODOS_URL}/999999/tree", headers=headers).status_code == 404
+        assert client.get(f"{TODOS_URL}/{project['project']}/tree", headers=stranger).status_code == 403
+
+    def test_list_filters_by_parent(self, client, auth, project):
+        _, headers = auth
+        top = json.loads(client.get(f'{TODOS_URL}?parent_id=none', headers=headers).data)['data']
+        assert [t['title'] for t in top] == ['project']
+        children = json.loads(client.get(f"{TODOS_URL}?parent_id={project['design']}", headers=headers).data)
+        assert sorted(t['title'] for t in children['data']) == ['review', 'sketch']
+        assert client.get(f'{TODOS_URL}?parent_id=top', headers=headers).status_code == 400
+
+
+class TestRollups:
+    """Parents keep done/total counts of their direct subtasks."""
+
+    def test_counts_follow_creates_and_status_changes(self, client, auth, project):
+        _, headers = auth
+        assert counts(client, headers, project['project']) == (0, 2)
+        assert counts(client, headers, project['design']) == (0, 2)
+
+        put(client, headers, project['sketch'], {'status': 'completed'})
+        assert counts(client, headers, project['design']) == (1, 2)
+        # Only direct children count.
+        assert counts(client, headers, project['project']) == (0, 2)
+        put(client, headers, project['sketch'], {'title': 'sketches'})
+        assert counts(client, headers, project['design']) == (1, 2)
+        put(client, headers, project['sketch'], {'status': 'pending'})
+        assert counts(client, headers, project['design']) == (0, 2)
+
+    def test_counts_follow_reparenting(self, client, auth, project):
+        _, headers = auth
+        put(client, headers, project['sketch'], {'status': 'completed'})
+        status, _ = put(client, headers, project['sketch'], {'parent_id': project['build']})
+        assert status == 200
+        assert counts(client, headers, project['design']) == (0, 1)
+        assert counts(client, headers, project['build']) == (1, 1)
+
+        put(client, headers, project['sketch'], {'parent_id': None})
+        assert counts(client, headers, project['build']) == (0, 0)
+        assert get(client, headers, project['sketch'])['parent_id'] is None
+
+    def test_counts_follow_deletes(self, client, auth, project):
+        _, headers = auth
+        put(client, headers, project['review'], {'status': 'completed'})
+        client.delete(f"{TODOS_URL}/{project['review']}", headers=headers)
+        assert counts(client, headers, project['design']) == (0, 1)
+
+    def test_counts_follow_batches(self, client, auth, project):
+        _, headers = auth
+        status, _ = batch(client, headers, [
+            {'action': 'create', 'data': {'title': 'deploy', 'parent_id': project['build'], 'status': 'completed'}},
+            {'action': 'create', 'data': {'title': 'test', 'parent_id': project['build']}},
+            {'action': 'update', 'id': project['sketch'], 'data': {'status': 'completed'}},
+        ])
+        assert status == 200
+        assert counts(client, headers, project['build']) == (1, 2)
+        assert counts(client, headers, project['design']) == (1, 2)
+
+    def test_parent_is_stamped_for_delta_sync(self, client, auth, project):
+        _, headers = auth
+        token = json.loads(client.get(f'{TODOS_URL}/changes', headers=headers).data)['data']['sync_token']
+        put(client, headers, project['sketch'], {'status': 'completed'})
+        changes = json.loads(client.get(f'{TODOS_URL}/changes?since={token}', headers=headers).data)['data']
+        changed = {todo['id']: todo for todo in changes['changed']}
+        assert set(changed) == {project['sketch'], project['design']}
+        assert changed[project['design']]['subtask_done_count'] == 1
+
+
+class TestParentValidation:
+    """parent_id must stay within the user's items, acyclic and shallow enough."""
+
+    def test_parent_must_be_owned(self, client, auth, project):
+        _, headers = auth
+        _, stranger = login(client, 'stranger')
+        status, body = create(client, stranger, title='x', parent_id=project['project'])
+        assert status == 400 and 'parent_id' in body['details']['validation_errors']
+        status, body = create(client, headers, title='x', parent_id='1')
+        assert status == 400 and 'parent_id' in body['details']['validation_errors']
+
+    def test_no_cycles(self, client, auth, project):
+        _, headers = auth
+        assert put(client, headers, project['design'], {'parent_id': project['design']})[0] == 400
+        assert put(client, headers, project['design'], {'parent_id': project['sketch']})[0] == 400
+        assert get(client, headers, project['design'])['parent_id'] == project['project']
+
+    def test_depth_limit(self, client, auth):
+        _, headers = auth
+        chain = [create_id(client, headers, 'level 0')]
+        for level in range(1, MAX_SUBTASK_DEPTH + 1):
+            chain.append(create_id(client, headers, f'level {level}', chain[-1]))
+        status, body = create(client, headers, title='too deep', parent_id=chain[-1])
+        assert status == 400 and 'parent_id' in body['details']['validation_errors']
+
+        # Moving a two-level subtree counts its height too.
+        other = create_id(client, headers, 'other')
+        create_id(client, headers, 'other child', other)
+        status, _ = put(client, headers, other, {'parent_id': chain[-2]})
+        assert status == 400
+        assert put(client, headers, other, {'parent_id': chain[-3]})[0] == 200
+
+    def test_batch_rejects_reparenting_and_foreign_parents(self, client, auth, project):
+        _, headers = auth
+        status, body = batch(client, headers, [
+            {'action': 'update', 'id': project['sketch'], 'data': {'parent_id': project['build']}},
+            {'action': 'create', 'data': {'title': 'x', 'parent_id': 999999}},
+        ])
+        assert status == 400
+        assert set(body['details']['validation_errors']) == {'operations[0].parent_id', 'operations[1].parent_id'}
+
+
+class TestSubtreeDelete:
+    """Deleting an item trashes its subtasks in the same single UPDATE."""
+
+    def test_delete_removes_the_subtree_with_one_statement(self, client, auth, project):
+        user_id, headers = auth
+        with statements_on('todo_items') as statements:
+            assert client.delete(f"{TODOS_URL}/{project['design']}", headers=headers).status_code == 204
+        assert verbs(statements) == ['UPDATE']
+
+        remaining = {t.title for t in TodoItem.query.filter_by(user_id=user_id, deleted_at=None)}
+        assert remaining == {'project', 'build'}
+        assert counts(client, headers, project['project']) == (0, 1)
+        tombstones = {t.todo_id for t in TodoTombstone.query.filter_by(user_id=user_id)}
+        assert tombstones == {project['design'], project['sketch'], project['review']}
+
+    def test_batch_delete_removes_subtrees(self, client, auth, project):
+        user_id, headers = auth
+        status, _ = batch(client, headers, [{'action': 'delete', 'id': project['project']}])
+        assert status == 200
+        assert TodoItem.query.filter_by(user_id=user_id, deleted_at=None).count() == 0
+
+    def test_batch_cannot_update_inside_a_deleted_subtree(self, client, auth, project):
+        user_id, headers = auth
+        status, body = batch(client, headers, [
+            {'action': 'update', 'id': project['sketch'], 'data': {'title': 'kept?'}},
+            {'action': 'create', 'data': {'title': 'new', 'parent_id': project['review']}},
+            {'action': 'delete', 'id': project['design']},
+        ])
+        assert status == 400
+        assert set(body['details']['validation_errors']) == {'operations[0].id', 'operations[1].parent_id'}
+        assert TodoItem.query.filter_by(user_id=user_id).count() == 5
@@ -0,0 +1,155 @@
+# /your_project_root/tests/test_todo_sync.py
+# Pytest test cases for delta sync of to-do items (GET /api/v1/todo/todos/changes).
+
+import pytest
+import json
+import datetime
+from app import create_app
+from app.extensions import db
+from app.models.user import User
+from app.models.user_profile import UserProfile
+from app.models.todo_item import TodoItem
+from app.models.todo_sync_state import TodoSyncState
+from app.models.todo_tombstone import TodoTombstone
+from app.utils.db_maintenance import compact_todo_tombstones
+
+CHANGES_URL = '/api/v1/todo/todos/changes'
+
+# --- Test Fixtures ---
+
+@pytest.fixture(scope='module')
+def test_app():
+    """Creates an app instance using the 'testing' configuration."""
+    flask_app = create_app(config_name='testing')
+    with flask_app.app_context():
+        db.create_all()
+        yield flask_app
+        db.session.remove()
+        db.drop_all()
+        db.engine.dispose()
+
+
+@pytest.fixture(scope='module')
+def client(test_app):
+    """Provides a test client for the app."""
+    with test_app.test_client() as testing_client:
+        yield testing_client
+
+
+@pytest.fixture(scope='function')
+def headers(client, test_app):
+    """Clears the tables, then registers and logs in a user. Returns auth headers."""
+    for model in (TodoTombstone, TodoSyncState, TodoItem, UserProfile, User):
+        model.query.delete()
+    db.session.commit()
+    client.post('/api/v1/auth/register', data=json.dumps(
+        {'username': 'syncer', 'email': 'syncer@example.com', 'password': 'password123'}),
+        content_type='application/json')
+    response = client.post('/api/v1/auth/login', data=json.dumps(
+        {'email': 'syncer@example.com', 'password': 'password123'}), content_type='application/json')
+    return {'Authorization': f"Bearer {json.loads(response.data)['access_token']}"}
+
+
+def changes(client, headers, since=None):
+    url = CHANGES_URL if since is None else f'{CHANGES_URL}?since={since}'
+    response = client.get(url, headers=headers)
+    return response.status_code, json.loads(response.data)
+
+
+def create(client, headers, title):
+    response = client.post('/api/v1/todo/todos', headers=headers, data=json.dumps({'title': title}),
+                           content_type='application/json')
+    return json.loads(response.data)['data']['id']
+
+
+# --- Test Cases ---
+
+class TestTodoChanges:
+    """Test suite for the delta sync endpoint and its tombstones."""
+
+    def test_snapshot_then_only_deltas(self, client, headers):
+        first, second = create(client, headers, 'first'), create(client, headers, 'second')
+        status, body = changes(client, headers)
+        assert status == 200
+        assert [t['id'] for t in body['data']['changed']] == [first, second]
+        assert body['data']['deleted'] == []
+        token = body['data']['sync_token']
+
+        client.put(f'/api/v1/todo/todos/{first}', headers=headers, data=json.dumps({'status': 'completed'}),
+                   content_type='application/json')
+        client.delete(f'/api/v1/todo/todos/{second}', headers=headers)
+        third = create(client, headers, 'third')
+
+        _, body = changes(client, headers, since=token)
+        assert [t['id'] for t in body['data']['changed']] == [first, third]
+        assert body['data']['changed'][0]['status'] == 'completed'
+        assert body['data']['deleted'] == [second]
+        assert body['data']['sync_token'] > token
+
+    def test_idle_client_gets_empty_delta(self, client, headers):
+        create(client, headers, 'only')
+        token = changes(client, headers)[1]['data']['sync_token']
+        status, body = changes(client, headers, since=token)
+        assert status == 200
+        assert body['data'] == {'changed': [], 'deleted': [], 'sync_token': token}
+
+    def test_batch_changes_share_one_version(self, client, headers):
+        keep, drop = create(client, headers, 'keep'), create(client, headers, 'drop')
+        token = changes(client, headers)[1]['data']['sync_token']
+        client.post('/api/v1/todo/todos/batch', headers=headers, content_type='application/json', data=json.dumps(
+            {'operations': [{'action': 'update', 'id': keep, 'data': {'priority': 'high'}},
+                            {'action': 'delete', 'id': drop},
+                            {'action': 'create', 'data': {'title': 'new'}}]}))
+
+        _, body = changes(client, headers, since=token)
+        assert body['data']['sync_token'] == token + 1
+        assert {t['title'] for t in body['data']['changed']} == {'keep', 'new'}
+        assert body['data']['deleted'] == [drop]
+
+    def test_changes_are_per_user(self, client, headers):
+        create(client, headers, 'mine')
+        client.post('/api/v1/auth/register', data=json.dumps(
+            {'username': 'other', 'email': 'other@example.com', 'password': 'password123'}),
+            content_type='application/json')
+        other = client.post('/api/v1/auth/login', data=json.dumps(
+            {'email': 'other@example.com', 'password': 'password123'}), content_type='application/json')
+        other_headers = {'Authorization': f"Bearer {json.loads(other.data)['access_token']}"}
+
+        _, body = changes(client, other_headers)
+        assert body['data'] == {'changed': [], 'deleted': [], 'sync_token': 0}
+
+    @pytest.mark.parametrize('since', ['abc', '-1', '999'])
+    def test_invalid_tokens_are_rejected(self, client, headers, since):
+        create(client, headers, 'x')
+        status, body = changes(client, headers, since=since)
+        assert status == 400
+        assert 'since' in body['details']['validation_errors']
+
+    def test_compaction_expires_old_tokens(self, client, headers, test_app):
+        first, second = create(client, headers, 'first'), create(client, headers, 'second')
+        old_token = changes(client, headers)[1]['data']['sync_token']
+        client.delete(f'/api/v1/todo/todos/{first}', headers=headers)
+        recent_token = changes(client, headers)[1]['data']['sync_token']
+        client.delete(f'/api/v1/todo/todos/{second}', headers=headers)
+
+        # Age the first tombstone past the retention window.
+        tombstone = TodoTombstone.query.filter_by(todo_id=first).one()
+        tombstone.deleted_at = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=31)
+        db.session.commit()
+
+        assert compact_todo_tombstones(retention_days=30) == 1
+        assert TodoTombstone.query.count() == 1
+
+        status, body = changes(client, headers, since=old_token)
+        assert status == 410
+        assert body['error_code'] == 'SYNC_TOKEN_EXPIRED'
+        status, body = changes(client, headers, since=recent_token)
+        assert status == 200
+        assert body['data']['deleted'] == [second]
+
+    def test_compaction_command(self, client, headers, test_app):
+        todo_id = create(client, headers, 'gone')
+        client.delete(f'/api/v1/todo/todos/{todo_id}', headers=headers)
+        result = test_app.test_cli_runner().invoke(args=['todos', 'compact-tombstones', '--retention-days', '0'])
+        assert result.exit_code == 0, result.output
+        assert 'Compacted 1 to-do tombstones' in result.output
@@ -0,0 +1,168 @@
+# /your_project_root/tests/test_todo_tags.py
+# Pytest test cases for todo tags: assignment, the tag filter and tag counts.
+
+import pytest
+import json
+from app.models.tag import Tag
+from app.models.todo_tag import TodoTag
+from app.utils.db_maintenance import purge_todo_trash
+from app.utils.todo_tags import MAX_TAGS_PER_TODO
+from tests.conftest import login, statements_on
+
+TODOS_URL = '/api/v1/todo/todos'
+
+# --- Test Fixtures ---
+
+def create(client, headers, **fields):
+    response = client.post(TODOS_URL, headers=headers, data=json.dumps(fields), content_type='application/json')
+    return response.status_code, json.loads(response.data)
+
+
+def create_id(client, headers, title, tags=None, **fields):
+    status, body = create(client, headers, title=title, tags=tags, **fields)
+    assert status == 201, body
+    return body['data']['id']
+
+
+def put(client, headers, todo_id, body):
+    response = client.put(f'{TODOS_URL}/{todo_id}', headers=headers, data=json.dumps(body),
+                          content_type='application/json')
+    return response.status_code, json.loads(response.data)
+
+
+def get(client, headers, todo_id):
+    return json.loads(client.get(f'{TODOS_URL}/{todo_id}', headers=headers).data)['data']
+
+
+def batch(client, headers, operations):
+    response = client.post(f'{TODOS_URL}/batch', headers=headers, data=json.dumps({'operations': operations}),
+                           content_type='application/json')
+    return response.status_code, json.loads(response.data)
+
+
+def listed(client, headers, query):
+    response = client.get(f'{TODOS_URL}?{query}', headers=headers)
+    assert response.status_code == 200, response.data
+    return sorted(todo['title'] for todo in json.loads(response.data)['data'])
+
+
+def facets(client, headers, query=''):
+    response = client.get(f'{TODOS_URL}/tags?{query}', headers=headers)
+    assert response.status_code == 200, response.data
+    return [(facet['name'], facet['count']) for facet in json.loads(response.data)['data']]
+
+
+@pytest.fixture(scope='function')
+def tagged(client, auth):
+    """Four items with overlapping tags. Returns the ids by title."""
+    _, headers = auth
+    return {
+        'report': create_id(client, headers, 'report', ['work', 'urgent']),
+        'slides': create_id(client, headers, 'slides', ['work'], status='completed'),
+        'dentist': create_id(client, headers, 'dentist', ['personal', 'urgent']),
+        'novel': create_id(client, headers, 'novel'),
+    }
+
+
+# --- Test Cases ---
+
+class TestTagAssignment:
+    """Tags are set on create and replaced on update."""
+
+    def test_tags_are_normalized_and_returned(self, client, auth):
+        _, headers = auth
+        status, body = create(client, headers, title='t', tags=[' Work ', 'work', 'URGENT'])
+        assert status == 201
+        assert body['data']['tags'] == ['urgent', 'work']
+        todo_id = body['data']['id']
+        assert get(client, headers, todo_id)['tags'] == ['urgent', 'work']
+        # One row per name and user, however many items use it.
+        create_id(client, headers, 'u', ['work'])
+        assert Tag.query.filter_by(name='work').count() == 1
+
+    def test_update_replaces_tags_and_stamps_the_item(self, client, auth, tagged):
+        _, headers = auth
+        before = get(client, headers, tagged['report'])['sync_version']
+        status, body = put(client, headers, tagged['report'], {'tags': ['review']})
+        assert status == 200 and body['tags'] == ['review']
+        assert body['sync_version'] > before
+        status, body = put(client, headers, tagged['report'], {'tags': None})
+        assert status == 200 and body['tags'] == []
+
+    def test_invalid_tags_are_rejected(self, client, auth):
+        _, headers = auth
+        for tags in ('work', [1], ['a,b'], [''], ['x' * 51], [f't{i}' for i in range(MAX_TAGS_PER_TODO + 1)]):
+            status, body = create(client, headers, title='t', tags=tags)
+            assert status == 400 and 'tags' in body['details']['validation_errors'], tags
+        todo_id = create_id(client, headers, 't')
+        assert put(client, headers, todo_id, {'tags': 'work'})[0] == 400
+
+    def test_batch_sets_tags(self, client, auth, tagged):
+        _, headers = auth
+        status, body = batch(client, headers, [
+            {'action': 'create', 'data': {'title': 'memo', 'tags': ['work']}},
+            {'action': 'update', 'id': tagged['novel'], 'data': {'tags': ['personal']}},
+            {'action': 'update', 'id': tagged['slides'], 'data': {'tags': []}},
+        ])
+        assert status == 200
+        assert [result['data']['tags'] for result in body['data']] == [['work'], ['personal'], []]
+
+    def test_purging_an_item_removes_its_links(self, client, auth, tagged):
+        _, headers = auth
+        client.delete(f"{TODOS_URL}/{tagged['report']}", headers=headers)
+        # Trashed items keep their tags for a restore; the purge removes them.
+        assert TodoTag.query.filter_by(todo_id=tagged['report']).count() == 2
+        assert purge_todo_trash(retention_days=0) == 1
+        assert TodoTag.query.filter_by(todo_id=tagged['report']).count() == 0
+
+
+class TestTagFilter:
+    """GET /todos?tag= lists items carrying all the given tags."""
+
+    def test_single_and_intersected_tags(self, client, auth, tagged):
+        _, headers = auth
+        assert listed(client, headers, 'tag=work') == ['report', 'slides']
+        assert listed(client, headers, 'tag=work,urgent') == ['report']
+        assert listed(client, headers, 'tag=Urgent') == ['dentist', 'report']
+        assert listed(client, headers, 'tag=work,personal') == []
+        assert listed(client, headers, 'tag=unknown') == []
+
+    def test_combines_with_other_filters(self, client, auth, tagged):
+        _, headers = auth
+        assert listed(client, headers, 'tag=work&status=completed') == ['slides']
+
+    def test_only_the_users_own_links_match(self, client, auth, tagged):
+        _, stranger = login(client, 'stranger')
+        create_id(client, stranger, 'theirs', ['work'])
+        _, headers = auth
+        assert listed(client, headers, 'tag=work') == ['report', 'slides']
+        assert listed(client, stranger, 'tag=work') == ['theirs']
+
+    def test_generated_occurrences_show_the_recurring_items_tags(self, client, auth):
+        _, headers = auth
+        create_id(client, headers, 'standup', ['work'], due_date='2026-03-02', recurrence='FREQ=DAILY')
+        response = client.get(f'{TODOS_URL}?due_after=2026-03-02&due_before=2026-03-03&tag=work', headers=headers)
+        todos = json.loads(response.data)['data']
+        assert [(t['occurrence_date'], t['tags']) for t in todos] == [('2026-03-02', ['work']), ('2026-03-03', ['work'])]
+
+
+class TestTagFacets:
+    """GET /todos/tags counts items per tag in one grouped query."""
+
+    def test_counts_most_used_first(self, client, auth, tagged):
+        _, headers = auth
+        assert facets(client, headers) == [('urgent', 2), ('work', 2), ('personal', 1)]
+
+    def test_counts_follow_the_list_filters(self, client, auth, tagged):
+        _, headers = auth
+        assert facets(client, headers, 'status=pending') == [('urgent', 2), ('personal', 1), ('work', 1)]
+        # Within a tag: the tags that co-occur with it.
+        assert facets(client, headers, 'tag=urgent') == [('urgent', 2), ('personal', 1), ('work', 1)]
+        response = client.get(f'{TODOS_URL}/tags?status=nope', headers=headers)
+        assert response.status_code == 400
+
+    def test_one_grouped_query(self, client, auth, tagged):
+        _, headers = auth
+        with statements_on('todo_tags') as statements:
+            facets(client, headers, 'tag=work')
+        assert len(statements) == 1 and 'GROUP BY' in statements[0]
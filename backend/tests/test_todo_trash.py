@@ -0,0 +1,179 @@
+# /your_project_root/tests/test_todo_trash.py
+# Pytest test cases for soft-deleted to-do items: the trash, restore and the purge.
+
+import pytest
+import json
+import datetime
+from sqlalchemy import text, update
+from app.extensions import db
+from app.models.todo_item import TodoItem
+from app.models.todo_tombstone import TodoTombstone
+from app.models.todo_tag import TodoTag
+from app.utils.db_maintenance import purge_todo_trash
+from tests.conftest import login
+
+TODOS_URL = '/api/v1/todo/todos'
+
+# --- Test Fixtures ---
+
+def create(client, headers, **fields):
+    response = client.post(TODOS_URL, data=json.dumps(fields), headers=headers, content_type='application/json')
+    return json.loads(response.data)['data']['id']
+
+
+def get_json(client, headers, url, **query):
+    response = client.get(url, headers=headers, query_string=query)
+    return response.status_code, json.loads(response.data)
+
+
+def restore(client, headers, todo_id):
+    response = client.post(f'{TODOS_URL}/{todo_id}/restore', headers=headers)
+    return response.status_code, json.loads(response.data)
+
+
+def live_titles(client, headers):
+    return sorted(todo['title'] for todo in get_json(client, headers, TODOS_URL)[1]['data'])
+
+
+@pytest.fixture(scope='function')
+def project(client, auth):
+    """project > (design > sketch, build); 'build' is completed. Returns the ids by title."""
+    _, headers = auth
+    ids = {'project': create(client, headers, title='project', tags=['work'])}
+    ids['design'] = create(client, headers, title='design', parent_id=ids['project'], tags=['work'])
+    ids['sketch'] = create(client, headers, title='sketch', parent_id=ids['design'])
+    ids['build'] = create(client, headers, title='build', parent_id=ids['project'], status='completed')
+    return ids
+
+
+def counts(client, headers, todo_id):
+    _, body = get_json(client, headers, f'{TODOS_URL}/{todo_id}')
+    return body['data']['subtask_count'], body['data']['subtask_done_count']
+
+# --- Test Cases ---
+
+class TestTrash:
+    """DELETE moves items to the trash, out of every other read."""
+
+    def test_deleted_items_are_listed_in_the_trash(self, client, auth, project):
+        _, headers = auth
+        assert client.delete(f"{TODOS_URL}/{project['design']}", headers=headers).status_code == 204
+
+        status, body = get_json(client, headers, f'{TODOS_URL}/trash')
+        assert status == 200
+        # Trashed together, so same deleted_at; the later id comes first.
+        assert [(todo['title'], todo['tags']) for todo in body['data']] == [('sketch', []), ('design', ['work'])]
+        assert all(todo['deleted_at'] for todo in body['data'])
+        assert live_titles(client, headers) == ['build', 'project']
+        assert counts(client, headers, project['project']) == (1, 1)
+
+    def test_trashed_items_are_hidden_everywhere(self, client, auth, project):
+        _, headers = auth
+        client.delete(f"{TODOS_URL}/{project['project']}", headers=headers)
+
+        assert client.get(f"{TODOS_URL}/{project['design']}", headers=headers).status_code == 404
+        assert client.get(f"{TODOS_URL}/{project['project']}/tree", headers=headers).status_code == 404
+        assert client.put(f"{TODOS_URL}/{project['build']}", data=json.dumps({'title': 'x'}), headers=headers,
+                          content_type='application/json').status_code == 404
+        assert client.delete(f"{TODOS_URL}/{project['build']}", headers=headers).status_code == 404
+        assert get_json(client, headers, f'{TODOS_URL}/stats')[1]['data']['total'] == 0
+        assert get_json(client, headers, f'{TODOS_URL}/search', q='design')[1]['data'] == []
+        assert get_json(client, headers, f'{TODOS_URL}/tags')[1]['data'] == []
+
+    def test_trash_is_paginated_newest_first(self, client, auth):
+        user_id, headers = auth
+        ids = [create(client, headers, title=f'todo {n}') for n in range(5)]
+        base = datetime.datetime(2024, 1, 1)
+        for n, todo_id in enumerate(ids):
+            db.session.execute(update(TodoItem).where(TodoItem.id == todo_id)
+                               .values(deleted_at=base + datetime.timedelta(hours=n)))
+        db.session.commit()
+
+        _, first = get_json(client, headers, f'{TODOS_URL}/trash', limit=3)
+        _, second = get_json(client, headers, f'{TODOS_URL}/trash', limit=3, cursor=first['meta']['next_cursor'])
+        titles = [todo['title'] for todo in first['data'] + second['data']]
+        assert titles == [f'todo {n}' for n in reversed(range(5))]
+        assert second['meta']['has_more'] is False
+        assert client.get(f'{TODOS_URL}/trash', headers=headers,
+                          query_string={'cursor': 'bogus'}).status_code == 400
+
+    def test_trash_query_uses_the_partial_index(self, test_app, auth):
+        user_id, _ = auth
+        plan = db.session.execute(text(
+            "EXPLAIN QUERY PLAN SELECT id FROM todo_items WHERE user_id = :uid AND deleted_at IS NOT NULL "
+            "ORDER BY deleted_at DESC, id DESC LIMIT 51"
+        ), {'uid': user_id}).all()
+        detail = ' '.join(row[-1] for row in plan)
+        assert 'ix_todo_items_user_deleted' in detail
+
+
+class TestRestore:
+    """POST /todos/<id>/restore brings back what one delete trashed."""
+
+    def test_restore_brings_back_the_subtree(self, client, auth, project):
+        user_id, headers = auth
+        client.delete(f"{TODOS_URL}/{project['design']}", headers=headers)
+        token = get_json(client, headers, f'{TODOS_URL}/changes')[1]['data']['sync_token']
+
+        status, body = restore(client, headers, project['design'])
+        assert status == 200
+        assert [task['title'] for task in body['data']['subtasks']] == ['sketch']
+        assert sorted(body['meta']['restored_ids']) == sorted([project['design'], project['sketch']])
+        assert live_titles(client, headers) == ['build', 'design', 'project', 'sketch']
+        assert counts(client, headers, project['project']) == (2, 1)
+
+        # Restored items come back as changed; their tombstones are gone.
+        _, changes = get_json(client, headers, f'{TODOS_URL}/changes', since=token)
+        assert {project['design'], project['sketch']} <= {todo['id'] for todo in changes['data']['changed']}
+        assert changes['data']['deleted'] == []
+        assert TodoTombstone.query.filter_by(user_id=user_id).count() == 0
+
+    def test_restore_keeps_separately_trashed_subtasks_in_the_trash(self, client, auth, project):
+        _, headers = auth
+        client.delete(f"{TODOS_URL}/{project['sketch']}", headers=headers)
+        db.session.execute(update(TodoItem).where(TodoItem.id == project['sketch'])
+                           .values(deleted_at=datetime.datetime(2024, 1, 1)))
+        db.session.commit()
+        client.delete(f"{TODOS_URL}/{project['design']}", headers=headers)
+
+        restore(client, headers, project['design'])
+        _, body = get_json(client, headers, f'{TODOS_URL}/trash')
+        assert [todo['title'] for todo in body['data']] == ['sketch']
+        assert counts(client, headers, project['design']) == (0, 0)
+
+    def test_restoring_below_a_trashed_parent_makes_a_top_level_item(self, client, auth, project):
+        _, headers = auth
+        client.delete(f"{TODOS_URL}/{project['build']}", headers=headers)
+        client.delete(f"{TODOS_URL}/{project['project']}", headers=headers)
+
+        status, body = restore(client, headers, project['build'])
+        assert status == 200
+        assert body['data']['parent_id'] is None
+        assert live_titles(client, headers) == ['build']
+
+    def test_restore_errors(self, client, auth, project):
+        _, headers = auth
+        assert restore(client, headers, project['design'])[0] == 404 # Not in the trash
+        assert restore(client, headers, 999999)[0] == 404
+        client.delete(f"{TODOS_URL}/{project['design']}", headers=headers)
+        _, stranger = login(client, 'stranger')
+        assert restore(client, stranger, project['design'])[0] == 403
+
+
+class TestPurge:
+    """purge_todo_trash permanently deletes items trashed before the retention period."""
+
+    def test_purge_deletes_only_old_trash(self, client, auth, project):
+        user_id, headers = auth
+        client.delete(f"{TODOS_URL}/{project['design']}", headers=headers)
+        client.delete(f"{TODOS_URL}/{project['build']}", headers=headers)
+        old = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=40)
+        db.session.execute(update(TodoItem).where(TodoItem.id.in_([project['design'], project['sketch']]))
+                           .values(deleted_at=old))
+        db.session.commit()
+
+        assert purge_todo_trash(retention_days=30, batch_size=1) == 2
+        remaining = {t.title: t.deleted_at is None for t in TodoItem.query.filter_by(user_id=user_id)}
+        assert remaining == {'project': True, 'build': False}
+        assert TodoTag.query.filter_by(todo_id=project['design']).count() == 0
+        assert counts(client, headers, project['project']) == (0, 0)
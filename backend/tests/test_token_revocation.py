@@ -0,0 +1,384 @@
+# /your_project_root/tests/test_token_revocation.py
+# Pytest test cases for the token revocation path (blocklist loader and its caches).
+
+import pytest
+import json
+import time
+import datetime
+from flask import Flask
+from app import create_app
+from app.extensions import db, revocation_cache, blocklist_filter
+from app.models.user import User
+from app.models.user_profile import UserProfile
+from app.models.token_blocklist import TokenBlocklist
+from app.utils.cache import TTLCache, SharedGeneration
+from app.utils.bloom_filter import BloomFilter
+from app.utils.token_revocation import RevocationCache
+from app.utils.db_maintenance import purge_expired_tokens
+from app.utils.background import BackgroundScheduler
+from app.api.auth_bp import _lookup_blocklist
+
+# --- Test Fixtures ---
+
+@pytest.fixture(scope='module')
+def test_app():
+    """Creates an app instance using the 'testing' configuration."""
+    flask_app = create_app(config_name='testing')
+    flask_app.config['ADMIN_EMAILS'] = ['revoker@example.com']
+    with flask_app.app_context():
+        db.create_all()
+        yield flask_app
+        db.session.remove()
+        db.drop_all()
+        db.engine.dispose()
+
+
+@pytest.fixture(scope='module')
+def client(test_app):
+    """Provides a test client for the app."""
+    with test_app.test_client() as testing_client:
+        yield testing_client
+
+
+@pytest.fixture(scope='function')
+def clean_db(test_app):
+    """Clears users, profiles and blocklist rows before each test."""
+    TokenBlocklist.query.delete()
+    UserProfile.query.delete()
+    User.query.delete()
+    db.session.commit()
+    revocation_cache.clear()
+    yield
+
+
+@pytest.fixture(scope='function')
+def tokens(client, clean_db):
+    """Registers and logs in a user, returning the issued tokens."""
+    client.post('/api/v1/auth/register',
+                data=json.dumps(dict(username='revoker', email='revoker@example.com', password='password123')),
+                content_type='application/json')
+    response = client.post('/api/v1/auth/login',
+                           data=json.dumps(dict(email='revoker@example.com', password='password123')),
+                           content_type='application/json')
+    return json.loads(response.data)
+
+
+def make_standalone_cache(tmp_path, **config):
+    """Builds a RevocationCache bound to a throwaway app and sync file."""
+    app = Flask(__name__, instance_path=str(tmp_path))
+    app.config['REVOCATION_SYNC_FILE'] = str(tmp_path / 'revocation.gen')
+    app.config.update(config)
+    return RevocationCache(app)
+
+
+# --- Test Cases ---
+
+class TestRevocationCache:
+    """Test suite for the in-process revocation cache."""
+
+    def test_repeated_requests_hit_cache(self, client, tokens):
+        """Only the first request for a token should reach the blocklist table."""
+        headers = {'Authorization': f"Bearer {tokens['access_token']}"}
+        before = revocation_cache.db_lookups
+        for _ in range(5):
+            assert client.get('/api/v1/auth/me', headers=headers).status_code == 200
+        assert revocation_cache.db_lookups - before == 1
+
+    def test_logout_revokes_cached_token(self, client, tokens):
+        """A token cached as valid must be rejected right after logout."""
+        headers = {'Authorization': f"Bearer {tokens['access_token']}"}
+        assert client.get('/api/v1/auth/me', headers=headers).status_code == 200
+        assert client.post('/api/v1/auth/logout', headers=headers).status_code == 200
+
+        response = client.get('/api/v1/auth/me', headers=headers)
+        assert response.status_code == 401
+        assert 'revoked' in json.loads(response.data)['msg'].lower()
+
+    def test_metrics_endpoint_publishes_counters(self, client, tokens):
+        """The metrics endpoint should expose the cache's hit/miss counters."""
+        headers = {'Authorization': f"Bearer {tokens['access_token']}"}
+        client.get('/api/v1/auth/me', headers=headers)
+        client.get('/api/v1/auth/me', headers=headers)
+
+        response = client.get('/api/v1/metrics', headers=headers)
+        data = json.loads(response.data)['data']
+        assert response.status_code == 200
+        assert data['revocation_cache']['hits'] >= 1
+        assert data['revocation_cache']['misses'] >= 1
+        assert 'db_lookups' in data['revocation_cache']
+
+    def test_metrics_endpoint_is_for_administrators_only(self, client, test_app, tokens, monkeypatch):
+        headers = {'Authorization': f"Bearer {tokens['access_token']}"}
+        assert client.get('/api/v1/metrics').status_code == 401
+        monkeypatch.setitem(test_app.config, 'ADMIN_EMAILS', [])
+        assert client.get('/api/v1/metrics', headers=headers).status_code == 403
+
+    def test_revocation_in_other_worker_invalidates_cache(self, tmp_path):
+        """A revocation recorded by another worker must clear this worker's negative answers."""
+        worker_a = make_standalone_cache(tmp_path)
+        worker_b = make_standalone_cache(tmp_path)
+        revoked_jtis = set()
+
+        def lookup(payload):
+            return payload['jti'] in revoked_jtis
+
+        payload = {'jti': 'abc', 'exp': time.time() + 600}
+        assert worker_a.is_revoked(payload, lookup) is False
+
+        revoked_jtis.add('abc')
+        worker_b.mark_revoked('abc', payload['exp'])
+
+        assert worker_a.is_revoked(payload, lookup) is True
+
+    def test_own_revocation_stays_cached(self, tmp_path):
+        """The worker that revokes a token keeps answering "revoked" without a lookup."""
+        cache = make_standalone_cache(tmp_path)
+        calls = []
+        payload = {'jti': 'mine', 'exp': time.time() + 600}
+
+        cache.mark_revoked('mine', payload['exp'])
+        assert cache.is_revoked(payload, lambda p: calls.append(1) or True) is True
+        assert calls == []
+
+    def test_revocation_only_drops_the_revoked_entry(self, tmp_path):
+        """Another worker's revocation invalidates that JTI (or user epoch) only."""
+        worker_a = make_standalone_cache(tmp_path)
+        worker_b = make_standalone_cache(tmp_path)
+        calls = []
+
+        def lookup(payload):
+            calls.append(payload['jti'])
+            return False
+
+        for jti in ('kept', 'revoked'):
+            worker_a.is_revoked({'jti': jti, 'exp': time.time() + 600}, lookup)
+        worker_a.is_epoch_revoked({'sub': '7', 'epoch': 0}, lambda user_id: 0)
+        worker_b.mark_revoked('revoked', time.time() + 600)
+        worker_b.forget_epoch('8')
+
+        worker_a.is_revoked({'jti': 'kept', 'exp': time.time() + 600}, lookup)
+        worker_a.is_revoked({'jti': 'revoked', 'exp': time.time() + 600}, lookup)
+        assert calls == ['kept', 'revoked', 'revoked']
+        assert worker_a.is_epoch_revoked({'sub': '7', 'epoch': 0}, lambda user_id: pytest.fail('epoch lookup')) is False
+
+    def test_falling_behind_the_change_log_clears_everything(self, tmp_path):
+        """Without the changed keys (a keyless bump, or a wrapped log) every answer is dropped."""
+        worker_a = make_standalone_cache(tmp_path)
+        worker_b = make_standalone_cache(tmp_path)
+        calls = []
+        payload = {'jti': 'abc', 'exp': time.time() + 600}
+        worker_a.is_revoked(payload, lambda p: calls.append(1) or False)
+
+        for n in range(SharedGeneration.LOG_SIZE + 1):
+            worker_b.mark_revoked(f'other-{n}', payload['exp'])
+        worker_a.is_revoked(payload, lambda p: calls.append(1) or False)
+        worker_b.notify_change()
+        worker_a.is_revoked(payload, lambda p: calls.append(1) or False)
+        assert len(calls) == 3
+
+    def test_ttl_capped_at_token_lifetime(self, tmp_path):
+        """Entries must not outlive the token they describe."""
+        cache = make_standalone_cache(tmp_path, REVOCATION_CACHE_TTL=300)
+        calls = []
+
+        def lookup(payload):
+            calls.append(payload['jti'])
+            return False
+
+        payload = {'jti': 'short-lived', 'exp': time.time() + 0.05}
+        cache.is_revoked(payload, lookup)
+        time.sleep(0.1)
+        cache.is_revoked(payload, lookup)
+        assert calls == ['short-lived', 'short-lived']
+
+    def test_disabled_cache_always_queries(self, tmp_path):
+        """With the cache disabled every call goes to the lookup."""
+        cache = make_standalone_cache(tmp_path, REVOCATION_CACHE_ENABLED=False)
+        calls = []
+        payload = {'jti': 'x', 'exp': time.time() + 600}
+        for _ in range(3):
+            cache.is_revoked(payload, lambda p: calls.append(1) or False)
+        assert len(calls) == 3
+
+
+class TestTTLCache:
+    """Test suite for the bounded LRU/TTL cache primitive."""
+
+    def test_lru_eviction(self):
+        cache = TTLCache(max_size=2, default_ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')      # 'a' becomes most recently used
+        cache.set('c', 3)   # evicts 'b'
+        assert cache.get('b') is None
+        assert cache.get('a') == 1
+        assert cache.get('c') == 3
+        assert cache.evictions == 1
+
+    def test_hit_and_miss_counters(self):
+        cache = TTLCache(max_size=10, default_ttl=60)
+        cache.set('k', False)
+        assert cache.get('k') is False
+        assert cache.get('missing') is None
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['misses'] == 1
+
+
+class TestBlocklistBloomFilter:
+    """Test suite for the Bloom filter in front of the jti query."""
+
+    def test_no_false_negatives_and_bounded_false_positives(self):
+        bloom = BloomFilter(capacity=10000, error_rate=0.01)
+        members = [f"jti-{i}" for i in range(10000)]
+        for jti in members:
+            bloom.add(jti)
+        assert all(jti in bloom for jti in members)
+        false_positives = sum(1 for i in range(10000) if f"other-{i}" in bloom)
+        assert false_positives < 300  # ~1% expected
+
+    def test_unrevoked_token_skips_jti_query(self, client, tokens):
+        """A token that was never revoked is answered by the filter alone."""
+        headers = {'Authorization': f"Bearer {tokens['access_token']}"}
+        before = blocklist_filter.negatives
+        assert client.get('/api/v1/auth/me', headers=headers).status_code == 200
+        assert blocklist_filter.negatives == before + 1
+
+    def test_filter_catches_up_with_other_workers(self, client, tokens, test_app):
+        """A row inserted by another worker must be seen once the generation changes."""
+        headers = {'Authorization': f"Bearer {tokens['access_token']}"}
+        assert client.get('/api/v1/auth/me', headers=headers).status_code == 200
+
+        # Simulate another worker: commit the row and bump the shared generation
+        # without touching this worker's filter.
+        with client.application.test_request_context():
+            from flask_jwt_extended import decode_token
+            claims = decode_token(tokens['access_token'])
+        user = User.query.filter_by(email='revoker@example.com').first()
+        db.session.add(TokenBlocklist(jti=claims['jti'], token_type='access', user_id=user.id))
+        db.session.commit()
+        revocation_cache.notify_change()
+
+        assert client.get('/api/v1/auth/me', headers=headers).status_code == 401
+
+
+class TestBlocklistExpiry:
+    """Test suite for blocklist row expiry and the batched purge."""
+
+    def _add_row(self, jti, user_id, expires_at):
+        db.session.add(TokenBlocklist(jti=jti, token_type='access', user_id=user_id, expires_at=expires_at))
+
+    def test_logout_stores_token_expiry(self, client, tokens):
+        headers = {'Authorization': f"Bearer {tokens['access_token']}"}
+        client.post('/api/v1/auth/logout', headers=headers)
+        row = TokenBlocklist.query.one()
+        assert row.expires_at is not None
+        assert row.expires_at > datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+
+    def test_purge_deletes_only_expired_rows_in_batches(self, client, tokens):
+        user = User.query.filter_by(email='revoker@example.com').first()
+        now = datetime.datetime.now(datetime.timezone.utc)
+        for i in range(25):
+            self._add_row(f"expired-{i}", user.id, now - datetime.timedelta(minutes=1))
+        for i in range(3):
+            self._add_row(f"live-{i}", user.id, now + datetime.timedelta(hours=1))
+        self._add_row('no-expiry', user.id, None)
+        db.session.commit()
+
+        assert purge_expired_tokens(batch_size=10) == 25
+        remaining = {row.jti for row in TokenBlocklist.query.all()}
+        assert remaining == {'live-0', 'live-1', 'live-2', 'no-expiry'}
+
+    def test_purge_cli_command(self, test_app, client, tokens):
+        user = User.query.filter_by(email='revoker@example.com').first()
+        past = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(seconds=5)
+        self._add_row('cli-expired', user.id, past)
+        db.session.commit()
+
+        result = test_app.test_cli_runner().invoke(args=['blocklist', 'purge', '--batch-size', '5'])
+        assert result.exit_code == 0
+        assert 'Purged 1 expired blocklist rows' in result.output
+        assert TokenBlocklist.query.filter_by(jti='cli-expired').first() is None
+
+    def test_lookup_skips_expired_rows(self, client, tokens):
+        user = User.query.filter_by(email='revoker@example.com').first()
+        past = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(seconds=5)
+        self._add_row('stale', user.id, past)
+        db.session.commit()
+        revocation_cache.clear()
+        blocklist_filter.add('stale')  # force the lookup past the bloom filter
+        assert _lookup_blocklist({'jti': 'stale'}) is False
+
+
+class TestBackgroundScheduler:
+    """Test suite for the in-app maintenance job runner."""
+
+    def test_run_now_and_exclusive_lock(self, tmp_path):
+        fcntl = pytest.importorskip('fcntl')
+        app = Flask(__name__, instance_path=str(tmp_path))
+        scheduler = BackgroundScheduler(app)
+        calls = []
+        scheduler.every(60, 'demo', lambda: calls.append(1) or len(calls))
+        scheduler.every(0, 'disabled', lambda: calls.append('never'))
+
+        assert scheduler.run_now('demo') == 1
+        assert list(scheduler.stats()) == ['demo']
+
+        # Another worker holding the job lock makes this round a no-op.
+        with open(tmp_path / 'demo.lock', 'w') as held:
+            fcntl.flock(held, fcntl.LOCK_EX)
+            assert scheduler.run_now('demo') is None
+        assert scheduler.stats()['demo']['runs'] == 1
+        assert scheduler.stats()['demo']['skipped'] == 1
+
+
+class TestLogoutAllDevices:
+    """Test suite for per-user token epochs."""
+
+    def _login(self, client):
+        response = client.post('/api/v1/auth/login',
+                               data=json.dumps(dict(email='revoker@example.com', password='password123')),
+                               content_type='application/json')
+        return json.loads(response.data)
+
+    def test_logout_all_revokes_every_session(self, client, tokens):
+        other_device = self._login(client)
+        headers_a = {'Authorization': f"Bearer {tokens['access_token']}"}
+        headers_b = {'Authorization': f"Bearer {other_device['access_token']}"}
+        refresh_b = {'Authorization': f"Bearer {other_device['refresh_token']}"}
+        assert client.get('/api/v1/auth/me', headers=headers_b).status_code == 200
+
+        response = client.post('/api/v1/auth/logout-all', headers=headers_a)
+        assert response.status_code == 200
+
+        assert client.get('/api/v1/auth/me', headers=headers_a).status_code == 401
+        assert client.get('/api/v1/auth/me', headers=headers_b).status_code == 401
+        assert client.post('/api/v1/auth/refresh', headers=refresh_b).status_code == 401
+        # No per-token rows were needed.
+        assert TokenBlocklist.query.count() == 0
+
+    def test_new_login_after_logout_all_is_valid(self, client, tokens):
+        headers = {'Authorization': f"Bearer {tokens['access_token']}"}
+        client.post('/api/v1/auth/logout-all', headers=headers)
+
+        fresh = self._login(client)
+        fresh_headers = {'Authorization': f"Bearer {fresh['access_token']}"}
+        assert client.get('/api/v1/auth/me', headers=fresh_headers).status_code == 200
+
+        refreshed = client.post('/api/v1/auth/refresh',
+                                headers={'Authorization': f"Bearer {fresh['refresh_token']}"})
+        assert refreshed.status_code == 200
+        refreshed_headers = {'Authorization': f"Bearer {json.loads(refreshed.data)['access_token']}"}
+        assert client.get('/api/v1/auth/me', headers=refreshed_headers).status_code == 200
+
+    def test_epoch_lookup_is_cached_per_user(self, tmp_path):
+        cache = make_standalone_cache(tmp_path)
+        calls = []
+
+        def lookup(user_id):
+            calls.append(user_id)
+            return 2
+
+        assert cache.is_epoch_revoked({'sub': '7', 'epoch': 1}, lookup) is True
+        assert cache.is_epoch_revoked({'sub': '7', 'epoch': 2}, lookup) is False
+        assert cache.is_epoch_revoked({'sub': '7'}, lookup) is True  # legacy token without the claim
+        assert calls == ['7']
@@ -0,0 +1,172 @@
+# /your_project_root/tests/test_user_import.py
+# Pytest test cases for bulk user provisioning (CLI and admin endpoint).
+
+import pytest
+import json
+from sqlalchemy import event
+from app import create_app
+from app.extensions import db
+from app.models.user import User
+from app.models.user_profile import UserProfile
+from app.models.token_blocklist import TokenBlocklist
+
+# --- Test Fixtures ---
+
+@pytest.fixture(scope='module')
+def test_app():
+    """Creates an app instance using the 'testing' configuration."""
+    flask_app = create_app(config_name='testing')
+    flask_app.config['ADMIN_EMAILS'] = ['admin@example.com']
+    flask_app.config['USER_IMPORT_WORKERS'] = 1
+    with flask_app.app_context():
+        db.create_all()
+        yield flask_app
+        db.session.remove()
+        db.drop_all()
+        db.engine.dispose()
+
+
+@pytest.fixture(scope='module')
+def client(test_app):
+    """Provides a test client for the app."""
+    with test_app.test_client() as testing_client:
+        yield testing_client
+
+
+@pytest.fixture(scope='function')
+def clean_db(test_app):
+    """Clears users, profiles and blocklist rows before each test."""
+    TokenBlocklist.query.delete()
+    UserProfile.query.delete()
+    User.query.delete()
+    db.session.commit()
+    db.session.expunge_all()
+    yield
+
+
+def login_headers(client, username, email):
+    """Registers and logs in a user, returning Authorization headers."""
+    client.post('/api/v1/auth/register', data=json.dumps(
+        {'username': username, 'email': email, 'password': 'password123'}), content_type='application/json')
+    response = client.post('/api/v1/auth/login', data=json.dumps(
+        {'email': email, 'password': 'password123'}), content_type='application/json')
+    return {'Authorization': f"Bearer {json.loads(response.data)['access_token']}"}
+
+
+CSV_USERS = (
+    "username,email,password\n"
+    "alice,alice@example.com,alice-pass\n"
+    "bob,bob@example.com,bob-pass\n"
+    "existing,new@example.com,whatever\n"
+    "carol,,carol-pass\n"
+    "bob2,bob@example.com,bob-pass\n"
+)
+
+
+# --- Test Cases ---
+
+class TestUsersImportCommand:
+    """Test suite for `flask users import`."""
+
+    def test_imports_csv_and_reports_skips(self, test_app, clean_db, tmp_path):
+        db.session.add(User(username='existing', email='existing@example.com', password='password123'))
+        db.session.commit()
+        source = tmp_path / 'users.csv'
+        source.write_text(CSV_USERS)
+
+        result = test_app.test_cli_runner().invoke(args=['users', 'import', str(source), '--workers', '1'])
+
+        assert result.exit_code == 0, result.output
+        assert 'Created 2 users, skipped 3' in result.output
+        assert 'users/s' in result.output
+        assert "line 4: Username 'existing' already exists" in result.output
+        assert "line 5: Missing required field 'email'" in result.output
+        assert "line 6: Email 'bob@example.com' already registered" in result.output
+
+        alice = User.query.filter_by(username='alice').one()
+        assert alice.check_password('alice-pass')
+        assert alice.profile is not None
+        assert User.query.count() == 3
+
+    def test_hashes_on_process_pool(self, test_app, clean_db, tmp_path):
+        source = tmp_path / 'users.ndjson'
+        source.write_text('\n'.join(json.dumps({'username': f'p{i}', 'email': f'p{i}@example.com',
+                                                'password': f'pass-{i}'}) for i in range(6)))
+
+        result = test_app.test_cli_runner().invoke(
+            args=['users', 'import', str(source), '--workers', '2', '--batch-size', '4'])
+
+        assert result.exit_code == 0, result.output
+        assert 'Created 6 users' in result.output
+        assert User.query.filter_by(username='p5').one().check_password('pass-5')
+        assert UserProfile.query.count() == 6
+
+    def test_inserts_each_batch_with_one_statement(self, test_app, clean_db, tmp_path):
+        source = tmp_path / 'users.ndjson'
+        source.write_text('\n'.join(json.dumps({'username': f'b{i}', 'email': f'b{i}@example.com',
+                                                'password': f'pass-{i}'}) for i in range(5)))
+        inserts = []
+        def collect(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith('INSERT INTO users'):
+                inserts.append(statement)
+        event.listen(db.engine, 'before_cursor_execute', collect)
+        try:
+            result = test_app.test_cli_runner().invoke(args=['users', 'import', str(source), '--workers', '1'])
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', collect)
+
+        assert result.exit_code == 0, result.output
+        assert len(inserts) == 1
+        # Each profile shares the id of its user.
+        for user in User.query.filter(User.username.like('b%')):
+            assert user.profile is not None
+
+    def test_unknown_extension_needs_format(self, test_app, tmp_path):
+        source = tmp_path / 'users.txt'
+        source.write_text(CSV_USERS)
+        result = test_app.test_cli_runner().invoke(args=['users', 'import', str(source)])
+        assert result.exit_code != 0
+        assert 'import format' in result.output
+
+
+class TestAdminImportEndpoint:
+    """Test suite for POST /api/v1/admin/users/import."""
+
+    def test_requires_admin(self, client, clean_db):
+        headers = login_headers(client, 'plain', 'plain@example.com')
+        response = client.post('/api/v1/admin/users/import', headers=headers,
+                               data=CSV_USERS, content_type='text/csv')
+        assert response.status_code == 403
+
+    def test_admin_imports_ndjson(self, client, clean_db):
+        headers = login_headers(client, 'admin', 'admin@example.com')
+        body = '\n'.join([
+            json.dumps({'username': 'dave', 'email': 'dave@example.com', 'password': 'dave-pass'}),
+            'not json',
+            json.dumps({'username': 'erin', 'email': 'erin@example.com', 'password': 'erin-pass'}),
+        ])
+        response = client.post('/api/v1/admin/users/import', headers=headers,
+                               data=body, content_type='application/x-ndjson')
+
+        assert response.status_code == 201
+        data = json.loads(response.data)['data']
+        assert data['created'] == 2
+        assert data['skipped'] == 1
+        assert data['errors'][0]['line'] == 2
+        assert User.query.filter_by(email='erin@example.com').one().check_password('erin-pass')
+
+    def test_rejects_bodies_over_the_request_limit(self, client, test_app, clean_db, monkeypatch):
+        monkeypatch.setitem(test_app.config, 'USER_IMPORT_MAX_REQUEST_ROWS', 2)
+        headers = login_headers(client, 'admin', 'admin@example.com')
+        response = client.post('/api/v1/admin/users/import', headers=headers,
+                               data=CSV_USERS, content_type='text/csv')
+
+        assert response.status_code == 413
+        assert 'flask users import' in json.loads(response.data)['error']
+        assert User.query.count() == 1
+
+    def test_rejects_unknown_format(self, client, clean_db):
+        headers = login_headers(client, 'admin', 'admin@example.com')
+        response = client.post('/api/v1/admin/users/import', headers=headers,
+                               data='<users/>', content_type='application/xml')
+        assert response.status_code == 400